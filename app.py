@@ -3,12 +3,14 @@ from tkinter import messagebox, ttk
 import os
 import pandas as pd
 import importlib
+import multiprocessing
 import threading
 import time
 from src.shared.utils.legacy_utils import load_config, data_path, storage_state_path, notify
 from src.config_window import show_config_window
 from src.config_validator import check_config_or_show_dialog
 from src.shared.logging.logger import PerformanceLogger, get_logger
+from src.infrastructure.browser.browser_service import get_browser_service, shutdown_browser_service
 
 # Initialize logger
 logger: PerformanceLogger = get_logger()
@@ -259,6 +261,9 @@ def limpiar_sesion():
         if not messagebox.askyesno("Confirmar", "¿Eliminar la sesión actual?"):
             logger.info("↩️ Cancelado por el usuario")
             return
+        # El navegador persistente conserva la sesión en memoria: se le pide que se
+        # cierre al terminar la operación en curso (sin bloquear la interfaz)
+        shutdown_browser_service()
         os.remove(path)
         logger.success("✅ Sesión eliminada exitosamente", path=path)
         messagebox.showinfo("Sesión", "Sesión eliminada. Se pedirá login en el próximo inicio.")
@@ -266,6 +271,20 @@ def limpiar_sesion():
         logger.error(f"No se pudo limpiar la sesión: {e}", error=str(e))
         messagebox.showerror("Error", f"No se pudo limpiar la sesión: {e}")
 
+def limpiar_cache_informes():
+    logger.info("🧹 Limpiando caché de scraping de informes")
+    try:
+        if not messagebox.askyesno("Confirmar", "¿Eliminar los datos de informes guardados en caché?\nSe volverán a extraer en el próximo informe."):
+            logger.info("↩️ Cancelado por el usuario")
+            return
+        from src.cache import get_scrape_cache
+        eliminadas = get_scrape_cache().invalidate()
+        logger.success("✅ Caché de informes eliminado", eliminadas=eliminadas)
+        messagebox.showinfo("Caché", f"Caché de informes eliminado ({eliminadas} entradas).")
+    except Exception as e:
+        logger.error(f"No se pudo limpiar el caché de informes: {e}", error=str(e))
+        messagebox.showerror("Error", f"No se pudo limpiar el caché de informes: {e}")
+
 def run_listar_campanias(btn):
     logger.info("🚀 Iniciando proceso de listado de campañas")
     def worker():
@@ -280,7 +299,7 @@ def run_listar_campanias(btn):
             importlib.reload(m)
 
             logger.info("⚙️ Ejecutando función principal de listado de campañas")
-            m.main()
+            get_browser_service().run(lambda page, context: m.main(page=page, context=context), name="listar_campanias")
             logger.success("✅ Listado de campañas completado exitosamente")
             root.after(0, lambda: notify("Completado", "Listado de campañas finalizado con éxito", "info"))
 
@@ -326,7 +345,7 @@ def run_obtener_suscriptores(btn):
             
             # root.after(0, lambda: actualizar_progreso("Procesando campañas y extrayendo suscriptores"))
             logger.info("⚙️ Ejecutando función principal de extracción de suscriptores")
-            m.main()
+            get_browser_service().run(lambda page, context: m.main(page=page, context=context), name="demo")
             
             # root.after(0, lambda: cerrar_contador_progreso())
             logger.success("✅ Extracción de suscriptores completada exitosamente")
@@ -415,7 +434,11 @@ def run_crear_lista(btn):
 
             # Ejecutar creación con scraping pasando las hojas seleccionadas
             logger.info("⚙️ Ejecutando función principal de creación de lista(s) con scraping")
-            m.main(nombre_hoja=hojas_seleccionadas, archivo_excel=archivo_excel, multiple=True)
+            get_browser_service().run(
+                lambda page, context: m.main(nombre_hoja=hojas_seleccionadas, archivo_excel=archivo_excel,
+                                             multiple=True, page=page, context=context),
+                name="crear_lista",
+            )
 
             logger.success("✅ Creación de lista(s) con scraping completada exitosamente")
             if len(hojas_seleccionadas) == 1:
@@ -554,7 +577,7 @@ def run_descargar_suscriptores(btn):
             
             # root.after(0, lambda: actualizar_progreso("Descargando datos de suscriptores"))
             logger.info("⚙️ Ejecutando función principal de descarga de suscriptores")
-            m.main()
+            get_browser_service().run(lambda page, context: m.main(page=page, context=context), name="descargar_suscriptores")
             
             # root.after(0, lambda: cerrar_contador_progreso())
             logger.success("✅ Descarga de suscriptores completada exitosamente")
@@ -669,6 +692,8 @@ def run_mapear_segmentos(btn):
 			# root.after(0, lambda: actualizar_progreso("Mapeando y creando segmentos"))
 			# Ejecutar mapeo completo
 			logger.info("⚙️ Ejecutando mapeo completo de segmentos")
+			# La parte de API va en hilos propios; la creación de segmentos por scraping
+			# se encola en el servicio de navegador persistente
 			resultado = m.mapear_segmentos_completo()
 
 			# root.after(0, lambda: cerrar_contador_progreso())
@@ -726,6 +751,8 @@ def run_mapear_segmentos(btn):
 	threading.Thread(target=worker, daemon=True).start()
 
 if __name__ == "__main__":
+    # Necesario en el ejecutable de PyInstaller para el pool de informes (reports.parallel_workers)
+    multiprocessing.freeze_support()
     logger.info("🚀 Iniciando aplicación de automatización Acumbamail")
     configuracion()
     archivo_busqueda()
@@ -824,4 +851,10 @@ if __name__ == "__main__":
     btn_clean = tk.Button(frame_config, text="Limpiar sesión actual", font=("Arial", 14), height=2, command=limpiar_sesion)
     btn_clean.pack(pady=8, fill="x", padx=15)
 
-    root.mainloop()
\ No newline at end of file
+    btn_clean_cache = tk.Button(frame_config, text="Limpiar caché de informes", font=("Arial", 14), height=2, command=limpiar_cache_informes)
+    btn_clean_cache.pack(pady=8, fill="x", padx=15)
+
+    root.mainloop()
+
+    # Cerrar el navegador persistente al salir de la aplicación (la ventana ya no existe)
+    shutdown_browser_service(wait=True, timeout=30)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de descarga de suscriptores: API paginada frente al scraping de la tabla web
+
+Descarga la misma lista por ``getSubscribers`` (``obtener_suscriptores_via_api``)
+y recorriendo la tabla de Acumbamail (``obtener_suscriptores_via_scraping``), y
+muestra las filas por segundo de cada camino, la aceleración y qué columnas de
+la web no devuelve la API. Si hay alguna, también el tiempo del camino "API
+primero" (``obtener_suscriptores_api_primero``), que en ese caso descarga por
+API y además recorre la tabla completa. Necesita config.yaml con credenciales
+y api_key.
+
+Uso:
+    python benchmark_descarga_suscriptores.py --lista 123456 [--nombre "Mi lista"] [--headless]
+"""
+
+import argparse
+import sys
+import time
+sys.path.insert(0, '.')
+
+from src.cache.checkpoints import get_checkpoint_store
+from src.descargar_suscriptores import (
+    campos_sin_api,
+    columnas_tabla_web,
+    completar_desde_scraping,
+    obtener_suscriptores_via_api,
+    obtener_suscriptores_via_scraping,
+)
+from src.infrastructure.api import API
+from src.infrastructure.browser.browser_service import authenticated_page
+
+
+def filas_por_segundo(filas: int, segundos: float) -> float:
+    return filas / segundos if segundos > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de descarga de suscriptores (API vs scraping)')
+    parser.add_argument('--lista', type=int, required=True, help='ID de la lista')
+    parser.add_argument('--nombre', default='benchmark', help='Nombre de la lista (solo informativo)')
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+
+    print(f"📊 Descargando lista {args.lista} por API...")
+    inicio = time.perf_counter()
+    filas_api, columnas_api = obtener_suscriptores_via_api(args.lista, args.nombre, API())
+    tiempo_api = time.perf_counter() - inicio
+    print(f"⚡ API: {len(filas_api):,} filas en {tiempo_api:.2f}s ({filas_por_segundo(len(filas_api), tiempo_api):,.1f} filas/s)")
+
+    with authenticated_page(headless=args.headless) as (page, _context):
+        inicio = time.perf_counter()
+        faltantes = campos_sin_api(columnas_tabla_web(page, args.lista), columnas_api)
+        tiempo_columnas = time.perf_counter() - inicio
+
+        # Sin checkpoint previo: el scraping debe recorrer todas las páginas
+        get_checkpoint_store().discard(f"list_subscribers:{args.lista}")
+        print(f"📊 Descargando lista {args.lista} por scraping...")
+        inicio = time.perf_counter()
+        filas_web = obtener_suscriptores_via_scraping(page, args.lista, args.nombre)
+        tiempo_web = time.perf_counter() - inicio
+    print(f"🐢 Scraping: {len(filas_web):,} filas en {tiempo_web:.2f}s ({filas_por_segundo(len(filas_web), tiempo_web):,.1f} filas/s)")
+
+    emails_api = {f["email"].lower() for f in filas_api}
+    emails_web = {f["email"].lower() for f in filas_web if f.get("email")}
+    coinciden = emails_api == emails_web
+    print(f"{'✅' if coinciden else '❌'} Suscriptores {'idénticos' if coinciden else 'distintos'} "
+          f"(solo API: {len(emails_api - emails_web)}, solo web: {len(emails_web - emails_api)})")
+    print(f"📋 Columnas de la web sin equivalente en la API: {faltantes or 'ninguna'}")
+    if tiempo_api > 0:
+        print(f"🚀 Aceleración de la API frente a scraping: x{tiempo_web / tiempo_api:.1f}")
+
+    # Camino "API primero": API + columnas de la web y, si falta alguna, la tabla completa
+    tiempo_hibrido = tiempo_api + tiempo_columnas
+    if faltantes:
+        inicio = time.perf_counter()
+        completar_desde_scraping(filas_api, filas_web, faltantes)
+        tiempo_hibrido += tiempo_web + time.perf_counter() - inicio
+        print(f"🐢 API primero (API + tabla web completa por {len(faltantes)} columna(s)): {tiempo_hibrido:.2f}s "
+              f"({filas_por_segundo(len(filas_api), tiempo_hibrido):,.1f} filas/s)")
+    else:
+        print(f"⚡ API primero (sin scraping): {tiempo_hibrido:.2f}s "
+              f"({filas_por_segundo(len(filas_api), tiempo_hibrido):,.1f} filas/s)")
+    if tiempo_hibrido > 0:
+        print(f"🚀 Aceleración de API primero frente a scraping: x{tiempo_web / tiempo_hibrido:.1f}")
+    return 0 if coinciden else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark de asignación de segmentos: motor vectorizado frente al bucle por segmento
+
+Genera una lista sintética (500.000 filas por defecto) y un juego de reglas como
+las de Segmentos.xlsx, y mide el tiempo de ``MotorSegmentos.asignar`` frente al
+algoritmo original regla a regla (máscara por columna y asignación fila a fila
+con ``df.loc``), copiado aquí sin los mensajes de log porque las funciones de
+``mapeo_segmentos`` ya usan el motor. Comprueba además que ambas columnas
+Segmentos resultantes coinciden.
+
+Uso:
+    python benchmark_segmentos.py [--filas 500000] [--reglas 40]
+"""
+
+import argparse
+import sys
+import time
+sys.path.insert(0, '.')
+
+import numpy as np
+import pandas as pd
+
+from src.motor_segmentos import MotorSegmentos
+
+HEADERS = ['NOMBRE SEGMENTO', 'SEDE', 'ORGANO', 'N ORGANO', 'ROL USUARIO', 'PERFIL USUARIO']
+SEDES = ['Madrid', 'Sevilla', 'Málaga', 'Cádiz', 'Granada', 'Córdoba', 'Huelva', 'Jaén']
+ORGANOS = ['Juzgado Primera Instancia', 'Juzgado Instrucción', 'Audiencia Provincial', 'Juzgado Social']
+ROLES = ['Juez', 'LAJ', 'Gestor', 'Tramitador', 'Auxilio']
+PERFILES = ['Titular', 'Sustituto', 'Refuerzo']
+
+
+def generar_lista(filas: int, semilla: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({
+        'email': [f'usuario{i}@example.com' for i in range(filas)],
+        'SEDE': rng.choice(SEDES, filas),
+        'ORGANO': rng.choice(ORGANOS, filas),
+        'N ORGANO': rng.integers(1, 15, filas),
+        'ROL USUARIO': rng.choice(ROLES, filas),
+        'PERFIL USUARIO': rng.choice(PERFILES, filas),
+    })
+
+
+def generar_reglas(cantidad: int, semilla: int = 42) -> list:
+    rng = np.random.default_rng(semilla)
+    reglas = []
+    for i in range(cantidad):
+        reglas.append([
+            f'Segmento {i % max(1, cantidad // 2)}',  # nombres repetidos, como en Segmentos.xlsx
+            str(rng.choice(SEDES)),
+            str(rng.choice(ORGANOS)) if rng.random() < 0.5 else None,
+            int(rng.integers(1, 15)) if rng.random() < 0.3 else None,
+            str(rng.choice(ROLES)) if rng.random() < 0.7 else None,
+            None,
+        ])
+    return reglas
+
+
+def es_vacio(valor) -> bool:
+    return pd.isna(valor) or valor == '' or valor is None or str(valor).lower() == 'nan'
+
+
+def mascara_original(df: pd.DataFrame, condiciones: list, headers: list) -> pd.Series:
+    """Máscara AND de una regla, columna a columna (implementación anterior al motor)."""
+    mask = pd.Series([True] * len(df))
+    for valor, columna in zip(condiciones[1:], headers[1:]):
+        if columna not in df.columns or es_vacio(valor):
+            continue
+        if isinstance(valor, (int, float)):
+            try:
+                condicion = (pd.to_numeric(df[columna], errors='coerce') == float(valor))
+            except (ValueError, TypeError):
+                condicion = (df[columna].astype(str) == str(valor))
+        else:
+            condicion = (df[columna].astype(str) == str(valor))
+        mask &= condicion
+    return mask
+
+
+def asignar_original(df: pd.DataFrame, mask: pd.Series, nombre_segmento: str) -> pd.DataFrame:
+    """Añade el segmento a las filas de la máscara con ``df.loc`` (implementación anterior al motor)."""
+    if 'Segmentos' not in df.columns:
+        df['Segmentos'] = ''
+    for idx in df[mask].index:
+        valor_actual = str(df.loc[idx, 'Segmentos']).strip()
+        if valor_actual == '' or pd.isna(valor_actual):
+            df.loc[idx, 'Segmentos'] = nombre_segmento
+        elif nombre_segmento not in valor_actual.split(';'):
+            df.loc[idx, 'Segmentos'] = f"{valor_actual};{nombre_segmento}"
+    return df
+
+
+def por_segmento(df: pd.DataFrame, reglas: list) -> pd.DataFrame:
+    for condiciones in reglas:
+        mask = mascara_original(df, condiciones, HEADERS)
+        if mask.any():
+            df = asignar_original(df, mask, condiciones[0])
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de asignación de segmentos')
+    parser.add_argument('--filas', type=int, default=500_000)
+    parser.add_argument('--reglas', type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"📊 Generando lista sintética: {args.filas:,} filas, {args.reglas} reglas")
+    df = generar_lista(args.filas)
+    reglas = generar_reglas(args.reglas)
+
+    inicio = time.perf_counter()
+    resultado = MotorSegmentos(reglas, HEADERS).asignar(df)
+    tiempo_motor = time.perf_counter() - inicio
+    print(f"⚡ Motor vectorizado: {tiempo_motor:.2f}s ({resultado.total_asignaciones:,} asignaciones)")
+
+    inicio = time.perf_counter()
+    df_bucle = por_segmento(df.copy(), reglas)
+    tiempo_bucle = time.perf_counter() - inicio
+    print(f"🐢 Bucle por segmento: {tiempo_bucle:.2f}s")
+
+    bucle = df_bucle['Segmentos'].fillna('') if 'Segmentos' in df_bucle else pd.Series('', index=df.index)
+    # Se comparan los valores: el tipo (object/str) y el nombre de la serie pueden diferir
+    coinciden = bucle.tolist() == resultado.segmentos.tolist()
+    print(f"{'✅' if coinciden else '❌'} Resultados {'idénticos' if coinciden else 'distintos'}")
+    if tiempo_motor > 0:
+        print(f"🚀 Aceleración: x{tiempo_bucle / tiempo_motor:.1f}")
+    return 0 if coinciden else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Cachés en disco para evitar repetir extracciones costosas
+"""
+from .sqlite_store import SQLiteStore, instancia_compartida
+from .scrape_cache import (
+    ScrapeResultCache,
+    get_scrape_cache,
+    parse_send_date,
+    KIND_HARD_BOUNCES,
+    KIND_NO_OPENS,
+    KIND_CAMPAIGN_URLS,
+    KIND_EMAIL_URL,
+)
+from .checkpoints import ScrapeCheckpointStore, get_checkpoint_store
+from .column_schema import ColumnSchemaStore, get_column_schema_store, huella_archivo
+from .list_stats_cache import ListStatsCache, get_list_stats_cache
+from .upload_journal import UploadJournal, get_upload_journal, clave_subida, hash_lote
+from .excel_sidecar import leer_excel_cacheado, limpiar_cache_excel
+from .sync_snapshot import (
+    DeltaSincronizacion,
+    SegmentSyncSnapshotStore,
+    calcular_delta,
+    calcular_hashes,
+    get_segment_snapshot_store,
+)
+
+__all__ = [
+    "SQLiteStore",
+    "instancia_compartida",
+    "ScrapeCheckpointStore",
+    "get_checkpoint_store",
+    "SegmentSyncSnapshotStore",
+    "get_segment_snapshot_store",
+    "DeltaSincronizacion",
+    "calcular_delta",
+    "calcular_hashes",
+    "ColumnSchemaStore",
+    "get_column_schema_store",
+    "huella_archivo",
+    "ListStatsCache",
+    "get_list_stats_cache",
+    "UploadJournal",
+    "get_upload_journal",
+    "clave_subida",
+    "hash_lote",
+    "leer_excel_cacheado",
+    "limpiar_cache_excel",
+    "ScrapeResultCache",
+    "get_scrape_cache",
+    "parse_send_date",
+    "KIND_HARD_BOUNCES",
+    "KIND_NO_OPENS",
+    "KIND_CAMPAIGN_URLS",
+    "KIND_EMAIL_URL",
+]
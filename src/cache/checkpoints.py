@@ -0,0 +1,188 @@
+"""
+Checkpoints de extracciones paginadas.
+
+Cada página completada de un scraping largo (no abiertos, hard bounces,
+suscriptores de una lista, listado de campañas) se guarda en SQLite junto con
+su número de página. Si la extracción falla a mitad (timeout, sesión
+expirada), la siguiente ejecución recupera las filas guardadas y continúa
+desde la primera página que falta en lugar de empezar desde cero.
+
+Uso típico:
+
+	store = get_checkpoint_store()
+	siguiente = store.start(clave, total_paginas)
+	filas = store.load_rows(clave)          # páginas 1..siguiente-1
+	for numero in range(siguiente, total_paginas + 1):
+		filas_pagina = extraer(...)
+		store.save_page(clave, numero, filas_pagina)
+	if store.is_complete(clave):
+		store.complete(clave)
+"""
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from ..shared.logging.logger import get_logger
+from ..shared.utils.legacy_utils import load_config
+from .sqlite_store import SQLiteStore, instancia_compartida
+
+logger = get_logger()
+
+M = TypeVar("M", bound=BaseModel)
+
+DEFAULT_MAX_AGE_HOURS = 24
+
+
+class ScrapeCheckpointStore(SQLiteStore):
+	"""
+	Almacén SQLite de páginas completadas por trabajo de scraping.
+	"""
+
+	DB_FILENAME = "scrape_checkpoints.db"
+	SCHEMA = (
+		"""
+			CREATE TABLE IF NOT EXISTS checkpoint_jobs (
+				job_key TEXT PRIMARY KEY,
+				total_pages INTEGER NOT NULL,
+				started_at TEXT NOT NULL,
+				updated_at TEXT NOT NULL
+			)
+		""",
+		"""
+			CREATE TABLE IF NOT EXISTS checkpoint_pages (
+				job_key TEXT NOT NULL,
+				page_number INTEGER NOT NULL,
+				rows TEXT NOT NULL,
+				saved_at TEXT NOT NULL,
+				PRIMARY KEY (job_key, page_number)
+			)
+		""",
+	)
+
+	def __init__(self, db_path: Optional[str] = None, max_age_hours: float = DEFAULT_MAX_AGE_HOURS, enabled: bool = True):
+		self.max_age_hours = max_age_hours
+		super().__init__(db_path, enabled)
+
+	def _delete(self, conn: sqlite3.Connection, job_key: str) -> None:
+		conn.execute("DELETE FROM checkpoint_pages WHERE job_key = ?", (job_key,))
+		conn.execute("DELETE FROM checkpoint_jobs WHERE job_key = ?", (job_key,))
+
+	def _next_page(self, conn: sqlite3.Connection, job_key: str) -> int:
+		"""Primera página que falta tras el bloque contiguo de páginas guardadas."""
+		pages = [row[0] for row in conn.execute(
+			"SELECT page_number FROM checkpoint_pages WHERE job_key = ? ORDER BY page_number",
+			(job_key,),
+		)]
+		siguiente = 1
+		for numero in pages:
+			if numero != siguiente:
+				break
+			siguiente += 1
+		return siguiente
+
+	def start(self, job_key: str, total_pages: int) -> int:
+		"""
+		Registra (o retoma) un trabajo y devuelve la página desde la que continuar.
+
+		Un checkpoint se descarta si es más antiguo que ``max_age_hours`` o si el
+		total de páginas cambió (los datos de origen ya no son los mismos).
+		"""
+		if not self.enabled:
+			return 1
+		now = datetime.now()
+		with self._lock, self._connect() as conn:
+			row = conn.execute(
+				"SELECT total_pages, started_at FROM checkpoint_jobs WHERE job_key = ?",
+				(job_key,),
+			).fetchone()
+			if row is not None:
+				stored_total, started_at = row
+				expired = now - datetime.fromisoformat(started_at) > timedelta(hours=self.max_age_hours)
+				if expired or stored_total != total_pages:
+					logger.info("🧹 Checkpoint descartado", job_key=job_key, expirado=expired,
+					            total_guardado=stored_total, total_actual=total_pages)
+					self._delete(conn, job_key)
+					row = None
+			if row is None:
+				conn.execute(
+					"INSERT INTO checkpoint_jobs (job_key, total_pages, started_at, updated_at) VALUES (?, ?, ?, ?)",
+					(job_key, total_pages, now.isoformat(), now.isoformat()),
+				)
+				return 1
+			siguiente = self._next_page(conn, job_key)
+
+		if siguiente > 1:
+			logger.info(f"♻️ Reanudando extracción desde la página {siguiente}/{total_pages}", job_key=job_key)
+		return siguiente
+
+	def save_page(self, job_key: str, page_number: int, rows: List[Any]) -> None:
+		"""Guarda las filas de una página completada y avanza el cursor."""
+		if not self.enabled:
+			return
+		serializable = [row.model_dump(mode="json") if isinstance(row, BaseModel) else row for row in rows]
+		now = datetime.now().isoformat()
+		with self._lock, self._connect() as conn:
+			conn.execute(
+				"INSERT OR REPLACE INTO checkpoint_pages (job_key, page_number, rows, saved_at) VALUES (?, ?, ?, ?)",
+				(job_key, page_number, json.dumps(serializable, ensure_ascii=False), now),
+			)
+			conn.execute("UPDATE checkpoint_jobs SET updated_at = ? WHERE job_key = ?", (now, job_key))
+
+	def load_rows(self, job_key: str) -> List[Any]:
+		"""Filas de las páginas contiguas ya completadas (1..siguiente-1), en orden."""
+		if not self.enabled:
+			return []
+		with self._connect() as conn:
+			siguiente = self._next_page(conn, job_key)
+			cursor = conn.execute(
+				"SELECT rows FROM checkpoint_pages WHERE job_key = ? AND page_number < ? ORDER BY page_number",
+				(job_key, siguiente),
+			)
+			rows: List[Any] = []
+			for (payload,) in cursor:
+				rows.extend(json.loads(payload))
+		return rows
+
+	def load_models(self, job_key: str, model: Type[M]) -> List[M]:
+		"""Como :meth:`load_rows` pero reconstruye modelos Pydantic."""
+		return [model.model_validate(row) for row in self.load_rows(job_key)]
+
+	def is_complete(self, job_key: str) -> bool:
+		"""True si todas las páginas del trabajo están guardadas."""
+		if not self.enabled:
+			return True
+		with self._connect() as conn:
+			row = conn.execute("SELECT total_pages FROM checkpoint_jobs WHERE job_key = ?", (job_key,)).fetchone()
+			if row is None:
+				return False
+			return self._next_page(conn, job_key) > row[0]
+
+	def complete(self, job_key: str) -> None:
+		"""Elimina el checkpoint de un trabajo terminado."""
+		self.discard(job_key)
+
+	def discard(self, job_key: str) -> None:
+		"""Elimina el checkpoint de un trabajo, terminado o no."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			self._delete(conn, job_key)
+
+
+@instancia_compartida
+def get_checkpoint_store() -> ScrapeCheckpointStore:
+	"""
+	Instancia compartida configurada desde config.yaml:
+
+	scrape_checkpoints:
+	  enabled: true
+	  max_age_hours: 24
+	"""
+	cfg = load_config().get("scrape_checkpoints", {}) or {}
+	return ScrapeCheckpointStore(
+		max_age_hours=float(cfg.get("max_age_hours", DEFAULT_MAX_AGE_HOURS)),
+		enabled=bool(cfg.get("enabled", True)),
+	)
@@ -0,0 +1,106 @@
+"""
+Caché de esquemas de columnas por lista y versión del archivo.
+
+Al subir una lista se perfilan las columnas de la hoja (tipo de campo,
+confianza y valor de ejemplo). El resultado se guarda con la clave
+(lista, huella del archivo), donde la huella es un hash del contenido del
+libro: volver a subir el mismo archivo, aunque se haya copiado o descargado de
+nuevo, reutiliza el esquema sin leer ni perfilar la hoja.
+
+	store = get_column_schema_store()
+	esquema = store.load(lista, huella)        # None si no hay esquema
+	if esquema is None:
+		esquema = ... perfilar ...
+		store.save(lista, huella, esquema)
+"""
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ..shared.logging.logger import get_logger
+from ..shared.utils.legacy_utils import load_config
+from .sqlite_store import SQLiteStore, instancia_compartida
+
+logger = get_logger()
+
+# Se incrementa cuando cambian las reglas de perfilado (invalida los esquemas guardados)
+VERSION_ESQUEMA = 1
+_BLOQUE = 1024 * 1024
+
+
+def huella_archivo(archivo: Union[str, Path]) -> str:
+	"""Hash del contenido del archivo (independiente de su ruta y fecha de modificación)."""
+	h = hashlib.blake2b(digest_size=16)
+	with open(archivo, "rb") as f:
+		for bloque in iter(lambda: f.read(_BLOQUE), b""):
+			h.update(bloque)
+	return h.hexdigest()
+
+
+class ColumnSchemaStore(SQLiteStore):
+	"""
+	Almacén SQLite de esquemas de columnas: ``[{nombre, tipo, confianza, ...}, ...]``
+	por (lista, huella).
+	"""
+
+	DB_FILENAME = "column_schemas.db"
+	SCHEMA = (
+		"""
+			CREATE TABLE IF NOT EXISTS column_schemas (
+				list_name TEXT NOT NULL,
+				fingerprint TEXT NOT NULL,
+				version INTEGER NOT NULL,
+				schema_json TEXT NOT NULL,
+				created_at TEXT NOT NULL,
+				PRIMARY KEY (list_name, fingerprint)
+			)
+		""",
+	)
+
+	def load(self, lista: str, huella: str) -> Optional[List[Dict[str, Any]]]:
+		"""Esquema guardado para la lista y versión del archivo, o None."""
+		if not self.enabled:
+			return None
+		with self._connect() as conn:
+			row = conn.execute(
+				"SELECT schema_json FROM column_schemas WHERE list_name = ? AND fingerprint = ? AND version = ?",
+				(str(lista), huella, VERSION_ESQUEMA),
+			).fetchone()
+		if row is None:
+			return None
+		try:
+			return json.loads(row[0])
+		except ValueError:
+			logger.warning("⚠️ Esquema de columnas corrupto, se volverá a perfilar", lista=lista)
+			return None
+
+	def save(self, lista: str, huella: str, esquema: List[Dict[str, Any]]) -> None:
+		"""Guarda el esquema; los de versiones anteriores del archivo para la lista se eliminan."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			conn.execute("DELETE FROM column_schemas WHERE list_name = ?", (str(lista),))
+			conn.execute(
+				"INSERT INTO column_schemas (list_name, fingerprint, version, schema_json, created_at) VALUES (?, ?, ?, ?, ?)",
+				(str(lista), huella, VERSION_ESQUEMA, json.dumps(esquema, ensure_ascii=False), datetime.now().isoformat()),
+			)
+
+	def discard(self, lista: str) -> None:
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			conn.execute("DELETE FROM column_schemas WHERE list_name = ?", (str(lista),))
+
+
+@instancia_compartida
+def get_column_schema_store() -> ColumnSchemaStore:
+	"""
+	Instancia compartida configurada desde config.yaml:
+
+	list_upload:
+	  schema_cache: true
+	"""
+	cfg = load_config().get("list_upload", {}) or {}
+	return ColumnSchemaStore(enabled=bool(cfg.get("schema_cache", True)))
@@ -0,0 +1,152 @@
+"""
+Caché de lecturas de Excel mediante ficheros "sidecar".
+
+Leer un .xlsx de 100k filas con pandas/openpyxl tarda decenas de segundos y los
+mismos libros (Busqueda_Listas.xlsx, Segmentos.xlsx, listas) se leen en cada
+ejecución. La primera lectura de cada hoja guarda el DataFrame en
+``data/excel_cache/`` y las siguientes lo sirven desde ahí mientras el libro no
+cambie. La clave incluye ruta, hoja, parámetros de lectura, fecha de
+modificación y tamaño del archivo, así que editar o reescribir el Excel
+invalida el sidecar automáticamente.
+
+El formato es Parquet cuando pyarrow está instalado; si no (o si la hoja tiene
+columnas con tipos mezclados que Parquet no admite) se usa pickle de pandas,
+que conserva el DataFrame exacto.
+"""
+import glob
+import hashlib
+import importlib.util
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pandas as pd
+
+from ..shared.logging.logger import get_logger
+from ..shared.utils.legacy_utils import data_path, load_config
+
+logger = get_logger()
+
+_PARQUET_DISPONIBLE = importlib.util.find_spec("pyarrow") is not None
+_lock = threading.Lock()
+
+
+def _directorio_cache() -> str:
+	directorio = data_path("excel_cache")
+	os.makedirs(directorio, exist_ok=True)
+	return directorio
+
+
+def _cache_habilitado() -> bool:
+	try:
+		return bool((load_config().get("excel_cache", {}) or {}).get("enabled", True))
+	except Exception:
+		return True
+
+
+def _prefijo(archivo: str, hoja: Optional[Union[str, int]], kwargs: dict) -> str:
+	"""Identifica (archivo, hoja, parámetros); la versión del archivo va aparte."""
+	clave = f"{os.path.abspath(archivo)}|{hoja!r}|{sorted(kwargs.items())!r}"
+	return hashlib.sha1(clave.encode("utf-8")).hexdigest()[:16]
+
+
+def _version(archivo: str) -> str:
+	stat = os.stat(archivo)
+	return f"{stat.st_mtime_ns}_{stat.st_size}"
+
+
+def _buscar_sidecar(base: str) -> Optional[str]:
+	for extension in (".parquet", ".pkl"):
+		if os.path.exists(base + extension):
+			return base + extension
+	return None
+
+
+def _guardar_sidecar(df: pd.DataFrame, base: str) -> str:
+	if _PARQUET_DISPONIBLE:
+		ruta = base + ".parquet"
+		try:
+			df.to_parquet(ruta, index=True)
+			return ruta
+		except Exception as e:
+			# Columnas con tipos mezclados (int + str) no son representables en Parquet
+			logger.debug("⚠️ Parquet no admite la hoja, usando pickle", error=str(e))
+			if os.path.exists(ruta):
+				os.remove(ruta)
+	ruta = base + ".pkl"
+	df.to_pickle(ruta)
+	return ruta
+
+
+def _cargar_sidecar(ruta: str) -> pd.DataFrame:
+	if ruta.endswith(".parquet"):
+		return pd.read_parquet(ruta)
+	return pd.read_pickle(ruta)
+
+
+def leer_excel_cacheado(archivo: Union[str, Path], hoja: Optional[Union[str, int]] = None, **kwargs: Any) -> pd.DataFrame:
+	"""
+	Equivalente a ``pd.read_excel(archivo, sheet_name=hoja, **kwargs)`` servido desde
+	un sidecar mientras el libro no cambie.
+
+	Args:
+		archivo: Ruta al .xlsx
+		hoja: Nombre o índice de la hoja (None = primera hoja)
+		**kwargs: Parámetros adicionales de ``pd.read_excel`` (forman parte de la clave)
+
+	Raises:
+		Las mismas excepciones que ``pd.read_excel`` (archivo inexistente, hoja no encontrada...)
+	"""
+	archivo = str(archivo)
+	sheet_name = 0 if hoja is None else hoja
+	kwargs.setdefault("engine", "openpyxl")
+
+	if not _cache_habilitado():
+		return pd.read_excel(archivo, sheet_name=sheet_name, **kwargs)
+
+	version = _version(archivo)
+	prefijo = _prefijo(archivo, sheet_name, kwargs)
+	directorio = _directorio_cache()
+	base = os.path.join(directorio, f"{prefijo}_{version}")
+
+	with _lock:
+		ruta = _buscar_sidecar(base)
+	if ruta:
+		try:
+			df = _cargar_sidecar(ruta)
+			logger.debug("💾 Excel servido desde sidecar", archivo=archivo, hoja=sheet_name, filas=len(df))
+			return df
+		except Exception as e:
+			logger.warning("⚠️ Sidecar de Excel corrupto, releyendo libro", archivo=archivo, error=str(e))
+
+	df = pd.read_excel(archivo, sheet_name=sheet_name, **kwargs)
+
+	with _lock:
+		# Eliminar sidecars de versiones anteriores del mismo libro/hoja
+		for antiguo in glob.glob(os.path.join(directorio, f"{prefijo}_*")):
+			try:
+				os.remove(antiguo)
+			except OSError:
+				pass
+		try:
+			ruta = _guardar_sidecar(df, base)
+			logger.debug("💾 Sidecar de Excel creado", archivo=archivo, hoja=sheet_name, sidecar=ruta)
+		except Exception as e:
+			logger.warning("⚠️ No se pudo guardar el sidecar de Excel", archivo=archivo, error=str(e))
+
+	return df
+
+
+def limpiar_cache_excel() -> int:
+	"""Elimina todos los sidecars. Devuelve el número de archivos borrados."""
+	eliminados = 0
+	with _lock:
+		for ruta in glob.glob(os.path.join(_directorio_cache(), "*")):
+			try:
+				os.remove(ruta)
+				eliminados += 1
+			except OSError:
+				pass
+	logger.info("🧹 Caché de lecturas Excel vaciado", eliminados=eliminados)
+	return eliminados
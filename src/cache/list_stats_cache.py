@@ -0,0 +1,127 @@
+"""
+Caché en disco de las estadísticas de cada lista (``get_list_stats``).
+
+``get_list_stats`` está limitado a 10 peticiones por minuto, así que no se
+puede pedir para todas las listas en cada ejecución de ``obtener_listas``. Se
+guarda en SQLite, por ID de lista, el número de suscriptores, la fecha de
+creación y la huella de la lista en ``getLists`` (``ListSummary.firma``) con
+la que se obtuvieron. Una entrada sirve mientras la huella no cambie y no
+supere ``max_age_hours``; si ``getLists`` devuelve algo distinto para la lista
+(por ejemplo otro número de suscriptores) o la entrada caduca, se vuelve a
+pedir.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Union
+
+from ..shared.logging.logger import get_logger
+from ..shared.utils.legacy_utils import load_config
+from .sqlite_store import SQLiteStore, instancia_compartida
+
+logger = get_logger()
+
+DEFAULT_MAX_AGE_HOURS = 168
+
+
+class ListStatsCache(SQLiteStore):
+	"""
+	Almacén SQLite de estadísticas por lista, invalidado por huella y antigüedad.
+	"""
+
+	DB_FILENAME = "list_stats_cache.db"
+	SCHEMA = (
+		"""
+			CREATE TABLE IF NOT EXISTS list_stats (
+				list_id TEXT PRIMARY KEY,
+				signature TEXT NOT NULL,
+				subscribers TEXT NOT NULL,
+				created TEXT NOT NULL,
+				fetched_at TEXT NOT NULL
+			)
+		""",
+	)
+
+	def __init__(self, db_path: Optional[str] = None, max_age_hours: float = DEFAULT_MAX_AGE_HOURS, enabled: bool = True):
+		self.max_age_hours = max_age_hours
+		super().__init__(db_path, enabled)
+
+	def vigentes(self, firmas: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+		"""
+		Estadísticas guardadas de las listas cuya huella coincide y no han caducado.
+
+		Args:
+			firmas: ID de lista -> huella actual en ``getLists``
+
+		Returns:
+			ID de lista -> {"suscriptores", "creacion"}
+		"""
+		if not self.enabled or not firmas:
+			return {}
+		limite = datetime.now() - timedelta(hours=self.max_age_hours)
+		with self._connect() as conn:
+			filas = conn.execute("SELECT list_id, signature, subscribers, created, fetched_at FROM list_stats").fetchall()
+		return {
+			list_id: {"suscriptores": suscriptores, "creacion": creacion}
+			for list_id, firma, suscriptores, creacion, obtenidas in filas
+			if firmas.get(list_id) == firma and datetime.fromisoformat(obtenidas) > limite
+		}
+
+	def put(self, list_id: Union[int, str], firma: str, suscriptores: str, creacion: str) -> None:
+		"""Guarda las estadísticas recién obtenidas de una lista."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			conn.execute(
+				"INSERT OR REPLACE INTO list_stats (list_id, signature, subscribers, created, fetched_at) VALUES (?, ?, ?, ?, ?)",
+				(str(list_id), firma, str(suscriptores), str(creacion), datetime.now().isoformat()),
+			)
+
+	def seed(self, entradas: Dict[str, Dict[str, str]]) -> int:
+		"""
+		Registra estadísticas ya conocidas (las del catálogo) de listas sin entrada.
+
+		Evita que la primera ejecución con caché vuelva a pedir las estadísticas de
+		todas las listas: cuentan como obtenidas ahora y se refrescan cuando cambie
+		la huella o caduquen.
+
+		Args:
+			entradas: ID de lista -> {"firma", "suscriptores", "creacion"}
+
+		Returns:
+			Entradas añadidas
+		"""
+		if not self.enabled or not entradas:
+			return 0
+		ahora = datetime.now().isoformat()
+		with self._lock, self._connect() as conn:
+			antes = conn.total_changes
+			conn.executemany(
+				"INSERT OR IGNORE INTO list_stats (list_id, signature, subscribers, created, fetched_at) VALUES (?, ?, ?, ?, ?)",
+				[(str(lid), e["firma"], str(e["suscriptores"]), str(e["creacion"]), ahora) for lid, e in entradas.items()],
+			)
+			return conn.total_changes - antes
+
+	def invalidate(self, list_id: Optional[Union[int, str]] = None) -> None:
+		"""Olvida las estadísticas de una lista (o de todas)."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			if list_id is None:
+				conn.execute("DELETE FROM list_stats")
+			else:
+				conn.execute("DELETE FROM list_stats WHERE list_id = ?", (str(list_id),))
+
+
+@instancia_compartida
+def get_list_stats_cache() -> ListStatsCache:
+	"""
+	Instancia compartida configurada desde config.yaml:
+
+	list_catalog:
+	  stats_cache: true
+	  stats_max_age_hours: 168
+	"""
+	cfg = load_config().get("list_catalog", {}) or {}
+	return ListStatsCache(
+		max_age_hours=float(cfg.get("stats_max_age_hours", DEFAULT_MAX_AGE_HOURS)),
+		enabled=bool(cfg.get("stats_cache", True)),
+	)
@@ -0,0 +1,239 @@
+"""
+Caché en disco de resultados de scraping de informes de campañas.
+
+Los hard bounces, no abiertos y tablas de URLs de una campaña enviada hace
+semanas no cambian, así que se guardan en SQLite por (ID de campaña, tipo de
+dato). Solo se cachean campañas "congeladas": las enviadas hace al menos
+``frozen_after_days`` días. Las campañas recientes se siguen extrayendo en
+cada ejecución.
+
+Invalidación manual:
+    python -m src.cache.scrape_cache --invalidate 12345
+    python -m src.cache.scrape_cache --invalidate-all
+"""
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+# Configurar package para imports consistentes y PyInstaller compatibility
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    __package__ = "src.cache"
+
+from ..shared.logging.logger import get_logger
+from ..shared.utils.legacy_utils import load_config
+from .sqlite_store import SQLiteStore, instancia_compartida
+
+logger = get_logger()
+
+M = TypeVar("M", bound=BaseModel)
+
+# Tipos de datos cacheados
+KIND_HARD_BOUNCES = "hard_bounces"
+KIND_NO_OPENS = "no_opens"
+KIND_CAMPAIGN_URLS = "campaign_urls"
+KIND_EMAIL_URL = "email_url"
+
+DEFAULT_FROZEN_AFTER_DAYS = 7
+
+_SEND_DATE_FORMATS = (
+	"%Y-%m-%d %H:%M:%S",
+	"%Y-%m-%d %H:%M",
+	"%Y-%m-%d",
+	"%d/%m/%Y %H:%M:%S",
+	"%d/%m/%Y %H:%M",
+	"%d/%m/%y %H:%M",
+	"%d/%m/%Y",
+	"%d/%m/%y",
+	"%d-%m-%Y %H:%M",
+	"%d-%m-%Y",
+)
+
+
+def parse_send_date(value: Any) -> Optional[datetime]:
+	"""Convierte la fecha de envío de la API ('2025-06-02 11:18:24', 'None', ...) a datetime."""
+	if isinstance(value, datetime):
+		return value
+	if value is None:
+		return None
+	text = str(value).strip()
+	if not text or text.lower() == "none":
+		return None
+	for fmt in _SEND_DATE_FORMATS:
+		try:
+			return datetime.strptime(text, fmt)
+		except ValueError:
+			continue
+	return None
+
+
+class ScrapeResultCache(SQLiteStore):
+	"""
+	Caché SQLite de datos scrapeados por campaña y tipo de dato.
+	"""
+
+	DB_FILENAME = "scrape_cache.db"
+	SCHEMA = (
+		"""
+			CREATE TABLE IF NOT EXISTS scrape_results (
+				campaign_id INTEGER NOT NULL,
+				kind TEXT NOT NULL,
+				payload TEXT NOT NULL,
+				sent_at TEXT,
+				created_at TEXT NOT NULL,
+				hit_count INTEGER NOT NULL DEFAULT 0,
+				PRIMARY KEY (campaign_id, kind)
+			)
+		""",
+	)
+
+	def __init__(self, db_path: Optional[str] = None, frozen_after_days: int = DEFAULT_FROZEN_AFTER_DAYS, enabled: bool = True):
+		self.frozen_after_days = frozen_after_days
+		super().__init__(db_path, enabled)
+
+	def is_frozen(self, sent_at: Any, now: Optional[datetime] = None) -> bool:
+		"""True si la campaña se envió hace al menos ``frozen_after_days`` días."""
+		sent = parse_send_date(sent_at)
+		if sent is None:
+			return False
+		now = now or datetime.now()
+		return now - sent >= timedelta(days=self.frozen_after_days)
+
+	def get(self, campaign_id: int, kind: str) -> Optional[Any]:
+		"""Devuelve el dato cacheado (JSON decodificado) o None si no existe."""
+		if not self.enabled:
+			return None
+		with self._lock, self._connect() as conn:
+			row = conn.execute(
+				"SELECT payload FROM scrape_results WHERE campaign_id = ? AND kind = ?",
+				(int(campaign_id), kind),
+			).fetchone()
+			if row is None:
+				return None
+			conn.execute(
+				"UPDATE scrape_results SET hit_count = hit_count + 1 WHERE campaign_id = ? AND kind = ?",
+				(int(campaign_id), kind),
+			)
+		logger.debug("💾 Dato de scraping servido desde caché", campaign_id=campaign_id, kind=kind)
+		return json.loads(row[0])
+
+	def has(self, campaign_id: int, kinds: Iterable[str]) -> bool:
+		"""True si están guardados todos los tipos de dato indicados (no cuenta como acierto)."""
+		if not self.enabled:
+			return False
+		with self._connect() as conn:
+			guardados = {
+				row[0] for row in conn.execute(
+					"SELECT kind FROM scrape_results WHERE campaign_id = ?", (int(campaign_id),)
+				)
+			}
+		return set(kinds) <= guardados
+
+	def get_models(self, campaign_id: int, kind: str, model: Type[M]) -> Optional[List[M]]:
+		"""Como :meth:`get` pero reconstruye una lista de modelos Pydantic."""
+		data = self.get(campaign_id, kind)
+		if data is None:
+			return None
+		return [model.model_validate(item) for item in data]
+
+	def put(self, campaign_id: int, kind: str, data: Any, sent_at: Any) -> bool:
+		"""
+		Guarda el dato si la campaña está congelada. Devuelve True si se guardó.
+
+		Las listas de modelos Pydantic se serializan con ``model_dump(mode="json")``.
+		"""
+		if not self.enabled or not self.is_frozen(sent_at):
+			return False
+		if isinstance(data, list):
+			data = [item.model_dump(mode="json") if isinstance(item, BaseModel) else item for item in data]
+		sent = parse_send_date(sent_at)
+		with self._lock, self._connect() as conn:
+			conn.execute(
+				"INSERT OR REPLACE INTO scrape_results (campaign_id, kind, payload, sent_at, created_at, hit_count) "
+				"VALUES (?, ?, ?, ?, ?, 0)",
+				(int(campaign_id), kind, json.dumps(data, ensure_ascii=False),
+				 sent.isoformat() if sent else None, datetime.now().isoformat()),
+			)
+		logger.debug("💾 Dato de scraping guardado en caché", campaign_id=campaign_id, kind=kind)
+		return True
+
+	def invalidate(self, campaign_id: Optional[int] = None, kind: Optional[str] = None) -> int:
+		"""
+		Elimina entradas del caché. Sin argumentos vacía todo el caché.
+
+		Returns:
+			Número de entradas eliminadas
+		"""
+		if not self.enabled:
+			return 0
+		query = "DELETE FROM scrape_results"
+		conditions, params = [], []
+		if campaign_id is not None:
+			conditions.append("campaign_id = ?")
+			params.append(int(campaign_id))
+		if kind is not None:
+			conditions.append("kind = ?")
+			params.append(kind)
+		if conditions:
+			query += " WHERE " + " AND ".join(conditions)
+		with self._lock, self._connect() as conn:
+			deleted = conn.execute(query, params).rowcount
+		logger.info("🧹 Caché de scraping invalidado", campaign_id=campaign_id, kind=kind, eliminadas=deleted)
+		return deleted
+
+	def stats(self) -> Dict[str, Any]:
+		"""Resumen de entradas por tipo de dato."""
+		if not self.enabled:
+			return {"enabled": False}
+		with self._connect() as conn:
+			rows = conn.execute(
+				"SELECT kind, COUNT(*), COALESCE(SUM(hit_count), 0) FROM scrape_results GROUP BY kind"
+			).fetchall()
+		return {
+			"enabled": True,
+			"db_path": self.db_path,
+			"kinds": {kind: {"entries": count, "hits": hits} for kind, count, hits in rows},
+		}
+
+
+@instancia_compartida
+def get_scrape_cache() -> ScrapeResultCache:
+	"""
+	Instancia compartida configurada desde config.yaml:
+
+	scrape_cache:
+	  enabled: true
+	  frozen_after_days: 7
+	"""
+	cfg = load_config().get("scrape_cache", {}) or {}
+	return ScrapeResultCache(
+		frozen_after_days=int(cfg.get("frozen_after_days", DEFAULT_FROZEN_AFTER_DAYS)),
+		enabled=bool(cfg.get("enabled", True)),
+	)
+
+
+def main():
+	import argparse
+
+	parser = argparse.ArgumentParser(description="Gestión del caché de scraping de informes")
+	parser.add_argument("--invalidate", type=int, metavar="CAMPAIGN_ID", help="Eliminar el caché de una campaña")
+	parser.add_argument("--kind", choices=[KIND_HARD_BOUNCES, KIND_NO_OPENS, KIND_CAMPAIGN_URLS, KIND_EMAIL_URL],
+	                    help="Limitar la invalidación a un tipo de dato")
+	parser.add_argument("--invalidate-all", action="store_true", help="Vaciar todo el caché")
+	args = parser.parse_args()
+
+	cache = get_scrape_cache()
+	if args.invalidate_all:
+		print(f"🧹 {cache.invalidate(kind=args.kind)} entradas eliminadas")
+	elif args.invalidate is not None:
+		print(f"🧹 {cache.invalidate(args.invalidate, args.kind)} entradas eliminadas")
+	else:
+		print(json.dumps(cache.stats(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+	main()
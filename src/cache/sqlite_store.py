@@ -0,0 +1,67 @@
+"""
+Base común de los almacenes SQLite de ``src/cache``.
+
+Cada almacén declara el archivo por defecto (``DB_FILENAME``) y las
+sentencias ``CREATE`` de sus tablas (``SCHEMA``); la base se encarga de la
+ruta, el interruptor ``enabled``, el lock entre hilos y las conexiones. La
+instancia compartida de cada módulo se declara con ``@instancia_compartida``.
+"""
+import functools
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Sequence, TypeVar
+
+from ..shared.utils.legacy_utils import data_path
+
+S = TypeVar("S")
+
+
+class SQLiteStore:
+	"""
+	Almacén SQLite con esquema propio y acceso serializado por ``_lock``.
+	"""
+
+	DB_FILENAME: str = ""
+	SCHEMA: Sequence[str] = ()
+
+	def __init__(self, db_path: Optional[str] = None, enabled: bool = True):
+		self.db_path = db_path or data_path(self.DB_FILENAME)
+		self.enabled = enabled
+		self._lock = threading.Lock()
+		if self.enabled:
+			self._init_db()
+
+	@contextmanager
+	def _connect(self) -> Iterator[sqlite3.Connection]:
+		conn = sqlite3.connect(self.db_path, timeout=30)
+		try:
+			with conn:
+				yield conn
+		finally:
+			conn.close()
+
+	def _init_db(self) -> None:
+		os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+		with self._connect() as conn:
+			for sentencia in self.SCHEMA:
+				conn.execute(sentencia)
+
+
+def instancia_compartida(crear: Callable[[], S]) -> Callable[[], S]:
+	"""
+	Convierte la fábrica ``get_*()`` de un módulo en un singleton: la
+	configuración se lee y el almacén se crea solo en la primera llamada.
+	"""
+	instancia: List[S] = []
+	lock = threading.Lock()
+
+	@functools.wraps(crear)
+	def obtener() -> S:
+		with lock:
+			if not instancia:
+				instancia.append(crear())
+			return instancia[0]
+
+	return obtener
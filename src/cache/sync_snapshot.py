@@ -0,0 +1,182 @@
+"""
+Instantáneas de la última sincronización de segmentos por lista.
+
+Tras subir una lista a Acumbamail se guarda, por email, un hash de los campos
+de segmentación (``Segmentos`` y las columnas de Segmentos.xlsx). En la
+siguiente sincronización se comparan los hashes actuales con la instantánea y
+solo se envían las altas, modificaciones y bajas, en lugar de volver a
+consultar la lista completa y re-subir a todos los usuarios modificados.
+
+Uso típico:
+
+	store = get_segment_snapshot_store()
+	anterior = store.load(list_id, columnas)       # None si no hay instantánea válida
+	actual = calcular_hashes(df, columnas)
+	delta = calcular_delta(actual, anterior or {})
+	... aplicar altas/modificaciones/bajas ...
+	store.apply(list_id, columnas, aplicados, bajas_aplicadas)
+"""
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from ..shared.logging.logger import get_logger
+from ..shared.utils.legacy_utils import load_config
+from .sqlite_store import SQLiteStore, instancia_compartida
+
+logger = get_logger()
+
+_VACIOS = {"nan", "none", "nat"}
+
+
+def normalizar_emails(emails: pd.Series) -> pd.Series:
+	"""Emails sin espacios y en minúsculas (clave de la instantánea)."""
+	return emails.fillna("").astype(str).str.strip().str.lower()
+
+
+def calcular_hashes(df: pd.DataFrame, columnas: Sequence[str], columna_email: str = "email") -> Dict[str, str]:
+	"""
+	Hash (hex de 64 bits) de los campos ``columnas`` de cada suscriptor.
+
+	Los valores se comparan como texto normalizado (NaN y 'nan' cuentan como
+	vacío); las columnas que no existen en ``df`` se tratan como vacías para que
+	el hash no dependa del orden ni de la presencia de columnas opcionales.
+	"""
+	if df.empty or columna_email not in df.columns:
+		return {}
+	emails = normalizar_emails(df[columna_email])
+	valores = df.reindex(columns=sorted(columnas)).fillna("").astype(str)
+	for columna in valores.columns:
+		valores[columna] = valores[columna].str.strip()
+		valores.loc[valores[columna].str.lower().isin(_VACIOS), columna] = ""
+	hashes = pd.util.hash_pandas_object(valores, index=False).map("{:016x}".format)
+	hashes.index = emails.values
+	hashes = hashes[hashes.index != ""]
+	return hashes[~hashes.index.duplicated(keep="last")].to_dict()
+
+
+@dataclass
+class DeltaSincronizacion:
+	"""Cambios a enviar respecto a la última sincronización."""
+
+	altas: List[str] = field(default_factory=list)
+	modificaciones: List[str] = field(default_factory=list)
+	bajas: List[str] = field(default_factory=list)
+	sin_cambios: int = 0
+
+	@property
+	def total(self) -> int:
+		return len(self.altas) + len(self.modificaciones) + len(self.bajas)
+
+	@property
+	def vacio(self) -> bool:
+		return self.total == 0
+
+
+def calcular_delta(actual: Dict[str, str], anterior: Dict[str, str]) -> DeltaSincronizacion:
+	"""Compara los hashes actuales con los de la instantánea."""
+	altas = [email for email in actual if email not in anterior]
+	modificaciones = [email for email, h in actual.items() if email in anterior and anterior[email] != h]
+	bajas = [email for email in anterior if email not in actual]
+	sin_cambios = len(actual) - len(altas) - len(modificaciones)
+	return DeltaSincronizacion(altas, modificaciones, bajas, sin_cambios)
+
+
+class SegmentSyncSnapshotStore(SQLiteStore):
+	"""
+	Almacén SQLite de hashes por (lista, email) de la última sincronización.
+	"""
+
+	DB_FILENAME = "segment_sync.db"
+	SCHEMA = (
+		"""
+			CREATE TABLE IF NOT EXISTS sync_lists (
+				list_id TEXT PRIMARY KEY,
+				columns TEXT NOT NULL,
+				synced_at TEXT NOT NULL
+			)
+		""",
+		"""
+			CREATE TABLE IF NOT EXISTS sync_rows (
+				list_id TEXT NOT NULL,
+				email TEXT NOT NULL,
+				row_hash TEXT NOT NULL,
+				PRIMARY KEY (list_id, email)
+			)
+		""",
+	)
+
+	@staticmethod
+	def _columnas(columnas: Sequence[str]) -> str:
+		return "|".join(sorted(columnas))
+
+	def load(self, list_id: int, columnas: Sequence[str]) -> Optional[Dict[str, str]]:
+		"""
+		Hashes de la última sincronización, o None si no hay instantánea o se
+		hizo con otras columnas de segmentación (los hashes no son comparables).
+		"""
+		if not self.enabled:
+			return None
+		with self._connect() as conn:
+			row = conn.execute("SELECT columns FROM sync_lists WHERE list_id = ?", (str(list_id),)).fetchone()
+			if row is None:
+				return None
+			if row[0] != self._columnas(columnas):
+				logger.info("🧹 Instantánea de sincronización descartada: columnas distintas", list_id=list_id)
+				return None
+			return dict(conn.execute("SELECT email, row_hash FROM sync_rows WHERE list_id = ?", (str(list_id),)))
+
+	def save(self, list_id: int, columnas: Sequence[str], hashes: Dict[str, str]) -> None:
+		"""Sustituye la instantánea completa de la lista."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			conn.execute("DELETE FROM sync_rows WHERE list_id = ?", (str(list_id),))
+			self._upsert(conn, list_id, columnas, hashes, [])
+		logger.info("📸 Instantánea de sincronización guardada", list_id=list_id, usuarios=len(hashes))
+
+	def apply(self, list_id: int, columnas: Sequence[str], cambios: Dict[str, str], bajas: Iterable[str] = ()) -> None:
+		"""Actualiza la instantánea con los cambios confirmados por la API."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			self._upsert(conn, list_id, columnas, cambios, bajas)
+
+	def _upsert(self, conn: sqlite3.Connection, list_id: int, columnas: Sequence[str],
+	            cambios: Dict[str, str], bajas: Iterable[str]) -> None:
+		clave = str(list_id)
+		conn.execute(
+			"INSERT OR REPLACE INTO sync_lists (list_id, columns, synced_at) VALUES (?, ?, ?)",
+			(clave, self._columnas(columnas), datetime.now().isoformat()),
+		)
+		conn.executemany(
+			"INSERT OR REPLACE INTO sync_rows (list_id, email, row_hash) VALUES (?, ?, ?)",
+			((clave, email, h) for email, h in cambios.items()),
+		)
+		conn.executemany(
+			"DELETE FROM sync_rows WHERE list_id = ? AND email = ?",
+			((clave, email) for email in bajas),
+		)
+
+	def discard(self, list_id: int) -> None:
+		"""Elimina la instantánea (la próxima sincronización será completa)."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			conn.execute("DELETE FROM sync_rows WHERE list_id = ?", (str(list_id),))
+			conn.execute("DELETE FROM sync_lists WHERE list_id = ?", (str(list_id),))
+
+
+@instancia_compartida
+def get_segment_snapshot_store() -> SegmentSyncSnapshotStore:
+	"""
+	Instancia compartida configurada desde config.yaml:
+
+	segment_sync:
+	  enabled: true
+	"""
+	cfg = load_config().get("segment_sync", {}) or {}
+	return SegmentSyncSnapshotStore(enabled=bool(cfg.get("enabled", True)))
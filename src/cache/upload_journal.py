@@ -0,0 +1,261 @@
+"""
+Diario de subidas de listas por API.
+
+Crear una lista y enviarle una hoja de 300.000 filas en lotes de
+``batchAddSubscribers`` lleva horas; si el proceso se corta (error, ráfaga de
+429, portátil cerrado) no quedaba registro de qué lotes habían llegado y al
+repetirlo se creaba otra lista o se reenviaba todo. El diario guarda en SQLite,
+por trabajo (archivo + hoja + lista):
+
+- el ID de la lista creada, para no volver a crearla;
+- cada lote enviado: desplazamiento en la hoja, número de filas, hash del
+  contenido y si la API lo confirmó;
+- el resultado de cada fila (email, correcto o error con su detalle).
+
+Al reanudar se omiten los lotes confirmados cuyo contenido no ha cambiado y se
+continúa desde el primero sin confirmar.
+
+	journal = get_upload_journal()
+	list_id = journal.begin(clave, total_filas, tamano_lote)   # ID si se reanuda
+	if list_id is None:
+		list_id = crear_lista(...)
+		journal.set_list(clave, list_id)
+	... enviar_lotes(api, list_id, lotes, journal, clave) ...
+	journal.complete(clave)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from ..shared.logging.logger import get_logger
+from ..shared.utils.legacy_utils import load_config
+from .sqlite_store import SQLiteStore, instancia_compartida
+
+logger = get_logger()
+
+DEFAULT_MAX_AGE_HOURS = 72
+
+ESTADO_EN_CURSO = "in_progress"
+ESTADO_COMPLETADO = "done"
+LOTE_CONFIRMADO = "confirmed"
+LOTE_FALLIDO = "failed"
+
+
+def hash_lote(filas: Sequence[Dict[str, Any]]) -> str:
+	"""Hash estable del contenido de un lote (independiente del orden de las claves)."""
+	h = hashlib.blake2b(digest_size=16)
+	h.update(json.dumps(list(filas), sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+	return h.hexdigest()
+
+
+def clave_subida(archivo: str, hoja: str, lista: str) -> str:
+	"""Clave del trabajo de subida: ruta absoluta del archivo, hoja y nombre de la lista."""
+	return f"{os.path.abspath(archivo)}|{hoja}|{lista}"
+
+
+class UploadJournal(SQLiteStore):
+	"""
+	Almacén SQLite de trabajos de subida, sus lotes y el resultado por fila.
+	"""
+
+	DB_FILENAME = "upload_journal.db"
+	SCHEMA = (
+		"""
+			CREATE TABLE IF NOT EXISTS upload_jobs (
+				job_key TEXT PRIMARY KEY,
+				list_id INTEGER,
+				total_rows INTEGER NOT NULL,
+				chunk_size INTEGER NOT NULL,
+				status TEXT NOT NULL,
+				created_at TEXT NOT NULL,
+				updated_at TEXT NOT NULL
+			)
+		""",
+		"""
+			CREATE TABLE IF NOT EXISTS upload_chunks (
+				job_key TEXT NOT NULL,
+				chunk_offset INTEGER NOT NULL,
+				row_count INTEGER NOT NULL,
+				content_hash TEXT NOT NULL,
+				status TEXT NOT NULL,
+				success_count INTEGER NOT NULL DEFAULT 0,
+				error_count INTEGER NOT NULL DEFAULT 0,
+				detail TEXT,
+				updated_at TEXT NOT NULL,
+				PRIMARY KEY (job_key, chunk_offset)
+			)
+		""",
+		"""
+			CREATE TABLE IF NOT EXISTS upload_rows (
+				job_key TEXT NOT NULL,
+				email TEXT NOT NULL,
+				chunk_offset INTEGER NOT NULL,
+				ok INTEGER NOT NULL,
+				detail TEXT,
+				PRIMARY KEY (job_key, email)
+			)
+		""",
+	)
+
+	def __init__(self, db_path: Optional[str] = None, max_age_hours: float = DEFAULT_MAX_AGE_HOURS, enabled: bool = True):
+		self.max_age_hours = max_age_hours
+		super().__init__(db_path, enabled)
+
+	def _borrar(self, conn: sqlite3.Connection, job_key: str) -> None:
+		for tabla in ("upload_rows", "upload_chunks", "upload_jobs"):
+			conn.execute(f"DELETE FROM {tabla} WHERE job_key = ?", (job_key,))
+
+	def begin(self, job_key: str, total_filas: int, tamano_lote: int) -> Optional[int]:
+		"""
+		Registra el trabajo y devuelve el ID de lista de un intento anterior sin terminar.
+
+		Un trabajo terminado, caducado o con otro tamaño de lote empieza de cero.
+		"""
+		if not self.enabled:
+			return None
+		ahora = datetime.now()
+		with self._lock, self._connect() as conn:
+			row = conn.execute(
+				"SELECT list_id, chunk_size, status, updated_at FROM upload_jobs WHERE job_key = ?", (job_key,)
+			).fetchone()
+			if row is not None:
+				list_id, chunk_size, estado, actualizado = row
+				caducado = ahora - datetime.fromisoformat(actualizado) > timedelta(hours=self.max_age_hours)
+				if estado == ESTADO_EN_CURSO and not caducado and chunk_size == tamano_lote:
+					conn.execute(
+						"UPDATE upload_jobs SET total_rows = ?, updated_at = ? WHERE job_key = ?",
+						(total_filas, ahora.isoformat(), job_key),
+					)
+					return list_id
+				self._borrar(conn, job_key)
+			conn.execute(
+				"INSERT INTO upload_jobs (job_key, list_id, total_rows, chunk_size, status, created_at, updated_at) "
+				"VALUES (?, NULL, ?, ?, ?, ?, ?)",
+				(job_key, total_filas, tamano_lote, ESTADO_EN_CURSO, ahora.isoformat(), ahora.isoformat()),
+			)
+		return None
+
+	def set_list(self, job_key: str, list_id: int) -> None:
+		"""Guarda el ID de la lista creada para el trabajo."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			conn.execute(
+				"UPDATE upload_jobs SET list_id = ?, updated_at = ? WHERE job_key = ?",
+				(int(list_id), datetime.now().isoformat(), job_key),
+			)
+
+	def confirmed_chunk(self, job_key: str, offset: int, content_hash: str) -> Optional[int]:
+		"""Filas correctas de un lote ya confirmado con el mismo contenido, o None si hay que enviarlo."""
+		if not self.enabled:
+			return None
+		with self._connect() as conn:
+			row = conn.execute(
+				"SELECT success_count FROM upload_chunks WHERE job_key = ? AND chunk_offset = ? AND content_hash = ? AND status = ?",
+				(job_key, offset, content_hash, LOTE_CONFIRMADO),
+			).fetchone()
+		return None if row is None else int(row[0])
+
+	def record_chunk(self, job_key: str, offset: int, content_hash: str, filas: int,
+			resultados: Iterable[Tuple[str, bool, Optional[str]]] = (), confirmado: bool = True,
+			detalle: Optional[str] = None) -> None:
+		"""
+		Anota el resultado de un lote.
+
+		Args:
+			job_key: Clave del trabajo
+			offset: Fila de la hoja donde empieza el lote
+			content_hash: ``hash_lote`` del contenido enviado
+			filas: Filas del lote
+			resultados: (email, correcto, detalle) de cada fila
+			confirmado: False si la API no aceptó el lote (se reintentará al reanudar)
+			detalle: Error del lote, si lo hubo
+		"""
+		if not self.enabled:
+			return
+		resultados = list(resultados)
+		exitos = sum(1 for _, ok, _ in resultados if ok)
+		ahora = datetime.now().isoformat()
+		with self._lock, self._connect() as conn:
+			conn.execute(
+				"INSERT OR REPLACE INTO upload_chunks "
+				"(job_key, chunk_offset, row_count, content_hash, status, success_count, error_count, detail, updated_at) "
+				"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+				(job_key, offset, filas, content_hash, LOTE_CONFIRMADO if confirmado else LOTE_FALLIDO,
+					exitos, len(resultados) - exitos, detalle, ahora),
+			)
+			conn.executemany(
+				"INSERT OR REPLACE INTO upload_rows (job_key, email, chunk_offset, ok, detail) VALUES (?, ?, ?, ?, ?)",
+				[(job_key, email.strip().lower(), offset, int(ok), det) for email, ok, det in resultados if email],
+			)
+			conn.execute("UPDATE upload_jobs SET updated_at = ? WHERE job_key = ?", (ahora, job_key))
+
+	def first_pending(self, job_key: str) -> int:
+		"""Fila donde empieza el primer lote sin confirmar (contando lotes consecutivos desde 0)."""
+		if not self.enabled:
+			return 0
+		with self._connect() as conn:
+			job = conn.execute("SELECT chunk_size FROM upload_jobs WHERE job_key = ?", (job_key,)).fetchone()
+			confirmados = {
+				offset for (offset,) in conn.execute(
+					"SELECT chunk_offset FROM upload_chunks WHERE job_key = ? AND status = ?", (job_key, LOTE_CONFIRMADO)
+				)
+			}
+		if job is None:
+			return 0
+		offset = 0
+		while offset in confirmados:
+			offset += job[0]
+		return offset
+
+	def summary(self, job_key: str) -> Dict[str, int]:
+		"""Lotes confirmados/fallidos y filas correctas/erróneas anotadas para el trabajo."""
+		resumen = {"lotes_confirmados": 0, "lotes_fallidos": 0, "filas_ok": 0, "filas_error": 0}
+		if not self.enabled:
+			return resumen
+		with self._connect() as conn:
+			for estado, cantidad in conn.execute(
+				"SELECT status, COUNT(*) FROM upload_chunks WHERE job_key = ? GROUP BY status", (job_key,)
+			):
+				resumen["lotes_confirmados" if estado == LOTE_CONFIRMADO else "lotes_fallidos"] = cantidad
+			for ok, cantidad in conn.execute(
+				"SELECT ok, COUNT(*) FROM upload_rows WHERE job_key = ? GROUP BY ok", (job_key,)
+			):
+				resumen["filas_ok" if ok else "filas_error"] = cantidad
+		return resumen
+
+	def complete(self, job_key: str) -> None:
+		"""Marca el trabajo como terminado (la próxima subida de la hoja empezará de cero)."""
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			conn.execute(
+				"UPDATE upload_jobs SET status = ?, updated_at = ? WHERE job_key = ?",
+				(ESTADO_COMPLETADO, datetime.now().isoformat(), job_key),
+			)
+		logger.info("📒 Subida completada en el diario", trabajo=job_key)
+
+	def discard(self, job_key: str) -> None:
+		if not self.enabled:
+			return
+		with self._lock, self._connect() as conn:
+			self._borrar(conn, job_key)
+
+
+@instancia_compartida
+def get_upload_journal() -> UploadJournal:
+	"""
+	Instancia compartida configurada desde config.yaml:
+
+	list_upload:
+	  journal: true
+	  journal_max_age_hours: 72
+	"""
+	cfg = load_config().get("list_upload", {}) or {}
+	return UploadJournal(
+		max_age_hours=float(cfg.get("journal_max_age_hours", DEFAULT_MAX_AGE_HOURS)),
+		enabled=bool(cfg.get("journal", True)),
+	)
@@ -0,0 +1,231 @@
+"""
+Catálogo de listas (Busqueda_Listas.xlsx) indexado por ID de lista.
+
+Sustituye a las recargas completas de ``obtener_listas``: el libro se lee una
+sola vez (servido desde el sidecar si no ha cambiado), las listas remotas y sus
+estadísticas se fusionan por ID con operaciones vectorizadas y solo se
+escribe el archivo cuando alguna fila ha cambiado. La columna ``Buscar``, que
+marca el usuario a mano, se conserva en las filas existentes.
+"""
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
+
+import pandas as pd
+
+from .cache.excel_sidecar import leer_excel_cacheado
+from .logger import get_logger
+
+logger = get_logger()
+
+COLUMNAS = ["Buscar", "ID_LISTA", "NOMBRE LISTA", "SUSCRIPTORES", "CREACION"]
+_VACIOS = {"", "nan", "none", "nat"}
+
+# AAAA-MM-DD[ HH:MM[:SS]] con "-", "/", " " o ":" como separadores
+_PATRON_FECHA = r"^\s*(\d{4})[-/ :](\d{1,2})[-/ :](\d{1,2})(?:[-/ :T](\d{1,2}))?(?:[-/ :](\d{1,2}))?(?:[-/ :](\d{1,2}))?"
+
+
+def _normalizar_ids(valores: pd.Series) -> pd.Series:
+	"""Números como texto sin decimales ("123.0" -> "123"); el resto se deja igual."""
+	numericos = pd.to_numeric(valores, errors="coerce")
+	texto = valores.astype(str).str.strip()
+	return texto.where(numericos.isna(), numericos.astype("Int64").astype(str))
+
+
+def _limpiar(df: pd.DataFrame) -> pd.DataFrame:
+	df = df.reindex(columns=COLUMNAS).fillna("").astype(str)
+	for columna in COLUMNAS:
+		df[columna] = df[columna].str.strip()
+		df.loc[df[columna].str.lower().isin(_VACIOS), columna] = ""
+	return df
+
+
+def clave_orden_fechas(fechas: pd.Series) -> pd.DataFrame:
+	"""
+	Componentes (año, mes, día, hora, minuto, segundo) de cada fecha de creación.
+
+	Acepta ``AAAA-MM-DD``, con ``/`` o espacios como separadores y la hora
+	opcional; las fechas vacías o no reconocibles quedan como NaN y se
+	ordenan al final.
+	"""
+	partes = fechas.astype(str).str.extract(_PATRON_FECHA).apply(pd.to_numeric, errors="coerce")
+	partes.columns = ["_anio", "_mes", "_dia", "_hora", "_minuto", "_segundo"]
+	completas = partes["_anio"].notna()
+	partes.loc[completas, ["_hora", "_minuto", "_segundo"]] = partes.loc[completas, ["_hora", "_minuto", "_segundo"]].fillna(0)
+	return partes
+
+
+class CatalogoListas:
+	"""
+	Filas de Busqueda_Listas.xlsx con semántica upsert por ``ID_LISTA``.
+
+	Las modificaciones se acumulan en memoria y ``guardar`` escribe el libro
+	(ordenado por fecha de creación) solo si hubo cambios.
+	"""
+
+	def __init__(self, archivo: Union[str, Path], df: Optional[pd.DataFrame] = None):
+		self.archivo = str(archivo)
+		df = _limpiar(df if df is not None else pd.DataFrame(columns=COLUMNAS))
+		df = df[df["ID_LISTA"] != ""]
+		df = df.assign(ID_LISTA=_normalizar_ids(df["ID_LISTA"]), SUSCRIPTORES=_normalizar_ids(df["SUSCRIPTORES"]))
+		self._df = df.drop_duplicates("ID_LISTA", keep="last").set_index("ID_LISTA", drop=False)
+		self.eliminadas = pd.DataFrame(columns=COLUMNAS)
+		self.cambios: set[str] = set()
+		self._hoja_eliminadas = ""
+		self._eliminadas_guardadas = True
+
+	@classmethod
+	def cargar(cls, archivo: Union[str, Path]) -> "CatalogoListas":
+		"""Lee el catálogo una sola vez; si no existe o no se puede leer empieza vacío."""
+		df = None
+		if os.path.exists(archivo):
+			try:
+				df = leer_excel_cacheado(archivo)
+				logger.info(f"Catálogo de listas cargado con {len(df)} filas", archivo=str(archivo))
+			except Exception as e:
+				logger.warning(f"Error cargando catálogo de listas, se creará nuevo: {e}")
+		return cls(archivo, df)
+
+	def __len__(self) -> int:
+		return len(self._df)
+
+	def __contains__(self, id_lista: object) -> bool:
+		return str(id_lista) in self._df.index
+
+	@property
+	def hay_cambios(self) -> bool:
+		return bool(self.cambios) or not self._eliminadas_guardadas
+
+	def fila(self, id_lista: Union[int, str]) -> list[str]:
+		return self._df.loc[str(id_lista), COLUMNAS].tolist()
+
+	def sincronizar_remotas(self, listas: Iterable[tuple[Union[int, str], str]]) -> dict[str, int]:
+		"""
+		Ajusta el catálogo al conjunto de listas remotas (id, nombre).
+
+		Las nuevas se añaden sin estadísticas, las renombradas actualizan su
+		nombre y las que ya no existen en remoto pasan a ``eliminadas``.
+		"""
+		remotas = pd.DataFrame(list(listas), columns=["ID_LISTA", "NOMBRE LISTA"])
+		remotas["ID_LISTA"] = _normalizar_ids(remotas["ID_LISTA"])
+		remotas["NOMBRE LISTA"] = remotas["NOMBRE LISTA"].fillna("").astype(str).str.strip()
+		remotas = remotas.drop_duplicates("ID_LISTA", keep="last").set_index("ID_LISTA", drop=False)
+
+		obsoletas = self._df.index.difference(remotas.index)
+		if len(obsoletas):
+			self.eliminadas = pd.concat([self.eliminadas, self._df.loc[obsoletas, COLUMNAS]], ignore_index=True)
+			self._df = self._df.drop(index=obsoletas)
+			self.cambios.difference_update(obsoletas)
+			self._hoja_eliminadas = self._hoja_eliminadas or f"ELIMINADAS_{int(datetime.now().timestamp())}"
+			self._eliminadas_guardadas = False
+
+		comunes = remotas.index.intersection(self._df.index)
+		renombradas = comunes[self._df.loc[comunes, "NOMBRE LISTA"].values != remotas.loc[comunes, "NOMBRE LISTA"].values]
+		if len(renombradas):
+			self._df.loc[renombradas, "NOMBRE LISTA"] = remotas.loc[renombradas, "NOMBRE LISTA"]
+			self.cambios.update(renombradas)
+
+		nuevas = remotas.index.difference(self._df.index)
+		if len(nuevas):
+			filas_nuevas = remotas.loc[nuevas].reindex(columns=COLUMNAS).fillna("")
+			self._df = pd.concat([self._df, filas_nuevas])
+			self.cambios.update(nuevas)
+
+		resumen = {"nuevas": len(nuevas), "renombradas": len(renombradas), "eliminadas": len(obsoletas)}
+		logger.info("🔄 Catálogo sincronizado con las listas remotas", **resumen)
+		return resumen
+
+	def upsert(self, id_lista: Union[int, str], **valores: object) -> bool:
+		"""
+		Inserta o actualiza una lista. Las claves son columnas del catálogo
+		(``nombre``, ``suscriptores``, ``creacion``, ``buscar`` o el nombre exacto).
+
+		Returns:
+			True si la fila cambió
+		"""
+		alias = {"nombre": "NOMBRE LISTA", "suscriptores": "SUSCRIPTORES", "creacion": "CREACION", "buscar": "Buscar"}
+		id_lista = str(id_lista)
+		nuevos = {alias.get(k, k): ("" if v is None else str(v).strip()) for k, v in valores.items()}
+		if id_lista not in self._df.index:
+			fila = {c: "" for c in COLUMNAS}
+			fila.update(nuevos)
+			fila["ID_LISTA"] = id_lista
+			self._df.loc[id_lista] = [fila[c] for c in COLUMNAS]
+			self.cambios.add(id_lista)
+			return True
+		actuales = self._df.loc[id_lista, list(nuevos)]
+		diferentes = {c: v for c, v in nuevos.items() if actuales[c] != v}
+		if not diferentes:
+			return False
+		self._df.loc[id_lista, list(diferentes)] = list(diferentes.values())
+		self.cambios.add(id_lista)
+		return True
+
+	def upsert_filas(self, filas: Iterable[Sequence[str]]) -> int:
+		"""Upsert vectorizado de filas completas ``COLUMNAS``. Devuelve las filas cambiadas."""
+		entrantes = _limpiar(pd.DataFrame(list(filas), columns=COLUMNAS))
+		entrantes["ID_LISTA"] = _normalizar_ids(entrantes["ID_LISTA"])
+		entrantes["SUSCRIPTORES"] = _normalizar_ids(entrantes["SUSCRIPTORES"])
+		entrantes = entrantes[entrantes["ID_LISTA"] != ""].drop_duplicates("ID_LISTA", keep="last").set_index("ID_LISTA", drop=False)
+
+		comunes = entrantes.index.intersection(self._df.index)
+		distintas = (self._df.loc[comunes, COLUMNAS] != entrantes.loc[comunes, COLUMNAS]).any(axis=1)
+		modificadas = comunes[distintas.values]
+		nuevas = entrantes.index.difference(self._df.index)
+
+		if len(modificadas):
+			self._df.loc[modificadas, COLUMNAS] = entrantes.loc[modificadas, COLUMNAS]
+		if len(nuevas):
+			self._df = pd.concat([self._df, entrantes.loc[nuevas, COLUMNAS]])
+		self.cambios.update(modificadas)
+		self.cambios.update(nuevas)
+		return len(modificadas) + len(nuevas)
+
+	def pendientes_de_estadisticas(self) -> list[str]:
+		"""IDs sin SUSCRIPTORES o sin CREACION."""
+		sin_datos = (self._df["SUSCRIPTORES"] == "") | (self._df["CREACION"] == "")
+		return self._df.index[sin_datos].tolist()
+
+	def ordenado(self) -> pd.DataFrame:
+		"""Catálogo por fecha de creación ascendente; las filas sin fecha van al final."""
+		claves = clave_orden_fechas(self._df["CREACION"])
+		orden = pd.concat([self._df[COLUMNAS], claves], axis=1)
+		return (orden.sort_values(list(claves.columns), na_position="last", kind="mergesort")[COLUMNAS]
+			.reset_index(drop=True))
+
+	def filas(self) -> list[list[str]]:
+		return self.ordenado().values.tolist()
+
+	def guardar(self, forzar: bool = False) -> bool:
+		"""
+		Escribe el libro si hubo cambios (o si ``forzar``). Las listas eliminadas en
+		remoto se guardan en una hoja ``ELIMINADAS_<timestamp>``.
+
+		Returns:
+			True si se escribió el archivo
+		"""
+		if not (forzar or self.hay_cambios):
+			logger.info("💾 Catálogo de listas sin cambios, no se reescribe", archivo=self.archivo)
+			return False
+
+		df = self.ordenado()
+		os.makedirs(os.path.dirname(os.path.abspath(self.archivo)), exist_ok=True)
+		with pd.ExcelWriter(self.archivo, engine="openpyxl") as writer:
+			df.to_excel(writer, sheet_name="Sheet1", index=False)
+			hoja = writer.sheets["Sheet1"]
+			# Ancho de columna según el contenido más largo (máximo 50 caracteres)
+			for indice, columna in enumerate(COLUMNAS):
+				largo = max(len(columna), int(df[columna].str.len().max() or 0)) if len(df) else len(columna)
+				hoja.column_dimensions[hoja.cell(row=1, column=indice + 1).column_letter].width = min(largo + 2, 50)
+			if not self.eliminadas.empty:
+				# Se reescribe en cada guardado para no perderla al rehacer el libro
+				self.eliminadas.to_excel(writer, sheet_name=self._hoja_eliminadas, index=False)
+				if not self._eliminadas_guardadas:
+					logger.info(f"Guardadas {len(self.eliminadas)} filas obsoletas en hoja {self._hoja_eliminadas}")
+
+		logger.info("💾 Catálogo de listas guardado", archivo=self.archivo, filas=len(df),
+			filas_cambiadas=len(self.cambios), eliminadas=len(self.eliminadas))
+		self.cambios.clear()
+		self._eliminadas_guardadas = True
+		return True
@@ -5,6 +5,8 @@ Reemplaza la implementación anterior que usaba Playwright.
 from .utils import data_path, load_config
 from .infrastructure.api import API
 from .infrastructure.api.models.suscriptores import SubscriberData
+from .infrastructure.api.batch_upload import TAMANO_LOTE, enviar_lotes
+from .cache.upload_journal import clave_subida, get_upload_journal
 from .logger import get_logger
 from .excel_helper import ExcelHelper
 import pandas as pd
@@ -295,7 +297,8 @@ def crear_lista_via_api(nombre_lista: str, config_lista: Dict[str, str], api: AP
         print(f"Error creando lista {nombre_lista}: {e}")
         return None
 
-def agregar_suscriptores_via_api(list_id: int, df_suscriptores: pd.DataFrame, api: API) -> int:
+def agregar_suscriptores_via_api(list_id: int, df_suscriptores: pd.DataFrame, api: API,
+                                 job_key: Optional[str] = None) -> int:
     """
     Agrega suscriptores a una lista usando la API con procesamiento en lotes
     
@@ -303,12 +306,13 @@ def agregar_suscriptores_via_api(list_id: int, df_suscriptores: pd.DataFrame, ap
         list_id: ID de la lista
         df_suscriptores: DataFrame con los datos de suscriptores
         api: Instancia de API reutilizable
+        job_key: Trabajo del diario de subidas; si se indica, los lotes ya
+            confirmados en un intento anterior no se reenvían
         
     Returns:
-        Número de suscriptores agregados exitosamente
+        Número de suscriptores agregados exitosamente (incluidos los de intentos anteriores)
     """
     logger = get_logger()
-    suscriptores_agregados = 0
     
     if df_suscriptores.empty:
         logger.warning("DataFrame de suscriptores está vacío")
@@ -320,12 +324,14 @@ def agregar_suscriptores_via_api(list_id: int, df_suscriptores: pd.DataFrame, ap
         logger.error(f"Columna 'email' requerida no encontrada. Columnas disponibles: {list(df_suscriptores.columns)}")
         return 0
     
-    try:
-        # Preparar datos para procesamiento en lotes
+    def lotes():
+        # Los lotes se delimitan por posición en la hoja para que al reanudar coincidan
         subscribers_batch = []
-        batch_size = 100  # Procesar en lotes de 100
-        
-        for _, fila in df_suscriptores.iterrows():
+        for posicion, (_, fila) in enumerate(df_suscriptores.iterrows()):
+            if posicion and posicion % TAMANO_LOTE == 0 and subscribers_batch:
+                yield posicion - TAMANO_LOTE, subscribers_batch
+                subscribers_batch = []
+            
             # Preparar campos del suscriptor
             merge_fields = {}
             
@@ -340,45 +346,28 @@ def agregar_suscriptores_via_api(list_id: int, df_suscriptores: pd.DataFrame, ap
             
             # Crear SubscriberData tipado
             try:
-                subscriber_data = SubscriberData(
+                subscribers_batch.append(SubscriberData(
                     email=merge_fields['email'],
                     **{k: v for k, v in merge_fields.items() if k != 'email'}
-                )
-                subscribers_batch.append(subscriber_data)
-                
-                # Procesar lote cuando alcance el tamaño
-                if len(subscribers_batch) >= batch_size:
-                    result = api.suscriptores.batch_add_subscribers(
-                        list_id=list_id,
-                        subscribers_data=subscribers_batch,
-                        update_subscriber=1,  # Actualizar si existe
-                        complete_json=1
-                    )
-                    suscriptores_agregados += result.success_count
-                    logger.info(f"Lote procesado: {result.success_count} exitosos, {result.error_count} errores")
-                    subscribers_batch.clear()
-                    
+                ))
             except Exception as e:
                 logger.warning(f"Error preparando suscriptor {merge_fields.get('email', 'sin email')}: {e}")
-                continue
         
-        # Procesar último lote si queda alguno
+        # Último lote si queda alguno
         if subscribers_batch:
-            result = api.suscriptores.batch_add_subscribers(
-                list_id=list_id,
-                subscribers_data=subscribers_batch,
-                update_subscriber=1,  # Actualizar si existe
-                complete_json=1
-            )
-            suscriptores_agregados += result.success_count
-            logger.info(f"Último lote procesado: {result.success_count} exitosos, {result.error_count} errores")
-        
-        logger.info(f"Agregados {suscriptores_agregados} suscriptores a lista {list_id}")
+            yield (len(df_suscriptores) - 1) // TAMANO_LOTE * TAMANO_LOTE, subscribers_batch
+    
+    try:
+        journal = get_upload_journal() if job_key else None
+        envio = enviar_lotes(api, list_id, lotes(), journal, job_key)
+        if envio.lotes_fallidos:
+            logger.warning(f"{envio.lotes_fallidos} lotes fallaron; se reintentarán al repetir la subida")
+        logger.info(f"Agregados {envio.total_exitosos} suscriptores a lista {list_id}")
+        return envio.total_exitosos
         
     except Exception as e:
         logger.error(f"Error en proceso de agregar suscriptores: {e}")
-    
-    return suscriptores_agregados
+        return 0
 
 def procesar_hoja_excel(archivo: str, nombre_hoja: str, config_lista: Dict[str, str], api: API) -> Optional[Dict[str, Any]]:
     """
@@ -405,23 +394,40 @@ def procesar_hoja_excel(archivo: str, nombre_hoja: str, config_lista: Dict[str,
         
         print(f"📄 Procesando hoja '{nombre_hoja}' con {len(df)} filas")
         
-        # Crear lista
-        list_id = crear_lista_via_api(nombre_hoja, config_lista, api)
-        if not list_id:
-            return None
+        # Crear lista (o retomar la de un intento anterior sin terminar)
+        journal = get_upload_journal()
+        job_key = clave_subida(archivo, nombre_hoja, nombre_hoja)
+        list_id = journal.begin(job_key, len(df), TAMANO_LOTE)
+        reanudada = list_id is not None
+        if reanudada:
+            print(f"♻️ Reanudando subida a la lista {list_id} desde la fila {journal.first_pending(job_key)}")
+        else:
+            list_id = crear_lista_via_api(nombre_hoja, config_lista, api)
+            if not list_id:
+                journal.discard(job_key)
+                return None
+            journal.set_list(job_key, list_id)
         
         # Agregar suscriptores
-        suscriptores_agregados = agregar_suscriptores_via_api(list_id, df, api)
+        suscriptores_agregados = agregar_suscriptores_via_api(list_id, df, api, job_key)
+        
+        resumen = journal.summary(job_key)
+        if not resumen['lotes_fallidos']:
+            journal.complete(job_key)
         
         resultado = {
             'nombre_lista': nombre_hoja,
             'list_id': list_id,
             'total_filas': len(df),
             'suscriptores_agregados': suscriptores_agregados,
-            'exitoso': suscriptores_agregados > 0
+            'exitoso': suscriptores_agregados > 0 and not resumen['lotes_fallidos'],
+            'reanudada': reanudada,
+            'lotes_pendientes': resumen['lotes_fallidos']
         }
         
         print(f"✅ Lista '{nombre_hoja}' creada - ID: {list_id}, Suscriptores: {suscriptores_agregados}/{len(df)}")
+        if resumen['lotes_fallidos']:
+            print(f"⚠️ {resumen['lotes_fallidos']} lotes sin confirmar; vuelve a ejecutar la subida para completarlos")
         return resultado
         
     except Exception as e:
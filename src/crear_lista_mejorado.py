@@ -10,6 +10,11 @@ Funcionalidades:
 
 from .utils import data_path, notify, load_config
 from .infrastructure.api import API
+from .infrastructure.api.merge_fields import provisionar_campos
+from .descargar_listas import iterar_bloques_suscriptores
+from .diff_suscriptores import COLUMNAS_EMAIL, comparar_con_remoto, detectar_columna_email, nombre_merge_field
+from .infrastructure.api.batch_upload import TAMANO_LOTE, enviar_lotes
+from .cache.upload_journal import clave_subida, get_upload_journal
 from .infrastructure.api.models.suscriptores import SubscriberData, FieldType
 from .logger import get_logger
 from .excel_helper import ExcelHelper
@@ -17,7 +22,7 @@ import pandas as pd
 import os
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 from pathlib import Path
 import shutil
 import re
@@ -89,7 +94,7 @@ def verificar_lista_existe_remota(list_id: int, api: API) -> bool:
 
 def obtener_suscriptores_remotos(list_id: int, api: API) -> set:
     """
-    Obtiene los emails de suscriptores de una lista remota
+    Obtiene los emails de todos los suscriptores de una lista remota (todos los bloques)
 
     Args:
         list_id: ID de la lista
@@ -101,14 +106,11 @@ def obtener_suscriptores_remotos(list_id: int, api: API) -> set:
     logger = get_logger()
 
     try:
-        # Obtener suscriptores de la lista - la función devuelve List[ActualSubscriber]
-        subscribers = api.suscriptores.get_subscribers(list_id)
-
         emails_remotos = set()
-        if subscribers:
-            for subscriber in subscribers:
-                if subscriber.email:
-                    emails_remotos.add(subscriber.email.lower())
+        for bloque in iterar_bloques_suscriptores(api.suscriptores, list_id):
+            for subscriber in bloque:
+                if subscriber.get('email'):
+                    emails_remotos.add(subscriber['email'].strip().lower())
 
         logger.info(f"Lista {list_id}: {len(emails_remotos)} suscriptores remotos encontrados")
         return emails_remotos
@@ -131,13 +133,7 @@ def comparar_suscriptores_local_vs_remoto(df_local: pd.DataFrame, emails_remotos
     logger = get_logger()
 
     # Detectar columna de email automáticamente
-    email_column = None
-    possible_email_columns = ['email', 'Email', 'EMAIL', 'Correo Electrónico', 'Correo', 'correo', 'e-mail', 'E-mail']
-
-    for col_name in possible_email_columns:
-        if col_name in df_local.columns:
-            email_column = col_name
-            break
+    email_column = detectar_columna_email(df_local)
 
     if not email_column:
         print(f"⚠️ No se encontró columna de email. Columnas disponibles: {list(df_local.columns)}")
@@ -240,55 +236,63 @@ def procesar_archivo_con_id_existente(archivo: str, list_id: int, api: API) -> O
         print(f"❌ Error leyendo archivo local: {e}")
         return None
 
-    # Obtener suscriptores remotos
-    print("🔍 Obteniendo suscriptores remotos...")
-    emails_remotos = obtener_suscriptores_remotos(list_id, api)
-    print(f"📊 Lista remota: {len(emails_remotos)} suscriptores")
+    # Comparar local vs lista remota completa (hash de los campos por email)
+    print("🔍 Comparando con los suscriptores remotos...")
+    try:
+        diff = comparar_con_remoto(df_local, api, list_id)
+    except Exception as e:
+        print(f"❌ Error comparando con la lista remota: {e}")
+        return None
 
-    # Comparar local vs remoto
-    comparacion = comparar_suscriptores_local_vs_remoto(df_local, emails_remotos)
+    print(f"📊 Lista remota: {diff.total_remotos} suscriptores")
+    print(f"   🆕 Nuevos: {len(diff.nuevos)}  ✏️ Modificados: {len(diff.modificados)}  ✅ Sin cambios: {len(diff.sin_cambios)}")
 
-    if not comparacion['tiene_nuevos']:
-        print("✅ No hay suscriptores nuevos que agregar")
+    if not diff.pendientes:
+        print("✅ No hay suscriptores nuevos ni modificados que enviar")
         print("🎯 Lista ya está actualizada")
 
         return {
             'nombre_lista': os.path.splitext(os.path.basename(archivo))[0],
             'list_id': list_id,
-            'total_filas': comparacion['total_locales'],
+            'total_filas': diff.total_locales,
             'suscriptores_agregados': 0,
             'exitoso': True,
             'ya_actualizada': True
         }
 
-    print(f"🆕 Encontrados {comparacion['cantidad_nuevos']} suscriptores nuevos")
-    print("📤 Agregando solo los nuevos suscriptores...")
+    print("📤 Enviando solo los suscriptores nuevos y modificados...")
+    df_envio = diff.filas_a_enviar(df_local)
 
     # Crear campos personalizados para los nuevos datos
-    crear_campos_personalizados(list_id, comparacion['df_nuevos'], api)
+    crear_campos_personalizados(list_id, df_envio, api)
 
-    # Agregar solo los suscriptores nuevos
-    suscriptores_agregados = agregar_suscriptores_via_api(list_id, comparacion['df_nuevos'], api)
+    # Enviar solo el delta (update_subscriber=1 actualiza los existentes); en los
+    # modificados los campos vaciados en local se envían vacíos para que converjan
+    suscriptores_agregados = agregar_suscriptores_via_api(list_id, df_envio, api,
+                                                          emails_con_vacios=diff.modificados)
 
     resultado = {
         'nombre_lista': os.path.splitext(os.path.basename(archivo))[0],
         'list_id': list_id,
-        'total_filas': comparacion['total_locales'],
+        'total_filas': diff.total_locales,
         'suscriptores_agregados': suscriptores_agregados,
         'exitoso': suscriptores_agregados > 0,
         'actualizacion_incremental': True,
-        'total_remotos_previo': comparacion['total_remotos'],
-        'nuevos_agregados': comparacion['cantidad_nuevos']
+        'total_remotos_previo': diff.total_remotos,
+        'nuevos_agregados': len(diff.nuevos),
+        'modificados_actualizados': len(diff.modificados),
+        'sin_cambios': len(diff.sin_cambios)
     }
 
     if resultado['exitoso']:
         print("✅ Actualización incremental exitosa:")
         print(f"   📊 Total en archivo: {resultado['total_filas']}")
         print(f"   📊 Remotos previos: {resultado['total_remotos_previo']}")
-        print(f"   🆕 Nuevos agregados: {resultado['suscriptores_agregados']}")
+        print(f"   🆕 Nuevos: {resultado['nuevos_agregados']}  ✏️ Modificados: {resultado['modificados_actualizados']}")
+        print(f"   📤 Enviados correctamente: {resultado['suscriptores_agregados']}")
 
         # Mostrar notificación
-        notify("Lista actualizada", f"Se agregaron {suscriptores_agregados} nuevos suscriptores a la lista {list_id}")
+        notify("Lista actualizada", f"Se enviaron {suscriptores_agregados} suscriptores nuevos o modificados a la lista {list_id}")
     else:
         print("❌ Error en actualización incremental")
 
@@ -630,10 +634,19 @@ def procesar_hoja_excel(archivo: str, nombre_hoja: str, config_lista: Dict[str,
 
         print(f"📄 Procesando hoja '{nombre_hoja}' con {len(df)} filas -> Lista '{nombre_lista}'")
 
-        # Crear lista
-        list_id = crear_lista_via_api(nombre_lista, config_lista, api)
-        if not list_id:
-            return None
+        # Crear lista (o retomar la de un intento anterior sin terminar)
+        journal = get_upload_journal()
+        job_key = clave_subida(archivo, nombre_hoja, nombre_lista)
+        list_id = journal.begin(job_key, len(df), TAMANO_LOTE)
+        reanudada = list_id is not None
+        if reanudada:
+            print(f"♻️ Reanudando subida a la lista {list_id} desde la fila {journal.first_pending(job_key)}")
+        else:
+            list_id = crear_lista_via_api(nombre_lista, config_lista, api)
+            if not list_id:
+                journal.discard(job_key)
+                return None
+            journal.set_list(job_key, list_id)
 
         # Crear campos personalizados automáticamente
         print("🔧 Paso 1: Creando campos personalizados...")
@@ -641,14 +654,20 @@ def procesar_hoja_excel(archivo: str, nombre_hoja: str, config_lista: Dict[str,
 
         # Agregar suscriptores
         print("👥 Paso 2: Agregando suscriptores...")
-        suscriptores_agregados = agregar_suscriptores_via_api(list_id, df, api)
+        suscriptores_agregados = agregar_suscriptores_via_api(list_id, df, api, job_key)
+
+        resumen = journal.summary(job_key)
+        if not resumen['lotes_fallidos']:
+            journal.complete(job_key)
 
         resultado = {
             'nombre_lista': nombre_lista,
             'list_id': list_id,
             'total_filas': len(df),
             'suscriptores_agregados': suscriptores_agregados,
-            'exitoso': suscriptores_agregados > 0
+            'exitoso': suscriptores_agregados > 0 and not resumen['lotes_fallidos'],
+            'reanudada': reanudada,
+            'lotes_pendientes': resumen['lotes_fallidos']
         }
 
         return resultado
@@ -661,13 +680,13 @@ def procesar_hoja_excel(archivo: str, nombre_hoja: str, config_lista: Dict[str,
 def crear_campos_personalizados(list_id: int, df_suscriptores: pd.DataFrame, api: API, page=None) -> bool:
     """
     Crea campos personalizados inteligentemente basándose en los campos disponibles en Acumba.
-    Usa scraping para verificar qué campos ya existen y evita crear duplicados.
+    Consulta el catálogo de campos (API con caché) para saber cuáles ya existen y evita crear duplicados.
 
     Args:
         list_id: ID de la lista
         df_suscriptores: DataFrame con los datos de suscriptores
         api: Instancia de API
-        page: Página de Playwright para scraping (opcional)
+        page: Página de Playwright para scraping si la API no responde (opcional)
 
     Returns:
         bool: True si se crearon exitosamente
@@ -684,43 +703,38 @@ def crear_campos_personalizados(list_id: int, df_suscriptores: pd.DataFrame, api
 
         print(f"🔍 Analizando {len(campos_excel)} campos del Excel...")
 
-        # Si tenemos una página, verificar campos existentes en Acumba
+        # Verificar campos existentes en Acumba (catálogo por API; la página solo se usa si la API falla)
         campos_acumba = []
-        if page:
-            try:
-                from .field_scraper import obtener_campos_disponibles_acumba, filtrar_campos_necesarios
-
-                print("📊 Obteniendo campos disponibles en Acumbamail...")
-                info_campos = obtener_campos_disponibles_acumba(page, list_id)
-                campos_acumba = info_campos.get("fields", [])
-
-                print(f"📋 Campos detectados en Acumba: {len(campos_acumba)}")
-                for campo in campos_acumba[:5]:  # Mostrar primeros 5
+        try:
+            from .field_scraper import obtener_campos_disponibles_acumba, filtrar_campos_necesarios
+
+            print("📊 Obteniendo campos disponibles en Acumbamail...")
+            info_campos = obtener_campos_disponibles_acumba(page, list_id, api)
+            campos_acumba = info_campos.get("fields", [])
+
+            print(f"📋 Campos detectados en Acumba: {len(campos_acumba)}")
+            for campo in campos_acumba[:5]:  # Mostrar primeros 5
+                print(f"   • {campo}")
+            if len(campos_acumba) > 5:
+                print(f"   • ... y {len(campos_acumba) - 5} más")
+
+            # Filtrar campos necesarios
+            filtrado = filtrar_campos_necesarios(campos_excel, campos_acumba)
+            campos_crear = filtrado["crear"]
+            campos_mapear = filtrado["mapear"]
+            campos_ignorar = filtrado["ignorar"]
+
+            print(f"🆕 Campos nuevos a crear: {len(campos_crear)}")
+            print(f"🔗 Campos existentes a mapear: {len(campos_mapear)}")
+            print(f"🚫 Campos a ignorar: {len(campos_ignorar)}")
+
+            if campos_ignorar:
+                print("📋 Campos ignorados:")
+                for campo in campos_ignorar:
                     print(f"   • {campo}")
-                if len(campos_acumba) > 5:
-                    print(f"   • ... y {len(campos_acumba) - 5} más")
-
-                # Filtrar campos necesarios
-                filtrado = filtrar_campos_necesarios(campos_excel, campos_acumba)
-                campos_crear = filtrado["crear"]
-                campos_mapear = filtrado["mapear"]
-                campos_ignorar = filtrado["ignorar"]
-
-                print(f"🆕 Campos nuevos a crear: {len(campos_crear)}")
-                print(f"🔗 Campos existentes a mapear: {len(campos_mapear)}")
-                print(f"🚫 Campos a ignorar: {len(campos_ignorar)}")
-
-                if campos_ignorar:
-                    print("📋 Campos ignorados:")
-                    for campo in campos_ignorar:
-                        print(f"   • {campo}")
 
-            except Exception as e:
-                logger.warning(f"Error en scraping de campos, usando modo fallback: {e}")
-                campos_crear = campos_excel
-        else:
-            # Sin scraping, crear todos los campos (modo legacy)
-            logger.info("No hay página disponible para scraping, usando modo legacy")
+        except Exception as e:
+            logger.warning(f"Error obteniendo campos disponibles, usando modo fallback: {e}")
             campos_crear = campos_excel
 
         if not campos_crear:
@@ -729,32 +743,28 @@ def crear_campos_personalizados(list_id: int, df_suscriptores: pd.DataFrame, api
 
         print(f"🔧 Creando {len(campos_crear)} campos personalizados necesarios...")
 
-        campos_creados = 0
-        campos_fallidos = 0
-
-        for campo in campos_crear:
-            try:
-                # Normalizar nombre del campo
-                campo_normalizado = campo.replace(' ', '_').replace('-', '_')
-
-                # Crear campo usando la API
-                api.suscriptores.add_merge_tag(
-                    list_id=list_id,
-                    field_name=campo_normalizado,
-                    field_type=FieldType.TEXT
-                )
+        # Normalizar nombres; los que ya existen en la lista (según la caché de esquemas) no se recrean
+        normalizados = {campo: campo.replace(' ', '_').replace('-', '_') for campo in campos_crear}
+        resultado = provisionar_campos(
+            api, list_id, {normalizado: FieldType.TEXT for normalizado in normalizados.values()}
+        )
 
-                campos_creados += 1
+        for campo, campo_normalizado in normalizados.items():
+            if campo_normalizado in resultado.creados:
                 print(f"   ✅ {campo} -> {campo_normalizado}")
                 logger.info(f"Campo '{campo_normalizado}' creado exitosamente")
+            elif campo_normalizado in resultado.fallidos:
+                print(f"   ❌ {campo}: {resultado.fallidos[campo_normalizado]}")
+                logger.warning(f"Error creando campo '{campo}': {resultado.fallidos[campo_normalizado]}")
+            else:
+                print(f"   🔗 {campo} -> {campo_normalizado} (ya existía)")
 
-            except Exception as e:
-                campos_fallidos += 1
-                print(f"   ❌ {campo}: {e}")
-                logger.warning(f"Error creando campo '{campo}': {e}")
+        # provisionar_campos ya ha descartado el catálogo de campos de la lista
+        campos_creados = len(resultado.creados)
+        campos_fallidos = len(resultado.fallidos)
 
         print(f"📊 Resultado: {campos_creados} exitosos, {campos_fallidos} fallidos")
-        return campos_creados > 0
+        return campos_creados > 0 or (campos_fallidos == 0 and bool(resultado.existentes))
 
     except Exception as e:
         logger.error(f"Error general creando campos personalizados: {e}")
@@ -822,117 +832,105 @@ def verificar_y_mostrar_campos(list_id: int, df_suscriptores: pd.DataFrame, api:
         print(f"⚠️  No se pudieron verificar los campos de la lista: {e}")
         return False
 
-def agregar_suscriptores_via_api(list_id: int, df_suscriptores: pd.DataFrame, api: API) -> int:
+def agregar_suscriptores_via_api(list_id: int, df_suscriptores: pd.DataFrame, api: API,
+                                 job_key: Optional[str] = None,
+                                 emails_con_vacios: Optional[Set[str]] = None) -> int:
     """
     Agrega suscriptores a una lista usando la API con procesamiento en lotes
     Primero define los campos personalizados, luego agrega los suscriptores
+
+    Con ``job_key`` cada lote se anota en el diario de subidas y los lotes ya
+    confirmados en un intento anterior no se reenvían. Para los emails de
+    ``emails_con_vacios`` (normalizados) las celdas vacías se envían como ""
+    en lugar de omitirse, de modo que un valor borrado en local se borre también
+    en la lista remota.
     """
     logger = get_logger()
-    suscriptores_agregados = 0
 
     if df_suscriptores.empty:
         logger.warning("DataFrame de suscriptores está vacío")
         return 0
 
     # Detectar columna de email automáticamente (igual que en comparar_suscriptores_local_vs_remoto)
-    email_column = None
-    possible_email_columns = ['email', 'Email', 'EMAIL', 'Correo Electrónico', 'Correo', 'correo', 'e-mail', 'E-mail']
-
-    for col_name in possible_email_columns:
-        if col_name in df_suscriptores.columns:
-            email_column = col_name
-            break
+    email_column = detectar_columna_email(df_suscriptores)
 
     if not email_column:
         logger.error(f"Columna de email no encontrada. Columnas disponibles: {list(df_suscriptores.columns)}")
-        logger.error(f"Columnas esperadas de email: {possible_email_columns}")
+        logger.error(f"Columnas esperadas de email: {COLUMNAS_EMAIL}")
         return 0
 
     print(f"📧 Usando columna de email: '{email_column}'")
 
-    try:
-        # PASO 1: Preparar datos con email column detectada
-        print("👥 Agregando suscriptores con campos personalizados...")
+    # Renombrar la columna de email si es necesario para la API
+    df_trabajo = df_suscriptores
+    if email_column != 'email':
+        df_trabajo = df_suscriptores.rename(columns={email_column: 'email'})
+        print(f"📧 Renombrando '{email_column}' -> 'email' para API")
 
-        # Renombrar la columna de email si es necesario para la API
-        df_trabajo = df_suscriptores.copy()
-        if email_column != 'email':
-            df_trabajo = df_trabajo.rename(columns={email_column: 'email'})
-            print(f"📧 Renombrando '{email_column}' -> 'email' para API")
-
-        # Preparar datos para procesamiento en lotes
+    def lotes():
+        # Los lotes se delimitan por posición en la hoja para que al reanudar coincidan
         subscribers_batch = []
-        batch_size = 100  # Procesar en lotes de 100
+        primero = True
+        for posicion, (_, fila) in enumerate(df_trabajo.iterrows()):
+            if posicion and posicion % TAMANO_LOTE == 0 and subscribers_batch:
+                yield posicion - TAMANO_LOTE, subscribers_batch
+                subscribers_batch = []
 
-        for _, fila in df_suscriptores.iterrows():
             # Preparar campos del suscriptor
             merge_fields = {}
 
             for columna, valor in fila.items():
                 if pd.notna(valor) and str(valor).strip():  # Solo valores no vacíos
                     # Normalizar nombre de campo (sin espacios, formato Acumbamail)
-                    campo_normalizado = columna.replace(' ', '_').replace('-', '_')
-                    merge_fields[campo_normalizado] = str(valor).strip()
+                    merge_fields[nombre_merge_field(columna)] = str(valor).strip()
 
             # Verificar que tenga email
             if 'email' not in merge_fields or not merge_fields['email']:
                 logger.warning(f"Fila sin email válido: {fila.to_dict()}")
                 continue
 
+            if emails_con_vacios and merge_fields['email'].lower() in emails_con_vacios:
+                for columna in fila.index:
+                    merge_fields.setdefault(nombre_merge_field(columna), "")
+
             # Crear SubscriberData tipado
             try:
-                # Debug: mostrar datos que se van a enviar
-                if len(subscribers_batch) == 0:  # Solo mostrar para el primer suscriptor
-                    print("📤 Datos del primer suscriptor:")
-                    for k, v in merge_fields.items():
-                        print(f"   {k}: '{v}'")
-
                 subscriber_data = SubscriberData(
                     email=merge_fields['email'],
                     **{k: v for k, v in merge_fields.items() if k != 'email'}
                 )
-
-                # Debug: verificar el objeto creado
-                if len(subscribers_batch) == 0:
-                    subscriber_dict = subscriber_data.model_dump()
-                    print("📦 SubscriberData creado:")
-                    for k, v in subscriber_dict.items():
-                        if v is not None:
-                            print(f"   {k}: '{v}'")
-
-                subscribers_batch.append(subscriber_data)
-
-                # Procesar lote cuando alcance el tamaño
-                if len(subscribers_batch) >= batch_size:
-                    result = api.suscriptores.batch_add_subscribers(
-                        list_id=list_id,
-                        subscribers_data=subscribers_batch,
-                        update_subscriber=1,  # Actualizar si existe
-                        complete_json=1
-                    )
-                    suscriptores_agregados += result.success_count
-                    logger.info(f"Lote procesado: {result.success_count} exitosos, {result.error_count} errores")
-                    subscribers_batch.clear()
-
             except Exception as e:
                 logger.warning(f"Error preparando suscriptor {merge_fields.get('email', 'sin email')}: {e}")
                 continue
 
-        # Procesar último lote si queda alguno
+            # Debug: mostrar datos que se van a enviar (solo el primer suscriptor)
+            if primero:
+                primero = False
+                print("📤 Datos del primer suscriptor:")
+                for k, v in merge_fields.items():
+                    print(f"   {k}: '{v}'")
+
+            subscribers_batch.append(subscriber_data)
+
+        # Último lote si queda alguno
         if subscribers_batch:
-            result = api.suscriptores.batch_add_subscribers(
-                list_id=list_id,
-                subscribers_data=subscribers_batch,
-                update_subscriber=1,  # Actualizar si existe
-                complete_json=1
-            )
-            suscriptores_agregados += result.success_count
-            logger.info(f"Último lote procesado: {result.success_count} exitosos, {result.error_count} errores")
+            yield (len(df_trabajo) - 1) // TAMANO_LOTE * TAMANO_LOTE, subscribers_batch
+
+    suscriptores_agregados = 0
+    try:
+        print("👥 Agregando suscriptores con campos personalizados...")
+        journal = get_upload_journal() if job_key else None
+        envio = enviar_lotes(api, list_id, lotes(), journal, job_key)
+        suscriptores_agregados = envio.total_exitosos
+        if envio.lotes_omitidos:
+            print(f"♻️ {envio.lotes_omitidos} lotes ya confirmados en un intento anterior")
+        if envio.lotes_fallidos:
+            print(f"⚠️ {envio.lotes_fallidos} lotes fallaron; se reintentarán al repetir la subida")
 
         logger.info(f"Agregados {suscriptores_agregados} suscriptores a lista {list_id}")
 
         # PASO 2: Verificar campos después de agregar suscriptores
-        if suscriptores_agregados > 0:
+        if envio.enviados > 0:
             print("🔍 Verificando campos de la lista...")
             verificar_y_mostrar_campos(list_id, df_suscriptores, api)
 
@@ -8,8 +8,12 @@ mediante automatización web con Playwright.
 from playwright.sync_api import sync_playwright
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from typing import Optional
+from typing import Callable, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 import os
+import threading
+import time
 from pathlib import Path
 
 if __package__ in (None, ""):
@@ -19,6 +23,7 @@ if __package__ in (None, ""):
     __package__ = "src"
 
 from .utils import (
+    config_int,
     load_config,
     data_path,
     storage_state_path,
@@ -28,6 +33,7 @@ from .utils import (
     get_timeouts,
 )
 from .autentificacion import login
+from .infrastructure.browser.browser_service import authenticated_page
 from .infrastructure.scraping.endpoints.lista_upload import ListUploader
 from .infrastructure.scraping.models.listas import (
     ListUploadConfig,
@@ -270,14 +276,21 @@ def seleccionar_archivo_excel(
     return archivo if archivo else None
 
 
-def main(nombre_hoja: Optional[str] = None, archivo_excel: Optional[str] = None, multiple: bool = False):
+def main(nombre_hoja: Optional[str] = None, archivo_excel: Optional[str] = None, multiple: bool = False,
+         page=None, context=None):
     """
     Función principal para subir lista usando scraping desde Listas.xlsx
 
+    Si se recibe una página autenticada (servicio de navegador persistente) se
+    reutiliza para la subida en serie; la subida en paralelo abre siempre un
+    navegador por hoja.
+
     Args:
         nombre_hoja: Nombre de la hoja a usar (si None, se pregunta al usuario)
         archivo_excel: Ruta del archivo Excel (si None, usa data/Listas.xlsx por defecto)
         multiple: Si es True, permite procesar múltiples hojas
+        page: Página autenticada a reutilizar (opcional)
+        context: Contexto de la página (opcional)
     """
     logger = get_logger()
     logger.info("=" * 70)
@@ -370,6 +383,12 @@ def main(nombre_hoja: Optional[str] = None, archivo_excel: Optional[str] = None,
         logger.info(f"📄 HOJA SELECCIONADA: {nombre_hoja}")
         logger.info("=" * 70)
 
+    hojas_en_paralelo = _hojas_en_paralelo()
+    if multiple and len(hojas_a_procesar) > 1 and hojas_en_paralelo > 1:
+        resultados = procesar_hojas_concurrente(archivo_excel, hojas_a_procesar, headless, hojas_en_paralelo)
+        mostrar_resumen_final(resultados, multiple)
+        return
+
     # Procesar cada hoja
     resultados = []
     uploader = ListUploader()
@@ -440,25 +459,9 @@ def main(nombre_hoja: Optional[str] = None, archivo_excel: Optional[str] = None,
             logger.info("🌐 INICIANDO NAVEGADOR")
             logger.info("=" * 70)
 
-            with sync_playwright() as p:
-                logger.info("🌐 Configurando navegador...")
-                browser = configurar_navegador(p, headless)
-                context = crear_contexto_navegador(browser, headless)
-                page = context.new_page()
-                logger.info("✅ Navegador configurado")
-
-                try:
-                    # Navegar y autenticar
-                    logger.info("")
-                    logger.info("🔐 AUTENTICACIÓN")
-                    logger.info("-" * 70)
-                    logger.info(f"🌐 Navegando a: {url_base}")
-                    page.goto(url_base, timeout=60000)
-                    logger.info(f"🌐 Navegando a: {url}")
-                    page.goto(url, timeout=60000)
-
-                    logger.info("🔑 Iniciando sesión...")
-                    login(page, context)
+            # Reutilizar la página recibida o lanzar un navegador propio con login
+            try:
+                with authenticated_page(page, context, headless) as (page, context):
                     logger.info("✅ Autenticación exitosa")
 
                     # Procesar la primera hoja
@@ -494,22 +497,150 @@ def main(nombre_hoja: Optional[str] = None, archivo_excel: Optional[str] = None,
                     # Mostrar resumen final
                     mostrar_resumen_final(resultados, multiple)
 
-                except Exception as e:
-                    logger.error(f"❌ Error durante el proceso: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    notify("Error", f"Error durante el proceso: {e}", "error")
-
-                finally:
-                    logger.info("")
-                    logger.info("🔒 Cerrando navegador...")
-                    browser.close()
-                    logger.info("✅ Navegador cerrado")
+            except Exception as e:
+                logger.error(f"❌ Error durante el proceso: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
+                notify("Error", f"Error durante el proceso: {e}", "error")
 
         # Si no es la primera hoja, continuamos con el flujo normal (esto se maneja arriba)
         break
 
 
+
+def _hojas_en_paralelo() -> int:
+    """Hojas subidas a la vez según ``list_upload.parallel_sheets`` (1 = en serie)."""
+    return config_int("list_upload", "parallel_sheets", 3)
+
+
+# Contexto + login en serie: el primer navegador guarda la sesión y los siguientes la reutilizan
+_login_lock = threading.Lock()
+
+
+@contextmanager
+def _pagina_autenticada(headless: bool):
+    """Navegador propio del hilo con la sesión de Acumbamail iniciada."""
+    with sync_playwright() as p:
+        browser = configurar_navegador(p, headless)
+        try:
+            with _login_lock:
+                context = crear_contexto_navegador(browser, headless)
+                page = context.new_page()
+                login(page, context)
+            yield page
+        finally:
+            browser.close()
+
+
+class ProgresoMultiHoja:
+    """
+    Combina el progreso de varias subidas simultáneas en un único flujo de
+    ``ListUploadProgress``: el porcentaje es la media de todas las hojas y el
+    mensaje indica la hoja que lo emite.
+    """
+
+    def __init__(self, hojas: list[str], callback: Callable[[ListUploadProgress], None]):
+        self.callback = callback
+        self.porcentajes = {hoja: 0.0 for hoja in hojas}
+        self._lock = threading.Lock()
+
+    def para_hoja(self, hoja: str) -> Callable[[ListUploadProgress], None]:
+        def reportar(progress: ListUploadProgress) -> None:
+            self.actualizar(hoja, progress)
+        return reportar
+
+    def actualizar(self, hoja: str, progress: ListUploadProgress) -> None:
+        with self._lock:
+            self.porcentajes[hoja] = max(self.porcentajes.get(hoja, 0.0), progress.porcentaje)
+            total = sum(self.porcentajes.values()) / max(len(self.porcentajes), 1)
+            self.callback(progress.model_copy(update={
+                "porcentaje": round(total, 1),
+                "mensaje": f"[{hoja}] {progress.mensaje}",
+            }))
+
+    def completar(self, hoja: str) -> None:
+        """Marca la hoja como terminada (también si falló) para que el total llegue a 100%."""
+        self.actualizar(hoja, ListUploadProgress(stage="finalizando", mensaje="Hoja terminada", porcentaje=100.0))
+
+
+def _subir_hoja_aislada(archivo_excel: str, nombre_hoja: str, headless: bool, progreso: ProgresoMultiHoja) -> dict:
+    """Sube una hoja en su propio navegador. Nunca lanza: los errores van en el resultado."""
+    logger = get_logger()
+    inicio = time.perf_counter()
+    try:
+        uploader = ListUploader()
+        columnas, _ = uploader.cargar_columnas_excel(archivo_excel, nombre_hoja)
+        if not columnas:
+            logger.error(f"❌ No se pudieron cargar las columnas de la hoja '{nombre_hoja}'")
+            resultado = {'hoja': nombre_hoja, 'success': False, 'error': 'Error al cargar columnas'}
+        else:
+            upload_config = ListUploadConfig(
+                nombre_lista=nombre_hoja,
+                archivo_path=archivo_excel,
+                hoja_nombre=nombre_hoja,
+                columnas=columnas,
+                timeout_seconds=60,
+                wait_time_ms=2000,
+            )
+            with _pagina_autenticada(headless) as page:
+                resultado = procesar_hoja_lista(page, uploader, upload_config, progreso.para_hoja(nombre_hoja), nombre_hoja)
+    except Exception as e:
+        logger.error(f"❌ Error subiendo la hoja '{nombre_hoja}': {e}")
+        resultado = {'hoja': nombre_hoja, 'success': False, 'error': str(e)}
+    finally:
+        progreso.completar(nombre_hoja)
+    resultado['duracion_s'] = round(time.perf_counter() - inicio, 1)
+    return resultado
+
+
+def procesar_hojas_concurrente(archivo_excel: str, hojas: list[str], headless: bool,
+                               max_workers: Optional[int] = None,
+                               progress_callback: Optional[Callable[[ListUploadProgress], None]] = None) -> list[dict]:
+    """
+    Sube varias hojas a la vez, cada una en su propio navegador (el API sync de
+    Playwright no se comparte entre hilos), con un máximo de ``max_workers``.
+
+    La espera en el servidor (creación de la lista, procesado del archivo,
+    mapeo) de cada hoja se solapa con la de las demás, así que el tiempo total
+    se acerca al de la hoja más lenta por tanda en lugar de a la suma.
+
+    Returns:
+        Un resultado por hoja, en el orden de ``hojas`` (con ``duracion_s``)
+    """
+    logger = get_logger()
+    max_workers = min(max_workers or _hojas_en_paralelo(), len(hojas))
+
+    def log_progreso(progress: ListUploadProgress):
+        barra_progreso = "█" * int(progress.porcentaje / 5) + "░" * (20 - int(progress.porcentaje / 5))
+        logger.info(f"[{barra_progreso}] {progress.porcentaje:5.1f}% | {progress.stage:20} | {progress.mensaje}")
+
+    progreso = ProgresoMultiHoja(hojas, progress_callback or log_progreso)
+    resultados: list[Optional[dict]] = [None] * len(hojas)
+    inicio = time.perf_counter()
+
+    logger.info("")
+    logger.info(f"🚀 Subiendo {len(hojas)} hojas con {max_workers} navegadores en paralelo")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="subida_lista") as executor:
+        futuros = {
+            executor.submit(_subir_hoja_aislada, archivo_excel, hoja, headless, progreso): i
+            for i, hoja in enumerate(hojas)
+        }
+        for terminadas, futuro in enumerate(as_completed(futuros), 1):
+            i = futuros[futuro]
+            resultados[i] = futuro.result()
+            estado = "✅" if resultados[i]['success'] else "❌"
+            logger.info(f"{estado} [{terminadas}/{len(hojas)}] {hojas[i]} ({resultados[i]['duracion_s']}s)")
+
+    logger.info(
+        "⏱️ Subida múltiple completada",
+        hojas=len(hojas),
+        paralelo=max_workers,
+        duracion_total_s=round(time.perf_counter() - inicio, 1),
+        suma_duraciones_s=round(sum(r['duracion_s'] for r in resultados), 1),
+    )
+    return resultados
+
+
 def procesar_hoja_lista(page, uploader, upload_config, progress_callback, nombre_hoja):
     """Función auxiliar para procesar una hoja individual"""
     logger = get_logger()
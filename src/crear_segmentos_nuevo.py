@@ -5,10 +5,10 @@ que procesa archivos individuales en data/listas/ y los sube a Acumbamail autom
 """
 from .utils import data_path
 from .logger import get_logger
-from .excel_helper import ExcelHelper
+from .excel_helper import ExcelHelper, SesionEscrituraExcel
 import pandas as pd
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 # Rutas de archivos
@@ -90,13 +90,16 @@ def leer_definiciones_segmentos() -> Dict[str, List[Dict[str, Any]]]:
         logger.error(f"Error leyendo definiciones de segmentos: {e}")
         return {}
 
-def aplicar_segmento_a_lista(nombre_lista: str, segmentos: List[Dict[str, Any]]) -> bool:
+def aplicar_segmento_a_lista(nombre_lista: str, segmentos: List[Dict[str, Any]],
+                             sesion: Optional[SesionEscrituraExcel] = None) -> bool:
     """
     Aplica los segmentos a una hoja específica del archivo Lista_envio.xlsx
     
     Args:
         nombre_lista: Nombre de la hoja/lista a procesar
         segmentos: Lista de definiciones de segmentos
+        sesion: Sesión de escritura compartida; si se indica, la hoja se deja pendiente
+            y se guarda junto con las demás al llamar a ``sesion.guardar()``
         
     Returns:
         True si se aplicó exitosamente, False si hubo error
@@ -160,6 +163,11 @@ def aplicar_segmento_a_lista(nombre_lista: str, segmentos: List[Dict[str, Any]])
         
         # Guardar cambios
         if filas_modificadas > 0:
+            if sesion is not None:
+                sesion.escribir_hoja(df, nombre_lista)
+                print(f"  📝 Cambios pendientes de guardar en '{nombre_lista}': {filas_modificadas} filas modificadas")
+                logger.info(f"Segmentos aplicados a '{nombre_lista}': {filas_modificadas} filas modificadas (pendiente de guardar)")
+                return True
             if ExcelHelper.escribir_excel(df, ARCHIVO_LISTA_ENVIO, nombre_lista, reemplazar=False):
                 print(f"  💾 Guardados cambios en '{nombre_lista}': {filas_modificadas} filas modificadas")
                 logger.info(f"Segmentos aplicados a '{nombre_lista}': {filas_modificadas} filas modificadas")
@@ -209,15 +217,19 @@ def actualizar_fecha_creacion_segmentos(listas_procesadas: List[str]):
     except Exception as e:
         logger.error(f"Error actualizando fechas de creación: {e}")
 
-def mostrar_resumen_segmentacion(nombre_lista: str) -> None:
+def mostrar_resumen_segmentacion(nombre_lista: str, sesion: Optional[SesionEscrituraExcel] = None) -> None:
     """
     Muestra un resumen de la segmentación aplicada a una lista
     
     Args:
         nombre_lista: Nombre de la lista a analizar
+        sesion: Sesión de escritura con cambios aún no guardados, si la hay
     """
     try:
-        df = ExcelHelper.leer_excel(ARCHIVO_LISTA_ENVIO, nombre_lista)
+        if sesion is not None:
+            df = sesion.leer_hoja(nombre_lista)
+        else:
+            df = ExcelHelper.leer_excel(ARCHIVO_LISTA_ENVIO, nombre_lista)
         
         if df.empty or 'Segmentos' not in df.columns:
             print(f"  📊 '{nombre_lista}': Sin datos de segmentación")
@@ -258,19 +270,29 @@ def main():
     for nombre_lista, segmentos in definiciones.items():
         print(f"  • {nombre_lista}: {len(segmentos)} segmento(s)")
     
-    # Procesar cada lista
+    # Procesar cada lista; todas las hojas modificadas se guardan juntas al final
     listas_exitosas = []
     listas_fallidas = []
+    sesion = ExcelHelper.sesion_escritura(ARCHIVO_LISTA_ENVIO)
     
     for nombre_lista, segmentos in definiciones.items():
         print(f"\n🔄 Procesando lista: {nombre_lista}")
         
-        if aplicar_segmento_a_lista(nombre_lista, segmentos):
+        if aplicar_segmento_a_lista(nombre_lista, segmentos, sesion):
             listas_exitosas.append(nombre_lista)
-            mostrar_resumen_segmentacion(nombre_lista)
+            mostrar_resumen_segmentacion(nombre_lista, sesion)
         else:
             listas_fallidas.append(nombre_lista)
     
+    hojas_pendientes = sesion.hojas_pendientes
+    if hojas_pendientes:
+        if sesion.guardar():
+            print(f"💾 Guardadas {len(hojas_pendientes)} hoja(s) en Lista_envio.xlsx")
+        else:
+            logger.error("Error guardando cambios en Lista_envio.xlsx")
+            listas_exitosas = [lista for lista in listas_exitosas if lista not in hojas_pendientes]
+            listas_fallidas.extend(hojas_pendientes)
+    
     # Actualizar fechas de creación
     if listas_exitosas:
         actualizar_fecha_creacion_segmentos(listas_exitosas)
@@ -1,9 +1,9 @@
-import csv
 import logging
+from contextlib import nullcontext
 from pathlib import Path
 from playwright.sync_api import sync_playwright, TimeoutError as PWTimeoutError
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 # Configurar package para imports consistentes y PyInstaller compatibility
 if __package__ in (None, ""):
@@ -12,7 +12,7 @@ if __package__ in (None, ""):
     __package__ = "src"
 
 from .infrastructure.api.models.campanias import CampaignBasicInfo
-from .excel_utils import agregar_datos, crear_hoja_con_datos, obtener_o_crear_hoja
+from .export import create_export_sink, resolver_formato, crear_pool_informes, FORMATO_CSV, PROPOSITO_INFORMES
 from .shared.utils.legacy_utils import cargar_campanias_a_buscar, crear_contexto_navegador, configurar_navegador, load_config, data_path, notify, storage_state_path
 from .shared.logging.logger import get_logger
 from .structured_logger import log_success, log_error, log_warning, log_info, log_performance, log_data_extraction
@@ -24,6 +24,9 @@ from .core.authentication.authentication_service import AuthenticationService
 from .core.config.config_manager import ConfigManager
 from .shared.utils.retry_utils import retry_with_backoff, is_connection_error
 from .infrastructure.scraping.endpoints.campanias import CampaignsScraper
+from .infrastructure.browser.browser_service import authenticated_page
+from .infrastructure.scraping.models.campanias import ScrapedCampaignUrl
+from .cache import get_scrape_cache, KIND_CAMPAIGN_URLS, KIND_EMAIL_URL, KIND_HARD_BOUNCES, KIND_NO_OPENS
 
 class FileSessionStorage:
     def __init__(self, session_path: str):
@@ -42,7 +45,6 @@ def login(page, context):
     logger.success("✅ Función de login completada")
     return result
 
-from openpyxl import Workbook
 import re
 
 ARCHIVO_BUSQUEDA = data_path("Busqueda.xlsx")
@@ -73,6 +75,25 @@ def generar_nombre_archivo_informe(nombre_campania: str = "", fecha_envio: str =
 	logger.info("✅ Nombre de archivo de informe generado", archivo=nombre_archivo)
 	return nombre_archivo
 
+def _hojas_informe(general: list[list[str]], informe_detallado: list[list[list[str]]], campaign_urls: list[list] = None) -> list:
+    """Hojas del informe (nombre, filas, encabezados) en el orden en que se exportan."""
+    [abiertos, no_abiertos, clics, hard_bounces, soft_bounces] = informe_detallado
+
+    hojas_config = [
+        ("General", general, ["Nombre", "Tipo", "Fecha envio", "Listas", "Emails", "Abiertos", "Clics", "URL de Correo"]),
+        ("Abiertos", abiertos, ["Proyecto", "Lista", "Correo", "Fecha apertura", "País apertura", "Aperturas", "Lista", "Estado", "Calidad"]),
+        ("No abiertos", no_abiertos, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"]),
+        ("Clics", clics, ["Proyecto", "Lista", "Correo", "Fecha primer clic", "País apertura", "Lista", "Estado", "Calidad"]),
+        ("Hard bounces", hard_bounces, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"]),
+        ("Soft bounces", soft_bounces, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"])
+    ]
+
+    # Crear hoja de URLs de Clics si están disponibles
+    if campaign_urls:
+        hojas_config.append(("URLs de Clics", campaign_urls, ["URL", "Clics Totales", "Porcentaje de Abridores"]))
+    return hojas_config
+
+
 def crear_archivo_csv(general: list[list[str]], informe_detallado: list[list[list[str]]], nombre_campania: str = "", fecha_envio: str = "", campaign_urls: list[list] = None):
     """
     Crea archivos CSV con los informes recopilados (uno por hoja)
@@ -81,56 +102,18 @@ def crear_archivo_csv(general: list[list[str]], informe_detallado: list[list[lis
         log_info("Iniciando creación de archivos CSV", 
                 campania=nombre_campania, fecha_envio=fecha_envio)
         
-        [abiertos, no_abiertos, clics, hard_bounces, soft_bounces] = informe_detallado
-        
         # Generar nombre base para los archivos CSV
         nombre_archivo_base = Path(generar_nombre_archivo_informe(nombre_campania, fecha_envio))
         nombre_base = nombre_archivo_base.stem  # Nombre sin extensión
-        directorio = nombre_archivo_base.parent
-        directorio_csv = directorio / "csv"
-        directorio_csv.mkdir(parents=True, exist_ok=True)  # Crear directorio CSV si no existe
-        
-        # Crear archivo CSV para la hoja general
-        encabezados_general = ["Nombre", "Tipo", "Fecha envio", "Listas", "Emails", "Abiertos", "Clics", "URL de Correo"]
-        archivo_general = directorio_csv / f"{nombre_base}_General.csv"
-        
-        with open(archivo_general, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(encabezados_general)  # Escribir encabezados
-            writer.writerows(general)  # Escribir datos
-        log_data_extraction("General", len(general), "CSV")
-        
-        # Definir configuraciones para los archivos CSV detallados
-        archivos_config = [
-            ("Abiertos", abiertos, ["Proyecto", "Lista", "Correo", "Fecha apertura", "País apertura", "Aperturas", "Lista", "Estado", "Calidad"]),
-            ("No abiertos", no_abiertos, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"]),
-            ("Clics", clics, ["Proyecto", "Lista", "Correo", "Fecha primer clic", "País apertura", "Lista", "Estado", "Calidad"]),
-            ("Hard bounces", hard_bounces, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"]),
-            ("Soft bounces", soft_bounces, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"])
-        ]
-
-        # Crear archivos CSV detallados usando la configuración
-        for nombre_archivo, datos, columnas in archivos_config:
-            archivo_path = directorio_csv / f"{nombre_base}_{nombre_archivo}.csv"
-            with open(archivo_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(columnas)  # Escribir encabezados
-                writer.writerows(datos)  # Escribir datos
-            log_data_extraction(nombre_archivo, len(datos), "CSV")
-
-        # Crear archivo CSV para URLs de Clics si están disponibles
-        total_archivos = len(archivos_config) + 1  # +1 por General
-        if campaign_urls:
-            archivo_urls = directorio_csv / f"{nombre_base}_URLs_de_Clics.csv"
-            with open(archivo_urls, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["URL", "Clics Totales", "Porcentaje de Abridores"])
-                writer.writerows(campaign_urls)
-            log_data_extraction("URLs de Clics", len(campaign_urls), "CSV")
-            total_archivos += 1
+        directorio_csv = nombre_archivo_base.parent / "csv"
+
+        with create_export_sink(directorio_csv / nombre_base, formato=FORMATO_CSV) as sink:
+            for nombre_hoja, datos, columnas in _hojas_informe(general, informe_detallado, campaign_urls):
+                registros = sink.write_table(nombre_hoja, columnas, datos)
+                log_data_extraction(nombre_hoja, registros, "CSV")
 
         log_success(f"Archivos CSV creados exitosamente en: {directorio_csv}",
-                   total_archivos=total_archivos, directorio=directorio_csv)
+                   total_archivos=len(sink.filas_por_tabla), directorio=directorio_csv)
         
         return str(directorio_csv)
         
@@ -140,79 +123,53 @@ def crear_archivo_csv(general: list[list[str]], informe_detallado: list[list[lis
         raise
 
 
-def crear_archivo_excel(general: list[list[str]], informe_detallado: list[list[list[str]]], nombre_campania: str = "", fecha_envio: str = "", campaign_urls: list[list] = None):
+def crear_archivo_excel(general: list[list[str]], informe_detallado: list[list[list[str]]], nombre_campania: str = "", fecha_envio: str = "", campaign_urls: list[list] = None, debug_mode: Optional[bool] = None):
     """
-    Crea el archivo Excel con los informes recopilados
+    Crea el archivo del informe con los datos recopilados.
+
+    El formato sale de ``export.report_format`` en config.yaml (xlsx por defecto);
+    en modo debug se generan CSV. Las hojas se escriben en streaming, por lo que
+    cada hoja de ``informe_detallado`` puede ser una lista o un iterador de filas.
+    ``debug_mode`` evita releer config.yaml cuando el llamador ya lo conoce.
     """
     try:
         # Cargar la configuración para verificar si estamos en modo debug
-        config = load_config()
-        debug_mode = config.get("debug", False)
+        if debug_mode is None:
+            debug_mode = load_config().get("debug", False)
         
         if debug_mode:
             log_info("Modo debug activado, generando archivos CSV en lugar de Excel",
                     campania=nombre_campania, fecha_envio=fecha_envio, debug_mode=debug_mode)
             return crear_archivo_csv(general, informe_detallado, nombre_campania, fecha_envio, campaign_urls)
-        else:
-            log_info("Modo normal, generando archivo Excel", 
-                    campania=nombre_campania, fecha_envio=fecha_envio, debug_mode=debug_mode)
-        
-        [abiertos, no_abiertos, clics, hard_bounces, soft_bounces] = informe_detallado
-        
-        # Crear libro y hoja general
-        wb = Workbook()
-
-        # Eliminar la hoja por defecto "Sheet" creada automáticamente
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
-
-        encabezados_general = ["Nombre", "Tipo", "Fecha envio", "Listas", "Emails", "Abiertos", "Clics", "URL de Correo"]
-        ws_general = obtener_o_crear_hoja(wb, "General", encabezados_general)
-        agregar_datos(ws_general, general)
-
-        # Definir configuraciones para las hojas detalladas
-        hojas_config = [
-            ("Abiertos", abiertos, ["Proyecto", "Lista", "Correo", "Fecha apertura", "País apertura", "Aperturas", "Lista", "Estado", "Calidad"]),
-            ("No abiertos", no_abiertos, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"]),
-            ("Clics", clics, ["Proyecto", "Lista", "Correo", "Fecha primer clic", "País apertura", "Lista", "Estado", "Calidad"]),
-            ("Hard bounces", hard_bounces, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"]),
-            ("Soft bounces", soft_bounces, ["Proyecto", "Lista", "Correo", "Lista", "Estado", "Calidad"])
-        ]
-
-        # Crear hojas detalladas usando la configuración
-        total_hojas = len(hojas_config) + 1  # +1 por General
-        for nombre_hoja, datos, columnas in hojas_config:
-            crear_hoja_con_datos(wb, nombre_hoja, datos, columnas)
-            log_data_extraction(nombre_hoja, len(datos), "base de datos")
-
-            # Log adicional para "No abiertos" para diagnosticar problemas
-            if nombre_hoja == "No abiertos":
-                if len(datos) == 0:
-                    log_warning("⚠️ Hoja 'No abiertos' creada pero SIN DATOS",
-                              nombre_hoja=nombre_hoja,
-                              campania=nombre_campania)
-                else:
-                    log_info("✅ Hoja 'No abiertos' creada con datos exitosamente",
-                            nombre_hoja=nombre_hoja,
-                            total_registros=len(datos),
-                            muestra_primer_registro=datos[0] if datos else None)
-
-        # Crear hoja de URLs de Clics si están disponibles
-        if campaign_urls:
-            crear_hoja_con_datos(
-                wb,
-                "URLs de Clics",
-                campaign_urls,
-                ["URL", "Clics Totales", "Porcentaje de Abridores"]
-            )
-            log_data_extraction("URLs de Clics", len(campaign_urls), "base de datos")
-            total_hojas += 1
+
+        formato = resolver_formato(proposito=PROPOSITO_INFORMES)
+        if formato == FORMATO_CSV:
+            return crear_archivo_csv(general, informe_detallado, nombre_campania, fecha_envio, campaign_urls)
+        log_info("Modo normal, generando archivo de informe",
+                campania=nombre_campania, fecha_envio=fecha_envio, debug_mode=debug_mode, formato=formato)
 
         nombre_archivo = generar_nombre_archivo_informe(nombre_campania, fecha_envio)
-        wb.save(nombre_archivo)
+        with create_export_sink(nombre_archivo, formato=formato) as sink:
+            for nombre_hoja, datos, columnas in _hojas_informe(general, informe_detallado, campaign_urls):
+                sink.write_table(nombre_hoja, columnas, datos)
+        registros_por_hoja = sink.filas_por_tabla
+        nombre_archivo = sink.path
+
+        for nombre_hoja, registros in registros_por_hoja.items():
+            log_data_extraction(nombre_hoja, registros, "base de datos")
+
+        # Log adicional para "No abiertos" para diagnosticar problemas
+        if registros_por_hoja.get("No abiertos", 0) == 0:
+            log_warning("⚠️ Hoja 'No abiertos' creada pero SIN DATOS",
+                      nombre_hoja="No abiertos",
+                      campania=nombre_campania)
+        else:
+            log_info("✅ Hoja 'No abiertos' creada con datos exitosamente",
+                    nombre_hoja="No abiertos",
+                    total_registros=registros_por_hoja["No abiertos"])
 
-        log_success(f"Archivo Excel creado exitosamente: {nombre_archivo}",
-                   total_hojas=total_hojas, archivo=nombre_archivo)
+        log_success(f"Archivo de informe creado exitosamente: {nombre_archivo}",
+                   total_hojas=len(registros_por_hoja), archivo=nombre_archivo, formato=formato)
         
         return nombre_archivo
         
@@ -379,6 +336,51 @@ def obtener_lista_suscriptor(email: str, mapa_email_lista: dict[str, str]) -> st
 	logger.debug("📧 Consultando lista de suscriptor", email=email_clean, lista_encontrada=lista)
 	return lista
 
+def obtener_url_email_con_cache(page, campaign_id: int, fecha_envio) -> str:
+	"""
+	URL del correo de la campaña, servida desde el caché de scraping si la
+	campaña ya está congelada (enviada hace más de N días).
+	"""
+	cache = get_scrape_cache()
+	url_email = cache.get(campaign_id, KIND_EMAIL_URL)
+	if url_email is not None:
+		return url_email
+
+	url_email = get_campaign_urls_with_fallback(page, campaign_id)
+	if url_email:
+		cache.put(campaign_id, KIND_EMAIL_URL, url_email, fecha_envio)
+	return url_email
+
+def obtener_urls_campania_con_cache(campaigns_scraper: CampaignsScraper, campaign_id: int, fecha_envio) -> List[ScrapedCampaignUrl]:
+	"""
+	Tabla de URLs con clics de la campaña, servida desde el caché de scraping
+	si la campaña ya está congelada.
+	"""
+	cache = get_scrape_cache()
+	campaign_urls = cache.get_models(campaign_id, KIND_CAMPAIGN_URLS, ScrapedCampaignUrl)
+	if campaign_urls is not None:
+		log_info("💾 URLs de campaña obtenidas desde caché", campania_id=campaign_id, urls_count=len(campaign_urls))
+		return campaign_urls
+
+	campaign_urls = campaigns_scraper.get_campaign_urls(campaign_id)
+	if campaign_urls:
+		cache.put(campaign_id, KIND_CAMPAIGN_URLS, campaign_urls, fecha_envio)
+	return campaign_urls
+
+def campanias_en_cache(campanias) -> bool:
+	"""
+	True si todos los datos scrapeados (hard bounces, no abiertos, URLs y URL
+	del correo) de todas las campañas están en el caché, así que no hace
+	falta abrir el navegador.
+	"""
+	cache = get_scrape_cache()
+	tipos = (KIND_HARD_BOUNCES, KIND_NO_OPENS, KIND_CAMPAIGN_URLS, KIND_EMAIL_URL)
+	try:
+		return bool(campanias) and all(cache.has(id, tipos) for id, _ in campanias)
+	except Exception as e:
+		log_warning(f"⚠️ No se pudo consultar el caché de scraping: {e}")
+		return False
+
 def generar_general(campania: CampaignBasicInfo, campania_complete, campaign_clics, todas_listas, page, campaign_id=None) -> list[str]:
 	from .shared.logging.logger import get_logger
 	logger = get_logger()
@@ -406,7 +408,7 @@ def generar_general(campania: CampaignBasicInfo, campania_complete, campaign_cli
 	logger.debug(f"   - ID usado para scraping de URLs: {actual_campaign_id}")
 	
 	if actual_campaign_id:
-		url_email = get_campaign_urls_with_fallback(page, actual_campaign_id)
+		url_email = obtener_url_email_con_cache(page, actual_campaign_id, campania.date_sent)
 		logger.debug(f"   - URLs obtenidas: '{url_email}'")
 	else:
 		logger.warning("⚠️ No se pudo determinar ID de campaña para scraping de URLs")
@@ -590,7 +592,13 @@ def formatear_fecha_envio(fecha_str: str) -> str:
 
 	return fecha_envio_param
 
-def main():
+def main(page=None, context=None):
+	"""
+	Extrae los datos de las campañas marcadas y genera un informe por campaña.
+
+	Si se recibe una página autenticada (servicio de navegador persistente) se
+	reutiliza; si no, se lanza un navegador propio.
+	"""
 	import argparse
 
 	# Inicializar logger
@@ -610,6 +618,7 @@ def main():
 
 		config = load_config()
 		extraccion_oculta = bool(config.get("headless", False))
+		debug_mode = config.get("debug", False)
 		log_info("Configuración cargada", headless=extraccion_oculta, validate_mode=args.validate is not None)
 
 		# Modo de validación para una campaña específica
@@ -620,22 +629,22 @@ def main():
 		campanias_a_buscar = cargar_campanias_a_buscar(ARCHIVO_BUSQUEDA)
 		log_info("Campañas a procesar", total_campanias=len(campanias_a_buscar))
 
-		with sync_playwright() as p:
-			log_info("🌐 Iniciando navegador")
-			browser = configurar_navegador(p, extraccion_oculta)
-			context = crear_contexto_navegador(browser, extraccion_oculta)
-
-			page = context.new_page()
-
-			log_info("🔐 Iniciando proceso de autenticación")
-			login(page, context=context)
-			log_success("Autenticación completada exitosamente")
-
-			# Espera adicional post-login para asegurar estabilidad de sesión antes de operaciones de API
-			log_info("⏳ Esperando estabilización completa de sesión antes de operaciones...")
-			page.wait_for_load_state("networkidle", timeout=30000)
-			page.wait_for_timeout(3000)  # 3 segundos adicionales para máxima estabilidad
-			log_success("✅ Sesión completamente estabilizada, iniciando operaciones")
+		if campanias_en_cache(campanias_a_buscar):
+			# Campañas congeladas con todo en caché: solo hace falta la API
+			log_info("💾 Datos de scraping de todas las campañas en caché, no se abre el navegador")
+			sesion = nullcontext((None, None))
+		else:
+			log_info("🌐 Preparando navegador autenticado", navegador_reutilizado=page is not None)
+			sesion = authenticated_page(page, context, extraccion_oculta)
+		with sesion as (page, context), crear_pool_informes() as pool_informes:
+			if page is not None:
+				log_success("Autenticación completada exitosamente")
+
+				# Espera adicional post-login para asegurar estabilidad de sesión antes de operaciones de API
+				log_info("⏳ Esperando estabilización completa de sesión antes de operaciones...")
+				page.wait_for_load_state("networkidle", timeout=30000)
+				page.wait_for_timeout(3000)  # 3 segundos adicionales para máxima estabilidad
+				log_success("✅ Sesión completamente estabilizada, iniciando operaciones")
 
 			# Inicializar servicio híbrido con la página autenticada
 			hybrid_service = HybridDataService(page)
@@ -643,7 +652,7 @@ def main():
 			log_info("🔧 Servicio híbrido inicializado")
 
 			# Inicializar scraper de campañas para extraer URLs
-			campaigns_scraper = CampaignsScraper(page)
+			campaigns_scraper = CampaignsScraper(page) if page is not None else None
 			log_info("🔗 Scraper de URLs de campañas inicializado")
 
 			errores_campanias = []
@@ -659,7 +668,7 @@ def main():
 					from .autentificacion import manejar_popup_cookies
 
 					# Verificar si la sesión sigue válida
-					if is_on_login_page(page):
+					if page is not None and is_on_login_page(page):
 						log_warning(f"⚠️ Sesión expirada detectada antes de procesar campaña {id}")
 						log_info("🔄 Re-autenticando con manejo agresivo de cookies...")
 
@@ -789,7 +798,7 @@ def main():
 				campaign_urls_data = []
 				try:
 					log_info("🔗 Iniciando extracción de URLs de campaña", campania_id=id)
-					campaign_urls = campaigns_scraper.get_campaign_urls(id)
+					campaign_urls = obtener_urls_campania_con_cache(campaigns_scraper, id, campania.date_sent)
 					if campaign_urls:
 						# Convertir a formato de filas para Excel: [URL, Clics, Porcentaje]
 						campaign_urls_data = [
@@ -816,21 +825,40 @@ def main():
 						fecha_envio_raw = general[0][2]  # Tercer campo: fecha de envío
 						fecha_envio_param = formatear_fecha_envio(fecha_envio_raw)
 
-					config = load_config()
-					debug_mode = config.get("debug", False)
+					if pool_informes:
+						# El libro se genera en otro proceso mientras se extrae la siguiente campaña
+						log_info(f"📤 Informe de la campaña {nombre_campania_param or id} enviado al pool de informes",
+								pendientes=pool_informes.pendientes)
+						pool_informes.submit(
+							nombre_campania_param or str(id),
+							crear_archivo_excel,
+							general,
+							[abiertos2, no_abiertos, clics, hard_bounces, soft_bounces],
+							nombre_campania_param,
+							fecha_envio_param,
+							campaign_urls_data,
+							debug_mode=debug_mode
+						)
+						continue
+
 					log_info(f"📁 Generando archivo ({'CSV' if debug_mode else 'Excel'}) para campaña: {nombre_campania_param or id}, debug_mode: {debug_mode}")
 					archivo_creado = crear_archivo_excel(
 						general,
 						[abiertos2, no_abiertos, clics, hard_bounces, soft_bounces],
 						nombre_campania_param,
 						fecha_envio_param,
-						campaign_urls_data  # Agregar URLs de campaña
+						campaign_urls_data,  # Agregar URLs de campaña
+						debug_mode=debug_mode
 					)
 					log_success(f"Archivo {'CSV' if debug_mode else 'Excel'} creado", archivo=archivo_creado, campania_id=id, debug_mode=debug_mode)
 					campanias_exitosas += 1
 
-			browser.close()
-			log_info("🌐 Navegador cerrado")
+			# Esperar a los informes que siguen generándose en el pool
+			if pool_informes:
+				informes, errores_informes = pool_informes.close()
+				campanias_exitosas += len(informes)
+				for etiqueta, error in errores_informes:
+					errores_campanias.append(f"No se pudo generar el informe de '{etiqueta}': {error}")
 
 			# Verificar si hubo errores en alguna campaña
 			if errores_campanias:
@@ -15,10 +15,14 @@ Uso:
 """
 
 import pandas as pd
+import itertools
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator
 import re
 
 # Configurar package para imports consistentes y PyInstaller compatibility
@@ -27,13 +31,104 @@ if __package__ in (None, ""):
     __package__ = "src"
 
 from .logger import get_logger
-from .utils import load_config, data_path, notify
+from .utils import config_int, load_config, data_path, notify
 from .infrastructure.api.client import APIClient
 from .infrastructure.api.endpoints.suscriptores import SuscriptoresAPI
-from .excel_utils import crear_o_cargar_libro_excel, obtener_o_crear_hoja, agregar_datos
+from .infrastructure.api.merge_fields import get_merge_field_cache, nombres_merge_fields
+from .export import create_export_sink
 
 logger = get_logger()
 
+TAMANO_BLOQUE = 1000  # Suscriptores por bloque de getSubscribers
+LISTAS_EN_PARALELO = 3
+
+
+def _listas_en_paralelo() -> int:
+    """Listas descargadas a la vez según ``list_download.parallel_lists`` en config.yaml."""
+    return config_int("list_download", "parallel_lists", LISTAS_EN_PARALELO)
+
+
+def suscriptor_a_diccionario(suscriptor: Any) -> Dict[str, Any]:
+    """Convierte un suscriptor de la API (modelo Pydantic, objeto o dict) en diccionario."""
+    if hasattr(suscriptor, 'model_dump'):
+        # Son objetos Pydantic
+        return suscriptor.model_dump()
+    if isinstance(suscriptor, dict):
+        # Ya es diccionario
+        return suscriptor
+    if hasattr(suscriptor, '__dict__'):
+        # Objeto con atributos
+        return dict(suscriptor.__dict__)
+    # Fallback: convertir a string
+    logger.warning(f"Formato de suscriptor no reconocido: {type(suscriptor)}")
+    return {'email': str(suscriptor)}
+
+
+def iterar_bloques_suscriptores(suscriptores_api: Any, id_lista: int, estado: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Recorre los bloques de ``getSubscribers`` de una lista, uno cada vez.
+
+    El fin de los datos se detecta por un bloque vacío, por el error
+    "No subscribers" de la API, por un bloque más corto que ``TAMANO_BLOQUE``
+    o por un bloque que repite el anterior (protección por si la API ignora
+    ``block_index`` y la paginación no avanzase nunca).
+
+    Args:
+        id_lista: ID de la lista
+        estado: Dict opcional donde se anotan ``bloques``, ``suscriptores``
+            y ``completa`` (False si la descarga se cortó por un error)
+
+    Yields:
+        Lista de diccionarios con los suscriptores de cada bloque
+    """
+    estado = estado if estado is not None else {}
+    estado.update(bloques=0, suscriptores=0, completa=True)
+    block_index = 0
+    primero_anterior = None
+
+    while True:
+        logger.debug(f"Descargando bloque {block_index} de lista {id_lista}")
+        try:
+            # Usar getSubscribers con all_fields=1 y complete_json=1 para obtener todos los datos
+            suscriptores = suscriptores_api.get_subscribers(
+                list_id=id_lista,
+                status=None,  # Todos los estados
+                block_index=block_index,
+                all_fields=1,  # IMPORTANTE: Obtener todos los campos
+                complete_json=1  # IMPORTANTE: Respuesta completa
+            )
+        except Exception as e:
+            if "No subscribers" in str(e):
+                logger.info(f"No más suscriptores en bloque {block_index}")
+                return
+            logger.error(f"Error descargando suscriptores de lista {id_lista}: {e}")
+            if not estado['suscriptores']:
+                raise
+            logger.warning(f"Se descargaron parcialmente {estado['suscriptores']} suscriptores")
+            estado['completa'] = False
+            return
+
+        if not suscriptores:
+            logger.info(f"No más suscriptores en bloque {block_index}")
+            return
+
+        bloque = [suscriptor_a_diccionario(suscriptor) for suscriptor in suscriptores]
+        primero = bloque[0].get('email')
+        if block_index and primero is not None and primero == primero_anterior:
+            logger.warning(f"El bloque {block_index} de lista {id_lista} repite el anterior; fin de los datos")
+            return
+        primero_anterior = primero
+
+        estado['bloques'] += 1
+        estado['suscriptores'] += len(bloque)
+        logger.info(f"Descargados {len(bloque)} suscriptores en bloque {block_index} (total: {estado['suscriptores']})")
+        yield bloque
+
+        # Un bloque incompleto es el último
+        if len(bloque) < TAMANO_BLOQUE:
+            return
+        block_index += 1
+
 
 class DescargadorListas:
     """Clase para manejar la descarga de listas de suscriptores"""
@@ -48,6 +143,8 @@ class DescargadorListas:
         self.archivo_busqueda = Path(archivo_busqueda)
         self.directorio_salida = Path("data/listas")
         self.config = load_config()
+        self._rutas_usadas: set = set()
+        self._rutas_lock = threading.Lock()
         
         # Validar configuración de API
         api_config = self.config.get("api", {})
@@ -191,6 +288,9 @@ class DescargadorListas:
     def descargar_suscriptores_lista(self, id_lista: int) -> List[Dict[str, Any]]:
         """
         Descarga todos los suscriptores de una lista con todos sus campos.
+
+        Mantiene todos los bloques en memoria; para listas grandes usar
+        ``procesar_lista_individual``, que escribe cada bloque al llegar.
         
         Args:
             id_lista: ID de la lista
@@ -201,120 +301,79 @@ class DescargadorListas:
         logger.info(f"Descargando suscriptores de lista {id_lista}")
         
         todos_suscriptores = []
-        block_index = 0
-        
-        try:
-            while True:
-                logger.debug(f"Descargando bloque {block_index} de lista {id_lista}")
-                
-                # Usar getSubscribers con all_fields=1 y complete_json=1 para obtener todos los datos
-                suscriptores = self.suscriptores_api.get_subscribers(
-                    list_id=id_lista,
-                    status=None,  # Todos los estados
-                    block_index=block_index,
-                    all_fields=1,  # IMPORTANTE: Obtener todos los campos
-                    complete_json=1  # IMPORTANTE: Respuesta completa
-                )
-                
-                if not suscriptores:
-                    logger.info(f"No más suscriptores en bloque {block_index}")
-                    break
-                
-                # Convertir a diccionarios si es necesario
-                suscriptores_dict = []
-                for suscriptor in suscriptores:
-                    if hasattr(suscriptor, 'model_dump'):
-                        # Son objetos Pydantic
-                        suscriptor_dict = suscriptor.model_dump()
-                    elif hasattr(suscriptor, '__dict__'):
-                        # Objeto con atributos
-                        suscriptor_dict = suscriptor.__dict__
-                    elif isinstance(suscriptor, dict):
-                        # Ya es diccionario
-                        suscriptor_dict = suscriptor
-                    else:
-                        # Fallback: convertir a string y luego parsear si es posible
-                        logger.warning(f"Formato de suscriptor no reconocido: {type(suscriptor)}")
-                        suscriptor_dict = {'email': str(suscriptor)}
-                    
-                    suscriptores_dict.append(suscriptor_dict)
-                
-                todos_suscriptores.extend(suscriptores_dict)
-                logger.info(f"Descargados {len(suscriptores)} suscriptores en bloque {block_index} (total: {len(todos_suscriptores)})")
-                
-                # Si recibimos menos de lo esperado, probablemente es el último bloque
-                if len(suscriptores) < 100:  # Asumiendo tamaño de página típico
-                    break
-                
-                block_index += 1
-                
-        except Exception as e:
-            logger.error(f"Error descargando suscriptores de lista {id_lista}: {e}")
-            if todos_suscriptores:
-                logger.warning(f"Se descargaron parcialmente {len(todos_suscriptores)} suscriptores")
-            else:
-                raise
+        for bloque in iterar_bloques_suscriptores(self.suscriptores_api, id_lista):
+            todos_suscriptores.extend(bloque)
         
         logger.info(f"Descarga completada: {len(todos_suscriptores)} suscriptores de lista {id_lista}")
         return todos_suscriptores
 
+    @staticmethod
+    def _filas(suscriptores: Iterable[Dict[str, Any]], campos: List[str]) -> Iterator[List[Any]]:
+        """Filas en el orden de ``campos`` (listas y dicts como texto, None como vacío)."""
+        for suscriptor in suscriptores:
+            fila = []
+            for campo in campos:
+                valor = suscriptor.get(campo, "")
+                # Manejar valores especiales
+                if isinstance(valor, (list, dict)):
+                    valor = str(valor)
+                elif valor is None:
+                    valor = ""
+                fila.append(valor)
+            yield fila
+
+    def _ruta_salida(self, lista_info: Dict[str, Any]) -> Path:
+        """
+        Ruta base (sin extensión) del archivo de una lista: su nombre limpio.
+
+        Si otra lista de la misma ejecución ya usa ese nombre se añade el ID,
+        para que dos descargas simultáneas no escriban en el mismo archivo.
+        """
+        nombre_limpio = self.limpiar_nombre_archivo(lista_info['nombre'])
+        with self._rutas_lock:
+            if nombre_limpio.lower() in self._rutas_usadas:
+                nombre_limpio = f"{nombre_limpio}_{lista_info['id_lista']}"
+            self._rutas_usadas.add(nombre_limpio.lower())
+        return self.directorio_salida / nombre_limpio
+
     def guardar_lista_excel(self, lista_info: Dict[str, Any], suscriptores: List[Dict[str, Any]], campos: List[str]) -> str:
         """
-        Guarda los suscriptores de una lista en un archivo Excel.
+        Guarda los suscriptores de una lista en el formato de exportación configurado
+        (``export.format`` en config.yaml; Excel por defecto).
         
         Args:
             lista_info: Información de la lista
             suscriptores: Lista de suscriptores
-            campos: Campos a incluir en el Excel
+            campos: Campos a incluir en el archivo
             
         Returns:
             Ruta del archivo creado
         """
         # Crear nombre de archivo - Solo el nombre de la lista limpio
         nombre_limpio = self.limpiar_nombre_archivo(lista_info['nombre'])
-        nombre_archivo = f"{nombre_limpio}.xlsx"
-        ruta_archivo = self.directorio_salida / nombre_archivo
-        
-        logger.info(f"Guardando lista {lista_info['id_lista']} en: {ruta_archivo}")
-        
-        # Crear libro Excel
-        libro = crear_o_cargar_libro_excel(str(ruta_archivo))
-        
-        # Eliminar la hoja por defecto si existe
-        if "Sheet" in libro.sheetnames:
-            del libro["Sheet"]
+        ruta_base = self.directorio_salida / nombre_limpio
         
-        # Crear hoja con el nombre de la lista que contenga los suscriptores
-        hoja_principal = obtener_o_crear_hoja(libro, lista_info['nombre'], campos)
+        logger.info(f"Guardando lista {lista_info['id_lista']} en: {ruta_base}")
         
-        # Preparar datos de suscriptores
-        datos_suscriptores = []
-        for suscriptor in suscriptores:
-            fila = []
-            for campo in campos:
-                valor = suscriptor.get(campo, "")
-                # Manejar valores especiales
-                if isinstance(valor, (list, dict)):
-                    valor = str(valor)
-                elif valor is None:
-                    valor = ""
-                fila.append(valor)
-            datos_suscriptores.append(fila)
-        
-        # Agregar datos
-        registros_agregados = agregar_datos(hoja_principal, datos_suscriptores)
-        
-        # Guardar archivo
-        libro.save(str(ruta_archivo))
+        # Una tabla (hoja) con el nombre de la lista que contenga los suscriptores
+        with create_export_sink(ruta_base) as sink:
+            registros_agregados = sink.write_table(lista_info['nombre'], campos, self._filas(suscriptores, campos))
+        ruta_archivo = sink.path
         
         logger.info(f"Archivo guardado exitosamente: {ruta_archivo}")
         logger.info(f"Registros guardados: {registros_agregados}")
         
-        return str(ruta_archivo)
+        return ruta_archivo
 
     def procesar_lista_individual(self, lista_info: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Procesa una lista individual: descarga suscriptores y guarda Excel.
+        Procesa una lista individual: descarga suscriptores y los escribe en su archivo.
+
+        Las columnas son los campos del primer bloque más los merge fields
+        de la lista, de modo que un campo vacío en los primeros 1000
+        suscriptores no se pierde; cada bloque se escribe en el archivo en
+        cuanto llega, así que la memoria usada no depende del
+        tamaño de la lista.
         
         Args:
             lista_info: Información de la lista
@@ -329,42 +388,81 @@ class DescargadorListas:
             'archivo_creado': None,
             'suscriptores_descargados': 0,
             'campos_encontrados': [],
+            'completa': True,
+            'duracion_s': 0.0,
+            'filas_por_segundo': 0.0,
             'error': None
         }
+        inicio = time.perf_counter()
         
         try:
             logger.info(f"Procesando lista {lista_info['id_lista']}: {lista_info['nombre']}")
             
-            # Descargar suscriptores primero
-            suscriptores = self.descargar_suscriptores_lista(lista_info['id_lista'])
+            estado: Dict[str, Any] = {}
+            bloques = iterar_bloques_suscriptores(self.suscriptores_api, lista_info['id_lista'], estado)
+            primer_bloque = next(bloques, None)
             
-            if not suscriptores:
+            if not primer_bloque:
                 logger.warning(f"No se encontraron suscriptores en lista {lista_info['id_lista']}")
                 resultado['error'] = "No se encontraron suscriptores"
                 return resultado
             
             # Obtener campos dinámicamente de los datos reales de suscriptores
-            campos_reales = self.extraer_campos_de_suscriptores(suscriptores)
+            campos_reales = self.extraer_campos_de_suscriptores(primer_bloque)
+            campos_reales += [c for c in self.campos_de_esquema(lista_info['id_lista']) if c not in campos_reales]
             resultado['campos_encontrados'] = campos_reales
+            conocidos = set(campos_reales)
             
-            logger.info(f"Campos encontrados en datos reales: {campos_reales}")
+            ruta_base = self._ruta_salida(lista_info)
+            logger.info(f"Guardando lista {lista_info['id_lista']} en: {ruta_base}")
             
-            # Guardar en Excel
-            archivo_creado = self.guardar_lista_excel(lista_info, suscriptores, campos_reales)
+            # Una tabla (hoja) con el nombre de la lista que contenga los suscriptores
+            with create_export_sink(ruta_base) as sink:
+                sink.begin_table(lista_info['nombre'], campos_reales)
+                for bloque in itertools.chain([primer_bloque], bloques):
+                    nuevos = {campo for suscriptor in bloque for campo in suscriptor} - conocidos
+                    if nuevos:
+                        logger.warning(f"Lista {lista_info['id_lista']}: campos ausentes del primer bloque y del esquema se omiten: {sorted(nuevos)}")
+                        conocidos |= nuevos
+                    sink.write_rows(self._filas(bloque, campos_reales))
             
             # Actualizar resultado
+            duracion = time.perf_counter() - inicio
             resultado['exitoso'] = True
-            resultado['archivo_creado'] = archivo_creado
-            resultado['suscriptores_descargados'] = len(suscriptores)
+            resultado['archivo_creado'] = sink.path
+            resultado['suscriptores_descargados'] = estado['suscriptores']
+            resultado['completa'] = estado['completa']
+            resultado['duracion_s'] = round(duracion, 2)
+            resultado['filas_por_segundo'] = round(estado['suscriptores'] / duracion, 1) if duracion > 0 else 0.0
             
             logger.info(f"Lista {lista_info['id_lista']} procesada exitosamente")
+            logger.info("⚡ Descarga de lista completada", lista=lista_info['id_lista'],
+                suscriptores=estado['suscriptores'], bloques=estado['bloques'],
+                segundos=resultado['duracion_s'], filas_por_segundo=resultado['filas_por_segundo'])
             
         except Exception as e:
             logger.error(f"Error procesando lista {lista_info['id_lista']}: {e}")
             resultado['error'] = str(e)
         
+        resultado['duracion_s'] = resultado['duracion_s'] or round(time.perf_counter() - inicio, 2)
         return resultado
 
+    def campos_de_esquema(self, id_lista: int) -> List[str]:
+        """
+        Merge fields de la lista, desde la caché de esquemas o ``get_merge_fields``.
+
+        Si la consulta falla devuelve una lista vacía y las columnas quedan
+        limitadas a las del primer bloque.
+        """
+        cacheados = get_merge_field_cache().get(id_lista)
+        if cacheados is not None:
+            return sorted(cacheados)
+        try:
+            return sorted(nombres_merge_fields(self.suscriptores_api.get_merge_fields(id_lista)))
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron obtener los merge fields de la lista {id_lista}: {e}")
+            return []
+
     def extraer_campos_de_suscriptores(self, suscriptores: List[Dict[str, Any]]) -> List[str]:
         """
         Extrae todos los campos únicos presentes en los suscriptores.
@@ -398,9 +496,18 @@ class DescargadorListas:
         logger.info(f"Campos extraídos de suscriptores: {campos_lista}")
         return campos_lista
 
-    def procesar_todas_las_listas(self) -> Dict[str, Any]:
+    def procesar_todas_las_listas(self, max_workers: Optional[int] = None,
+                                  progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         Procesa todas las listas marcadas en el archivo Excel.
+
+        Se descargan ``max_workers`` listas a la vez (``list_download.parallel_lists``
+        en config.yaml); el ritmo de peticiones lo sigue marcando el límite de la
+        API, que es global al proceso, y cada lista escribe su propio archivo.
+        
+        Args:
+            max_workers: Listas simultáneas (por defecto, el valor de config.yaml)
+            progress_callback: Recibe un mensaje cada vez que termina una lista
         
         Returns:
             Resumen de resultados del procesamiento
@@ -411,10 +518,13 @@ class DescargadorListas:
             'total_listas': 0,
             'exitosas': 0,
             'fallidas': 0,
+            'suscriptores_descargados': 0,
+            'duracion_s': 0.0,
             'archivos_creados': [],
             'errores': [],
             'detalle': []
         }
+        inicio = time.perf_counter()
         
         try:
             # Leer listas marcadas
@@ -425,22 +535,42 @@ class DescargadorListas:
                 logger.info("No hay listas marcadas para procesar")
                 return resultados
             
-            # Procesar cada lista
-            for lista_info in listas_marcadas:
-                resultado = self.procesar_lista_individual(lista_info)
-                resultados['detalle'].append(resultado)
-                
-                if resultado['exitoso']:
-                    resultados['exitosas'] += 1
-                    resultados['archivos_creados'].append(resultado['archivo_creado'])
-                    logger.info(f"✅ Lista {resultado['id_lista']} procesada: {resultado['archivo_creado']}")
-                else:
-                    resultados['fallidas'] += 1
-                    resultados['errores'].append(f"Lista {resultado['id_lista']}: {resultado['error']}")
-                    logger.error(f"❌ Lista {resultado['id_lista']} falló: {resultado['error']}")
+            max_workers = max(1, min(max_workers or _listas_en_paralelo(), len(listas_marcadas)))
+            logger.info(f"Descargando {len(listas_marcadas)} listas ({max_workers} en paralelo)")
+            
+            # Procesar las listas en paralelo; los resultados se recogen en este hilo
+            detalle: List[Optional[Dict[str, Any]]] = [None] * len(listas_marcadas)
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="descarga_lista") as executor:
+                futuros = {
+                    executor.submit(self.procesar_lista_individual, lista_info): indice
+                    for indice, lista_info in enumerate(listas_marcadas)
+                }
+                for terminadas, futuro in enumerate(as_completed(futuros), start=1):
+                    resultado = futuro.result()
+                    detalle[futuros[futuro]] = resultado
+                    
+                    if resultado['exitoso']:
+                        resultados['exitosas'] += 1
+                        resultados['suscriptores_descargados'] += resultado['suscriptores_descargados']
+                        logger.info(f"✅ Lista {resultado['id_lista']} procesada: {resultado['archivo_creado']} "
+                                    f"({resultado['suscriptores_descargados']} suscriptores, {resultado['filas_por_segundo']} filas/s)")
+                    else:
+                        resultados['fallidas'] += 1
+                        resultados['errores'].append(f"Lista {resultado['id_lista']}: {resultado['error']}")
+                        logger.error(f"❌ Lista {resultado['id_lista']} falló: {resultado['error']}")
+                    
+                    if progress_callback:
+                        progress_callback(f"Progreso: {terminadas}/{len(listas_marcadas)} listas descargadas")
+            
+            # Detalle y archivos en el orden del archivo de búsqueda
+            resultados['detalle'] = detalle
+            resultados['archivos_creados'] = [r['archivo_creado'] for r in detalle if r['exitoso']]
             
             # Resumen final
+            resultados['duracion_s'] = round(time.perf_counter() - inicio, 2)
             logger.info(f"Procesamiento completado: {resultados['exitosas']}/{resultados['total_listas']} exitosas")
+            logger.info("📊 Descarga de listas terminada", listas=resultados['total_listas'], paralelo=max_workers,
+                suscriptores=resultados['suscriptores_descargados'], segundos=resultados['duracion_s'])
             
         except Exception as e:
             logger.error(f"Error en procesamiento general: {e}")
@@ -478,8 +608,9 @@ def listar_archivos_descargados() -> List[str]:
         return []
     
     archivos = []
-    for archivo in directorio_listas.glob("*.xlsx"):
-        archivos.append(str(archivo))
+    for extension in ("xlsx", "csv", "parquet", "db"):
+        for archivo in directorio_listas.glob(f"*.{extension}"):
+            archivos.append(str(archivo))
     
     return sorted(archivos)
 
@@ -508,11 +639,14 @@ if __name__ == "__main__":
         print(f"Total listas procesadas: {resultados['total_listas']}")
         print(f"Exitosas: {resultados['exitosas']}")
         print(f"Fallidas: {resultados['fallidas']}")
+        print(f"Suscriptores descargados: {resultados['suscriptores_descargados']} en {resultados['duracion_s']}s")
         
         if resultados['archivos_creados']:
             print(f"\n✅ ARCHIVOS CREADOS ({len(resultados['archivos_creados'])}):")
-            for archivo in resultados['archivos_creados']:
-                print(f"   📄 {archivo}")
+            for detalle in resultados['detalle']:
+                if detalle['exitoso']:
+                    print(f"   📄 {detalle['archivo_creado']} ({detalle['suscriptores_descargados']} suscriptores, "
+                          f"{detalle['filas_por_segundo']} filas/s)")
         
         if resultados['errores']:
             print(f"\n❌ ERRORES ENCONTRADOS ({len(resultados['errores'])}):")
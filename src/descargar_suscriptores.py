@@ -3,8 +3,9 @@ Módulo para descargar listas de suscriptores desde Acumbamail.
 Extrae datos de suscriptores de listas marcadas en Busqueda_Listas.xlsx.
 """
 import os
+import time
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Tuple
 import re
 from pathlib import Path
 import sys
@@ -14,8 +15,13 @@ if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
     __package__ = "src"
 
-from .utils import data_path, load_config, crear_contexto_navegador, configurar_navegador, obtener_total_paginas, navegar_siguiente_pagina
+from .utils import data_path, load_config, crear_contexto_navegador, configurar_navegador, obtener_total_paginas, navegar_siguiente_pagina, ir_a_pagina
 from .autentificacion import login
+from .infrastructure.browser.browser_service import authenticated_page
+from .cache.checkpoints import get_checkpoint_store
+from .cache.excel_sidecar import leer_excel_cacheado
+from .export import create_export_sink, extension_exportacion
+from .descargar_listas import iterar_bloques_suscriptores
 from .logger import get_logger
 from playwright.sync_api import sync_playwright, Page
 
@@ -24,6 +30,18 @@ logger = get_logger()
 ARCHIVO_BUSQUEDA_LISTAS = data_path("Busqueda_Listas.xlsx")
 DIRECTORIO_LISTAS = data_path("listas")
 
+# Origen de los datos (subscriber_export.source en config.yaml)
+ORIGEN_API = "api"
+ORIGEN_SCRAPING = "scraping"
+
+# Columnas de getSubscribers que en la tabla web tienen otro nombre
+COLUMNAS_API_EQUIVALENTES = {
+    'status': 'estado',
+    'create_date': 'fecha_de_alta',
+}
+# Columnas internas de la API que la tabla web no muestra
+COLUMNAS_API_INTERNAS = {'id', 'list_id'}
+
 def extraer_ids_marcados() -> List[Tuple[int, str]]:
     """
     Extrae los IDs de las listas marcadas con 'x' en la primera columna de Busqueda_Listas.xlsx
@@ -38,7 +56,7 @@ def extraer_ids_marcados() -> List[Tuple[int, str]]:
         return []
 
     try:
-        df = pd.read_excel(ARCHIVO_BUSQUEDA_LISTAS)
+        df = leer_excel_cacheado(ARCHIVO_BUSQUEDA_LISTAS)
 
         # Verificar columnas necesarias
         columnas_requeridas = ['Buscar', 'ID_LISTA', 'NOMBRE LISTA']
@@ -65,6 +83,28 @@ def extraer_ids_marcados() -> List[Tuple[int, str]]:
         return []
 
 
+def _reanudar_desde_checkpoint(page: Page, clave: str, total_paginas: int, url: str) -> Tuple[int, List[Dict[str, str]]]:
+    """
+    Recupera las páginas guardadas de un intento anterior y posiciona la tabla en la
+    primera página pendiente. Si no se puede saltar a ella, reinicia desde la página 1.
+    """
+    checkpoints = get_checkpoint_store()
+    pagina_inicial = checkpoints.start(clave, total_paginas)
+    if pagina_inicial <= 1:
+        return 1, []
+
+    recuperados = checkpoints.load_rows(clave)
+    if pagina_inicial > total_paginas or ir_a_pagina(page, pagina_inicial):
+        logger.info(f"♻️ {len(recuperados)} suscriptores recuperados, continuando en página {pagina_inicial}/{total_paginas}")
+        return pagina_inicial, recuperados
+
+    logger.warning("⚠️ No se pudo reanudar desde checkpoint, reiniciando desde la página 1")
+    checkpoints.discard(clave)
+    page.goto(url, wait_until="networkidle", timeout=60000)
+    checkpoints.start(clave, total_paginas)
+    return 1, []
+
+
 def scrape_subscriber_list(page: Page, list_id: int, nombre_lista: str) -> List[Dict[str, str]]:
     """
     Extrae datos de suscriptores de una lista específica usando Playwright con paginación
@@ -95,8 +135,14 @@ def scrape_subscriber_list(page: Page, list_id: int, nombre_lista: str) -> List[
         total_paginas = obtener_total_paginas(page)
         logger.info(f"📄 Total de páginas a procesar: {total_paginas}")
 
+        # Retomar un intento anterior interrumpido, si lo hay
+        checkpoints = get_checkpoint_store()
+        clave_checkpoint = f"list_subscribers:{list_id}"
+        pagina_inicial, recuperados = _reanudar_desde_checkpoint(page, clave_checkpoint, total_paginas, url)
+        suscriptores.extend(recuperados)
+
         # Procesar cada página usando la navegación probada
-        for numero_pagina in range(1, total_paginas + 1):
+        for numero_pagina in range(pagina_inicial, total_paginas + 1):
             logger.info(f"📃 Procesando página {numero_pagina}/{total_paginas}")
 
             try:
@@ -105,6 +151,8 @@ def scrape_subscriber_list(page: Page, list_id: int, nombre_lista: str) -> List[
                 logger.info(f"✅ Página {numero_pagina}: {len(suscriptores_pagina)} suscriptores extraídos")
 
                 suscriptores.extend(suscriptores_pagina)
+                if suscriptores_pagina:
+                    checkpoints.save_page(clave_checkpoint, numero_pagina, suscriptores_pagina)
 
                 # Navegar a siguiente página usando la función probada de utils.py
                 if numero_pagina < total_paginas:
@@ -116,6 +164,9 @@ def scrape_subscriber_list(page: Page, list_id: int, nombre_lista: str) -> List[
                 logger.error(f"Error procesando página {numero_pagina}: {e}")
                 continue
 
+        if checkpoints.is_complete(clave_checkpoint):
+            checkpoints.complete(clave_checkpoint)
+
         logger.info(f"✅ Scraping completado - Total: {len(suscriptores)} suscriptores de lista {list_id}")
         return suscriptores
 
@@ -407,9 +458,10 @@ def generar_nombre_archivo(nombre_lista: str, list_id: int) -> str:
     # Limpiar nombre de lista para uso en archivos
     nombre_limpio = re.sub(r'[<>:"/\\|?*]', '_', nombre_lista)
 
-    # Formato base
+    # Formato base (la extensión depende del formato de exportación configurado)
+    extension = extension_exportacion()
     nombre_base = f"{nombre_limpio}-ID-{list_id}"
-    archivo_base = os.path.join(DIRECTORIO_LISTAS, f"{nombre_base}.xlsx")
+    archivo_base = os.path.join(DIRECTORIO_LISTAS, f"{nombre_base}{extension}")
 
     # Si no existe, usar nombre base
     if not os.path.exists(archivo_base):
@@ -418,7 +470,7 @@ def generar_nombre_archivo(nombre_lista: str, list_id: int) -> str:
     # Si existe, buscar siguiente versión disponible
     contador = 1
     while True:
-        nombre_version = f"{nombre_base}_v{contador}.xlsx"
+        nombre_version = f"{nombre_base}_v{contador}{extension}"
         archivo_version = os.path.join(DIRECTORIO_LISTAS, nombre_version)
 
         if not os.path.exists(archivo_version):
@@ -428,7 +480,8 @@ def generar_nombre_archivo(nombre_lista: str, list_id: int) -> str:
 
 def generar_archivo_excel(suscriptores: List[Dict[str, str]], nombre_archivo: str) -> bool:
     """
-    Genera archivo Excel con los datos de suscriptores con todas las columnas
+    Genera el archivo con los datos de suscriptores con todas las columnas, en el
+    formato de exportación configurado (Excel por defecto)
 
     Args:
         suscriptores: Lista de datos de suscriptores
@@ -493,13 +546,13 @@ def generar_archivo_excel(suscriptores: List[Dict[str, str]], nombre_archivo: st
 
         df.columns = nuevos_nombres
 
-        # Crear directorio si no existe
-        os.makedirs(os.path.dirname(nombre_archivo), exist_ok=True)
-
-        # Guardar archivo Excel
-        df.to_excel(nombre_archivo, index=False)
+        # Guardar en el formato de exportación configurado (Excel por defecto)
+        df = df.astype(object).where(pd.notna(df), None)
+        with create_export_sink(nombre_archivo) as sink:
+            sink.write_table("", list(df.columns), df.itertuples(index=False, name=None))
+        nombre_archivo = sink.path
 
-        logger.info(f"✅ Archivo Excel creado: {nombre_archivo} con {len(suscriptores)} suscriptores")
+        logger.info(f"✅ Archivo creado: {nombre_archivo} con {len(suscriptores)} suscriptores")
         print(f"✅ Archivo guardado: {os.path.basename(nombre_archivo)}")
         return True
 
@@ -530,8 +583,14 @@ def obtener_suscriptores_via_scraping(page: Page, list_id: int, nombre_lista: st
         total_paginas = obtener_total_paginas(page)
         logger.info(f"📄 Total de páginas a procesar: {total_paginas}")
 
+        # Retomar un intento anterior interrumpido, si lo hay
+        checkpoints = get_checkpoint_store()
+        clave_checkpoint = f"list_subscribers:{list_id}"
+        pagina_inicial, recuperados = _reanudar_desde_checkpoint(page, clave_checkpoint, total_paginas, url)
+        resultado.extend(recuperados)
+
         # Procesar cada página usando la navegación probada de utils.py
-        for numero_pagina in range(1, total_paginas + 1):
+        for numero_pagina in range(pagina_inicial, total_paginas + 1):
             try:
                 logger.info(f"📃 Procesando página {numero_pagina}/{total_paginas}")
                 
@@ -539,6 +598,8 @@ def obtener_suscriptores_via_scraping(page: Page, list_id: int, nombre_lista: st
                 datos_pagina = extraer_suscriptores_tabla_lista(page, nombre_lista, list_id)
                 
                 if datos_pagina:
+                    # Una página vacía no se guarda: el siguiente intento la vuelve a extraer
+                    checkpoints.save_page(clave_checkpoint, numero_pagina, datos_pagina)
                     resultado.extend(datos_pagina)
                     logger.info(f"✅ Página {numero_pagina}: {len(datos_pagina)} suscriptores extraídos")
                 else:
@@ -556,6 +617,9 @@ def obtener_suscriptores_via_scraping(page: Page, list_id: int, nombre_lista: st
                 # Continuar con la siguiente página en caso de error
                 continue
 
+        if checkpoints.is_complete(clave_checkpoint):
+            checkpoints.complete(clave_checkpoint)
+
         logger.info(f"✅ Scraping completado - Total: {len(resultado)} suscriptores de lista {list_id}")
         return resultado
 
@@ -563,25 +627,217 @@ def obtener_suscriptores_via_scraping(page: Page, list_id: int, nombre_lista: st
         logger.error(f"❌ Error en scraping de lista {list_id}: {e}")
         return []
 
-def procesar_lista_individual(page: Page, list_id: int, nombre_lista: str) -> bool:
+def _origen_suscriptores() -> str:
+    """Origen configurado en ``subscriber_export.source`` (``api`` por defecto)."""
+    try:
+        cfg = load_config().get("subscriber_export", {}) or {}
+        origen = str(cfg.get("source", ORIGEN_API)).strip().lower()
+    except Exception:
+        return ORIGEN_API
+    return origen if origen in (ORIGEN_API, ORIGEN_SCRAPING) else ORIGEN_API
+
+
+def _columna_api(campo: str) -> str:
+    """Nombre de una columna de getSubscribers con la misma clave que usa la extracción web."""
+    if campo == 'email':
+        return 'email'
+    return COLUMNAS_API_EQUIVALENTES.get(campo) or _normalizar_nombre_columna(campo)
+
+
+def obtener_suscriptores_via_api(list_id: int, nombre_lista: str, api: Any = None) -> Tuple[List[Dict[str, str]], List[str]]:
     """
-    Procesa una lista individual completa: scraping + generación de archivo
+    Obtiene los suscriptores de la lista con ``getSubscribers`` (todos los campos, paginado).
+
+    Las filas usan las mismas claves que ``extraer_suscriptores_tabla_lista``
+    (``lista``, ``email`` y el resto de columnas normalizadas) para que el
+    archivo generado sea igual venga de la API o del navegador.
+
+    Args:
+        list_id: ID de la lista
+        nombre_lista: Nombre de la lista
+        api: Cliente ``API`` (si no se indica se crea uno)
+
+    Returns:
+        (suscriptores, columnas normalizadas que devuelve la API); vacíos si la
+        paginación se cortó por un error, para que el llamador use el scraping
+    """
+    if api is None:
+        from .infrastructure.api import API
+        api = API()
+
+    suscriptores: List[Dict[str, str]] = []
+    columnas: Dict[str, None] = {}
+    estado: Dict[str, Any] = {}
+    for bloque in iterar_bloques_suscriptores(api.suscriptores, list_id, estado):
+        for suscriptor in bloque:
+            fila = {"lista": nombre_lista}
+            for campo, valor in suscriptor.items():
+                if campo in COLUMNAS_API_INTERNAS:
+                    continue
+                clave = _columna_api(campo)
+                columnas.setdefault(clave)
+                # Igual que en la tabla web, los valores vacíos no se guardan
+                if valor is not None and valor != "":
+                    fila[clave] = str(valor)
+            if fila.get("email"):
+                suscriptores.append(fila)
+
+    if not estado.get("completa", True):
+        # Un archivo con parte de la lista no puede darse por bueno: que se use el navegador
+        logger.warning(f"⚠️ Descarga por API de lista {list_id} incompleta "
+                       f"({estado['suscriptores']} suscriptores en {estado['bloques']} bloques), se descarta")
+        return [], []
+    return suscriptores, list(columnas)
+
+
+def columnas_tabla_web(page: Page, list_id: int) -> List[str]:
+    """
+    Columnas (normalizadas) de la tabla de suscriptores de la lista en la web.
+
+    Solo carga la primera página; sirve para saber qué columnas muestra la web
+    sin recorrer toda la paginación.
+    """
+    url = f"https://acumbamail.com/app/list/{list_id}/subscriber/list/"
+    page.goto(url, wait_until="networkidle", timeout=60000)
+    encabezados = page.evaluate("""
+        () => {
+            for (const ul of document.querySelectorAll('ul')) {
+                if (!ul.querySelector('a[href*="subscriber/detail"]')) continue;
+                const filaHeader = ul.querySelector('li');
+                const encabezados = [];
+                for (const elem of filaHeader.querySelectorAll('span, div')) {
+                    const text = elem.textContent.trim();
+                    if (text && text.length > 2 && text.length < 50 &&
+                        !text.includes('checkbox') && !text.includes('button') &&
+                        !text.match(/^\\d+$/) && !encabezados.includes(text)) {
+                        encabezados.push(text);
+                    }
+                }
+                return encabezados;
+            }
+            return [];
+        }
+    """) or []
+    columnas = []
+    for encabezado in encabezados:
+        columna = _normalizar_nombre_columna(encabezado)
+        if columna not in columnas:
+            columnas.append(columna)
+    return columnas
+
+
+def campos_sin_api(columnas_web: List[str], columnas_api: List[str]) -> List[str]:
+    """Columnas de la tabla web que la API no devuelve (el email siempre viene de la API)."""
+    cubiertas = set(columnas_api) | {'email', 'correo_electronico'}
+    return [columna for columna in columnas_web if columna not in cubiertas]
+
+
+def completar_desde_scraping(suscriptores: List[Dict[str, str]], suscriptores_web: List[Dict[str, str]], campos: List[str]) -> int:
+    """
+    Añade a las filas de la API los ``campos`` que solo tiene la tabla web, cruzando por email.
+
+    Returns:
+        Número de suscriptores completados
+    """
+    por_email = {
+        fila["email"].strip().lower(): fila
+        for fila in suscriptores_web
+        if fila.get("email")
+    }
+    completados = 0
+    sin_cruce = 0
+    for suscriptor in suscriptores:
+        web = por_email.get(suscriptor["email"].strip().lower())
+        if web is None:
+            sin_cruce += 1
+            continue
+        valores = {campo: web[campo] for campo in campos if web.get(campo)}
+        if valores:
+            suscriptor.update(valores)
+            completados += 1
+    if sin_cruce:
+        logger.warning(f"⚠️ {sin_cruce} suscriptores de la API no aparecen en la tabla web")
+    return completados
+
+
+def obtener_suscriptores_api_primero(page: Page, list_id: int, nombre_lista: str, api: Any = None) -> List[Dict[str, str]]:
+    """
+    Descarga la lista por la API y recurre al navegador solo si hace falta.
+
+    Se comparan las columnas que devuelve ``getSubscribers`` con las de la
+    tabla web (primera página): si la web muestra columnas que la API no
+    trae, se recorre la tabla y se copian únicamente esas columnas a las filas
+    de la API. Basta una columna así para recorrer la tabla entera, con lo que
+    la descarga tarda más que el scraping solo. Si la API falla o no devuelve nada se devuelve una lista vacía
+    para que el llamador use el scraping completo.
+    """
+    inicio = time.perf_counter()
+    try:
+        suscriptores, columnas_api = obtener_suscriptores_via_api(list_id, nombre_lista, api)
+    except Exception as e:
+        logger.warning(f"⚠️ Descarga por API de lista {list_id} falló, se usará el navegador: {e}")
+        return []
+    if not suscriptores:
+        return []
+    duracion = time.perf_counter() - inicio
+    logger.info("⚡ Suscriptores obtenidos por API", lista=list_id, suscriptores=len(suscriptores),
+        segundos=round(duracion, 2), filas_por_segundo=round(len(suscriptores) / duracion, 1) if duracion > 0 else None)
+
+    try:
+        faltantes = campos_sin_api(columnas_tabla_web(page, list_id), columnas_api)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudieron leer las columnas de la tabla web de lista {list_id}: {e}")
+        return suscriptores
+
+    if faltantes:
+        # La tabla web no se puede pedir por columnas: completar aunque sea una sola
+        # supone recorrer todas sus páginas, además de la descarga por API
+        logger.warning(
+            f"🐢 La API no devuelve {faltantes} en lista {list_id}; se recorrerá la tabla web completa "
+            f"({len(suscriptores)} suscriptores) para completarlas",
+            lista=list_id, columnas_solo_web=faltantes,
+        )
+        inicio_web = time.perf_counter()
+        suscriptores_web = obtener_suscriptores_via_scraping(page, list_id, nombre_lista)
+        completados = completar_desde_scraping(suscriptores, suscriptores_web, faltantes)
+        logger.info(f"✅ {completados} suscriptores completados con columnas de la web", lista=list_id,
+            segundos_scraping=round(time.perf_counter() - inicio_web, 2),
+            segundos_total=round(time.perf_counter() - inicio, 2))
+    return suscriptores
+
+
+def procesar_lista_individual(page: Page, list_id: int, nombre_lista: str, api: Any = None) -> bool:
+    """
+    Procesa una lista individual completa: descarga + generación de archivo
+
+    Con ``subscriber_export.source: api`` (por defecto) los datos salen de la
+    API y el navegador solo se usa para las columnas que la API no devuelve;
+    con ``scraping`` se recorre siempre la tabla web.
 
     Args:
         page: Página de Playwright autenticada
         list_id: ID de la lista
         nombre_lista: Nombre de la lista
+        api: Cliente ``API`` compartido entre listas (opcional)
 
     Returns:
         True si se procesó exitosamente
     """
     logger.info(f"Procesando lista {list_id}: {nombre_lista}")
+    inicio = time.perf_counter()
 
     try:
-        # 1) Usar scraping como método principal para obtener todos los campos
-        suscriptores = obtener_suscriptores_via_scraping(page, list_id, nombre_lista)
+        suscriptores: List[Dict[str, str]] = []
+
+        # 1) API como método principal, completando por scraping solo lo que falte
+        if _origen_suscriptores() == ORIGEN_API:
+            suscriptores = obtener_suscriptores_api_primero(page, list_id, nombre_lista, api)
 
-        # 2) Fallback a extracción básica si el scraping completo falla
+        # 2) Scraping completo de la tabla web
+        if not suscriptores:
+            suscriptores = obtener_suscriptores_via_scraping(page, list_id, nombre_lista)
+
+        # 3) Fallback a extracción básica si el scraping completo falla
         if not suscriptores:
             logger.info("Scraping completo falló, intentando extracción básica...")
             suscriptores = scrape_subscriber_list(page, list_id, nombre_lista)
@@ -590,6 +846,10 @@ def procesar_lista_individual(page: Page, list_id: int, nombre_lista: str) -> bo
             logger.warning(f"No se obtuvieron datos para lista {list_id}")
             return False
 
+        duracion = time.perf_counter() - inicio
+        logger.info("📊 Lista descargada", lista=list_id, suscriptores=len(suscriptores), segundos=round(duracion, 2),
+            filas_por_segundo=round(len(suscriptores) / duracion, 1) if duracion > 0 else None)
+
         # Generar archivo
         nombre_archivo = generar_nombre_archivo(nombre_lista, list_id)
         exitoso = generar_archivo_excel(suscriptores, nombre_archivo)
@@ -606,9 +866,12 @@ def procesar_lista_individual(page: Page, list_id: int, nombre_lista: str) -> bo
         print(f"❌ Error procesando lista {nombre_lista}: {e}")
         return False
 
-def main():
+def main(page=None, context=None):
     """
     Función principal para descargar todas las listas marcadas
+
+    Si se recibe una página autenticada (servicio de navegador persistente) se
+    reutiliza; si no, se lanza un navegador propio.
     """
     logger.info("Iniciando descarga de listas de suscriptores")
     print("🔄 Iniciando descarga de listas de suscriptores...")
@@ -630,15 +893,17 @@ def main():
         for list_id, nombre in ids_marcados:
             print(f"  • {nombre} (ID: {list_id})")
 
-        # Configurar Playwright
-        with sync_playwright() as p:
-            browser = configurar_navegador(p, headless)
-            context = crear_contexto_navegador(browser, headless)
-            page = context.new_page()
-
-            # Autenticación
-            login(page, context=context)
+        # Un cliente de API para todas las listas (si falla, cada lista recurre al navegador)
+        api = None
+        if _origen_suscriptores() == ORIGEN_API:
+            try:
+                from .infrastructure.api import API
+                api = API()
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo crear el cliente de API, se usará el navegador: {e}")
 
+        # Reutilizar la página recibida o lanzar un navegador propio con login
+        with authenticated_page(page, context, headless) as (page, context):
             # Procesar cada lista
             exitosas = 0
             fallidas = 0
@@ -646,14 +911,11 @@ def main():
             for list_id, nombre_lista in ids_marcados:
                 print(f"\n🔄 Procesando {exitosas + fallidas + 1}/{len(ids_marcados)}: {nombre_lista}")
 
-                if procesar_lista_individual(page, list_id, nombre_lista):
+                if procesar_lista_individual(page, list_id, nombre_lista, api):
                     exitosas += 1
                 else:
                     fallidas += 1
 
-            # Cerrar navegador
-            browser.close()
-
             # Resumen final
             print("\n📊 Resumen de descarga:")
             print(f"   ✅ Exitosas: {exitosas}")
@@ -0,0 +1,162 @@
+"""
+Diferencias entre una hoja local de suscriptores y su lista remota en Acumbamail.
+
+Antes solo se leía el primer bloque de ``getSubscribers`` y se comparaban los
+conjuntos de emails, así que en listas grandes casi todo parecía "nuevo" y los
+cambios de valor en un suscriptor existente nunca se detectaban. Aquí se
+recorre la lista remota completa bloque a bloque y, por email, se calcula un
+hash de los merge fields normalizados (``calcular_hashes``, el mismo que usa la
+sincronización de segmentos). El hash de la hoja local se calcula de una vez
+para todo el DataFrame y la comparación devuelve qué suscriptores son nuevos,
+cuáles cambiaron y cuáles siguen igual, de modo que solo se envía el delta.
+
+De la lista remota solo se conservan los hashes, no los suscriptores.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import pandas as pd
+
+from .cache.sync_snapshot import calcular_hashes, normalizar_emails
+from .descargar_listas import iterar_bloques_suscriptores
+from .logger import get_logger
+
+logger = get_logger()
+
+COLUMNAS_EMAIL = ['email', 'Email', 'EMAIL', 'Correo Electrónico', 'Correo', 'correo', 'e-mail', 'E-mail']
+
+
+def detectar_columna_email(df: pd.DataFrame) -> Optional[str]:
+    """Primera columna de ``df`` que parece contener el email (ver ``COLUMNAS_EMAIL``)."""
+    for columna in COLUMNAS_EMAIL:
+        if columna in df.columns:
+            return columna
+    return None
+
+
+def nombre_merge_field(columna: str) -> str:
+    """Nombre con el que se envía una columna local como merge field (igual que ``agregar_suscriptores_via_api``)."""
+    return str(columna).replace(' ', '_').replace('-', '_')
+
+
+def _clave(campo: str) -> str:
+    # La API puede devolver los nombres de campo con otras mayúsculas
+    return nombre_merge_field(campo).strip().lower()
+
+
+def _normalizar_valores(df: pd.DataFrame) -> pd.DataFrame:
+    """Texto sin espacios; los enteros leídos como float ("12.0") se comparan como "12"."""
+    valores = df.astype(object).where(pd.notna(df), "").astype(str)
+    for columna in valores.columns:
+        valores[columna] = valores[columna].str.strip().str.replace(r'^(-?\d+)\.0+$', r'\1', regex=True)
+    return valores
+
+
+def hashes_locales(df: pd.DataFrame, columna_email: str, campos: Sequence[str]) -> Dict[str, str]:
+    """
+    Hash por email de los ``campos`` (claves normalizadas) de la hoja local.
+
+    Args:
+        df: Hoja local
+        columna_email: Columna con el email
+        campos: Claves de ``campos_comparables``
+    """
+    renombradas = {columna: _clave(columna) for columna in df.columns if columna != columna_email}
+    valores = _normalizar_valores(df[list(renombradas)].rename(columns=renombradas))
+    valores = valores.loc[:, ~valores.columns.duplicated()]
+    valores["email"] = df[columna_email].values
+    return calcular_hashes(valores, campos)
+
+
+def hashes_remotos(api: Any, list_id: int, campos: Sequence[str]) -> Dict[str, str]:
+    """
+    Hash por email de los ``campos`` de todos los suscriptores de la lista remota.
+
+    Recorre ``getSubscribers`` hasta el final de la lista y calcula los hashes
+    de cada bloque al recibirlo.
+
+    Raises:
+        Las excepciones de la API si falla el primer bloque
+    """
+    hashes: Dict[str, str] = {}
+    estado: Dict[str, Any] = {}
+    for bloque in iterar_bloques_suscriptores(api.suscriptores, list_id, estado):
+        filas = [{_clave(campo): valor for campo, valor in suscriptor.items()} for suscriptor in bloque]
+        df = pd.DataFrame.from_records(filas).reindex(columns=["email", *campos])
+        valores = _normalizar_valores(df.drop(columns="email"))
+        valores["email"] = df["email"].values
+        hashes.update(calcular_hashes(valores, campos))
+    if not estado.get("completa", True):
+        logger.warning(f"⚠️ Lista {list_id} leída de forma incompleta; algunos suscriptores pueden aparecer como nuevos")
+    return hashes
+
+
+def campos_comparables(df: pd.DataFrame, columna_email: str) -> List[str]:
+    """Claves normalizadas de los merge fields que aporta la hoja local (sin el email)."""
+    return sorted({_clave(columna) for columna in df.columns if columna != columna_email})
+
+
+@dataclass
+class DiffLista:
+    """Suscriptores locales nuevos, modificados y sin cambios respecto a la lista remota."""
+
+    columna_email: str
+    nuevos: Set[str] = field(default_factory=set)
+    modificados: Set[str] = field(default_factory=set)
+    sin_cambios: Set[str] = field(default_factory=set)
+    total_remotos: int = 0
+
+    @property
+    def total_locales(self) -> int:
+        return len(self.nuevos) + len(self.modificados) + len(self.sin_cambios)
+
+    @property
+    def pendientes(self) -> Set[str]:
+        """Emails que hay que enviar (altas y modificaciones)."""
+        return self.nuevos | self.modificados
+
+    def filas_a_enviar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Filas de ``df`` con altas o modificaciones, con la columna de email como ``email``."""
+        mask = normalizar_emails(df[self.columna_email]).isin(self.pendientes)
+        filas = df[mask.values].copy()
+        if self.columna_email != 'email':
+            filas = filas.rename(columns={self.columna_email: 'email'})
+        return filas
+
+
+def comparar_con_remoto(df_local: pd.DataFrame, api: Any, list_id: int,
+                        columna_email: Optional[str] = None) -> DiffLista:
+    """
+    Compara la hoja local con la lista remota completa.
+
+    Args:
+        df_local: Hoja local
+        api: Cliente ``API``
+        list_id: ID de la lista remota
+        columna_email: Columna de email (se detecta si no se indica)
+
+    Raises:
+        ValueError: Si la hoja no tiene columna de email
+    """
+    columna_email = columna_email or detectar_columna_email(df_local)
+    if columna_email is None:
+        raise ValueError(f"No se encontró columna de email en: {list(df_local.columns)}")
+
+    campos = campos_comparables(df_local, columna_email)
+    locales = hashes_locales(df_local, columna_email, campos)
+    remotos = hashes_remotos(api, list_id, campos)
+
+    diff = DiffLista(columna_email=columna_email, total_remotos=len(remotos))
+    for email, valor in locales.items():
+        anterior = remotos.get(email)
+        if anterior is None:
+            diff.nuevos.add(email)
+        elif anterior != valor:
+            diff.modificados.add(email)
+        else:
+            diff.sin_cambios.add(email)
+
+    logger.info("🔍 Diferencias con la lista remota", lista=list_id, locales=diff.total_locales,
+                remotos=diff.total_remotos, nuevos=len(diff.nuevos), modificados=len(diff.modificados),
+                sin_cambios=len(diff.sin_cambios))
+    return diff
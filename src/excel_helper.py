@@ -7,6 +7,7 @@ import os
 from typing import List, Dict, Optional, Any, Union
 from pathlib import Path
 from .logger import get_logger
+from .cache.excel_sidecar import leer_excel_cacheado
 
 logger = get_logger()
 
@@ -30,10 +31,8 @@ class ExcelHelper:
                 logger.warning(f"Archivo no existe: {archivo}")
                 return pd.DataFrame()
                 
-            if hoja:
-                df = pd.read_excel(archivo, sheet_name=hoja, engine="openpyxl")
-            else:
-                df = pd.read_excel(archivo, engine="openpyxl")
+            # Servido desde el sidecar si el libro no ha cambiado desde la última lectura
+            df = leer_excel_cacheado(archivo, hoja)
                 
             logger.info(f"Leído Excel: {archivo} ({len(df)} filas)")
             return df
@@ -77,6 +76,14 @@ class ExcelHelper:
             logger.error(f"Error escribiendo Excel {archivo}: {e}")
             return False
     
+    @staticmethod
+    def sesion_escritura(archivo: Union[str, Path], reemplazar: bool = False) -> "SesionEscrituraExcel":
+        """
+        Crea una sesión que acumula varias hojas y las guarda con una sola escritura.
+        Ver :class:`SesionEscrituraExcel`.
+        """
+        return SesionEscrituraExcel(archivo, reemplazar)
+    
     @staticmethod
     def obtener_hojas(archivo: Union[str, Path]) -> List[str]:
         """
@@ -276,4 +283,86 @@ class ExcelHelper:
             
         except Exception as e:
             logger.error(f"Error obteniendo última fila: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+class SesionEscrituraExcel:
+    """
+    Acumula actualizaciones de hojas y las guarda en el libro con una única apertura y
+    un único guardado, en lugar de reescribir el archivo completo por cada hoja como
+    hace ``escribir_excel(..., reemplazar=False)``.
+
+    Uso:
+        with ExcelHelper.sesion_escritura(archivo) as sesion:
+            sesion.escribir_hoja(df_a, "Lista A")
+            sesion.escribir_hoja(df_b, "Lista B")
+        # al salir del bloque sin excepción se guarda todo de una vez
+    """
+    
+    def __init__(self, archivo: Union[str, Path], reemplazar: bool = False):
+        """
+        Args:
+            archivo: Ruta del archivo destino
+            reemplazar: Si True, el archivo resultante contiene solo las hojas de la sesión.
+                Si False, las hojas de la sesión sustituyen a las existentes del mismo nombre
+                y el resto del libro se conserva.
+        """
+        self.archivo = str(archivo)
+        self.reemplazar = reemplazar
+        self._hojas: Dict[str, pd.DataFrame] = {}
+        self.guardado = False
+    
+    @property
+    def hojas_pendientes(self) -> List[str]:
+        """Nombres de las hojas pendientes de guardar, en orden de escritura."""
+        return list(self._hojas)
+    
+    def escribir_hoja(self, df: pd.DataFrame, hoja: str = "Sheet1") -> None:
+        """Registra el contenido de una hoja; una segunda escritura de la misma hoja la sustituye."""
+        self._hojas[hoja] = df
+    
+    def leer_hoja(self, hoja: Optional[str] = None) -> pd.DataFrame:
+        """Lee una hoja viendo los cambios aún no guardados de la sesión."""
+        if hoja in self._hojas:
+            return self._hojas[hoja].copy()
+        return ExcelHelper.leer_excel(self.archivo, hoja)
+    
+    def guardar(self) -> bool:
+        """
+        Escribe todas las hojas pendientes en una sola operación.
+        
+        Returns:
+            True si exitoso (o no había nada que guardar), False si hay error
+        """
+        if not self._hojas:
+            return True
+        try:
+            directorio = os.path.dirname(self.archivo)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            
+            if self.reemplazar or not os.path.exists(self.archivo):
+                writer = pd.ExcelWriter(self.archivo, engine="openpyxl")
+            else:
+                writer = pd.ExcelWriter(self.archivo, mode='a', engine="openpyxl",
+                                        if_sheet_exists='replace')
+            with writer:
+                for hoja, df in self._hojas.items():
+                    df.to_excel(writer, sheet_name=hoja, index=False)
+            
+            total_filas = sum(len(df) for df in self._hojas.values())
+            logger.info(f"Escrito Excel: {self.archivo} - {len(self._hojas)} hojas ({total_filas} filas)")
+            self._hojas.clear()
+            self.guardado = True
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error escribiendo Excel {self.archivo}: {e}")
+            return False
+    
+    def __enter__(self) -> "SesionEscrituraExcel":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.guardar()
@@ -0,0 +1,45 @@
+"""
+Destinos de exportación (xlsx, CSV, Parquet, SQLite) seleccionables desde config.yaml
+"""
+from .sinks import (
+	ExportSink,
+	XlsxSink,
+	CsvSink,
+	ParquetSink,
+	SqliteSink,
+	create_export_sink,
+	resolver_formato,
+	extension_exportacion,
+	ESTILO_ENCABEZADO,
+	MAX_FILAS_EXCEL,
+	HOJA_INDICE,
+	FORMATO_XLSX,
+	FORMATO_CSV,
+	FORMATO_PARQUET,
+	FORMATO_SQLITE,
+	PROPOSITO_DATOS,
+	PROPOSITO_INFORMES,
+)
+from .report_pool import ReportBuilderPool, crear_pool_informes
+
+__all__ = [
+	"ReportBuilderPool",
+	"crear_pool_informes",
+	"ExportSink",
+	"XlsxSink",
+	"CsvSink",
+	"ParquetSink",
+	"SqliteSink",
+	"create_export_sink",
+	"resolver_formato",
+	"extension_exportacion",
+	"ESTILO_ENCABEZADO",
+	"MAX_FILAS_EXCEL",
+	"HOJA_INDICE",
+	"FORMATO_XLSX",
+	"FORMATO_CSV",
+	"FORMATO_PARQUET",
+	"FORMATO_SQLITE",
+	"PROPOSITO_DATOS",
+	"PROPOSITO_INFORMES",
+]
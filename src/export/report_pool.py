@@ -0,0 +1,130 @@
+"""
+Generación de informes en procesos separados.
+
+Construir los libros de una campaña es trabajo de CPU que, en el hilo principal,
+bloquea el GIL mientras la siguiente campaña espera su E/S. ``ReportBuilderPool``
+envía cada campaña ya recopilada a un ``ProcessPoolExecutor``: la extracción
+continúa con la siguiente y los informes se generan en paralelo, uno por núcleo.
+
+Se activa con ``reports.parallel_workers`` en config.yaml (0 = desactivado,
+``auto`` = núcleos - 1). ``reports.max_pending`` limita los informes en cola;
+al alcanzarlo ``submit`` espera a que termine alguno (contrapresión), así que
+la memoria no crece si la extracción va más rápido que la escritura.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from ..shared.logging.logger import get_logger
+
+logger = get_logger()
+
+
+class ReportBuilderPool:
+	"""
+	Pool de procesos para generar informes con contrapresión.
+
+	``funcion`` y sus argumentos deben poder serializarse con pickle (funciones
+	de módulo y listas de filas). Los resultados y errores se recogen por
+	etiqueta; un informe que falla no detiene a los demás.
+	"""
+
+	def __init__(self, max_workers: int, max_pendientes: Optional[int] = None):
+		self.max_workers = max(1, int(max_workers))
+		self.max_pendientes = max(1, int(max_pendientes or self.max_workers * 2))
+		self.resultados: List[Tuple[str, Any]] = []
+		self.errores: List[Tuple[str, str]] = []
+		self._pendientes: dict[Future, str] = {}
+		self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+		logger.info("🏭 Pool de informes iniciado", procesos=self.max_workers, max_pendientes=self.max_pendientes)
+
+	@property
+	def pendientes(self) -> int:
+		return len(self._pendientes)
+
+	def _recoger(self, futuros: Iterable[Future]) -> None:
+		for futuro in futuros:
+			etiqueta = self._pendientes.pop(futuro)
+			try:
+				resultado = futuro.result()
+				self.resultados.append((etiqueta, resultado))
+				logger.info("✅ Informe generado", etiqueta=etiqueta, resultado=resultado)
+			except Exception as e:
+				self.errores.append((etiqueta, str(e)))
+				logger.error("❌ Error generando informe", etiqueta=etiqueta, error=str(e), error_type=type(e).__name__)
+
+	def submit(self, etiqueta: str, funcion: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+		"""Encola un informe; si hay ``max_pendientes`` en curso espera a que acabe alguno."""
+		if len(self._pendientes) >= self.max_pendientes:
+			logger.debug("⏳ Cola de informes llena, esperando", pendientes=len(self._pendientes))
+			while len(self._pendientes) >= self.max_pendientes:
+				terminados, _ = wait(list(self._pendientes), return_when=FIRST_COMPLETED)
+				self._recoger(terminados)
+		self._recoger([f for f in list(self._pendientes) if f.done()])
+		self._pendientes[self._executor.submit(funcion, *args, **kwargs)] = etiqueta
+
+	def close(self, cancelar: bool = False) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, str]]]:
+		"""
+		Espera a los informes en curso y apaga el pool.
+
+		Returns:
+			(resultados, errores) como listas de (etiqueta, resultado|mensaje)
+		"""
+		if cancelar:
+			for futuro in list(self._pendientes):
+				if futuro.cancel():
+					etiqueta = self._pendientes.pop(futuro)
+					self.errores.append((etiqueta, "Cancelado"))
+		if self._pendientes:
+			terminados, _ = wait(list(self._pendientes))
+			self._recoger(terminados)
+		self._executor.shutdown(wait=True)
+		return self.resultados, self.errores
+
+	def __enter__(self) -> "ReportBuilderPool":
+		return self
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		self.close(cancelar=exc_type is not None)
+
+
+def _procesos_configurados(valor: Union[int, str, None]) -> int:
+	if isinstance(valor, str) and valor.strip().lower() == "auto":
+		return max(1, (os.cpu_count() or 2) - 1)
+	try:
+		return max(0, int(valor or 0))
+	except (TypeError, ValueError):
+		logger.warning("⚠️ reports.parallel_workers no válido, generando informes en serie", valor=valor)
+		return 0
+
+
+def crear_pool_informes(max_workers: Union[int, str, None] = None, max_pendientes: Optional[int] = None):
+	"""
+	Context manager con el pool de informes configurado, o ``None`` si está desactivado.
+
+	Uso::
+
+		with crear_pool_informes() as pool:
+			if pool:
+				pool.submit("Campaña", crear_archivo_excel, general, detalle)
+			else:
+				crear_archivo_excel(general, detalle)
+	"""
+	if max_workers is None or max_pendientes is None:
+		# Import diferido: legacy_utils importa módulos de infraestructura al cargarse
+		from ..shared.utils.legacy_utils import load_config
+
+		try:
+			cfg = load_config().get("reports", {}) or {}
+		except Exception:
+			cfg = {}
+		if max_workers is None:
+			max_workers = cfg.get("parallel_workers", 0)
+		if max_pendientes is None:
+			max_pendientes = cfg.get("max_pending")
+
+	procesos = _procesos_configurados(max_workers)
+	if procesos <= 0:
+		return nullcontext()
+	return ReportBuilderPool(procesos, max_pendientes)
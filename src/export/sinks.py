@@ -0,0 +1,487 @@
+"""
+Destinos de exportación intercambiables para descargas e informes.
+
+Cada flujo que genera archivos (listas descargadas, suscriptores, informes de
+campañas, no-openers) escribe a través de un ``ExportSink``: se abre una tabla
+con ``begin_table`` y se vuelcan las filas con ``write_rows``, que acepta
+iteradores y no acumula nada en memoria. ``close`` devuelve la ruta final.
+
+Formatos disponibles:
+	- ``xlsx``: libro ``write_only`` con una hoja por tabla (para personas)
+	- ``csv``: un archivo por tabla
+	- ``parquet``: un archivo por tabla, columnar (requiere pyarrow)
+	- ``sqlite``: una base de datos con una tabla por tabla exportada
+
+El formato se elige en config.yaml (sección ``export``) con
+``create_export_sink``; cada flujo indica su formato habitual por si la
+configuración no dice nada.
+"""
+import csv
+import importlib.util
+import re
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Union
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle
+
+from ..core.errors import DataProcessingError
+from ..shared.logging.logger import get_logger
+
+logger = get_logger()
+
+FORMATO_XLSX = "xlsx"
+FORMATO_CSV = "csv"
+FORMATO_PARQUET = "parquet"
+FORMATO_SQLITE = "sqlite"
+
+# Propósitos: los informes los leen personas, los datos suelen procesarse después
+PROPOSITO_DATOS = "data"
+PROPOSITO_INFORMES = "reports"
+
+ESTILO_ENCABEZADO = "Encabezado informe"
+
+# 1.048.576 filas por hoja en Excel, menos la cabecera
+MAX_FILAS_EXCEL = 1_048_575
+HOJA_INDICE = "Índice"
+ENCABEZADOS_INDICE = ["Tabla", "Hoja", "Primer registro", "Último registro", "Registros"]
+
+PARQUET_DISPONIBLE = importlib.util.find_spec("pyarrow") is not None
+
+_CARACTERES_INVALIDOS = re.compile(r'[<>:"/\\|?*\[\]]')
+
+
+def _nombre_seguro(nombre: str) -> str:
+	return _CARACTERES_INVALIDOS.sub("_", str(nombre)).strip()
+
+
+def _encabezados_unicos(encabezados: Sequence[str]) -> List[str]:
+	"""Parquet y SQLite no admiten columnas repetidas (los informes repiten "Lista")."""
+	vistos: dict[str, int] = {}
+	resultado = []
+	for encabezado in encabezados:
+		nombre = str(encabezado) or "columna"
+		if nombre in vistos:
+			vistos[nombre] += 1
+			nombre = f"{nombre}_{vistos[nombre]}"
+		else:
+			vistos[nombre] = 1
+		resultado.append(nombre)
+	return resultado
+
+
+class ExportSink(ABC):
+	"""
+	Destino de exportación con escritura en streaming.
+
+	Uso::
+
+		with create_export_sink("data/listas/Clientes") as sink:
+			sink.begin_table("Clientes", ["email", "nombre"])
+			sink.write_rows(filas)
+		ruta = sink.path
+
+	``base_path`` es la ruta sin extensión; cada implementación añade la suya.
+	Las exportaciones de una sola tabla pueden usar ``write_table`` con
+	``nombre=""``: los formatos de archivo por tabla escriben entonces
+	``<base>.<ext>`` en lugar de ``<base>_<tabla>.<ext>``.
+	"""
+
+	formato: str = ""
+	extension: str = ""
+
+	def __init__(self, base_path: Union[str, Path]):
+		base = Path(base_path)
+		if self.extension and base.suffix.lower() == self.extension:
+			base = base.with_suffix("")
+		self.base_path = base
+		self.base_path.parent.mkdir(parents=True, exist_ok=True)
+		self.filas_por_tabla: dict[str, int] = {}
+		self._tabla_actual: Optional[str] = None
+		self._cerrado = False
+
+	@property
+	def path(self) -> str:
+		"""Ruta del archivo (o directorio) resultante."""
+		return str(self.base_path) + self.extension
+
+	def begin_table(self, nombre: str, encabezados: Sequence[str]) -> None:
+		"""Empieza una tabla nueva; la anterior queda cerrada."""
+		if self._cerrado:
+			raise DataProcessingError("El destino de exportación ya está cerrado", file_path=self.path)
+		self._end_table()
+		self._tabla_actual = nombre
+		self.filas_por_tabla[nombre] = 0
+		self._begin_table(nombre, list(encabezados))
+
+	def write_rows(self, filas: Iterable[Sequence[Any]]) -> int:
+		"""Escribe filas en la tabla actual. Devuelve cuántas se escribieron."""
+		if self._tabla_actual is None:
+			raise DataProcessingError("write_rows llamado sin begin_table", file_path=self.path)
+		escritas = self._write_rows(filas)
+		self.filas_por_tabla[self._tabla_actual] += escritas
+		return escritas
+
+	def write_table(self, nombre: str, encabezados: Sequence[str], filas: Iterable[Sequence[Any]]) -> int:
+		"""Atajo para ``begin_table`` + ``write_rows``."""
+		self.begin_table(nombre, encabezados)
+		return self.write_rows(filas)
+
+	def close(self) -> str:
+		"""Vuelca lo pendiente y devuelve la ruta resultante."""
+		if not self._cerrado:
+			self._end_table()
+			self._tabla_actual = None
+			self._close()
+			self._cerrado = True
+			logger.info("💾 Exportación completada", formato=self.formato, ruta=self.path,
+				tablas=len(self.filas_por_tabla), filas=sum(self.filas_por_tabla.values()))
+		return self.path
+
+	def __enter__(self) -> "ExportSink":
+		return self
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		self.close()
+
+	@abstractmethod
+	def _begin_table(self, nombre: str, encabezados: List[str]) -> None:
+		...
+
+	@abstractmethod
+	def _write_rows(self, filas: Iterable[Sequence[Any]]) -> int:
+		...
+
+	def _end_table(self) -> None:
+		pass
+
+	def _close(self) -> None:
+		pass
+
+
+def _estilo_encabezado() -> NamedStyle:
+	"""Estilo con nombre compartido por las cabeceras de todas las hojas."""
+	estilo = NamedStyle(name=ESTILO_ENCABEZADO)
+	estilo.font = Font(bold=True)
+	return estilo
+
+
+class XlsxSink(ExportSink):
+	"""
+	Libro Excel en modo ``write_only``: cada fila va al disco al añadirse.
+
+	Las filas vacías se omiten igual que en ``agregar_datos``. Cuando una tabla
+	supera ``max_filas_por_hoja`` (por defecto el límite de Excel) continúa en
+	``<hoja>_2``, ``<hoja>_3``... con la misma cabecera (sin repetir el nombre
+	de una hoja ya escrita), y al cerrar se añade al principio del libro la
+	hoja ``Índice`` con el rango de registros de cada parte.
+	"""
+
+	formato = FORMATO_XLSX
+	extension = ".xlsx"
+
+	def __init__(self, base_path: Union[str, Path], max_filas_por_hoja: Optional[int] = None):
+		super().__init__(base_path)
+		if max_filas_por_hoja is None:
+			max_filas_por_hoja = _config_exportacion().get("xlsx_max_rows") or MAX_FILAS_EXCEL
+		self.max_filas_por_hoja = max(1, min(int(max_filas_por_hoja), MAX_FILAS_EXCEL))
+		# nombre de tabla -> [(hoja, primer registro, último registro)]
+		self.partes: dict[str, List[List[Any]]] = {}
+		self._wb = Workbook(write_only=True)
+		self._wb.add_named_style(_estilo_encabezado())
+		self._ws = None
+		self._encabezados: List[str] = []
+		self._filas_hoja = 0
+
+	def _titulo_unico(self, nombre: str, parte: int = 1) -> str:
+		"""
+		``<nombre>`` o ``<nombre>_<parte>`` recortado a 31 caracteres; si ya hay
+		una hoja con ese título (Excel no distingue mayúsculas) se prueba con
+		el siguiente número.
+		"""
+		# Excel limita los nombres de hoja a 31 caracteres sin []:*?/\
+		base = _nombre_seguro(nombre) or "Sheet1"
+		usados = {hoja.lower() for hoja in self._wb.sheetnames}
+		while True:
+			sufijo = f"_{parte}" if parte > 1 else ""
+			titulo = base[:31 - len(sufijo)] + sufijo
+			if titulo.lower() not in usados:
+				return titulo
+			parte += 1
+
+	def _crear_hoja(self, nombre: str, encabezados: List[str], parte: int) -> None:
+		self._ws = self._wb.create_sheet(title=self._titulo_unico(nombre, parte))
+		cabecera = []
+		for encabezado in encabezados:
+			celda = WriteOnlyCell(self._ws, value=encabezado)
+			celda.style = ESTILO_ENCABEZADO
+			cabecera.append(celda)
+		self._ws.append(cabecera)
+		self._filas_hoja = 0
+		partes = self.partes.setdefault(nombre, [])
+		registro = partes[-1][2] + 1 if partes else 1
+		partes.append([self._ws.title, registro, registro - 1])
+
+	def _begin_table(self, nombre: str, encabezados: List[str]) -> None:
+		self._encabezados = encabezados
+		self.partes.pop(nombre, None)
+		self._crear_hoja(nombre, encabezados, 1)
+
+	def _write_rows(self, filas: Iterable[Sequence[Any]]) -> int:
+		nombre = self._tabla_actual
+		escritas = 0
+		for fila in filas:
+			if any(fila):  # Solo agregar filas con datos
+				if self._filas_hoja >= self.max_filas_por_hoja:
+					parte = len(self.partes[nombre]) + 1
+					logger.info("📄 Hoja llena, continuando en una nueva", tabla=nombre, parte=parte,
+						filas=self.max_filas_por_hoja)
+					self._crear_hoja(nombre, self._encabezados, parte)
+				self._ws.append(list(fila))
+				self._filas_hoja += 1
+				self.partes[nombre][-1][2] += 1
+				escritas += 1
+		return escritas
+
+	def _escribir_indice(self) -> None:
+		ws = self._wb.create_sheet(title=self._titulo_unico(HOJA_INDICE), index=0)
+		cabecera = []
+		for encabezado in ENCABEZADOS_INDICE:
+			celda = WriteOnlyCell(ws, value=encabezado)
+			celda.style = ESTILO_ENCABEZADO
+			cabecera.append(celda)
+		ws.append(cabecera)
+		for nombre, partes in self.partes.items():
+			for hoja, primero, ultimo in partes:
+				ws.append([nombre, hoja, primero, ultimo, ultimo - primero + 1])
+
+	def _close(self) -> None:
+		if not self._wb.worksheets:
+			self._wb.create_sheet(title="Sheet1")
+		elif any(len(partes) > 1 for partes in self.partes.values()):
+			self._escribir_indice()
+		self._wb.save(self.path)
+
+
+class CsvSink(ExportSink):
+	"""Un CSV UTF-8 por tabla: ``<base>_<tabla>.csv`` (o ``<base>.csv`` sin nombre)."""
+
+	formato = FORMATO_CSV
+	extension = ".csv"
+
+	def __init__(self, base_path: Union[str, Path]):
+		super().__init__(base_path)
+		self.archivos: List[str] = []
+		self._archivo = None
+		self._writer = None
+
+	def _ruta_tabla(self, nombre: str) -> str:
+		if not nombre:
+			return str(self.base_path) + self.extension
+		return f"{self.base_path}_{_nombre_seguro(nombre)}{self.extension}"
+
+	@property
+	def path(self) -> str:
+		# Con una sola tabla la ruta es el propio archivo; con varias, el directorio
+		if len(self.archivos) == 1:
+			return self.archivos[0]
+		if self.archivos:
+			return str(self.base_path.parent)
+		return str(self.base_path) + self.extension
+
+	def _begin_table(self, nombre: str, encabezados: List[str]) -> None:
+		ruta = self._ruta_tabla(nombre)
+		self._archivo = open(ruta, "w", newline="", encoding="utf-8")
+		self._writer = csv.writer(self._archivo)
+		self._writer.writerow(encabezados)
+		self.archivos.append(ruta)
+
+	def _write_rows(self, filas: Iterable[Sequence[Any]]) -> int:
+		escritas = 0
+		for fila in filas:
+			self._writer.writerow(fila)
+			escritas += 1
+		return escritas
+
+	def _end_table(self) -> None:
+		if self._archivo is not None:
+			self._archivo.close()
+			self._archivo = None
+			self._writer = None
+
+
+class ParquetSink(CsvSink):
+	"""
+	Un archivo Parquet por tabla, escrito por lotes con ``pyarrow.parquet.ParquetWriter``.
+
+	Todas las columnas se guardan como texto: las hojas exportadas mezclan tipos
+	en la misma columna y un esquema fijo evita errores a mitad de la escritura.
+	"""
+
+	formato = FORMATO_PARQUET
+	extension = ".parquet"
+	TAMANO_LOTE = 10_000
+
+	def __init__(self, base_path: Union[str, Path]):
+		if not PARQUET_DISPONIBLE:
+			raise DataProcessingError("El formato parquet requiere pyarrow (pip install pyarrow)")
+		import pyarrow as pa
+		import pyarrow.parquet as pq
+
+		self._pa = pa
+		self._pq = pq
+		self._schema = None
+		self._lote: List[Sequence[Any]] = []
+		super().__init__(base_path)
+
+	def _begin_table(self, nombre: str, encabezados: List[str]) -> None:
+		ruta = self._ruta_tabla(nombre)
+		self._schema = self._pa.schema([(columna, self._pa.string()) for columna in _encabezados_unicos(encabezados)])
+		self._writer = self._pq.ParquetWriter(ruta, self._schema)
+		self._archivo = None
+		self.archivos.append(ruta)
+
+	def _volcar_lote(self) -> None:
+		if not self._lote:
+			return
+		columnas = list(zip(*self._lote))
+		arrays = []
+		for indice in range(len(self._schema)):
+			valores = columnas[indice] if indice < len(columnas) else [None] * len(self._lote)
+			arrays.append(self._pa.array([None if v is None else str(v) for v in valores], type=self._pa.string()))
+		self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+		self._lote = []
+
+	def _write_rows(self, filas: Iterable[Sequence[Any]]) -> int:
+		ancho = len(self._schema)
+		escritas = 0
+		for fila in filas:
+			fila = list(fila)[:ancho]
+			self._lote.append(fila + [None] * (ancho - len(fila)))
+			escritas += 1
+			if len(self._lote) >= self.TAMANO_LOTE:
+				self._volcar_lote()
+		return escritas
+
+	def _end_table(self) -> None:
+		if self._writer is not None:
+			self._volcar_lote()
+			self._writer.close()
+			self._writer = None
+
+
+class SqliteSink(ExportSink):
+	"""Una base SQLite ``<base>.db`` con una tabla por tabla exportada (se reemplaza si existe)."""
+
+	formato = FORMATO_SQLITE
+	extension = ".db"
+	TAMANO_LOTE = 5_000
+
+	def __init__(self, base_path: Union[str, Path]):
+		super().__init__(base_path)
+		self._conn = sqlite3.connect(self.path)
+		self._insert = ""
+		self._ancho = 0
+
+	def _begin_table(self, nombre: str, encabezados: List[str]) -> None:
+		tabla = _nombre_seguro(nombre) or "data"
+		columnas = _encabezados_unicos(encabezados)
+		self._ancho = len(columnas)
+		definicion = ", ".join('"{}"'.format(c.replace('"', '""')) for c in columnas)
+		tabla_sql = '"{}"'.format(tabla.replace('"', '""'))
+		self._conn.execute(f"DROP TABLE IF EXISTS {tabla_sql}")
+		self._conn.execute(f"CREATE TABLE {tabla_sql} ({definicion})")
+		self._insert = f"INSERT INTO {tabla_sql} VALUES ({', '.join('?' * self._ancho)})"
+
+	@staticmethod
+	def _valor(valor: Any) -> Any:
+		if valor is None or isinstance(valor, (str, int, float, bytes)):
+			return valor
+		return str(valor)
+
+	def _write_rows(self, filas: Iterable[Sequence[Any]]) -> int:
+		escritas = 0
+		lote = []
+		for fila in filas:
+			fila = [self._valor(v) for v in list(fila)[:self._ancho]]
+			lote.append(fila + [None] * (self._ancho - len(fila)))
+			if len(lote) >= self.TAMANO_LOTE:
+				self._conn.executemany(self._insert, lote)
+				escritas += len(lote)
+				lote = []
+		if lote:
+			self._conn.executemany(self._insert, lote)
+			escritas += len(lote)
+		return escritas
+
+	def _end_table(self) -> None:
+		self._conn.commit()
+
+	def _close(self) -> None:
+		self._conn.close()
+
+
+SINKS = {
+	FORMATO_XLSX: XlsxSink,
+	FORMATO_CSV: CsvSink,
+	FORMATO_PARQUET: ParquetSink,
+	FORMATO_SQLITE: SqliteSink,
+}
+
+
+def _config_exportacion() -> dict:
+	# Import diferido: legacy_utils importa módulos de infraestructura al cargarse
+	from ..shared.utils.legacy_utils import load_config
+
+	try:
+		return load_config().get("export", {}) or {}
+	except Exception:
+		return {}
+
+
+def resolver_formato(formato: Optional[str] = None, proposito: str = PROPOSITO_DATOS, por_defecto: str = FORMATO_XLSX) -> str:
+	"""
+	Decide el formato de una exportación.
+
+	Prioridad: ``formato`` explícito > ``export.report_format`` (informes) o
+	``export.format`` (datos) en config.yaml > ``por_defecto`` del flujo.
+	Si se pide parquet sin pyarrow instalado se usa ``por_defecto``.
+	"""
+	if not formato:
+		cfg = _config_exportacion()
+		clave = "report_format" if proposito == PROPOSITO_INFORMES else "format"
+		formato = cfg.get(clave) or por_defecto
+	formato = str(formato).lower().lstrip(".")
+	if formato not in SINKS:
+		logger.warning("⚠️ Formato de exportación desconocido, usando el habitual", formato=formato, por_defecto=por_defecto)
+		return por_defecto
+	if formato == FORMATO_PARQUET and not PARQUET_DISPONIBLE:
+		logger.warning("⚠️ pyarrow no está instalado, exportando en el formato habitual", por_defecto=por_defecto)
+		return por_defecto
+	return formato
+
+
+def extension_exportacion(formato: Optional[str] = None, proposito: str = PROPOSITO_DATOS, por_defecto: str = FORMATO_XLSX) -> str:
+	"""Extensión (con punto) que tendrá el archivo de ``create_export_sink`` con los mismos parámetros."""
+	return SINKS[resolver_formato(formato, proposito, por_defecto)].extension
+
+
+def create_export_sink(base_path: Union[str, Path], formato: Optional[str] = None,
+		proposito: str = PROPOSITO_DATOS, por_defecto: str = FORMATO_XLSX) -> ExportSink:
+	"""
+	Crea el destino de exportación configurado.
+
+	Args:
+		base_path: Ruta de salida; la extensión (si la tiene) se sustituye por la del formato
+		formato: Fuerza un formato concreto (xlsx, csv, parquet, sqlite)
+		proposito: ``PROPOSITO_DATOS`` o ``PROPOSITO_INFORMES``; elige la clave de config.yaml
+		por_defecto: Formato habitual del flujo si config.yaml no indica ninguno
+	"""
+	formato = resolver_formato(formato, proposito, por_defecto)
+	base = Path(base_path)
+	if base.suffix.lower() in {sink.extension for sink in SINKS.values()}:
+		base = base.with_suffix("")
+	return SINKS[formato](base)
@@ -0,0 +1,159 @@
+"""
+Catálogo de campos de las listas de Acumbamail servido desde la API.
+
+Sustituye al scraping de la página de campos (``field_scraper``): los nombres se
+obtienen con ``get_list_fields`` (o ``get_merge_fields`` si la primera no
+devuelve nombres) y se guardan en ``data/field_catalog.json`` con una caducidad,
+de modo que mapear columnas antes de una subida no necesita abrir el navegador
+ni repetir la consulta en cada ejecución. ``provisionar_campos`` descarta la
+entrada de la lista al crear campos.
+
+El resultado tiene la misma forma que ``obtener_campos_disponibles_acumba``:
+``{"fields": [...], "required": [...], "optional": [...]}``.
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .logger import get_logger
+from .utils import data_path, load_config
+
+logger = get_logger()
+
+TTL_CATALOGO = 3600  # segundos
+
+
+def clasificar_campos(campos: List[str]) -> Dict[str, List[str]]:
+    """
+    Limpia y deduplica nombres de campo (por su forma normalizada) y los
+    separa en requeridos (email) y opcionales.
+    """
+    from .field_scraper import normalizar_nombre_campo
+
+    campos_limpios: List[str] = []
+    campos_vistos = set()
+    for campo in campos:
+        campo_limpio = str(campo).strip()
+        campo_norm = normalizar_nombre_campo(campo_limpio)
+        # Evitar duplicados basados en la versión normalizada
+        if campo_limpio and campo_norm not in campos_vistos:
+            campos_limpios.append(campo_limpio)
+            campos_vistos.add(campo_norm)
+        elif campo_limpio:
+            logger.debug(f"Campo duplicado omitido: {campo_limpio} (normalizado: {campo_norm})")
+
+    campos_requeridos = []
+    campos_opcionales = []
+    for campo in campos_limpios:
+        if any(keyword in campo.lower() for keyword in ["correo", "email", "e-mail"]):
+            campos_requeridos.append(campo)
+        else:
+            campos_opcionales.append(campo)
+
+    # Asegurar que 'email' esté en requeridos
+    if not any("email" in c.lower() or "correo" in c.lower() for c in campos_requeridos):
+        campos_requeridos.append("email")
+
+    return {"fields": campos_limpios, "required": campos_requeridos, "optional": campos_opcionales}
+
+
+class FieldCatalogService:
+    """
+    Campos disponibles por lista desde la API, con caché local en JSON.
+
+    Args:
+        api: Cliente ``API`` (si no se indica se crea uno al primer uso)
+        cache_path: Archivo de caché (por defecto ``data/field_catalog.json``)
+        ttl: Segundos durante los que se reutiliza el catálogo de una lista
+    """
+
+    def __init__(self, api: Any = None, cache_path: Optional[str] = None, ttl: Optional[float] = None):
+        self._api = api
+        self.cache_path = cache_path or data_path("field_catalog.json")
+        if ttl is None:
+            cfg = load_config().get("merge_fields", {}) or {}
+            ttl = float(cfg.get("catalog_ttl", TTL_CATALOGO))
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @property
+    def api(self) -> Any:
+        if self._api is None:
+            from .infrastructure.api import API
+            self._api = API()
+        return self._api
+
+    # ============== Caché ==============
+    def _leer_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _escribir_cache(self, datos: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        temporal = f"{self.cache_path}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, self.cache_path)
+
+    def invalidar(self, list_id: Optional[int] = None) -> None:
+        """Descarta el catálogo de la lista (o todo si ``list_id`` es None)."""
+        with self._lock:
+            datos = {} if list_id is None else self._leer_cache()
+            if list_id is not None and str(list_id) not in datos:
+                return
+            datos.pop(str(list_id), None)
+            self._escribir_cache(datos)
+
+    # ============== Consulta ==============
+    def _campos_api(self, list_id: int) -> List[str]:
+        from .infrastructure.api.merge_fields import nombres_merge_fields
+
+        nombres: List[str] = []
+        try:
+            nombres = self.api.suscriptores.get_list_fields(list_id).field_names
+        except Exception as e:
+            logger.warning(f"getListFields falló para lista {list_id}, usando getMergeFields: {e}")
+        if not any(nombres):
+            nombres = nombres_merge_fields(self.api.suscriptores.get_merge_fields(list_id))
+        return [n for n in nombres if n]
+
+    def obtener_campos(self, list_id: int, refrescar: bool = False) -> Dict[str, List[str]]:
+        """
+        Campos disponibles de la lista: ``{"fields", "required", "optional"}``.
+
+        Raises:
+            Las excepciones de la API si no hay catálogo en caché y la consulta falla
+        """
+        clave = str(list_id)
+        if not refrescar:
+            with self._lock:
+                entrada = self._leer_cache().get(clave)
+            if entrada and time.time() - float(entrada.get("fetched_at", 0)) <= self.ttl:
+                logger.debug(f"📋 Campos de lista {list_id} servidos desde caché")
+                return clasificar_campos(entrada.get("fields", []))
+
+        campos = self._campos_api(list_id)
+        with self._lock:
+            datos = self._leer_cache()
+            datos[clave] = {"fields": campos, "fetched_at": time.time()}
+            self._escribir_cache(datos)
+        logger.info(f"📋 Campos de lista {list_id} obtenidos por API: {len(campos)}")
+        return clasificar_campos(campos)
+
+
+_catalogo: Optional[FieldCatalogService] = None
+
+
+def get_field_catalog(api: Any = None) -> FieldCatalogService:
+    """Instancia compartida (``api`` se usa si aún no tiene cliente)."""
+    global _catalogo
+    if _catalogo is None:
+        _catalogo = FieldCatalogService(api)
+    elif api is not None and _catalogo._api is None:
+        _catalogo._api = api
+    return _catalogo
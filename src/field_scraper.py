@@ -1,12 +1,43 @@
 """
-Utilidad para obtener los campos disponibles en una lista de Acumbamail mediante scraping
-Utiliza la misma técnica que descargar_suscriptores.py para detectar campos dinámicamente
+Utilidad para obtener los campos disponibles en una lista de Acumbamail
+Los campos se sirven desde la API (``field_catalog``); el scraping de la página de
+campos, con la misma técnica que descargar_suscriptores.py, queda como respaldo
 """
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
 from playwright.sync_api import Page
+from .field_catalog import clasificar_campos, get_field_catalog
 from .logger import get_logger
 
-def obtener_campos_disponibles_acumba(page: Page, list_id: int) -> Dict[str, List[str]]:
+CAMPOS_BASICOS = {
+    "fields": ["Correo electrónico", "Estado", "Fecha de alta"],
+    "required": ["email"],
+    "optional": ["Estado", "Fecha de alta"]
+}
+
+
+def obtener_campos_disponibles_acumba(page: Optional[Page], list_id: int, api: Any = None) -> Dict[str, List[str]]:
+    """
+    Obtiene los campos disponibles en una lista de Acumbamail desde el catálogo
+    de campos (API con caché local). Solo si la API falla y hay página se
+    recurre al scraping.
+
+    Returns:
+        Dict con:
+        - 'fields': Lista de nombres de campos disponibles
+        - 'required': Lista de campos requeridos (como 'email')
+        - 'optional': Lista de campos opcionales
+    """
+    logger = get_logger()
+    try:
+        return get_field_catalog(api).obtener_campos(list_id)
+    except Exception as e:
+        logger.warning(f"Catálogo de campos no disponible para lista {list_id}: {e}")
+    if page is not None:
+        return obtener_campos_por_scraping(page, list_id)
+    return {clave: list(valores) for clave, valores in CAMPOS_BASICOS.items()}
+
+
+def obtener_campos_por_scraping(page: Page, list_id: int) -> Dict[str, List[str]]:
     """
     Obtiene los campos disponibles en una lista de Acumbamail mediante scraping
     MEJORADO para detectar mejor los campos y evitar duplicados
@@ -123,52 +154,15 @@ def obtener_campos_disponibles_acumba(page: Page, list_id: int) -> Dict[str, Lis
         else:
             campos = campos_desde_pagina_campos.get('campos', [])
 
-        # Limpiar y deduplicar campos
-        campos_limpios = []
-        campos_vistos = set()
-
-        for campo in campos:
-            campo_limpio = campo.strip()
-            campo_norm = normalizar_nombre_campo(campo_limpio)
-
-            # Evitar duplicados basados en la versión normalizada
-            if campo_norm not in campos_vistos and campo_limpio:
-                campos_limpios.append(campo_limpio)
-                campos_vistos.add(campo_norm)
-            else:
-                logger.info(f"Campo duplicado omitido: {campo_limpio} (normalizado: {campo_norm})")
-
-        logger.info(f"Campos detectados (sin duplicados): {campos_limpios}")
-
-        # Clasificar campos
-        campos_requeridos = []
-        campos_opcionales = []
-
-        for campo in campos_limpios:
-            campo_lower = campo.lower()
-            if any(keyword in campo_lower for keyword in ["correo", "email", "e-mail"]):
-                campos_requeridos.append(campo)
-            else:
-                campos_opcionales.append(campo)
-
-        # Asegurar que 'email' esté en requeridos
-        if not any("email" in c.lower() or "correo" in c.lower() for c in campos_requeridos):
-            campos_requeridos.append("email")
-
-        return {
-            "fields": campos_limpios,
-            "required": campos_requeridos,
-            "optional": campos_opcionales
-        }
+        # Limpiar, deduplicar y clasificar campos
+        resultado_campos = clasificar_campos(campos)
+        logger.info(f"Campos detectados (sin duplicados): {resultado_campos['fields']}")
+        return resultado_campos
 
     except Exception as e:
         logger.error(f"Error obteniendo campos disponibles: {e}")
         # Fallback con campos básicos comunes
-        return {
-            "fields": ["Correo electrónico", "Estado", "Fecha de alta"],
-            "required": ["email"],
-            "optional": ["Estado", "Fecha de alta"]
-        }
+        return {clave: list(valores) for clave, valores in CAMPOS_BASICOS.items()}
 
 def normalizar_nombre_campo(nombre: str) -> str:
     """
@@ -269,9 +269,10 @@ class HybridCampaignsAPI:
     
     def export_non_openers_to_file(self, campaign_id: int, filename: str = None) -> str:
         """
-        💾 Exportar no-openers a archivo CSV (HÍBRIDO)
+        💾 Exportar no-openers a archivo (HÍBRIDO)
         
-        Usa scraping para obtener no-openers y los exporta a CSV.
+        Usa scraping para obtener no-openers y los exporta en el formato de
+        ``export.format`` (config.yaml); CSV si no se configura ninguno.
         Útil para crear listas de re-engagement.
         
         Args:
@@ -281,9 +282,9 @@ class HybridCampaignsAPI:
         Returns:
             Ruta del archivo creado
         """
-        import csv
         from pathlib import Path
         from datetime import datetime
+        from ..export import create_export_sink, FORMATO_CSV
         
         # Obtener no-openers por scraping
         non_openers = self.get_non_openers(campaign_id)
@@ -293,25 +294,15 @@ class HybridCampaignsAPI:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"non_openers_campaign_{campaign_id}_{timestamp}.csv"
         
-        # Crear archivo CSV
-        filepath = Path("data") / filename
-        filepath.parent.mkdir(parents=True, exist_ok=True)
+        campos = ['email', 'campaign_id', 'date_sent', 'list_name', 'subscriber_name', 'domain']
+        filas = (
+            [getattr(non_opener, campo) for campo in campos]
+            for non_opener in non_openers
+        )
         
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=[
-                'email', 'campaign_id', 'date_sent', 'list_name', 'subscriber_name', 'domain'
-            ])
-            
-            writer.writeheader()
-            for non_opener in non_openers:
-                writer.writerow({
-                    'email': non_opener.email,
-                    'campaign_id': non_opener.campaign_id,
-                    'date_sent': non_opener.date_sent,
-                    'list_name': non_opener.list_name,
-                    'subscriber_name': non_opener.subscriber_name,
-                    'domain': non_opener.domain
-                })
+        with create_export_sink(Path("data") / filename, por_defecto=FORMATO_CSV) as sink:
+            sink.write_table("", campos, filas)
+        filepath = sink.path
         
         logger.info(f"💾 No-openers exportados a: {filepath}")
         return str(filepath)
@@ -18,12 +18,15 @@ from .infrastructure.api.models.campanias import CampaignBasicInfo
 from .shared.utils.legacy_utils import is_on_login_page
 from .scrapping import (
     SubscriberDetailsService,
+    HardBounceSubscriber,
+    NoOpenSubscriber,
     ScrapingResult,
     ScrapingSession
 )
 from .shared.logging.logger import get_logger
 from .shared.utils.retry_utils import retry_with_backoff, is_connection_error
 from .autentificacion import manejar_popup_cookies
+from .cache import ScrapeResultCache, get_scrape_cache, KIND_HARD_BOUNCES, KIND_NO_OPENS
 
 
 class HybridDataService:
@@ -31,9 +34,10 @@ class HybridDataService:
     Servicio híbrido que combina datos de API y scraping para obtener información completa
     """
 
-    def __init__(self, page: Optional[Page] = None):
+    def __init__(self, page: Optional[Page] = None, scrape_cache: Optional[ScrapeResultCache] = None):
         self.api = API()
         self.scraping_service = SubscriberDetailsService(page) if page else None
+        self.scrape_cache = scrape_cache or get_scrape_cache()
         self.logger = get_logger()
 
     def get_complete_campaign_data(self, campaign_id: int) -> Dict[str, Any]:
@@ -124,7 +128,10 @@ class HybridDataService:
                 else:
                     self.logger.warning("⚠️ No se pudieron extraer datos de scraping")
             else:
-                self.logger.warning("⚠️ Servicio de scraping no disponible - saltando extracción")
+                # Sin navegador solo sirven los datos ya guardados de campañas congeladas
+                scraping_data = self._get_cached_scraping_result(campaign_basic, campaign_id)
+                if scraping_data is None:
+                    self.logger.warning("⚠️ Servicio de scraping no disponible - saltando extracción")
 
             # 3. Combinar datos
             self.logger.debug("🔄 Combinando datos de API y scraping...")
@@ -164,6 +171,10 @@ class HybridDataService:
         Extrae datos por scraping que no están disponibles en la API.
         Incluye reintentos automáticos con re-autenticación si la sesión expira.
         """
+        cached_result = self._get_cached_scraping_result(campaign, campaign_id)
+        if cached_result:
+            return cached_result
+
         max_retries = 2
         retry_count = 0
 
@@ -251,6 +262,16 @@ class HybridDataService:
                                     f"Hard bounces: {len(hard_bounces)}, No opens: {len(no_opens)}")
                 self.logger.success(f"✅ Extracción por scraping exitosa", campaign_id=campaign_id)
 
+                # Campañas antiguas: guardar para no volver a scrapearlas. Cada tipo
+                # se guarda solo si su extracción terminó sin errores: una lista
+                # vacía o parcial por sesión expirada o timeout no debe quedar fija.
+                for kind, datos in ((KIND_HARD_BOUNCES, hard_bounces), (KIND_NO_OPENS, no_opens)):
+                    if self.scraping_service.extraccion_completa(f"{kind}:{campaign_id}"):
+                        self.scrape_cache.put(campaign_id, kind, datos, campaign.date_sent)
+                    else:
+                        self.logger.warning("⚠️ Extracción incompleta, no se guarda en caché",
+                                            campaign_id=campaign_id, tipo=kind)
+
                 return scraping_result
 
             except Exception as e:
@@ -283,6 +304,31 @@ class HybridDataService:
         self.logger.error(f"❌ No se pudo extraer datos de scraping para campaña {campaign_id} después de {max_retries} intentos")
         return None
 
+    def _get_cached_scraping_result(self, campaign: CampaignBasicInfo, campaign_id: int) -> Optional[ScrapingResult]:
+        """
+        Devuelve el resultado de scraping desde el caché en disco si ambos tipos
+        de dato (hard bounces y no abiertos) están guardados para la campaña.
+        """
+        try:
+            hard_bounces = self.scrape_cache.get_models(campaign_id, KIND_HARD_BOUNCES, HardBounceSubscriber)
+            no_opens = self.scrape_cache.get_models(campaign_id, KIND_NO_OPENS, NoOpenSubscriber)
+        except Exception as e:
+            self.logger.warning(f"⚠️ No se pudo leer el caché de scraping: {e}", campaign_id=campaign_id)
+            return None
+
+        if hard_bounces is None or no_opens is None:
+            return None
+
+        self.logger.info("💾 Datos de scraping obtenidos desde caché (campaña congelada)",
+                         campaign_id=campaign_id, hard_bounces=len(hard_bounces), no_opens=len(no_opens))
+        return ScrapingResult(
+            campaign_id=campaign_id,
+            campaign_name=campaign.name or "",
+            hard_bounces=hard_bounces,
+            no_opens=no_opens,
+            total_processed=len(hard_bounces) + len(no_opens)
+        )
+
     def process_multiple_campaigns(self, campaign_ids: List[int]) -> ScrapingSession:
         """
         Procesa múltiples campañas y retorna una sesión completa
@@ -0,0 +1,133 @@
+"""
+Envío de suscriptores por lotes con ``batchAddSubscribers`` anotado en el diario de subidas.
+
+Cada lote se identifica por la fila de la hoja donde empieza y por el hash de
+su contenido. Con diario, los lotes que ya confirmó la API en un intento
+anterior se omiten; un lote que falla se anota y se continúa con el siguiente,
+de modo que al repetir la subida solo se reenvía lo que no llegó
+(``update_subscriber=1`` hace que reenviar un lote sea inocuo).
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from .models.suscriptores import BatchAddResult, SubscriberData
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 100
+
+
+@dataclass
+class ResultadoEnvio:
+    """Resumen de un envío por lotes (``previos``: filas confirmadas en intentos anteriores)."""
+    enviados: int = 0
+    errores: int = 0
+    previos: int = 0
+    lotes_enviados: int = 0
+    lotes_omitidos: int = 0
+    lotes_fallidos: int = 0
+
+    @property
+    def total_exitosos(self) -> int:
+        return self.enviados + self.previos
+
+    @property
+    def completo(self) -> bool:
+        return self.lotes_fallidos == 0
+
+
+def resultados_por_fila(lote: Sequence[SubscriberData], resultado: BatchAddResult) -> List[Tuple[str, bool, Optional[str]]]:
+    """
+    (email, correcto, detalle) de cada suscriptor del lote a partir de la respuesta.
+
+    Las respuestas traen ``{"email", "id"}`` o ``{email: id}`` por suscriptor
+    correcto; si la API devuelve una entrada por fila se cruzan por posición.
+    """
+    def exito(entrada: Any) -> bool:
+        if not isinstance(entrada, dict):
+            return False
+        if 'id' in entrada:
+            return True
+        return len(entrada) == 1 and '@' in next(iter(entrada)) and isinstance(next(iter(entrada.values())), int)
+
+    entradas = resultado.results
+    if len(entradas) == len(lote):
+        return [
+            (suscriptor.email, exito(entrada), None if exito(entrada) else str(entrada))
+            for suscriptor, entrada in zip(lote, entradas)
+        ]
+
+    correctos = set()
+    for entrada in entradas:
+        if exito(entrada):
+            email = entrada.get('email') if 'id' in entrada else next(iter(entrada))
+            correctos.add(str(email).strip().lower())
+    return [
+        (s.email, s.email.strip().lower() in correctos,
+         None if s.email.strip().lower() in correctos else "Sin confirmación en la respuesta")
+        for s in lote
+    ]
+
+
+def enviar_lotes(
+    api_client: Any,
+    list_id: int,
+    lotes: Iterable[Tuple[int, List[SubscriberData]]],
+    journal: Any = None,
+    job_key: Optional[str] = None,
+) -> ResultadoEnvio:
+    """
+    Envía los lotes a la lista y anota cada uno en el diario (si se indica).
+
+    Args:
+        api_client: Cliente ``API``
+        list_id: ID de la lista
+        lotes: (fila inicial en la hoja, suscriptores) de cada lote
+        journal: ``UploadJournal`` (opcional)
+        job_key: Clave del trabajo en el diario
+
+    Returns:
+        ResultadoEnvio
+    """
+    from ...cache.upload_journal import hash_lote
+
+    usar_diario = journal is not None and job_key is not None
+    resultado = ResultadoEnvio()
+
+    for offset, lote in lotes:
+        if not lote:
+            continue
+        contenido = hash_lote([s.model_dump() for s in lote])
+        previos = journal.confirmed_chunk(job_key, offset, contenido) if usar_diario else None
+        if previos is not None:
+            resultado.previos += previos
+            resultado.lotes_omitidos += 1
+            continue
+
+        try:
+            respuesta = api_client.suscriptores.batch_add_subscribers(
+                list_id=list_id,
+                subscribers_data=lote,
+                update_subscriber=1,  # Actualizar si existe
+                complete_json=1
+            )
+        except Exception as e:
+            resultado.lotes_fallidos += 1
+            logger.error(f"Lote en fila {offset} ({len(lote)} suscriptores) falló: {e}")
+            if usar_diario:
+                journal.record_chunk(job_key, offset, contenido, len(lote), confirmado=False, detalle=str(e))
+            continue
+
+        filas = resultados_por_fila(lote, respuesta)
+        exitos = sum(1 for _, ok, _ in filas if ok)
+        resultado.enviados += exitos
+        resultado.errores += len(filas) - exitos
+        resultado.lotes_enviados += 1
+        logger.info(f"Lote en fila {offset} procesado: {respuesta.success_count} exitosos, {respuesta.error_count} errores")
+        if usar_diario:
+            journal.record_chunk(job_key, offset, contenido, len(lote), filas)
+
+    if resultado.lotes_omitidos:
+        logger.info(f"{resultado.lotes_omitidos} lotes ya confirmados en un intento anterior; no se reenvían")
+    return resultado
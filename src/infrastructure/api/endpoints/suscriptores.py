@@ -1,6 +1,7 @@
 from typing import List, Dict, Any, Union, Optional
 from ..client import APIClient
 from ..decorators import medium_rate_limit, burst_rate_limit
+from ..merge_fields import get_merge_field_cache, nombres_merge_fields
 from ..models.suscriptores import (
     ListSummary, ListStats, ListFields, SubscriberDetails,
     SubscriberSearchResult, SubscriberList, ListSubsStats,
@@ -195,18 +196,18 @@ class SuscriptoresAPI:
         Raises:
             ValueError: Si encuentra nombres incorrectos de campos
         """
-        # Validaciones específicas para lista 1168867 (Prueba_SEGMENTOS)
-        if list_id == 1168867:
-            # Verificar campo de segmentos
+        # Si se conoce el esquema de la lista, el campo de segmentos debe usar su nombre exacto
+        campos_lista = get_merge_field_cache().get(list_id)
+        campos_segmento = [c for c in (campos_lista or ()) if 'segment' in c.lower()]
+        if campos_segmento:
             segment_fields = [k for k in merge_fields.keys() if 'segment' in k.lower()]
-            if segment_fields:
-                incorrect_fields = [f for f in segment_fields if f not in ['Segmentos', 'SEGMENTOS']]
-                if incorrect_fields:
-                    raise ValueError(
-                        f"Campo(s) de segmento incorrecto(s): {incorrect_fields}. "
-                        f"Use 'Segmentos' (con S mayúscula) para lista {list_id}"
-                    )
-        
+            incorrect_fields = [f for f in segment_fields if f not in campos_segmento]
+            if incorrect_fields:
+                raise ValueError(
+                    f"Campo(s) de segmento incorrecto(s): {incorrect_fields}. "
+                    f"Use {campos_segmento} para lista {list_id}"
+                )
+
         # Validaciones generales
         common_mistakes = {
             'segmento': 'Segmentos',
@@ -426,6 +427,7 @@ class SuscriptoresAPI:
             "field_type": field_type_str
         }
         self.client.post("addMergeTag/", data=data)
+        get_merge_field_cache().add(list_id, [field_name])
 
     def get_list_fields(self, list_id: int) -> ListFields:
         """
@@ -464,6 +466,9 @@ class SuscriptoresAPI:
         """
         Obtiene merge fields de una lista.
 
+        La respuesta actualiza la caché de esquemas de campos
+        (``merge_fields.get_merge_field_cache``).
+
         Args:
             list_id: ID de la lista
 
@@ -474,7 +479,9 @@ class SuscriptoresAPI:
         """
         params = {"list_id": list_id}
         response = self.client.get("getMergeFields/", params=params)
-        return MergeFieldsList.from_api_response(response)
+        result = MergeFieldsList.from_api_response(response)
+        get_merge_field_cache().put(list_id, nombres_merge_fields(response))
+        return result
 
     # === OTROS ===
 
@@ -512,7 +519,7 @@ class SuscriptoresAPI:
     # === MÉTODOS DE ELIMINACIÓN ===
 
     @medium_rate_limit
-    def batch_delete_subscribers(self, list_id: int, email_list: Dict[str, str]) -> BatchDeleteResult:
+    def batch_delete_subscribers(self, list_id: int, email_list: Union[List[str], Dict[str, str]]) -> BatchDeleteResult:
         """
         Elimina un grupo de suscriptores de una lista.
 
@@ -521,16 +528,21 @@ class SuscriptoresAPI:
 
         Args:
             list_id: ID de la lista
-            email_list: Dict con lista de emails a eliminar
+            email_list: Emails a eliminar (lista, o dict cuyos valores son los emails)
 
         Returns:
             BatchDeleteResult: Resultados del proceso de eliminación
 
         Rate limit: 10 peticiones/minuto
         """
+        import json
+
+        if isinstance(email_list, dict):
+            email_list = list(email_list.values())
+
         data = {
             "list_id": list_id,
-            "email_list": email_list
+            "email_list": json.dumps(list(email_list))
         }
 
         response = self.client.post("batchDeleteSubscribers/", data=data)
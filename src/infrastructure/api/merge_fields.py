@@ -0,0 +1,197 @@
+"""
+Esquema de campos (merge fields) por lista con caché en memoria y creación en lote.
+
+``getMergeFields`` y ``addMergeTag`` comparten el límite de 10 peticiones por
+minuto, así que consultar los campos de una lista en cada ejecución y crear
+los que faltan de uno en uno consume casi todo el presupuesto. La caché guarda
+los nombres de campo de cada lista durante ``ttl`` segundos; ``add_merge_tag``
+añade el campo creado a la entrada de la lista y ``invalidar`` la descarta
+cuando el estado remoto deja de ser fiable (por ejemplo, tras un fallo al crear).
+
+``provisionar_campos`` calcula de una vez qué campos faltan y los crea en
+paralelo; el ritmo lo sigue marcando ``medium_rate_limit``, que es global al
+proceso. Si crea (o intenta crear) campos descarta también la entrada de la
+lista en el catálogo en disco de ``field_catalog``, que sobrevive entre
+ejecuciones.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Union
+
+from .models.suscriptores import FieldType
+
+logger = logging.getLogger(__name__)
+
+TTL_CAMPOS = 900  # segundos
+CREACIONES_EN_PARALELO = 4
+
+
+def nombres_merge_fields(respuesta: Any) -> List[str]:
+    """
+    Nombres de campo de una respuesta de ``get_merge_fields`` (``MergeFieldsList``,
+    dict ``{nombre: tipo}`` o lista de dicts/objetos con ``name``).
+    """
+    campos = getattr(respuesta, "merge_fields", respuesta)
+    if isinstance(campos, dict):
+        return [str(nombre) for nombre in campos.keys()]
+    nombres: List[str] = []
+    for campo in campos or []:
+        if isinstance(campo, dict):
+            if campo.get("name"):
+                nombres.append(str(campo["name"]))
+        elif hasattr(campo, "name"):
+            nombres.append(str(getattr(campo, "name")))
+    return nombres
+
+
+class MergeFieldSchemaCache:
+    """Nombres de campo por lista con caducidad (thread-safe)."""
+
+    def __init__(self, ttl: float = TTL_CAMPOS):
+        self.ttl = ttl
+        self._entradas: Dict[int, tuple[float, Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, list_id: int) -> Optional[Set[str]]:
+        """Campos conocidos de la lista, o None si no hay entrada vigente."""
+        with self._lock:
+            entrada = self._entradas.get(int(list_id))
+            if entrada is None:
+                return None
+            if time.monotonic() - entrada[0] > self.ttl:
+                del self._entradas[int(list_id)]
+                return None
+            return set(entrada[1])
+
+    def put(self, list_id: int, nombres: Iterable[str]) -> None:
+        with self._lock:
+            self._entradas[int(list_id)] = (time.monotonic(), set(nombres))
+
+    def add(self, list_id: int, nombres: Iterable[str]) -> None:
+        """Añade campos recién creados a una entrada vigente (sin entrada no hace nada)."""
+        with self._lock:
+            entrada = self._entradas.get(int(list_id))
+            if entrada is not None:
+                entrada[1].update(nombres)
+
+    def invalidar(self, list_id: Optional[int] = None) -> None:
+        """Descarta la entrada de la lista (o todas si ``list_id`` es None)."""
+        with self._lock:
+            if list_id is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(int(list_id), None)
+
+    def nombres(self, api_client: Any, list_id: int, refrescar: bool = False) -> Set[str]:
+        """Campos de la lista desde la caché; consulta ``get_merge_fields`` solo si no hay entrada."""
+        if not refrescar:
+            cacheados = self.get(list_id)
+            if cacheados is not None:
+                return cacheados
+        # get_merge_fields actualiza la caché compartida; aquí se guarda también por si es otra instancia
+        nombres = nombres_merge_fields(api_client.suscriptores.get_merge_fields(list_id))
+        self.put(list_id, nombres)
+        return set(nombres)
+
+
+_cache: Optional[MergeFieldSchemaCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_merge_field_cache() -> MergeFieldSchemaCache:
+    """
+    Instancia compartida; el TTL se lee de config.yaml:
+
+    merge_fields:
+      cache_ttl: 900
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            ttl = TTL_CAMPOS
+            try:
+                from ...shared.utils.legacy_utils import load_config
+                ttl = float((load_config().get("merge_fields", {}) or {}).get("cache_ttl", TTL_CAMPOS))
+            except Exception:
+                pass
+            _cache = MergeFieldSchemaCache(ttl)
+        return _cache
+
+
+@dataclass
+class ResultadoProvision:
+    """Campos que ya existían, creados y fallidos (nombre -> error)."""
+    existentes: List[str] = field(default_factory=list)
+    creados: List[str] = field(default_factory=list)
+    fallidos: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.fallidos
+
+
+def provisionar_campos(
+    api_client: Any,
+    list_id: int,
+    campos: Mapping[str, Union[str, FieldType]],
+    max_workers: int = CREACIONES_EN_PARALELO,
+    cache: Optional[MergeFieldSchemaCache] = None,
+) -> ResultadoProvision:
+    """
+    Garantiza que la lista tenga los campos indicados.
+
+    Args:
+        api_client: Cliente ``API``
+        list_id: ID de la lista
+        campos: {nombre: tipo} de los campos necesarios
+        max_workers: Creaciones simultáneas (el límite de la API se respeta igualmente)
+        cache: Caché de esquemas (por defecto la compartida)
+
+    Returns:
+        ResultadoProvision
+    """
+    cache = cache or get_merge_field_cache()
+    existentes = cache.nombres(api_client, list_id)
+    faltantes = [nombre for nombre in dict.fromkeys(campos) if nombre not in existentes]
+    resultado = ResultadoProvision(existentes=[n for n in dict.fromkeys(campos) if n in existentes])
+    if not faltantes:
+        return resultado
+
+    logger.info(f"Creando {len(faltantes)} campo(s) en lista {list_id}: {faltantes}")
+
+    def crear(nombre: str) -> Optional[str]:
+        try:
+            api_client.suscriptores.add_merge_tag(list_id, nombre, campos[nombre])
+            return None
+        except Exception as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(faltantes))),
+                            thread_name_prefix="merge_tag") as executor:
+        for nombre, error in zip(faltantes, executor.map(crear, faltantes)):
+            if error is None:
+                resultado.creados.append(nombre)
+            else:
+                resultado.fallidos[nombre] = error
+                logger.error(f"Error creando campo '{nombre}' en lista {list_id}: {error}")
+
+    if resultado.fallidos:
+        # El campo puede haberse creado aunque la respuesta fallase: releer en la próxima consulta
+        cache.invalidar(list_id)
+    else:
+        cache.add(list_id, resultado.creados)
+    _invalidar_catalogo(list_id)
+    return resultado
+
+
+def _invalidar_catalogo(list_id: int) -> None:
+    """Descarta la lista en el catálogo de campos en disco (``field_catalog``)."""
+    try:
+        # Importación diferida: field_catalog depende de este módulo
+        from ...field_catalog import get_field_catalog
+        get_field_catalog().invalidar(list_id)
+    except Exception as e:
+        logger.warning(f"No se pudo invalidar el catálogo de campos de la lista {list_id}: {e}")
@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional, Dict, List, Any
 from datetime import datetime
@@ -63,20 +66,28 @@ class ListSummary(BaseModel):
     """Resumen de lista de suscriptores desde getLists"""
     id: int = Field(..., description="ID único de la lista")
     name: str = Field(..., description="Nombre de la lista")
+    firma: str = Field("", description="Huella de los datos de la lista en getLists (cambia si cambia alguno)")
+
+    @staticmethod
+    def calcular_firma(list_data: Any) -> str:
+        """Hash corto y estable de los datos que devuelve getLists para una lista."""
+        contenido = json.dumps(list_data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(contenido.encode("utf-8"), digest_size=8).hexdigest()
 
     @classmethod
     def from_api_dict(cls, list_id: str, list_data: Any) -> "ListSummary":
         """Crear ListSummary desde el formato de API {id: datos}"""
+        firma = cls.calcular_firma(list_data)
         if isinstance(list_data, str):
             # Formato simple: {id: nombre}
-            return cls(id=int(list_id), name=list_data)
+            return cls(id=int(list_id), name=list_data, firma=firma)
         elif isinstance(list_data, dict):
             # Formato complejo: {id: {name: ..., description: ...}}
             name = list_data.get('name', str(list_data))
-            return cls(id=int(list_id), name=name)
+            return cls(id=int(list_id), name=name, firma=firma)
         else:
             # Fallback: usar el valor como string
-            return cls(id=int(list_id), name=str(list_data))
+            return cls(id=int(list_id), name=str(list_data), firma=firma)
 
     @classmethod
     def from_api_response(cls, api_response: Dict[str, Any]) -> List["ListSummary"]:
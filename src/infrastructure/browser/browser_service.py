@@ -0,0 +1,240 @@
+"""Long-lived browser service shared by GUI operations.
+
+Playwright's sync API is bound to the thread that started it, so the service
+owns a dedicated worker thread. Operations are submitted as callables and run
+on that thread with a page from an already authenticated context. The browser
+is closed after ``idle_timeout`` seconds without work and relaunched lazily on
+the next submission.
+"""
+import queue
+import sys
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Tuple, TypeVar
+
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright
+
+from ...core.errors import BrowserAutomationError
+from .page_profiler import profiling_session
+from ...shared.logging.logger import get_logger
+from ...shared.utils.legacy_utils import (
+    configurar_navegador,
+    crear_contexto_navegador,
+    is_on_login_page,
+    load_config,
+)
+
+T = TypeVar("T")
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+logger = get_logger()
+
+
+class BrowserService:
+    """Keeps a warm, authenticated browser context and hands out pages."""
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, headless: Optional[bool] = None):
+        self.idle_timeout = idle_timeout
+        self.headless = headless
+        self._jobs: "queue.Queue[tuple[Callable[[Page, BrowserContext], Any], Future, Optional[str]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+        self._authenticated = False
+
+    @property
+    def is_running(self) -> bool:
+        """True while the worker thread (and therefore the browser) is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, operation: Callable[[Page, BrowserContext], T], timeout: Optional[float] = None,
+            name: Optional[str] = None) -> T:
+        """Run ``operation(page, context)`` on the service thread and return its result.
+
+        Blocks the caller until the operation finishes. Exceptions raised by the
+        operation are re-raised in the caller's thread. ``name`` labels the run
+        in profiling reports.
+        """
+        if self._thread is threading.current_thread():
+            raise BrowserAutomationError("BrowserService.run() cannot be nested inside an operation")
+
+        future: Future = Future()
+        with self._lock:
+            self._jobs.put((operation, future, name))
+            if not self.is_running:
+                self._thread = threading.Thread(target=self._worker, name="BrowserService", daemon=True)
+                self._thread.start()
+        return future.result(timeout=timeout)
+
+    def shutdown(self, wait: bool = False, timeout: Optional[float] = None) -> None:
+        """Ask the worker to close the browser once the current operation ends.
+
+        Only signals the worker by default, so it is safe to call from the Tk
+        main thread while an operation is running. Operations submitted after
+        the request still run, on a freshly launched browser. ``wait`` joins the
+        worker thread (at most ``timeout`` seconds).
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._jobs.put(None)  # type: ignore[arg-type]
+        if wait and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _worker(self) -> None:
+        logger.info("🌐 Servicio de navegador iniciado", idle_timeout=self.idle_timeout)
+        while True:
+            try:
+                job = self._jobs.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    # Re-check under the lock so run() never enqueues onto a dying thread
+                    if self._jobs.empty():
+                        logger.info("💤 Servicio de navegador inactivo, cerrando navegador")
+                        self._close_browser()
+                        self._thread = None
+                        return
+                continue
+
+            if job is None:
+                self._close_browser()
+                with self._lock:
+                    # Work queued behind the request runs on a new browser
+                    if self._jobs.empty():
+                        self._thread = None
+                        logger.info("🔚 Servicio de navegador detenido")
+                        return
+                logger.info("🔄 Navegador cerrado, quedan operaciones pendientes")
+                continue
+
+            operation, future, name = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._execute(operation, name))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _execute(self, operation: Callable[[Page, BrowserContext], T], name: Optional[str] = None) -> T:
+        context = self._ensure_context()
+        page = context.new_page()
+        try:
+            self._ensure_authenticated(page, context)
+            with profiling_session(name or getattr(operation, "__name__", "operation"), context):
+                return operation(page, context)
+        finally:
+            try:
+                if not page.is_closed():
+                    page.close()
+            except Exception:
+                pass
+
+    def _ensure_context(self) -> BrowserContext:
+        if self._browser is not None and not self._browser.is_connected():
+            logger.warning("⚠️ Navegador desconectado, se relanzará")
+            self._close_browser()
+
+        if self._context is None:
+            headless = self.headless
+            if headless is None:
+                headless = bool(load_config().get("headless", False))
+            logger.info("🚀 Lanzando navegador persistente", headless=headless)
+            self._playwright = sync_playwright().start()
+            self._browser = configurar_navegador(self._playwright, headless)
+            self._context = crear_contexto_navegador(self._browser, headless)
+            self._authenticated = False
+        return self._context
+
+    def _ensure_authenticated(self, page: Page, context: BrowserContext) -> None:
+        # Imported lazily: autentificacion pulls in the GUI notification helpers
+        from ...autentificacion import login
+
+        if not self._authenticated:
+            login(page, context)
+            self._authenticated = True
+            return
+
+        url = load_config().get("url", "")
+        if url:
+            page.goto(url, wait_until="domcontentloaded", timeout=60_000)
+        if is_on_login_page(page):
+            logger.info("🔄 Sesión del navegador persistente expirada, re-autenticando")
+            login(page, context)
+
+    def _close_browser(self) -> None:
+        for resource, closer in ((self._context, "close"), (self._browser, "close"), (self._playwright, "stop")):
+            if resource is None:
+                continue
+            try:
+                getattr(resource, closer)()
+            except Exception:
+                # Cleanup errors must not mask the operation result
+                pass
+        self._context = None
+        self._browser = None
+        self._playwright = None
+        self._authenticated = False
+
+
+_service: Optional[BrowserService] = None
+_service_lock = threading.Lock()
+
+
+def get_browser_service() -> BrowserService:
+    """Return the process-wide browser service, creating it on first use.
+
+    The idle timeout is read from ``browser_service.idle_timeout`` in
+    config.yaml (seconds).
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            cfg = load_config().get("browser_service", {}) or {}
+            _service = BrowserService(idle_timeout=float(cfg.get("idle_timeout", DEFAULT_IDLE_TIMEOUT)))
+        return _service
+
+
+def shutdown_browser_service(wait: bool = False, timeout: Optional[float] = None) -> None:
+    """Close the process-wide browser service if it was started.
+
+    Non-blocking unless ``wait`` is given; see :meth:`BrowserService.shutdown`.
+    """
+    with _service_lock:
+        service = _service
+    if service is not None:
+        service.shutdown(wait=wait, timeout=timeout)
+
+
+@contextmanager
+def authenticated_page(
+    page: Optional[Page] = None,
+    context: Optional[BrowserContext] = None,
+    headless: bool = False,
+) -> Iterator[Tuple[Page, BrowserContext]]:
+    """Yield ``(page, context)``, reusing the given ones or launching a throwaway browser.
+
+    Lets module entry points accept a page from :class:`BrowserService` while
+    keeping their standalone behaviour (own browser + login) when run directly.
+    """
+    if page is not None:
+        yield page, context if context is not None else page.context
+        return
+
+    from ...autentificacion import login
+
+    with sync_playwright() as p:
+        browser = configurar_navegador(p, headless)
+        try:
+            context = crear_contexto_navegador(browser, headless)
+            page = context.new_page()
+            login(page, context)
+            with profiling_session(Path(sys.argv[0]).stem or "standalone", context):
+                yield page, context
+        finally:
+            browser.close()
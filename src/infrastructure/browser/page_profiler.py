@@ -0,0 +1,340 @@
+"""Opt-in per-step profiler for Playwright page operations.
+
+When ``profiling.enabled`` is set in config.yaml, every run started through
+:class:`BrowserService` or :func:`authenticated_page` opens a profiling
+session. Pages handed to the scrapers are wrapped by :func:`profile_page`,
+which times each Playwright call (navigation, load-state waits, fixed waits,
+locator queries, extraction, actions) and records the URL and the bytes
+received while it ran. At the end of the run a per-category breakdown is
+logged and written to ``data/profiles/<run>_<timestamp>.json``; with
+``profiling.trace`` a Playwright trace zip is saved next to it
+(open it with ``playwright show-trace``).
+
+With profiling disabled :func:`profile_page` returns the page unchanged, so
+instrumented call sites pay nothing.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from playwright.sync_api import BrowserContext, Locator, Page
+
+from ...shared.logging.logger import get_logger
+
+logger = get_logger()
+
+CATEGORY_NAVIGATION = "navigation"
+CATEGORY_LOAD_STATE = "load_state"
+CATEGORY_FIXED_WAIT = "fixed_wait"
+CATEGORY_LOCATOR = "locator"
+CATEGORY_EXTRACTION = "extraction"
+CATEGORY_ACTION = "action"
+
+_METHOD_CATEGORIES = {
+    "goto": CATEGORY_NAVIGATION,
+    "reload": CATEGORY_NAVIGATION,
+    "go_back": CATEGORY_NAVIGATION,
+    "go_forward": CATEGORY_NAVIGATION,
+    "wait_for_load_state": CATEGORY_LOAD_STATE,
+    "wait_for_url": CATEGORY_LOAD_STATE,
+    "wait_for_timeout": CATEGORY_FIXED_WAIT,
+    "wait_for": CATEGORY_LOCATOR,
+    "wait_for_selector": CATEGORY_LOCATOR,
+    "count": CATEGORY_LOCATOR,
+    "is_visible": CATEGORY_LOCATOR,
+    "is_enabled": CATEGORY_LOCATOR,
+    "query_selector": CATEGORY_LOCATOR,
+    "query_selector_all": CATEGORY_LOCATOR,
+    "get_attribute": CATEGORY_LOCATOR,
+    "inner_text": CATEGORY_EXTRACTION,
+    "inner_html": CATEGORY_EXTRACTION,
+    "text_content": CATEGORY_EXTRACTION,
+    "all_inner_texts": CATEGORY_EXTRACTION,
+    "all_text_contents": CATEGORY_EXTRACTION,
+    "input_value": CATEGORY_EXTRACTION,
+    "content": CATEGORY_EXTRACTION,
+    "evaluate": CATEGORY_EXTRACTION,
+    "title": CATEGORY_EXTRACTION,
+    "click": CATEGORY_ACTION,
+    "dblclick": CATEGORY_ACTION,
+    "fill": CATEGORY_ACTION,
+    "press": CATEGORY_ACTION,
+    "check": CATEGORY_ACTION,
+    "select_option": CATEGORY_ACTION,
+    "set_input_files": CATEGORY_ACTION,
+    "hover": CATEGORY_ACTION,
+    "screenshot": CATEGORY_ACTION,
+}
+
+DEFAULT_SLOW_STEP_MS = 2000.0
+
+
+@dataclass
+class ProfileStep:
+    """A single timed Playwright call."""
+
+    category: str
+    action: str
+    duration_ms: float
+    url: str
+    bytes_received: int
+    detail: str = ""
+    error: Optional[str] = None
+
+
+@dataclass
+class ProfilingSession:
+    """Steps recorded during one run, plus network byte accounting."""
+
+    name: str
+    slow_step_ms: float = DEFAULT_SLOW_STEP_MS
+    started_at: float = field(default_factory=time.perf_counter)
+    steps: List[ProfileStep] = field(default_factory=list)
+    bytes_received: int = 0
+    _listeners: List[tuple] = field(default_factory=list, repr=False)
+
+    def attach(self, page: Page) -> None:
+        """Count response bytes for ``page`` (once per page)."""
+        if any(p is page for p, _ in self._listeners):
+            return
+
+        def _on_response(response: Any) -> None:
+            try:
+                self.bytes_received += int(response.headers.get("content-length", 0) or 0)
+            except Exception:
+                pass
+
+        try:
+            page.on("response", _on_response)
+            self._listeners.append((page, _on_response))
+        except Exception:
+            pass
+
+    def detach(self) -> None:
+        for page, handler in self._listeners:
+            try:
+                page.remove_listener("response", handler)
+            except Exception:
+                pass
+        self._listeners.clear()
+
+    def record(self, step: ProfileStep) -> None:
+        self.steps.append(step)
+        if step.duration_ms >= self.slow_step_ms:
+            logger.debug(f"🐢 Paso lento: {step.action} ({step.duration_ms:.0f} ms)",
+                         category=step.category, url=step.url, detail=step.detail)
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Per-category totals, slowest steps and time spent in fixed waits."""
+        total_ms = (time.perf_counter() - self.started_at) * 1000
+        categories: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "bytes": 0})
+        for step in self.steps:
+            cat = categories[step.category]
+            cat["count"] += 1
+            cat["total_ms"] += step.duration_ms
+            cat["bytes"] += step.bytes_received
+        profiled_ms = sum(c["total_ms"] for c in categories.values())
+        slowest = sorted(self.steps, key=lambda s: s.duration_ms, reverse=True)[:10]
+        return {
+            "name": self.name,
+            "total_ms": round(total_ms, 1),
+            "profiled_ms": round(profiled_ms, 1),
+            "unprofiled_ms": round(max(total_ms - profiled_ms, 0.0), 1),
+            "bytes_received": self.bytes_received,
+            "steps": len(self.steps),
+            "fixed_wait_ms": round(categories[CATEGORY_FIXED_WAIT]["total_ms"], 1) if CATEGORY_FIXED_WAIT in categories else 0.0,
+            "categories": {
+                name: {"count": int(c["count"]), "total_ms": round(c["total_ms"], 1), "bytes": int(c["bytes"])}
+                for name, c in sorted(categories.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            },
+            "slowest": [asdict(s) for s in slowest],
+        }
+
+
+_state = threading.local()
+
+
+def get_active_session() -> Optional[ProfilingSession]:
+    """Session profiling the current thread, if any."""
+    return getattr(_state, "session", None)
+
+
+def _unwrap(value: Any) -> Any:
+    return value._target if isinstance(value, _ProfiledProxy) else value
+
+
+def _join_selector(parent: str, child: str) -> str:
+    return f"{parent} >> {child}" if parent else child
+
+
+def _describe(action: str, args: tuple, kwargs: dict) -> str:
+    if action == "wait_for_timeout" and args:
+        return f"{args[0]} ms"
+    if action in ("goto", "wait_for_url") and args:
+        return str(args[0])
+    if action == "wait_for_load_state":
+        return str(args[0] if args else kwargs.get("state", "load"))
+    if action in ("wait_for_selector", "query_selector", "query_selector_all") and args:
+        return str(args[0])
+    return ""
+
+
+class _ProfiledProxy:
+    """Transparent wrapper timing Playwright calls on a Page or Locator."""
+
+    __slots__ = ("_target", "_session", "_selector")
+
+    def __init__(self, target: Any, session: ProfilingSession, selector: str = ""):
+        self._target = target
+        self._session = session
+        self._selector = selector
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if isinstance(attr, Locator):
+            # Properties such as .first / .last
+            return _ProfiledProxy(attr, self._session, _join_selector(self._selector, name))
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        category = _METHOD_CATEGORIES.get(name)
+
+        def _call(*args: Any, **kwargs: Any) -> Any:
+            args = tuple(_unwrap(a) for a in args)
+            kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+            if category is None:
+                result = attr(*args, **kwargs)
+                return self._wrap_result(name, args, result)
+
+            bytes_before = self._session.bytes_received
+            start = time.perf_counter()
+            error = None
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"[:200]
+                raise
+            finally:
+                detail = _describe(name, args, kwargs) or self._selector
+                self._session.record(ProfileStep(
+                    category=category,
+                    action=name,
+                    duration_ms=(time.perf_counter() - start) * 1000,
+                    url=self._current_url(),
+                    bytes_received=self._session.bytes_received - bytes_before,
+                    detail=detail[:200],
+                    error=error,
+                ))
+            return self._wrap_result(name, args, result)
+
+        return _call
+
+    def _wrap_result(self, name: str, args: tuple, result: Any) -> Any:
+        if isinstance(result, Locator):
+            selector = str(args[0]) if args and isinstance(args[0], str) else name
+            return _ProfiledProxy(result, self._session, _join_selector(self._selector, selector))
+        if isinstance(result, list) and result and isinstance(result[0], Locator):
+            return [_ProfiledProxy(item, self._session, self._selector) for item in result]
+        return result
+
+    def _current_url(self) -> str:
+        try:
+            page = self._target if isinstance(self._target, Page) else self._target.page
+            return page.url
+        except Exception:
+            return ""
+
+    def __repr__(self) -> str:
+        return f"<Profiled {self._target!r}>"
+
+
+def profile_page(page: Page) -> Page:
+    """Return ``page`` instrumented for the active session, or unchanged if none."""
+    session = get_active_session()
+    if session is None or page is None or isinstance(page, _ProfiledProxy):
+        return page
+    session.attach(page)
+    return _ProfiledProxy(page, session)  # type: ignore[return-value]
+
+
+def _profiling_config() -> Dict[str, Any]:
+    # Imported lazily: the navigation helpers in legacy_utils import this module
+    from ...shared.utils.legacy_utils import load_config
+
+    try:
+        return load_config().get("profiling", {}) or {}
+    except Exception:
+        return {}
+
+
+def _report(session: ProfilingSession, output_dir: str, stamp: str) -> Dict[str, Any]:
+    summary = session.breakdown()
+    path = os.path.join(output_dir, f"{session.name}_{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({**summary, "all_steps": [asdict(s) for s in session.steps]}, f, ensure_ascii=False, indent=2)
+
+    print(f"\n⏱️ Perfil de '{session.name}': {summary['total_ms'] / 1000:.1f}s en {summary['steps']} pasos "
+          f"({summary['bytes_received'] / 1024:.0f} KB recibidos)")
+    for name, cat in summary["categories"].items():
+        share = cat["total_ms"] / summary["total_ms"] * 100 if summary["total_ms"] else 0
+        print(f"   • {name:<12} {cat['total_ms'] / 1000:8.1f}s  {share:5.1f}%  ({cat['count']} llamadas)")
+    print(f"   • {'sin perfilar':<12} {summary['unprofiled_ms'] / 1000:8.1f}s")
+    logger.info("⏱️ Perfil de ejecución guardado", path=path, total_ms=summary["total_ms"],
+                fixed_wait_ms=summary["fixed_wait_ms"], bytes=summary["bytes_received"])
+    return summary
+
+
+@contextmanager
+def profiling_session(name: str, context: Optional[BrowserContext] = None,
+                      enabled: Optional[bool] = None, trace: Optional[bool] = None) -> Iterator[Optional[ProfilingSession]]:
+    """Profile everything run inside the block on this thread.
+
+    ``enabled`` and ``trace`` default to ``profiling.enabled`` /
+    ``profiling.trace`` in config.yaml. Nested sessions reuse the outer one.
+    """
+    cfg = _profiling_config()
+    enabled = bool(cfg.get("enabled", False)) if enabled is None else enabled
+    if not enabled or get_active_session() is not None:
+        yield get_active_session()
+        return
+
+    trace = bool(cfg.get("trace", False)) if trace is None else trace
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name) or "run"
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    from ...shared.utils.legacy_utils import data_path
+
+    output_dir = str(cfg.get("output_dir") or data_path("profiles"))
+    os.makedirs(output_dir, exist_ok=True)
+
+    session = ProfilingSession(safe_name, slow_step_ms=float(cfg.get("slow_step_ms", DEFAULT_SLOW_STEP_MS)))
+    tracing = trace and context is not None
+    if tracing:
+        try:
+            context.tracing.start(screenshots=True, snapshots=True)
+        except Exception as e:
+            logger.warning("⚠️ No se pudo iniciar la traza de Playwright", error=str(e))
+            tracing = False
+
+    _state.session = session
+    try:
+        yield session
+    finally:
+        _state.session = None
+        session.detach()
+        if tracing:
+            trace_path = os.path.join(output_dir, f"{safe_name}_{stamp}.zip")
+            try:
+                context.tracing.stop(path=trace_path)
+                logger.info("🎞️ Traza de Playwright guardada", path=trace_path)
+            except Exception as e:
+                logger.warning("⚠️ No se pudo guardar la traza de Playwright", error=str(e))
+        try:
+            _report(session, output_dir, stamp)
+        except Exception as e:
+            logger.warning("⚠️ No se pudo generar el informe de perfilado", error=str(e))
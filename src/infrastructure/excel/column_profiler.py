@@ -0,0 +1,139 @@
+"""
+Perfilado vectorizado de columnas para el mapeo de campos al subir listas.
+
+En lugar de deducir el tipo de cada columna a partir de la primera fila, se
+evalúan todos los valores no vacíos de la columna (o una muestra si la hoja es
+muy grande) con expresiones regulares sobre la Serie completa. Cada tipo
+candidato obtiene una puntuación (fracción de valores que lo cumplen) y se
+elige el más específico cuya puntuación supera el umbral; si ninguno lo
+supera la columna queda como ``Texto``.
+
+Los tipos devueltos son las etiquetas de Acumbamail (``tipo_campo.VALUE_TO_LABEL``).
+Los emails se detectan para informar, pero se mapean como ``Texto`` porque
+Acumbamail no tiene un tipo de campo email.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from ...shared.logging.logger import get_logger
+
+logger = get_logger()
+
+UMBRAL_CONFIANZA = 0.95
+MUESTRA_MAXIMA = 50_000
+
+TIPO_TEXTO = "Texto"
+TIPO_ENTERO = "Número entero"
+TIPO_DECIMAL = "Número decimal"
+TIPO_FECHA = "Fecha"
+TIPO_URL = "Url"
+
+# Enteros sin ceros a la izquierda (códigos postales o teléfonos con 0 inicial son texto)
+# y con 15 dígitos como máximo (los identificadores más largos no caben en un entero)
+_PATRON_ENTERO = r"[-+]?(?:0|[1-9]\d{0,14})"
+_PATRON_DECIMAL = r"[-+]?(?:\d+[.,]\d+|\d+[.,]|[.,]\d+)(?:[eE][-+]?\d+)?"
+_PATRON_FECHA = (
+    r"(?:\d{4}[-/]\d{1,2}[-/]\d{1,2}|\d{1,2}[-/]\d{1,2}[-/]\d{4})"
+    r"(?:[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?"
+)
+_PATRON_URL = r"(?:https?://[^\s/$.?#][^\s]*|www\.[^\s]+\.[^\s]+)"
+_PATRON_EMAIL = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+
+# Orden de preferencia: del tipo más específico al más general
+_CANDIDATOS = (
+    ("entero", _PATRON_ENTERO, TIPO_ENTERO),
+    ("decimal", None, TIPO_DECIMAL),  # enteros o decimales
+    ("fecha", _PATRON_FECHA, TIPO_FECHA),
+    ("url", _PATRON_URL, TIPO_URL),
+    ("email", _PATRON_EMAIL, TIPO_TEXTO),
+)
+
+
+@dataclass
+class PerfilColumna:
+    """Tipo detectado de una columna y las puntuaciones de cada candidato."""
+    nombre: str
+    tipo: str = TIPO_TEXTO
+    confianza: float = 1.0
+    detectado: str = "texto"
+    puntuaciones: Dict[str, float] = field(default_factory=dict)
+    no_vacios: int = 0
+    muestra: str = ""
+
+
+def _muestra(df: pd.DataFrame, max_filas: Optional[int]) -> pd.DataFrame:
+    """Filas a perfilar: todas, o una muestra reproducible si la hoja es mayor que ``max_filas``."""
+    if not max_filas or len(df) <= max_filas:
+        return df
+    return df.sample(n=max_filas, random_state=0)
+
+
+def perfilar_columna(valores: pd.Series, nombre: str = "", umbral: float = UMBRAL_CONFIANZA) -> PerfilColumna:
+    """
+    Perfila una columna de texto.
+
+    Args:
+        valores: Valores de la columna (se tratan como texto; NaN cuenta como vacío)
+        nombre: Nombre de la columna
+        umbral: Puntuación mínima para aceptar un tipo distinto de ``Texto``
+    """
+    texto = valores.fillna("").astype(str).str.strip()
+    texto = texto[(texto != "") & (~texto.str.lower().isin(("nan", "none", "nat")))]
+    perfil = PerfilColumna(nombre=str(nombre), no_vacios=int(len(texto)))
+    if texto.empty:
+        return perfil
+    perfil.muestra = texto.iloc[0]
+
+    total = len(texto)
+    coincidencias: Dict[str, pd.Series] = {}
+    for clave, patron, _tipo in _CANDIDATOS:
+        if clave == "decimal":
+            coincide = coincidencias["entero"] | texto.str.fullmatch(_PATRON_DECIMAL)
+        else:
+            coincide = texto.str.fullmatch(patron, case=False)
+        coincidencias[clave] = coincide
+        perfil.puntuaciones[clave] = round(float(coincide.sum()) / total, 4)
+
+    for clave, _patron, tipo in _CANDIDATOS:
+        if perfil.puntuaciones[clave] >= umbral:
+            perfil.tipo = tipo
+            perfil.detectado = clave
+            perfil.confianza = perfil.puntuaciones[clave]
+            return perfil
+
+    # Texto: la confianza baja cuanto más se acerca algún candidato al umbral
+    perfil.confianza = round(1.0 - max(perfil.puntuaciones.values()), 4)
+    return perfil
+
+
+def perfilar_columnas(
+    df: pd.DataFrame,
+    max_filas: Optional[int] = MUESTRA_MAXIMA,
+    umbral: float = UMBRAL_CONFIANZA,
+) -> List[PerfilColumna]:
+    """
+    Perfila todas las columnas de ``df`` (en el orden de ``df.columns``).
+
+    Args:
+        df: Hoja leída como texto
+        max_filas: Filas máximas a evaluar por columna (None = la hoja completa)
+        umbral: Puntuación mínima para aceptar un tipo distinto de ``Texto``
+    """
+    filas = _muestra(df, max_filas)
+    perfiles = [perfilar_columna(filas.iloc[:, i], nombre, umbral) for i, nombre in enumerate(df.columns)]
+    # La muestra puede no contener el primer valor de la hoja; se conserva como ejemplo
+    for i, perfil in enumerate(perfiles):
+        primeros = df.iloc[:, i].dropna().astype(str).str.strip()
+        primeros = primeros[primeros != ""]
+        if not primeros.empty:
+            perfil.muestra = primeros.iloc[0]
+
+    logger.debug(
+        "🔎 Columnas perfiladas",
+        filas=len(df),
+        filas_evaluadas=len(filas),
+        tipos={p.nombre: f"{p.tipo} ({p.confianza:.0%})" for p in perfiles},
+    )
+    return perfiles
@@ -0,0 +1,193 @@
+"""
+Conversión en streaming de una hoja Excel a CSV.
+
+La hoja se lee fila a fila con openpyxl en modo ``read_only`` y se escribe en
+bloques, sin cargar el libro completo en un DataFrame: la memoria no depende
+del tamaño de la hoja y el CSV empieza a escribirse desde la primera fila.
+Opcionalmente el resultado se reparte en varios archivos de tamaño máximo
+(cada uno con la cabecera) para formularios de subida con límite de tamaño.
+"""
+import csv
+import io
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time
+from typing import Any, Iterator, List, Optional, Sequence
+
+from openpyxl import load_workbook
+
+from ...shared.logging.logger import get_logger
+
+logger = get_logger()
+
+FILAS_POR_BLOQUE = 5000
+ENCODING_CSV = "utf-8-sig"  # compatible con Excel
+
+
+@dataclass
+class ResultadoConversionCsv:
+    """Archivos generados y rendimiento de la conversión."""
+    archivos: List[str] = field(default_factory=list)
+    filas: int = 0
+    bytes_escritos: int = 0
+    segundos: float = 0.0
+
+    @property
+    def mb_por_segundo(self) -> float:
+        if self.segundos <= 0:
+            return 0.0
+        return self.bytes_escritos / (1024 * 1024) / self.segundos
+
+
+def _texto(valor: Any) -> str:
+    """Valor de celda como texto, con el mismo formato que ``read_excel(dtype=str)``."""
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return valor.isoformat(sep=" ")
+    if isinstance(valor, (date, dt_time)):
+        return valor.isoformat()
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _encabezados(fila: Sequence[Any]) -> List[str]:
+    valores = list(fila)
+    while valores and valores[-1] in (None, ""):
+        valores.pop()
+    return [_texto(v) if v not in (None, "") else f"Unnamed: {i}" for i, v in enumerate(valores)]
+
+
+def _filas_hoja(archivo_excel: str, hoja: str) -> Iterator[List[str]]:
+    """Cabecera y filas no vacías de la hoja, como listas de texto del ancho de la cabecera."""
+    wb = load_workbook(archivo_excel, read_only=True, data_only=True)
+    try:
+        if hoja not in wb.sheetnames:
+            raise ValueError(f"La hoja '{hoja}' no existe en {archivo_excel}")
+        filas = wb[hoja].iter_rows(values_only=True)
+        cabecera = _encabezados(next(filas, ()))
+        yield cabecera
+        ancho = len(cabecera)
+        for fila in filas:
+            valores = [_texto(v) for v in fila[:ancho]]
+            if not any(valores):
+                continue
+            if len(valores) < ancho:
+                valores.extend([""] * (ancho - len(valores)))
+            yield valores
+    finally:
+        wb.close()
+
+
+def convertir_hoja_a_csv(
+    archivo_excel: str,
+    hoja: str,
+    destino: str,
+    max_bytes_por_archivo: Optional[int] = None,
+    filas_por_bloque: int = FILAS_POR_BLOQUE,
+) -> ResultadoConversionCsv:
+    """
+    Convierte ``hoja`` de ``archivo_excel`` a CSV (utf-8-sig).
+
+    Args:
+        archivo_excel: Libro de origen
+        hoja: Hoja a convertir
+        destino: Ruta del CSV; al repartir se generan ``<base>_2.csv``, ``<base>_3.csv``...
+        max_bytes_por_archivo: Tamaño máximo aproximado de cada CSV (None = un solo archivo)
+        filas_por_bloque: Filas acumuladas antes de escribir en disco
+
+    Returns:
+        ResultadoConversionCsv con los archivos, filas, bytes y MB/s
+
+    Si la conversión falla se borran los archivos ya escritos y se propaga el error.
+    """
+    inicio = time.perf_counter()
+    resultado = ResultadoConversionCsv()
+    base, extension = os.path.splitext(destino)
+    extension = extension or ".csv"
+
+    filas = _filas_hoja(archivo_excel, hoja)
+    cabecera = next(filas)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(cabecera)
+    bytes_cabecera = len(buffer.getvalue().encode("utf-8"))
+    buffer.seek(0)
+    buffer.truncate()
+
+    archivo = None
+    bytes_archivo = 0
+    bytes_pendientes = 0  # estimación de lo acumulado en el buffer
+
+    def abrir_siguiente():
+        nonlocal archivo, bytes_archivo
+        if archivo is not None:
+            archivo.close()
+        ruta = destino if not resultado.archivos else f"{base}_{len(resultado.archivos) + 1}{extension}"
+        archivo = open(ruta, "w", newline="", encoding=ENCODING_CSV)
+        csv.writer(archivo, lineterminator="\n").writerow(cabecera)
+        resultado.archivos.append(ruta)
+        bytes_archivo = bytes_cabecera
+
+    def volcar():
+        nonlocal bytes_archivo, bytes_pendientes
+        texto = buffer.getvalue()
+        if texto:
+            archivo.write(texto)
+            tamano = len(texto.encode("utf-8"))
+            bytes_archivo += tamano
+            resultado.bytes_escritos += tamano
+        buffer.seek(0)
+        buffer.truncate()
+        bytes_pendientes = 0
+
+    try:
+        abrir_siguiente()
+        resultado.bytes_escritos += bytes_cabecera
+        pendientes = 0
+        for fila in filas:
+            if max_bytes_por_archivo:
+                tamano_fila = len(",".join(fila).encode("utf-8")) + 1
+                if bytes_archivo + bytes_pendientes + tamano_fila > max_bytes_por_archivo and (
+                    pendientes or bytes_archivo > bytes_cabecera
+                ):
+                    volcar()
+                    pendientes = 0
+                    abrir_siguiente()
+                    resultado.bytes_escritos += bytes_cabecera
+                bytes_pendientes += tamano_fila
+            writer.writerow(fila)
+            resultado.filas += 1
+            pendientes += 1
+            if pendientes >= filas_por_bloque:
+                volcar()
+                pendientes = 0
+        volcar()
+    except BaseException:
+        # No dejar partes a medias en el directorio temporal
+        if archivo is not None:
+            archivo.close()
+        for ruta in resultado.archivos:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+        logger.warning("🧹 Conversión a CSV interrumpida, partes eliminadas", hoja=hoja, archivos=len(resultado.archivos))
+        raise
+    finally:
+        if archivo is not None:
+            archivo.close()
+
+    resultado.segundos = time.perf_counter() - inicio
+    logger.info(
+        "📄 Hoja convertida a CSV",
+        hoja=hoja,
+        filas=resultado.filas,
+        archivos=len(resultado.archivos),
+        mb=round(resultado.bytes_escritos / (1024 * 1024), 2),
+        mb_por_segundo=round(resultado.mb_por_segundo, 2),
+        segundos=round(resultado.segundos, 2),
+    )
+    return resultado
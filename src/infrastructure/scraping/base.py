@@ -8,6 +8,7 @@ import time
 from dataclasses import dataclass
 
 from src.shared.logging.logger import get_logger
+from src.infrastructure.browser.page_profiler import profile_page
 
 logger = get_logger()
 
@@ -27,7 +28,7 @@ class BaseScraper:
     """Clase base para todos los scrapers"""
     
     def __init__(self, page: Page, config: Optional[ScrapingConfig] = None):
-        self.page = page
+        self.page = profile_page(page)
         self.config = config or ScrapingConfig()
         
         # Crear directorio de screenshots si no existe
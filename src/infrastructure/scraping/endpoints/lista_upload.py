@@ -9,7 +9,7 @@ from playwright.sync_api import (
     Error as PWError,
     expect,
 )
-from typing import Optional, Callable, Tuple, Any
+from typing import Optional, Callable, Tuple, Any, List
 from datetime import datetime
 import pandas as pd
 import os
@@ -33,8 +33,10 @@ if __package__ in (None, ""):
     __package__ = "src"
 
 from ....shared.logging.logger import get_logger
-from ....tipo_campo import field_type_label
-from ....utils import get_timeouts
+from ....utils import get_timeouts, load_config
+from ....cache.column_schema import get_column_schema_store, huella_archivo
+from ...excel.column_profiler import MUESTRA_MAXIMA, perfilar_columnas
+from ...excel.csv_stream import convertir_hoja_a_csv
 
 
 class ListUploader:
@@ -113,54 +115,85 @@ class ListUploader:
             return False
 
     def cargar_columnas_excel(
-        self, archivo: str, hoja: str
+        self, archivo: str, hoja: str, lista: Optional[str] = None
     ) -> tuple[list[ListUploadColumn], list[str]]:
         """
-        Carga columnas del Excel y obtiene valores de ejemplo
+        Carga columnas del Excel con el tipo de campo detectado sobre la columna completa
+
+        El esquema se guarda por lista y huella del archivo: si se vuelve a subir
+        el mismo libro a la misma lista no se lee ni se perfila la hoja.
+
+        Args:
+            archivo: Libro de origen
+            hoja: Hoja a subir
+            lista: Nombre de la lista destino (por defecto, el de la hoja)
 
         Returns:
             (columnas, segunda_fila): Lista de columnas con metadatos y valores de la segunda fila
         """
         try:
-            with pd.ExcelFile(archivo, engine="openpyxl") as xls:
-                # Leer como texto y reemplazar NaN por vacío
-                df = pd.read_excel(xls, sheet_name=hoja, dtype=str).fillna("")
-
-            columnas_nombres = [str(c) for c in df.columns.tolist()]
+            lista = lista or hoja
+            store = get_column_schema_store()
+            huella = huella_archivo(archivo) if store.enabled else ""
+            clave = f"{lista}|{hoja}"
 
-            # Primera fila de datos (debajo del header)
-            if len(df) > 0:
-                segunda_fila = [str(v) for v in df.iloc[0].tolist()]
-            else:
-                segunda_fila = [""] * len(columnas_nombres)
-
-            # Crear objetos ListUploadColumn con detección de tipo
-            columnas = []
-            for idx, nombre in enumerate(
-                columnas_nombres, start=1
-            ):  # Start at 1 (Columna 1, 2, 3, etc.)
-                valor_ejemplo = (
-                    segunda_fila[idx - 1] if idx - 1 < len(segunda_fila) else ""
+            esquema = store.load(clave, huella) if store.enabled else None
+            if esquema is not None:
+                self.logger.info(
+                    "💾 Esquema de columnas reutilizado", lista=lista, hoja=hoja, columnas=len(esquema)
                 )
-                tipo_campo = (
-                    field_type_label(valor_ejemplo) if valor_ejemplo else "Texto"
+            else:
+                with pd.ExcelFile(archivo, engine="openpyxl") as xls:
+                    # Leer como texto y reemplazar NaN por vacío
+                    df = pd.read_excel(xls, sheet_name=hoja, dtype=str).fillna("")
+
+                perfiles = perfilar_columnas(df, max_filas=self._max_filas_perfilado())
+                # Primera fila de datos (debajo del header)
+                primera = [str(v) for v in df.iloc[0].tolist()] if len(df) > 0 else [""] * len(perfiles)
+                esquema = [
+                    {
+                        "name": perfil.nombre,
+                        "field_type": perfil.tipo,
+                        "confidence": perfil.confianza,
+                        "detected": perfil.detectado,
+                        "sample_value": primera[idx],
+                    }
+                    for idx, perfil in enumerate(perfiles)
+                ]
+                if store.enabled:
+                    store.save(clave, huella, esquema)
+                self.logger.info(
+                    "🔎 Columnas perfiladas",
+                    lista=lista,
+                    hoja=hoja,
+                    filas=len(df),
+                    tipos={c["name"]: f"{c['field_type']} ({c['confidence']:.0%})" for c in esquema},
                 )
 
-                columnas.append(
-                    ListUploadColumn(
-                        index=idx,
-                        name=nombre,
-                        field_type=tipo_campo,
-                        sample_value=valor_ejemplo,
-                    )
+            segunda_fila = [c["sample_value"] for c in esquema]
+            columnas = [
+                ListUploadColumn(
+                    index=idx,  # Start at 1 (Columna 1, 2, 3, etc.)
+                    name=c["name"],
+                    field_type=c["field_type"],
+                    sample_value=c["sample_value"],
                 )
-
+                for idx, c in enumerate(esquema, start=1)
+            ]
             return columnas, segunda_fila
 
         except Exception as e:
             self.logger.error(f"Error cargando columnas: {e}")
             return [], []
 
+    def _max_filas_perfilado(self) -> Optional[int]:
+        """Filas evaluadas por columna (``list_upload.profile_rows``; 0 = la hoja completa)."""
+        try:
+            filas = (load_config().get("list_upload", {}) or {}).get("profile_rows", MUESTRA_MAXIMA)
+            return int(filas) or None
+        except Exception:
+            return MUESTRA_MAXIMA
+
     def generar_archivo_temporal_csv(self, archivo_excel: str, hoja: str) -> str:
         """
         Genera un CSV temporal solo con la hoja indicada
@@ -168,22 +201,49 @@ class ListUploader:
         Returns:
             Ruta del archivo temporal CSV
         """
-        try:
-            with pd.ExcelFile(archivo_excel, engine="openpyxl") as xls:
-                df = pd.read_excel(xls, sheet_name=hoja, dtype=str).fillna("")
+        return self.generar_archivos_temporales_csv(archivo_excel, hoja, max_mb=None)[0]
+
+    def generar_archivos_temporales_csv(
+        self, archivo_excel: str, hoja: str, max_mb: Optional[float] = None
+    ) -> List[str]:
+        """
+        Genera uno o varios CSV temporales con la hoja indicada, en streaming
+
+        Args:
+            archivo_excel: Libro de origen
+            hoja: Hoja a convertir
+            max_mb: Tamaño máximo de cada CSV; None o 0 genera un único archivo
 
+        Returns:
+            Rutas de los archivos temporales CSV (cada uno con cabecera)
+        """
+        try:
             # CSV temporal compatible con Excel (utf-8-sig)
             tmp_path = os.path.join(
                 tempfile.gettempdir(), f"lista_{uuid.uuid4().hex}.csv"
             )
-            df.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+            max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+            conversion = convertir_hoja_a_csv(archivo_excel, hoja, tmp_path, max_bytes)
 
-            self.logger.info(f"Archivo temporal CSV generado: {tmp_path}")
-            return tmp_path
+            self.logger.info(
+                f"Archivo temporal CSV generado: {tmp_path} "
+                f"({conversion.filas} filas, {len(conversion.archivos)} archivo(s), "
+                f"{conversion.mb_por_segundo:.1f} MB/s)"
+            )
+            return conversion.archivos
         except Exception as e:
             self.logger.error(f"Error generando CSV temporal: {e}")
             raise
 
+    def _max_mb_por_archivo(self) -> Optional[float]:
+        """Tamaño máximo por CSV subido (``list_upload.max_csv_mb``); None = sin dividir."""
+        try:
+            valor = (load_config().get("list_upload", {}) or {}).get("max_csv_mb")
+            return float(valor) if valor else None
+        except (TypeError, ValueError):
+            self.logger.warning("list_upload.max_csv_mb no válido, se sube un único archivo")
+            return None
+
     def crear_lista(self, page: Page, nombre_lista: str) -> bool:
         """
         Crea una nueva lista en Acumbamail usando selectores modernos
@@ -657,7 +717,7 @@ class ListUploader:
             subscribers_uploaded=False,
         )
 
-        archivo_temporal = None
+        archivos_temporales: List[str] = []
 
         try:
             # Etapa 1: Navegación (0-10%)
@@ -707,11 +767,11 @@ class ListUploader:
                 )
                 progress_callback(progreso)
 
-            archivo_temporal = self.generar_archivo_temporal_csv(
-                config.archivo_path, config.hoja_nombre
+            archivos_temporales = self.generar_archivos_temporales_csv(
+                config.archivo_path, config.hoja_nombre, self._max_mb_por_archivo()
             )
 
-            if not self.subir_archivo(page, archivo_temporal):
+            if not self.subir_archivo(page, archivos_temporales[0]):
                 session.add_error("No se pudo subir el archivo")
                 session.complete_session(success=False)
                 resultado.error_message = "Error subiendo el archivo"
@@ -750,6 +810,19 @@ class ListUploader:
                 resultado.error_message = "Error finalizando la subida"
                 return resultado
 
+            # Partes adicionales (CSV dividido por tamaño): misma subida sobre la lista ya creada
+            for numero, archivo_parte in enumerate(archivos_temporales[1:], 2):
+                self.logger.info(f"📤 Subiendo parte {numero}/{len(archivos_temporales)}")
+                subida_ok = self.subir_archivo(page, archivo_parte)
+                if subida_ok:
+                    self.mapear_columnas(page, config.columnas)
+                    subida_ok = self.finalizar_subida(page)
+                if not subida_ok:
+                    session.add_error(f"No se pudo subir la parte {numero}")
+                    session.complete_session(success=False)
+                    resultado.error_message = f"Error subiendo la parte {numero} de {len(archivos_temporales)}"
+                    return resultado
+
             resultado.subscribers_uploaded = True
 
             # Éxito completo
@@ -766,12 +839,13 @@ class ListUploader:
             resultado.error_message = error_msg
 
         finally:
-            # Limpiar archivo temporal
-            if archivo_temporal and os.path.exists(archivo_temporal):
-                try:
-                    os.remove(archivo_temporal)
-                    self.logger.debug(f"Archivo temporal eliminado: {archivo_temporal}")
-                except Exception as e:
-                    self.logger.warning(f"No se pudo eliminar archivo temporal: {e}")
+            # Limpiar archivos temporales
+            for archivo_temporal in archivos_temporales:
+                if os.path.exists(archivo_temporal):
+                    try:
+                        os.remove(archivo_temporal)
+                        self.logger.debug(f"Archivo temporal eliminado: {archivo_temporal}")
+                    except Exception as e:
+                        self.logger.warning(f"No se pudo eliminar archivo temporal: {e}")
 
         return resultado
@@ -15,13 +15,16 @@ from .utils import (
     navegar_a_reportes,
     obtener_total_paginas,
     navegar_siguiente_pagina,
+    ir_a_pagina,
 )
 from .autentificacion import login, manejar_popup_cookies
+from .infrastructure.browser.browser_service import authenticated_page
+from .cache.checkpoints import get_checkpoint_store
 from .infrastructure.api import API
 from .shared.utils.legacy_utils import is_on_login_page
 from .core.authentication.exceptions import SessionExpiredError, AuthenticationFailedError
 
-from playwright.sync_api import sync_playwright, Page
+from playwright.sync_api import sync_playwright, Page, BrowserContext
 import re
 import time
 from functools import wraps
@@ -396,12 +399,32 @@ def procesar_todas_las_paginas(page: Page) -> list[list[str]]:
         total_paginas = obtener_total_paginas(page)
         logger.info(f"📚 Total de páginas a procesar: {total_paginas}")
 
+        # Retomar un listado anterior interrumpido, si lo hay
+        checkpoints = get_checkpoint_store()
+        clave_checkpoint = "listar_campanias"
+        pagina_inicial = checkpoints.start(clave_checkpoint, total_paginas)
+        if pagina_inicial > 1:
+            if pagina_inicial > total_paginas or ir_a_pagina(page, pagina_inicial):
+                for campania in checkpoints.load_rows(clave_checkpoint):
+                    if len(campania) >= 3 and campania[2] not in ids_globales:
+                        ids_globales.add(campania[2])
+                        todas_campanias.append(campania)
+                logger.info(f"♻️ {len(todas_campanias)} campañas recuperadas, continuando en página {pagina_inicial}")
+            else:
+                logger.warning("⚠️ No se pudo reanudar desde checkpoint, reiniciando desde la página 1")
+                checkpoints.discard(clave_checkpoint)
+                navegar_a_reportes(page)
+                checkpoints.start(clave_checkpoint, total_paginas)
+                pagina_inicial = 1
+
         # Procesar cada página
-        for pagina_actual in range(1, total_paginas + 1):
+        pagina_actual = pagina_inicial - 1
+        for pagina_actual in range(pagina_inicial, total_paginas + 1):
             logger.info(f"📖 === PROCESANDO PÁGINA {pagina_actual} DE {total_paginas} ===")
 
             # Extraer campañas de la página actual
             campanias_pagina = extraer_campanias_de_pagina(page)
+            checkpoints.save_page(clave_checkpoint, pagina_actual, campanias_pagina)
 
             # Filtrar duplicados globales (entre páginas)
             campanias_nuevas = 0
@@ -436,6 +459,9 @@ def procesar_todas_las_paginas(page: Page) -> list[list[str]]:
                 page.wait_for_timeout(2000)
                 logger.debug(f"✅ Navegación a página {pagina_actual + 1} completada")
 
+        if checkpoints.is_complete(clave_checkpoint):
+            checkpoints.complete(clave_checkpoint)
+
         logger.success(f"🎉 Procesamiento completo: {len(todas_campanias)} campañas extraídas de {pagina_actual} páginas")
 
     except Exception as e:
@@ -444,57 +470,52 @@ def procesar_todas_las_paginas(page: Page) -> list[list[str]]:
     return todas_campanias
 
 
-def main():
+def procesar_listado_campanias(page: Page):
+    """
+    Extrae el listado de campañas usando una página ya autenticada y lo guarda en Excel
+    """
+    # Navegar a reportes
+    logger.info("📊 Navegando a sección de reportes")
+    navegar_a_reportes(page)
+    logger.success("✅ Navegación a reportes completada")
+
+    # Esperar a que la página cargue completamente
+    logger.debug("⏳ Esperando carga completa de la página")
+    page.wait_for_load_state("networkidle", timeout=60000)
+    page.wait_for_timeout(3000)  # Espera adicional para asegurar carga completa
+    logger.debug("✅ Página cargada completamente")
+
+    # Procesar todas las páginas y extraer campañas con scraping
+    logger.info("📥 Iniciando extracción de campañas mediante scraping")
+    informe = procesar_todas_las_paginas(page)
+    logger.info(f"📊 Total de campañas extraídas mediante scraping: {len(informe)}")
+
+    # Guardar en Excel
+    if informe:
+        logger.info("💾 Guardando datos en archivo Excel")
+        guardar_datos_en_excel(informe, ARCHIVO_BUSQUEDA)
+        logger.success("✅ Programa completado exitosamente")
+        notify("Listado de Campañas", f"Se extrajeron {len(informe)} campañas correctamente", "info")
+    else:
+        logger.warning("⚠️ No se encontraron campañas para guardar")
+        notify("Listado de Campañas", "No se encontraron campañas", "warning")
+
+
+def main(page: Page | None = None, context: BrowserContext | None = None):
     """
     Función principal del programa de listado de campañas
     Usa API para obtener IDs y scraping para completar los datos
+
+    Si se recibe una página autenticada (p. ej. del servicio de navegador persistente)
+    se reutiliza; si no, se lanza un navegador propio.
     """
     logger.info("🚀 Iniciando programa de listado de campañas (modo híbrido: API + Scraping)")
 
     try:
-        with sync_playwright() as p:
-            # Configurar navegador
-            logger.info("🌐 Configurando navegador Playwright")
-            browser = configurar_navegador(p, extraccion_oculta=False)
-            context = crear_contexto_navegador(browser, extraccion_oculta=False)
-            page = context.new_page()
-            logger.success("✅ Navegador configurado correctamente")
-
-            # Login
-            logger.info("🔐 Iniciando proceso de autenticación")
-            login(page, context)
+        logger.info("🌐 Preparando navegador autenticado", navegador_reutilizado=page is not None)
+        with authenticated_page(page, context, headless=False) as (page, context):
             logger.success("✅ Sesión iniciada correctamente")
-
-            # Navegar a reportes
-            logger.info("📊 Navegando a sección de reportes")
-            navegar_a_reportes(page)
-            logger.success("✅ Navegación a reportes completada")
-
-            # Esperar a que la página cargue completamente
-            logger.debug("⏳ Esperando carga completa de la página")
-            page.wait_for_load_state("networkidle", timeout=60000)
-            page.wait_for_timeout(3000)  # Espera adicional para asegurar carga completa
-            logger.debug("✅ Página cargada completamente")
-
-            # Procesar todas las páginas y extraer campañas con scraping
-            logger.info("📥 Iniciando extracción de campañas mediante scraping")
-            informe = procesar_todas_las_paginas(page)
-            logger.info(f"📊 Total de campañas extraídas mediante scraping: {len(informe)}")
-
-            # Guardar en Excel
-            if informe:
-                logger.info("💾 Guardando datos en archivo Excel")
-                guardar_datos_en_excel(informe, ARCHIVO_BUSQUEDA)
-                logger.success("✅ Programa completado exitosamente")
-                notify("Listado de Campañas", f"Se extrajeron {len(informe)} campañas correctamente", "info")
-            else:
-                logger.warning("⚠️ No se encontraron campañas para guardar")
-                notify("Listado de Campañas", "No se encontraron campañas", "warning")
-
-            # Cerrar navegador
-            logger.debug("🔚 Cerrando navegador")
-            browser.close()
-            logger.info("✅ Navegador cerrado correctamente")
+            procesar_listado_campanias(page)
 
     except Exception as e:
         logger.error(f"❌ Error crítico en el programa: {e}", extra={"error": str(e)})
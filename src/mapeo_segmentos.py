@@ -3,17 +3,32 @@ Módulo para mapear segmentos de Excel a archivos de listas individuales.
 Procesa el archivo Segmentos.xlsx y aplica las condiciones a los archivos de listas correspondientes.
 """
 import logging
+import threading
+import time
+import numpy as np
 import pandas as pd
-from collections import defaultdict
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional, Tuple
 # from playwright.sync_api import TimeoutError as PlaywrightTimeoutError  # no longer used
 
-from .utils import data_path, load_config, notify
+from .utils import config_int, data_path, load_config, notify
 from .logger import get_logger
 from .excel_helper import ExcelHelper
+from .cache.excel_sidecar import leer_excel_cacheado
+from .cache.sync_snapshot import (
+    DeltaSincronizacion,
+    SegmentSyncSnapshotStore,
+    calcular_delta,
+    calcular_hashes,
+    get_segment_snapshot_store,
+    normalizar_emails,
+)
 from .infrastructure.api import API
+from .infrastructure.browser.browser_service import get_browser_service, shutdown_browser_service
+from .infrastructure.api.merge_fields import provisionar_campos
 from .crear_lista_mejorado import extraer_id_desde_nombre_archivo
+from .motor_segmentos import MotorSegmentos
 from .scrapping.endpoints import SegmentsScrapingService
 
 logger = get_logger()
@@ -22,6 +37,9 @@ logger = get_logger()
 ARCHIVO_SEGMENTOS = data_path("Segmentos.xlsx")
 CARPETA_LISTAS = data_path("listas")
 
+# Listas procesadas en paralelo: Segmentos.xlsx es compartido (el scraping lo serializa el servicio de navegador)
+_segmentos_lock = threading.RLock()
+
 def obtener_id_lista_desde_archivo(nombre_lista: str) -> Optional[int]:
     """
     Obtiene el ID de una lista buscando archivos con formato -ID-[numero].xlsx en /data/listas/
@@ -376,8 +394,8 @@ def procesar_excel_segmentos(archivo_excel: str) -> Tuple[List[str], List[List[A
     """
     logger.info(f"Procesando archivo de segmentos: {archivo_excel}")
 
-    # Leer el archivo Excel
-    df = pd.read_excel(archivo_excel)
+    # Leer el archivo Excel (desde el sidecar si no ha cambiado)
+    df = leer_excel_cacheado(archivo_excel)
 
     # Eliminar columna "CREACION SEGMENTO" si existe
     if 'CREACION SEGMENTO' in df.columns:
@@ -399,40 +417,16 @@ def procesar_excel_segmentos(archivo_excel: str) -> Tuple[List[str], List[List[A
         logger.error(f"Columnas requeridas faltantes: {faltantes}")
         return [], []
 
-    # Diccionario para agrupar por NOMBRE LISTA
-    grouped_data = defaultdict(set)
-
-    # Función helper para limpiar valores NaN
-    def get_clean_value(row, col):
-        """Obtiene valor limpio, convirtiendo NaN a None"""
-        val = row.get(col)
-        return None if pd.isna(val) else val
-
-    # Procesar cada fila
-    for _, row in df.iterrows():
-        nombre_lista = row['NOMBRE LISTA']
-
-        if pd.isna(nombre_lista):
-            continue
+    # Condiciones únicas por NOMBRE LISTA (NaN -> None), sin recorrer fila a fila
+    columnas_condicion = ['NOMBRE LISTA'] + headers
+    df_condiciones = df.reindex(columns=columnas_condicion)
+    df_condiciones = df_condiciones[df_condiciones['NOMBRE LISTA'].notna()]
+    df_condiciones = df_condiciones.astype(object).where(df_condiciones.notna(), None)
+    df_condiciones = df_condiciones.drop_duplicates()
 
-        # Crear tupla con los valores que nos interesan, convirtiendo NaN a None
-        valores = (
-            get_clean_value(row, 'NOMBRE SEGMENTO'),
-            get_clean_value(row, 'SEDE'),
-            get_clean_value(row, 'ORGANO'),
-            get_clean_value(row, 'N ORGANO'),
-            get_clean_value(row, 'ROL USUARIO'),
-            get_clean_value(row, 'PERFIL USUARIO')
-        )
-
-        # Añadir al set (automáticamente elimina duplicados)
-        grouped_data[nombre_lista].add(valores)
-
-    # Convertir sets a listas para el formato final
     resultado_final = []
-    for nombre_lista, valores_set in grouped_data.items():
-        valores_lista = [list(tupla) for tupla in valores_set]
-        resultado_final.append([nombre_lista, valores_lista])
+    for nombre_lista, grupo in df_condiciones.groupby('NOMBRE LISTA', sort=False):
+        resultado_final.append([nombre_lista, grupo[headers].values.tolist()])
 
     logger.info(f"Procesadas {len(resultado_final)} listas con segmentos")
     return headers, resultado_final
@@ -494,69 +488,10 @@ def aplicar_condiciones_segmento(df: pd.DataFrame, condiciones: List[Any], heade
     """
     if len(condiciones) != len(headers):
         logger.warning(f"Longitud de condiciones ({len(condiciones)}) no coincide con headers ({len(headers)})")
-        return pd.Series([False] * len(df))
-
-    # Empezar con todas las filas como True
-    mask = pd.Series([True] * len(df))
-    condiciones_aplicadas = 0
-
-    # Filtrar condiciones válidas para logging
-    condiciones_limpias = []
-    for i, (valor, columna) in enumerate(zip(condiciones, headers)):
-        if i == 0:  # NOMBRE SEGMENTO siempre se incluye
-            condiciones_limpias.append(f"{columna}: '{valor}'")
-        elif not (pd.isna(valor) or valor == '' or valor is None or str(valor).lower() == 'nan'):
-            condiciones_limpias.append(f"{columna}: '{valor}'")
-        else:
-            condiciones_limpias.append(f"{columna}: [IGNORADO - NaN/vacío]")
-
-    logger.info(f"Aplicando condiciones para segmento '{condiciones[0]}':")
-    for condicion in condiciones_limpias:
-        logger.info(f"  - {condicion}")
-    logger.info(f"Columnas disponibles en DataFrame: {list(df.columns)}")
-
-    # Aplicar cada condición con AND
-    for i, (valor, columna) in enumerate(zip(condiciones[1:], headers[1:]), 1):  # Saltar NOMBRE SEGMENTO
-        if columna not in df.columns:
-            logger.warning(f"Columna '{columna}' no existe en DataFrame")
-            continue
-
-        # Ignorar valores None, vacíos, NaN o string 'nan'
-        if pd.isna(valor) or valor == '' or valor is None or str(valor).lower() == 'nan':
-            logger.info(f"Saltando condición para '{columna}': valor vacío/nulo (valor: {repr(valor)})")
-            continue
-
-        # Mostrar valores únicos en la columna para debugging
-        valores_unicos = df[columna].dropna().unique()[:10]  # Primeros 10 valores
-        logger.info(f"Valores únicos en '{columna}': {valores_unicos}")
-
-        # Aplicar condición
-        if isinstance(valor, (int, float)) and not pd.isna(valor):
-            # Para números, comparación exacta considerando tipos mixtos
-            # Convertir a número tanto el valor como la columna para comparar
-            try:
-                valor_num = float(valor)
-                condicion = (pd.to_numeric(df[columna], errors='coerce') == valor_num)
-                logger.info(f"Aplicando condición numérica: {columna} == {valor_num}")
-            except (ValueError, TypeError):
-                # Si no se puede convertir a número, usar comparación de string
-                condicion = (df[columna].astype(str) == str(valor))
-                logger.info(f"Aplicando condición texto (fallback): {columna} == '{valor}'")
-        else:
-            # Para texto, comparación de string
-            condicion = (df[columna].astype(str) == str(valor))
-            logger.info(f"Aplicando condición texto: {columna} == '{valor}'")
-
-        coincidencias_antes = mask.sum()
-        mask &= condicion
-        coincidencias_despues = mask.sum()
-        condiciones_aplicadas += 1
-
-        logger.info(f"Condición '{columna}' == '{valor}': {coincidencias_antes} → {coincidencias_despues} filas")
-
-    filas_coincidentes = mask.sum()
-    logger.info(f"Total condiciones aplicadas: {condiciones_aplicadas}, filas finales coincidentes: {filas_coincidentes}")
+        return pd.Series([False] * len(df), index=df.index)
 
+    mask = pd.Series(MotorSegmentos([condiciones], headers).evaluar(df)[:, 0], index=df.index)
+    logger.info(f"Segmento '{condiciones[0]}': {int(mask.sum())} filas coincidentes")
     return mask
 
 def actualizar_columna_segmentos(df: pd.DataFrame, mask: pd.Series, nombre_segmento: str) -> Tuple[pd.DataFrame, List[int]]:
@@ -574,22 +509,15 @@ def actualizar_columna_segmentos(df: pd.DataFrame, mask: pd.Series, nombre_segme
     # Agregar columna Segmentos si no existe
     df = ExcelHelper.agregar_columna_si_no_existe(df, 'Segmentos', '')
 
-    filas_modificadas = []
-
-    for idx in df[mask].index:
-        valor_actual = str(df.loc[idx, 'Segmentos']).strip()
+    mask = np.asarray(mask, dtype=bool)
+    actual = df['Segmentos'].fillna('').astype(str).str.strip()
+    ya_asignado = actual.str.split(';').apply(lambda partes: nombre_segmento in partes)
+    modificar = mask & ~ya_asignado.to_numpy()
 
-        if valor_actual == '' or pd.isna(valor_actual):
-            # Primera asignación
-            df.loc[idx, 'Segmentos'] = nombre_segmento
-            filas_modificadas.append(idx)
-        else:
-            # Verificar si ya tiene este segmento
-            segmentos_existentes = valor_actual.split(';')
-            if nombre_segmento not in segmentos_existentes:
-                # Concatenar nuevo segmento
-                df.loc[idx, 'Segmentos'] = f"{valor_actual};{nombre_segmento}"
-                filas_modificadas.append(idx)
+    nuevos = np.where(actual[modificar] == '', nombre_segmento, actual[modificar] + ';' + nombre_segmento)
+    df['Segmentos'] = df['Segmentos'].astype(object)
+    df.loc[modificar, 'Segmentos'] = nuevos
+    filas_modificadas = df.index[modificar].tolist()
 
     logger.info(f"Actualizadas {len(filas_modificadas)} filas con segmento '{nombre_segmento}'")
     return df, filas_modificadas
@@ -667,7 +595,10 @@ def obtener_id_lista_por_nombre(nombre_lista: str, api_client: API) -> Optional[
 def verificar_y_crear_campos_segmentacion(list_id: int, headers: List[str], api_client: API) -> bool:
     """
     Verifica que existan los campos necesarios para segmentación en la lista.
-    Si no existen, los crea usando add_merge_tag.
+    Si no existen, los crea en lote (``provisionar_campos``).
+
+    Los campos de cada lista se consultan una vez y quedan en la caché de
+    esquemas, así que las siguientes ejecuciones no llaman a ``get_merge_fields``.
 
     Args:
         list_id: ID de la lista
@@ -678,70 +609,21 @@ def verificar_y_crear_campos_segmentacion(list_id: int, headers: List[str], api_
         True si los campos están disponibles
     """
     try:
-        # Obtener campos existentes
-        campos_existentes = api_client.suscriptores.get_merge_fields(list_id)
-
-        # Extraer nombres de campos según el formato de respuesta (robusto)
-        nombres_campos = []
-        if hasattr(campos_existentes, 'merge_fields'):
-            mf = getattr(campos_existentes, 'merge_fields')
-            if isinstance(mf, dict):
-                nombres_campos = list(mf.keys())
-            elif isinstance(mf, list):
-                for campo in mf:
-                    if isinstance(campo, dict):
-                        name_val = campo.get('name')  # type: ignore[attr-defined]
-                        if name_val:
-                            nombres_campos.append(str(name_val))
-                    elif hasattr(campo, 'name'):
-                        try:
-                            nombres_campos.append(str(getattr(campo, 'name')))
-                        except Exception:
-                            continue
-        else:
-            # Respuesta directa como dict o lista
-            if isinstance(campos_existentes, dict):
-                nombres_campos = list(campos_existentes.keys())
-            elif isinstance(campos_existentes, list):
-                for campo in campos_existentes:
-                    if isinstance(campo, dict):
-                        name_val = campo.get('name')  # type: ignore[attr-defined]
-                        if name_val:
-                            nombres_campos.append(str(name_val))
-                    elif hasattr(campo, 'name'):
-                        try:
-                            nombres_campos.append(str(getattr(campo, 'name')))
-                        except Exception:
-                            continue
-
-        logger.info(f"Campos existentes en lista {list_id}: {nombres_campos}")
-
-        # Verificar qué campos necesitamos crear
-        campos_a_crear = []
-
-        # Siempre crear el campo Segmentos si no existe
-        if "Segmentos" not in nombres_campos:
-            campos_a_crear.append(("Segmentos", "text"))
+        # Siempre el campo Segmentos; el resto de campos de segmentación como texto
+        # (Acumbamail no acepta "number")
+        campos = {"Segmentos": "text"}
+        campos.update({header: "text" for header in headers[1:]})  # Saltar NOMBRE SEGMENTO
 
-        # Verificar otros campos de segmentación (opcional)
-        for header in headers[1:]:  # Saltar NOMBRE SEGMENTO
-            if header not in nombres_campos:
-                # Usar tipo text para todos los campos (Acumbamail no acepta "number")
-                tipo_campo = "text"
-                campos_a_crear.append((header, tipo_campo))
+        resultado = provisionar_campos(api_client, list_id, campos)
+        logger.info(f"Campos existentes en lista {list_id}: {resultado.existentes}")
 
-        # Crear campos faltantes
-        for nombre_campo, tipo_campo in campos_a_crear:
-            try:
-                logger.info(f"Creando campo '{nombre_campo}' tipo '{tipo_campo}' en lista {list_id}")
-                api_client.suscriptores.add_merge_tag(list_id, nombre_campo, tipo_campo)
-                print(f"  ✅ Campo '{nombre_campo}' creado exitosamente")
-            except Exception as e:
-                logger.error(f"Error creando campo '{nombre_campo}': {e}")
-                print(f"  ❌ Error creando campo '{nombre_campo}': {e}")
+        for nombre_campo in resultado.creados:
+            print(f"  ✅ Campo '{nombre_campo}' creado exitosamente")
+        for nombre_campo, error in resultado.fallidos.items():
+            print(f"  ❌ Error creando campo '{nombre_campo}': {error}")
 
-        if campos_a_crear:
-            logger.info(f"Creados {len(campos_a_crear)} campos en lista {list_id}")
+        if resultado.creados or resultado.fallidos:
+            logger.info(f"Creados {len(resultado.creados)} campos en lista {list_id}")
         else:
             logger.info(f"Todos los campos necesarios ya existen en lista {list_id}")
 
@@ -847,7 +729,8 @@ def eliminar_usuarios_de_lista(emails: List[str], list_id: int, api_client: API)
         logger.error(f"Error eliminando usuarios: {e}")
         return False
 
-def subir_usuarios_actualizados(df: pd.DataFrame, list_id: int, api_client: API) -> int:
+def subir_usuarios_actualizados(df: pd.DataFrame, list_id: int, api_client: API, batch_size: int = 100,
+                                columnas_vaciables: Optional[List[str]] = None) -> int:
     """
     Sube usuarios con sus segmentos actualizados a la lista usando procesamiento en lotes.
 
@@ -855,6 +738,9 @@ def subir_usuarios_actualizados(df: pd.DataFrame, list_id: int, api_client: API)
         df: DataFrame con usuarios y segmentos
         list_id: ID de la lista
         api_client: Cliente de la API
+        batch_size: Usuarios por llamada a batchAddSubscribers (máximo 1000)
+        columnas_vaciables: Columnas que se envían como "" cuando están vacías,
+            para borrar el valor en Acumbamail (por defecto se omiten)
 
     Returns:
         Número de usuarios subidos exitosamente
@@ -864,7 +750,6 @@ def subir_usuarios_actualizados(df: pd.DataFrame, list_id: int, api_client: API)
         
         usuarios_subidos = 0
         subscribers_batch = []
-        batch_size = 100  # Procesar en lotes de 100
 
         for _, row in df.iterrows():
             try:
@@ -880,6 +765,10 @@ def subir_usuarios_actualizados(df: pd.DataFrame, list_id: int, api_client: API)
                     if col not in ["email", "Segmentos"] and pd.notna(row[col]) and str(row[col]).strip():
                         merge_fields[col] = str(row[col]).strip()
 
+                # Campos vaciados en local: se envían vacíos para que se borren también en remoto
+                for col in columnas_vaciables or []:
+                    merge_fields.setdefault(col, "")
+
                 # Verificar que tenga email válido
                 if not merge_fields.get("email"):
                     logger.warning(f"Fila sin email válido: {row.to_dict()}")
@@ -926,13 +815,112 @@ def subir_usuarios_actualizados(df: pd.DataFrame, list_id: int, api_client: API)
         logger.error(f"Error subiendo usuarios: {e}")
         return 0
 
-def crear_segmentos_con_scraping_batch(list_id: int, segmentos_nombres: List[str], api_client: API) -> bool:
+def guardar_instantanea_sincronizacion(df: pd.DataFrame, list_id: int, columnas: List[str],
+                                       store: SegmentSyncSnapshotStore) -> None:
+    """Guarda los hashes de todos los usuarios tras una sincronización completa correcta."""
+    try:
+        store.save(list_id, columnas, calcular_hashes(df, columnas))
+    except Exception as e:
+        logger.warning(f"No se pudo guardar la instantánea de sincronización: {e}")
+
+
+def aplicar_delta_segmentos(df: pd.DataFrame, delta: DeltaSincronizacion, hashes: Dict[str, str], list_id: int,
+                            api_client: API, columnas: List[str], eliminar_bajas: bool = True,
+                            tamano_lote: int = 1000) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Envía un delta a Acumbamail con los endpoints masivos.
+
+    Altas y modificaciones van juntas a batchAddSubscribers con
+    ``update_subscriber=1`` (sin borrar y re-subir); las bajas a
+    batchDeleteSubscribers. Las ``columnas`` del hash se envían siempre, vacías
+    si lo están en local, para que un valor borrado también se borre en remoto.
+    Un lote solo se da por aplicado si la API confirma todos sus usuarios, así
+    los fallidos se reintentan en la próxima ejecución.
+
+    Returns:
+        (hashes aplicados por email, emails dados de baja en la instantánea)
+    """
+    aplicados: Dict[str, str] = {}
+    bajas_aplicadas: List[str] = []
+
+    pendientes = delta.altas + delta.modificaciones
+    if pendientes:
+        df_envio = df.assign(_email_sync=normalizar_emails(df['email']))
+        df_envio = df_envio[df_envio['_email_sync'].isin(set(pendientes))]
+        df_envio = df_envio.drop_duplicates('_email_sync', keep='last').set_index('_email_sync')
+        for inicio in range(0, len(pendientes), tamano_lote):
+            lote = pendientes[inicio:inicio + tamano_lote]
+            df_lote = df_envio.loc[lote].reset_index(drop=True)
+            subidos = subir_usuarios_actualizados(df_lote, list_id, api_client, batch_size=tamano_lote,
+                                                 columnas_vaciables=columnas)
+            if subidos >= len(df_lote):
+                aplicados.update({email: hashes[email] for email in lote})
+            else:
+                logger.warning(f"Lote de sincronización incompleto: {subidos}/{len(df_lote)} usuarios confirmados")
+
+    if delta.bajas and eliminar_bajas:
+        for inicio in range(0, len(delta.bajas), tamano_lote):
+            lote = delta.bajas[inicio:inicio + tamano_lote]
+            try:
+                resultado = api_client.suscriptores.batch_delete_subscribers(list_id, lote)
+                if resultado.error_count == 0:
+                    bajas_aplicadas.extend(lote)
+                else:
+                    logger.warning(f"Bajas con errores: {resultado.error_count}/{len(lote)} usuarios")
+            except Exception as e:
+                logger.warning(f"Error eliminando {len(lote)} usuarios de la lista {list_id}: {e}")
+    elif delta.bajas:
+        # Sin borrado remoto: se olvidan de la instantánea para no proponerlas en cada ejecución
+        logger.info(f"{len(delta.bajas)} usuarios ya no están en el archivo local (borrado remoto desactivado)")
+        bajas_aplicadas.extend(delta.bajas)
+
+    return aplicados, bajas_aplicadas
+
+
+def sincronizar_delta_segmentos(df: pd.DataFrame, list_id: int, api_client: API, columnas: List[str],
+                                anterior: Dict[str, str], store: SegmentSyncSnapshotStore,
+                                eliminar_bajas: bool = True) -> DeltaSincronizacion:
+    """
+    Sincronización incremental: calcula el delta frente a la instantánea,
+    lo aplica y registra en la instantánea lo que la API confirmó.
+    """
+    hashes = calcular_hashes(df, columnas)
+    delta = calcular_delta(hashes, anterior)
+    logger.info(f"Delta de sincronización lista {list_id}: {len(delta.altas)} altas, "
+                f"{len(delta.modificaciones)} modificaciones, {len(delta.bajas)} bajas, {delta.sin_cambios} sin cambios")
+    if delta.vacio:
+        print("  Sin cambios respecto a la última sincronización")
+        return delta
+
+    print(f"Sincronizando {delta.total} cambios con Acumbamail "
+          f"({len(delta.altas)} altas, {len(delta.modificaciones)} modificaciones, {len(delta.bajas)} bajas)...")
+    notify("Actualizando Usuarios", f"Sincronizando {delta.total} cambios en Acumbamail", "info")
+    aplicados, bajas_aplicadas = aplicar_delta_segmentos(df, delta, hashes, list_id, api_client, columnas, eliminar_bajas)
+    store.apply(list_id, columnas, aplicados, bajas_aplicadas)
+
+    enviados = len(delta.altas) + len(delta.modificaciones)
+    print(f"  Sincronizados {len(aplicados)}/{enviados} usuarios y {len(bajas_aplicadas)}/{len(delta.bajas)} bajas")
+    if len(aplicados) < enviados:
+        notify("Advertencia", f"{enviados - len(aplicados)} usuarios se reintentarán en la próxima sincronización", "warning")
+    return delta
+
+
+def crear_segmentos_con_scraping_batch(list_id: int, segmentos_nombres: List[str], api_client: API,
+                                       page=None) -> bool:
     """
     Delegado al servicio SegmentsScrapingService para crear segmentos por scraping.
-    Mantener firma para compatibilidad con flujo existente.
+
+    Con ``page`` se usa esa página autenticada. Sin ella, la creación se encola
+    en el servicio de navegador persistente: todas las listas (también las
+    procesadas en hilos) comparten el mismo navegador y el mismo login, y el
+    servicio las atiende de una en una.
     """
-    service = SegmentsScrapingService()
-    return service.create_segments_batch(list_id, segmentos_nombres, api_client)
+    if page is not None:
+        return SegmentsScrapingService(page).create_segments_batch(list_id, segmentos_nombres, api_client)
+    return get_browser_service().run(
+        lambda page, context: SegmentsScrapingService(page).create_segments_batch(list_id, segmentos_nombres, api_client),
+        name="crear_segmentos",
+    )
 
 def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]], headers: List[str]) -> bool:
     """
@@ -980,7 +968,8 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
         # 1. Primero buscar ID en nuestros archivos locales (con manejo de errores)
         list_id = None
         try:
-            list_id = obtener_o_buscar_id_lista(nombre_lista)
+            with _segmentos_lock:
+                list_id = obtener_o_buscar_id_lista(nombre_lista)
         except Exception as e:
             logger.warning(f"Error buscando ID local para {nombre_lista}: {e}")
 
@@ -1014,7 +1003,8 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
                 # Si encontramos la lista en servidor pero no en nuestros archivos, actualizar
                 print(f"Lista '{nombre_lista}' encontrada en servidor (ID: {list_id})")
                 try:
-                    actualizar_id_en_segmentos(nombre_lista, list_id)
+                    with _segmentos_lock:
+                        actualizar_id_en_segmentos(nombre_lista, list_id)
                 except Exception as e:
                     logger.warning(f"Error actualizando ID en segmentos: {e}")
             else:
@@ -1042,26 +1032,33 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
             notify("Error", f"Error verificando campos: {e}", "error")
             return False
 
-        # Obtener usuarios existentes en Acumbamail (con manejo de errores)
+        # Instantánea de la última sincronización: si existe solo se envían altas, modificaciones y bajas
+        columnas_sync = ['Segmentos'] + list(headers[1:])
+        eliminar_bajas = bool((config.get('segment_sync', {}) or {}).get('delete_removed', True))
+        snapshot_store = get_segment_snapshot_store()
         try:
-            usuarios_existentes = obtener_usuarios_existentes_con_segmentos(list_id, api_client)
+            snapshot = snapshot_store.load(list_id, columnas_sync)
         except Exception as e:
-            logger.warning(f"Error obteniendo usuarios existentes: {e}")
-            usuarios_existentes = {}
+            logger.warning(f"Error leyendo instantánea de sincronización: {e}")
+            snapshot = None
+        sincronizacion_ok = True
 
-        # Obtener TODOS los usuarios de la lista (con manejo robusto de errores)
-        try:
-            todos_usuarios_acumba = api_client.suscriptores.get_subscribers(list_id, all_fields=1, complete_json=1)
-            emails_en_acumba = {usuario.email for usuario in todos_usuarios_acumba}
-            logger.info(f"Encontrados {len(emails_en_acumba)} usuarios en Acumbamail")
-        except Exception as e:
-            # Lista recién creada o vacía - esto es normal
-            if "No subscribers" in str(e) or "not found" in str(e).lower():
-                logger.info(f"Lista {list_id} está vacía (recién creada)")
-                emails_en_acumba = set()
-            else:
-                logger.warning(f"Error obteniendo usuarios de Acumbamail: {e}")
-                emails_en_acumba = set()
+        emails_en_acumba = set()
+        if snapshot is None:
+            # Primera sincronización: obtener TODOS los usuarios de la lista (con manejo robusto de errores)
+            try:
+                todos_usuarios_acumba = api_client.suscriptores.get_subscribers(list_id, all_fields=1, complete_json=1)
+                emails_en_acumba = {usuario.email for usuario in todos_usuarios_acumba}
+                logger.info(f"Encontrados {len(emails_en_acumba)} usuarios en Acumbamail")
+            except Exception as e:
+                # Lista recién creada o vacía - esto es normal
+                if "No subscribers" in str(e) or "not found" in str(e).lower():
+                    logger.info(f"Lista {list_id} está vacía (recién creada)")
+                else:
+                    logger.warning(f"Error obteniendo usuarios de Acumbamail: {e}")
+                    sincronizacion_ok = False
+        else:
+            logger.info(f"Sincronización incremental de {nombre_lista}: {len(snapshot)} usuarios en la instantánea")
 
         # Obtener/asegurar ruta del archivo local con ID en el nombre (con validaciones)
         try:
@@ -1125,6 +1122,12 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
                 logger.info(f"Lista {nombre_lista} no tiene columnas para segmentación, procesando solo usuarios")
                 notify("Sin Segmentación", f"Lista {nombre_lista} no tiene campos de segmentación, procesando solo usuarios", "warning")
 
+                if snapshot is not None:
+                    sincronizar_delta_segmentos(df, list_id, api_client, columnas_sync, snapshot,
+                                                snapshot_store, eliminar_bajas)
+                    logger.info(f"Lista {nombre_lista} procesada sin segmentación")
+                    return True
+
                 # Identificar usuarios nuevos (con manejo de errores)
                 try:
                     emails_locales = set(df['email'].dropna())
@@ -1137,9 +1140,11 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
                             usuarios_subidos = subir_usuarios_actualizados(df_nuevos, list_id, api_client)
                             print(f"{usuarios_subidos} usuarios nuevos subidos")
                             notify("Usuarios Subidos", f"{usuarios_subidos} usuarios nuevos subidos a {nombre_lista}", "info")
+                            sincronizacion_ok = sincronizacion_ok and usuarios_subidos >= len(df_nuevos)
                         except Exception as e:
                             logger.error(f"Error subiendo usuarios nuevos: {e}")
                             notify("Error Subida", f"Error subiendo usuarios: {e}", "error")
+                            sincronizacion_ok = False
                     else:
                         notify("Sin Usuarios Nuevos", f"No hay usuarios nuevos para subir a {nombre_lista}", "info")
                 except Exception as e:
@@ -1147,6 +1152,8 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
                     notify("Error", f"Error procesando usuarios: {e}", "error")
                     return False
 
+                if sincronizacion_ok:
+                    guardar_instantanea_sincronizacion(df, list_id, columnas_sync, snapshot_store)
                 logger.info(f"Lista {nombre_lista} procesada sin segmentación")
                 return True
             else:
@@ -1158,10 +1165,11 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
 
         logger.info(f"Lista {nombre_lista}: {len(df)} filas, columnas disponibles: {columnas_disponibles}")
 
-        # Identificar y subir usuarios nuevos antes de la segmentación (con manejo robusto)
+        # Identificar y subir usuarios nuevos antes de la segmentación (con manejo robusto).
+        # Con instantánea las altas se envían junto al resto del delta tras segmentar.
         try:
             emails_locales = set(df['email'].dropna())
-            usuarios_nuevos = emails_locales - emails_en_acumba
+            usuarios_nuevos = emails_locales - emails_en_acumba if snapshot is None else set()
 
             if usuarios_nuevos:
                 print(f"Subiendo {len(usuarios_nuevos)} usuarios nuevos a Acumbamail...")
@@ -1171,13 +1179,16 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
                     usuarios_subidos = subir_usuarios_actualizados(df_nuevos, list_id, api_client)
                     print(f"{usuarios_subidos} usuarios nuevos subidos")
                     notify("Usuarios Subidos", f"{usuarios_subidos} usuarios nuevos subidos", "info")
+                    sincronizacion_ok = sincronizacion_ok and usuarios_subidos >= len(df_nuevos)
                 except Exception as e:
                     logger.error(f"Error subiendo usuarios nuevos: {e}")
                     notify("Error Subida", f"Error subiendo usuarios nuevos: {e}", "error")
+                    sincronizacion_ok = False
                     # Continuar con segmentación aunque falle la subida de nuevos usuarios
         except Exception as e:
             logger.error(f"Error identificando usuarios nuevos: {e}")
             notify("Error", f"Error identificando usuarios nuevos: {e}", "warning")
+            sincronizacion_ok = False
             # Continuar con segmentación aunque falle esta parte
 
         # Guardar estado original para detectar cambios (con validación)
@@ -1197,45 +1208,29 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
 
         notify("Procesando Segmentos", f"Iniciando procesamiento de {len(segmentos_data)} segmentos", "info")
 
-        for i, segmento_condiciones in enumerate(segmentos_data, 1):
-            nombre_segmento = segmento_condiciones[0]
-
-            logger.info(f"Aplicando segmento {i}/{len(segmentos_data)}: {nombre_segmento}")
-
-            # Aplicar condiciones con manejo de errores
-            try:
-                mask = aplicar_condiciones_segmento(df, segmento_condiciones, headers)
-            except Exception as e:
-                logger.error(f"Error aplicando condiciones del segmento {nombre_segmento}: {e}")
-                notify("Error Segmento", f"Error en segmento {nombre_segmento}: {e}", "warning")
-                continue  # Continuar con el siguiente segmento
-
-            if mask.any():
-                # Actualizar segmentos con manejo de errores
-                try:
-                    df, filas_modificadas = actualizar_columna_segmentos(df, mask, nombre_segmento)
-                    total_modificaciones += len(filas_modificadas)
+        # Todas las reglas se evalúan a la vez y la columna Segmentos se calcula en una pasada
+        try:
+            motor = MotorSegmentos(segmentos_data, headers)
+            resultado = motor.asignar(df)
+            df = resultado.aplicar(df)
+            total_modificaciones = resultado.total_asignaciones
+        except Exception as e:
+            logger.error(f"Error aplicando segmentos de la lista {nombre_lista}: {e}")
+            notify("Error Segmento", f"Error aplicando segmentos: {e}", "error")
+            return False
 
-                    # Marcar usuarios para re-subir
-                    for idx in filas_modificadas:
-                        try:
-                            email = df.loc[idx, 'email']
-                            usuarios_a_eliminar.add(email)
-                        except Exception as e:
-                            logger.warning(f"Error procesando usuario en índice {idx}: {e}")
+        # Marcar usuarios para re-subir
+        if len(resultado.filas_modificadas) and 'email' in df.columns:
+            usuarios_a_eliminar.update(df.loc[resultado.filas_modificadas, 'email'].dropna())
 
-                    print(f"  Segmento '{nombre_segmento}': {len(filas_modificadas)} usuarios asignados")
-                    
-                    # Agregar a la lista de segmentos únicos que necesitan ser creados en Acumbamail
-                    segmentos_creados.add(nombre_segmento)
-                except Exception as e:
-                    logger.error(f"Error actualizando segmento {nombre_segmento}: {e}")
-                    notify("Error Actualización", f"Error actualizando segmento {nombre_segmento}: {e}", "warning")
-                    continue
-                
+        for nombre_segmento in motor.segmentos:
+            if resultado.coincidencias_por_segmento[nombre_segmento]:
+                print(f"  Segmento '{nombre_segmento}': {resultado.asignados_por_segmento[nombre_segmento]} usuarios asignados")
+                # Agregar a la lista de segmentos únicos que necesitan ser creados en Acumbamail
+                segmentos_creados.add(nombre_segmento)
             else:
                 print(f"  Segmento '{nombre_segmento}': 0 usuarios cumplen las condiciones")
-                logger.warning(f"No hay usuarios que cumplan las condiciones para el segmento '{nombre_segmento}': {segmento_condiciones}")
+                logger.warning(f"No hay usuarios que cumplan las condiciones para el segmento '{nombre_segmento}'")
 
         # Detectar cambios con manejo de errores
         try:
@@ -1246,7 +1241,14 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
             df_cambios = None
 
         # Procesar usuarios que cambiaron de segmento con manejo robusto
-        if usuarios_a_eliminar:
+        if snapshot is not None:
+            try:
+                sincronizar_delta_segmentos(df, list_id, api_client, columnas_sync, snapshot,
+                                            snapshot_store, eliminar_bajas)
+            except Exception as e:
+                logger.error(f"Error en sincronización incremental: {e}")
+                notify("Error Actualización", f"Error sincronizando cambios: {e}", "error")
+        elif usuarios_a_eliminar:
             print(f"Actualizando {len(usuarios_a_eliminar)} usuarios en Acumbamail...")
             notify("Actualizando Usuarios", f"Actualizando {len(usuarios_a_eliminar)} usuarios en Acumbamail", "info")
 
@@ -1264,43 +1266,48 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
                         usuarios_subidos = subir_usuarios_actualizados(df_usuarios_actualizados, list_id, api_client)
                         print(f"  Re-subidos {usuarios_subidos} usuarios con segmentos actualizados")
                         notify("Usuarios Actualizados", f"Re-subidos {usuarios_subidos} usuarios", "info")
+                        sincronizacion_ok = sincronizacion_ok and usuarios_subidos >= len(df_usuarios_actualizados)
                     except Exception as e:
                         logger.error(f"Error re-subiendo usuarios: {e}")
                         notify("Error Re-subida", f"Error re-subiendo usuarios: {e}", "error")
+                        sincronizacion_ok = False
                 else:
                     logger.warning("No se pudieron eliminar usuarios para actualización")
                     notify("Advertencia", "No se pudieron eliminar usuarios para actualización", "warning")
+                    sincronizacion_ok = False
             except Exception as e:
                 logger.error(f"Error en proceso de actualización de usuarios: {e}")
                 notify("Error Actualización", f"Error actualizando usuarios: {e}", "error")
+                sincronizacion_ok = False
 
-        # Guardar archivo principal local con validaciones
+        # Primera sincronización completa: guardar la instantánea para las siguientes
+        if snapshot is None and sincronizacion_ok:
+            guardar_instantanea_sincronizacion(df, list_id, columnas_sync, snapshot_store)
+
+        # Guardar archivo principal y hoja de cambios con una sola escritura del libro.
+        # Si hay modificaciones el archivo se reescribe con 'Datos' (+ 'Cambios');
+        # si solo hay cambios, 'Cambios' se añade conservando el resto del libro.
+        hay_cambios = df_cambios is not None and not df_cambios.empty
+        sesion = ExcelHelper.sesion_escritura(ruta_archivo, reemplazar=total_modificaciones > 0)
         if total_modificaciones > 0:
-            try:
-                if ExcelHelper.escribir_excel(df, ruta_archivo, 'Datos', reemplazar=True):
+            sesion.escribir_hoja(df, 'Datos')
+        if hay_cambios:
+            sesion.escribir_hoja(df_cambios, 'Cambios')
+
+        if sesion.hojas_pendientes:
+            if sesion.guardar():
+                if total_modificaciones > 0:
                     logger.info(f"Guardado archivo principal: {nombre_lista} ({total_modificaciones} modificaciones)")
                     notify("Archivo Guardado", f"Guardado archivo con {total_modificaciones} modificaciones", "info")
-                else:
-                    logger.error(f"Error guardando archivo principal: {nombre_lista}")
-                    notify("Error Guardado", f"Error guardando archivo: {nombre_lista}", "error")
-            except Exception as e:
-                logger.error(f"Error escribiendo archivo {ruta_archivo}: {e}")
-                notify("Error Archivo", f"Error escribiendo archivo: {e}", "error")
-                logger.error(f"Error guardando archivo principal: {nombre_lista}")
-                return False
-
-        # Guardar hoja de cambios si hay cambios (con validación de None)
-        if df_cambios is not None and not df_cambios.empty:
-            try:
-                if ExcelHelper.escribir_excel(df_cambios, ruta_archivo, 'Cambios', reemplazar=False):
+                if hay_cambios:
                     logger.info(f"Guardada hoja de cambios: {nombre_lista} ({len(df_cambios)} cambios)")
                     notify("Cambios Guardados", f"Guardados {len(df_cambios)} cambios detectados", "info")
-                else:
-                    logger.warning(f"Error guardando hoja de cambios: {nombre_lista}")
-                    notify("Error Cambios", f"Error guardando hoja de cambios: {nombre_lista}", "warning")
-            except Exception as e:
-                logger.error(f"Error escribiendo hoja de cambios: {e}")
-                notify("Error", f"Error escribiendo hoja de cambios: {e}", "warning")
+            elif total_modificaciones > 0:
+                logger.error(f"Error guardando archivo principal: {nombre_lista}")
+                notify("Error Guardado", f"Error guardando archivo: {nombre_lista}", "error")
+            else:
+                logger.warning(f"Error guardando hoja de cambios: {nombre_lista}")
+                notify("Error Cambios", f"Error guardando hoja de cambios: {nombre_lista}", "warning")
 
         # Determinar cantidad de cambios para reporte
         num_cambios = len(df_cambios) if df_cambios is not None else 0
@@ -1343,6 +1350,88 @@ def procesar_lista_individual(nombre_lista: str, segmentos_data: List[List[Any]]
         notify("Error Procesamiento", f"Error procesando lista '{nombre_lista}': {e}", "error")
         return False
 
+def _listas_en_paralelo() -> int:
+    """Listas simultáneas según ``segment_mapping.parallel_lists`` (1 = en serie)."""
+    return config_int('segment_mapping', 'parallel_lists', 4)
+
+
+def _tamano_lista(nombre_lista: str) -> int:
+    """Tamaño del archivo local de la lista (0 si no existe), para ordenar por coste."""
+    try:
+        with _segmentos_lock:
+            ruta = obtener_ruta_archivo_lista(nombre_lista)
+        return os.path.getsize(ruta) if os.path.exists(ruta) else 0
+    except Exception:
+        return 0
+
+
+def _procesar_lista_aislada(nombre_lista: str, segmentos_data: List[List[Any]], headers: List[str]) -> Dict[str, Any]:
+    """Ejecuta ``procesar_lista_individual`` y convierte cualquier excepción en una fila de resultado."""
+    inicio = time.perf_counter()
+    fila = {"lista": nombre_lista, "segmentos": len(segmentos_data), "estado": "fallida", "error": ""}
+    try:
+        if procesar_lista_individual(nombre_lista, segmentos_data, headers):
+            fila["estado"] = "procesada"
+        else:
+            fila["error"] = "Error en procesamiento"
+    except Exception as e:
+        fila["error"] = str(e)
+        logger.error(f"Error procesando lista {nombre_lista}: {e}")
+    fila["duracion_s"] = round(time.perf_counter() - inicio, 2)
+    return fila
+
+
+def procesar_listas_concurrente(grouped_data: List[List[Any]], headers: List[str],
+                                max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Procesa varias listas a la vez con un número acotado de hilos.
+
+    Las listas son independientes; el presupuesto de la API es común porque los
+    límites de ``rate_limit`` son globales al proceso. Las listas más grandes se
+    lanzan primero para que el tiempo total se acerque al de la mayor. Un fallo
+    en una lista no afecta a las demás.
+
+    Returns:
+        Una fila por lista, en el orden de ``grouped_data``:
+        {lista, segmentos, estado, error, duracion_s}
+    """
+    max_workers = max_workers or _listas_en_paralelo()
+    total = len(grouped_data)
+    orden = sorted(range(total), key=lambda i: _tamano_lista(grouped_data[i][0]), reverse=True)
+    resultados: List[Optional[Dict[str, Any]]] = [None] * total
+
+    if max_workers <= 1 or total <= 1:
+        for i in range(total):
+            nombre_lista, segmentos_data = grouped_data[i][0], grouped_data[i][1]
+            print(f"\nProcesando lista {i + 1}/{total}: {nombre_lista}")
+            notify("Progreso", f"Procesando lista {i + 1}/{total}: {nombre_lista}", "info")
+            resultados[i] = _procesar_lista_aislada(nombre_lista, segmentos_data, headers)
+        return resultados
+
+    print(f"\nProcesando {total} listas con {min(max_workers, total)} en paralelo")
+    notify("Progreso", f"Procesando {total} listas ({min(max_workers, total)} en paralelo)", "info")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mapeo") as executor:
+        futuros = {
+            executor.submit(_procesar_lista_aislada, grouped_data[i][0], grouped_data[i][1], headers): i
+            for i in orden
+        }
+        for terminadas, futuro in enumerate(as_completed(futuros), 1):
+            i = futuros[futuro]
+            resultados[i] = futuro.result()
+            print(f"[{terminadas}/{total}] {resultados[i]['lista']}: {resultados[i]['estado']} ({resultados[i]['duracion_s']}s)")
+    return resultados
+
+
+def imprimir_tabla_resultados(resultados: List[Dict[str, Any]]) -> None:
+    """Tabla consolidada por lista: estado, segmentos, duración y error."""
+    if not resultados:
+        return
+    ancho = max(len("Lista"), *(len(str(r["lista"])) for r in resultados))
+    print(f"\n   {'Lista':<{ancho}}  {'Estado':<10} {'Segm.':>5} {'Tiempo':>8}  Error")
+    for r in resultados:
+        print(f"   {str(r['lista']):<{ancho}}  {r['estado']:<10} {r['segmentos']:>5} {r['duracion_s']:>7.1f}s  {r['error']}")
+
+
 def mapear_segmentos_completo() -> Dict[str, Any]:
     """
     Función principal para mapear todos los segmentos.
@@ -1419,30 +1508,24 @@ def mapear_segmentos_completo() -> Dict[str, Any]:
             "errores_detallados": []
         }
 
-        for i, lista_info in enumerate(grouped_data, 1):
-            nombre_lista = lista_info[0]
-            segmentos_data = lista_info[1]
-
-            print(f"\nProcesando lista {i}/{len(grouped_data)}: {nombre_lista}")
-            notify("Progreso", f"Procesando lista {i}/{len(grouped_data)}: {nombre_lista}", "info")
+        inicio = time.perf_counter()
+        resultados = procesar_listas_concurrente(grouped_data, headers)
+        estadisticas["resultados"] = resultados
+        estadisticas["duracion_s"] = round(time.perf_counter() - inicio, 2)
 
-            try:
-                if procesar_lista_individual(nombre_lista, segmentos_data, headers):
-                    estadisticas["listas_procesadas"].append(nombre_lista)
-                    logger.info(f"Lista procesada exitosamente: {nombre_lista}")
-                else:
-                    estadisticas["listas_fallidas"].append(nombre_lista)
-                    estadisticas["errores_detallados"].append(f"{nombre_lista}: Error en procesamiento")
-                    logger.warning(f"Lista falló en procesamiento: {nombre_lista}")
-            except Exception as e:
+        for resultado in resultados:
+            nombre_lista = resultado["lista"]
+            if resultado["estado"] == "procesada":
+                estadisticas["listas_procesadas"].append(nombre_lista)
+                logger.info(f"Lista procesada exitosamente: {nombre_lista}")
+            else:
                 estadisticas["listas_fallidas"].append(nombre_lista)
-                error_detalle = f"{nombre_lista}: {str(e)}"
-                estadisticas["errores_detallados"].append(error_detalle)
-                logger.error(f"Error procesando lista {nombre_lista}: {e}")
-                notify("Error Lista", f"Error procesando {nombre_lista}: {e}", "warning")
+                estadisticas["errores_detallados"].append(f"{nombre_lista}: {resultado['error']}")
+                logger.warning(f"Lista falló en procesamiento: {nombre_lista}")
 
         # Resumen final sin emojis
-        print("\nResumen del mapeo:")
+        imprimir_tabla_resultados(resultados)
+        print(f"\nResumen del mapeo ({estadisticas['duracion_s']}s):")
         print(f"   Listas procesadas: {len(estadisticas['listas_procesadas'])}")
         for lista in estadisticas["listas_procesadas"]:
             print(f"      • {lista}")
@@ -1503,6 +1586,9 @@ def main():
         logger.error(f"Error en mapeo de segmentos: {e}")
         print(f"❌ Error durante el mapeo: {e}")
         return False
+    finally:
+        # Fuera de la aplicación nadie más usa el navegador: cerrarlo antes de salir
+        shutdown_browser_service(wait=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
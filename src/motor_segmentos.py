@@ -0,0 +1,218 @@
+"""
+Motor vectorizado de asignación de segmentos.
+
+Compila todas las reglas de segmento de una lista (filas de Segmentos.xlsx) y
+las evalúa sobre el DataFrame de la lista sin bucles por fila:
+
+- Cada columna usada en alguna condición se factoriza una sola vez
+  (``pd.factorize``); las condiciones de texto se convierten en comparaciones de
+  códigos enteros y las numéricas en una comparación sobre la columna numérica.
+- El resultado es una matriz booleana filas x reglas (``evaluar_reglas``) o
+  filas x segmentos (``evaluar``).
+- La columna ``Segmentos`` se calcula en una pasada: las filas se agrupan por
+  (patrón de segmentos, valor actual de ``Segmentos``) y la cadena final se
+  construye una vez por grupo, no una vez por fila.
+
+Las reglas mantienen la semántica de ``aplicar_condiciones_segmento``: AND entre
+las condiciones no vacías, comparación numérica si el valor de la regla es
+``int``/``float`` y de texto en otro caso. Los segmentos nuevos se añaden al
+valor existente separados por ``;`` en el mismo orden que si las reglas se
+aplicaran una tras otra.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .logger import get_logger
+
+logger = get_logger()
+
+COLUMNA_SEGMENTOS = "Segmentos"
+SEPARADOR = ";"
+
+
+def _es_vacio(valor: Any) -> bool:
+    if valor is None:
+        return True
+    try:
+        if pd.isna(valor):
+            return True
+    except (TypeError, ValueError):
+        pass
+    return valor == '' or str(valor).lower() == 'nan'
+
+
+@dataclass
+class Condicion:
+    columna: str
+    valor: Any
+    numerica: bool
+
+
+@dataclass
+class ReglaSegmento:
+    nombre: str
+    condiciones: List[Condicion]
+    valida: bool = True
+
+
+@dataclass
+class ResultadoSegmentacion:
+    """Resultado de ``MotorSegmentos.asignar``."""
+
+    segmentos: pd.Series
+    filas_modificadas: pd.Index
+    coincidencias_por_segmento: Dict[str, int] = field(default_factory=dict)
+    asignados_por_segmento: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_asignaciones(self) -> int:
+        """Pares (fila, segmento) añadidos; equivale a la suma de ``filas_modificadas`` por segmento."""
+        return int(sum(self.asignados_por_segmento.values()))
+
+    def aplicar(self, df: pd.DataFrame, columna: str = COLUMNA_SEGMENTOS) -> pd.DataFrame:
+        """Escribe la columna de segmentos en ``df`` si hubo asignaciones nuevas."""
+        if self.total_asignaciones:
+            df = df.copy()
+            df[columna] = self.segmentos
+        return df
+
+
+class MotorSegmentos:
+    """
+    Reglas de segmento compiladas para una lista.
+
+    Args:
+        reglas: Filas ``[nombre_segmento, sede, organo, ...]`` como las devuelve
+            ``procesar_excel_segmentos``
+        headers: Columnas correspondientes (``headers[0]`` es NOMBRE SEGMENTO)
+    """
+
+    def __init__(self, reglas: List[List[Any]], headers: List[str]):
+        self.headers = list(headers)
+        self.reglas: List[ReglaSegmento] = []
+        for condiciones in reglas:
+            nombre = condiciones[0] if condiciones else None
+            if len(condiciones) != len(self.headers):
+                logger.warning(f"Longitud de condiciones ({len(condiciones)}) no coincide con headers ({len(self.headers)})")
+                self.reglas.append(ReglaSegmento(str(nombre), [], valida=False))
+                continue
+            compiladas = [
+                Condicion(columna, valor, isinstance(valor, (int, float)))
+                for valor, columna in zip(condiciones[1:], self.headers[1:])
+                if not _es_vacio(valor)
+            ]
+            self.reglas.append(ReglaSegmento(str(nombre), compiladas))
+
+        # Segmentos únicos en orden de aparición (varias reglas pueden dar el mismo segmento)
+        self.segmentos: List[str] = list(dict.fromkeys(regla.nombre for regla in self.reglas))
+
+    def evaluar_reglas(self, df: pd.DataFrame) -> np.ndarray:
+        """Matriz booleana (filas x ``self.reglas``) con las filas que cumple cada regla."""
+        n = len(df)
+        resultado = np.zeros((n, len(self.reglas)), dtype=bool)
+        textos: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+        numeros: Dict[str, np.ndarray] = {}
+        columnas_ausentes = set()
+
+        for r, regla in enumerate(self.reglas):
+            if not regla.valida:
+                continue
+            mask = np.ones(n, dtype=bool)
+            for condicion in regla.condiciones:
+                columna = condicion.columna
+                if columna not in df.columns:
+                    columnas_ausentes.add(columna)
+                    continue
+                if condicion.numerica:
+                    if columna not in numeros:
+                        numeros[columna] = pd.to_numeric(df[columna], errors='coerce').to_numpy(dtype=float)
+                    mask &= numeros[columna] == float(condicion.valor)
+                else:
+                    if columna not in textos:
+                        codigos, valores = pd.factorize(df[columna].astype(str))
+                        textos[columna] = (codigos, pd.Index(valores))
+                    codigos, valores = textos[columna]
+                    codigo = valores.get_indexer([str(condicion.valor)])[0]
+                    if codigo < 0:
+                        mask[:] = False
+                    else:
+                        mask &= codigos == codigo
+            resultado[:, r] = mask
+
+        for columna in sorted(columnas_ausentes):
+            logger.warning(f"Columna '{columna}' no existe en DataFrame")
+        return resultado
+
+    def _por_segmento(self, matriz_reglas: np.ndarray) -> np.ndarray:
+        indice_segmento = {nombre: i for i, nombre in enumerate(self.segmentos)}
+        resultado = np.zeros((matriz_reglas.shape[0], len(self.segmentos)), dtype=bool)
+        for r, regla in enumerate(self.reglas):
+            resultado[:, indice_segmento[regla.nombre]] |= matriz_reglas[:, r]
+        return resultado
+
+    def evaluar(self, df: pd.DataFrame) -> np.ndarray:
+        """Matriz booleana (filas x ``self.segmentos``) con las filas que cumple cada segmento."""
+        return self._por_segmento(self.evaluar_reglas(df))
+
+    def asignar(self, df: pd.DataFrame, columna: str = COLUMNA_SEGMENTOS) -> ResultadoSegmentacion:
+        """
+        Calcula la columna de segmentos de todas las filas en una pasada.
+
+        No modifica ``df``; usar ``ResultadoSegmentacion.aplicar``.
+        """
+        n = len(df)
+        matriz = self.evaluar_reglas(df)
+
+        if columna in df.columns:
+            actual = df[columna].fillna('').astype(str).str.strip()
+            actual = actual.mask(actual.str.lower() == 'nan', '')
+        else:
+            actual = pd.Series([''] * n, index=df.index, dtype=object)
+        codigos_actual, valores_actual = pd.factorize(actual)
+        if len(valores_actual) == 0:
+            valores_actual = pd.Index([''])
+            codigos_actual = np.zeros(n, dtype=np.int64)
+
+        # Código de patrón por fila (qué reglas cumple)
+        if len(self.reglas) <= 62:
+            pesos = np.left_shift(np.int64(1), np.arange(len(self.reglas), dtype=np.int64))
+            claves_patron = matriz.astype(np.int64) @ pesos if len(self.reglas) else np.zeros(n, dtype=np.int64)
+            codigos_patron, _ = pd.factorize(claves_patron)
+        else:
+            _, codigos_patron = np.unique(matriz, axis=0, return_inverse=True)
+            codigos_patron = codigos_patron.reshape(-1)
+
+        # Grupos (patrón, valor actual): la cadena resultante se construye una vez por grupo
+        clave_grupo = codigos_patron.astype(np.int64) * len(valores_actual) + codigos_actual
+        codigos_grupo, grupos = pd.factorize(clave_grupo)
+        if n:
+            _, representantes = np.unique(codigos_grupo, return_index=True)
+        else:
+            representantes = np.array([], dtype=np.int64)
+        tamanos = np.bincount(codigos_grupo, minlength=len(grupos)) if n else np.array([], dtype=np.int64)
+
+        asignados = dict.fromkeys(self.segmentos, 0)
+        cadenas = np.empty(len(grupos), dtype=object)
+        for g, fila in enumerate(representantes):
+            previo = valores_actual[codigos_actual[fila]]
+            existentes = previo.split(SEPARADOR) if previo else []
+            # Mismo orden que aplicar las reglas una tras otra
+            nuevos = []
+            for r, regla in enumerate(self.reglas):
+                if matriz[fila, r] and regla.nombre not in existentes and regla.nombre not in nuevos:
+                    nuevos.append(regla.nombre)
+            for s in nuevos:
+                asignados[s] += int(tamanos[g])
+            cadenas[g] = SEPARADOR.join(existentes + nuevos) if nuevos else previo
+
+        segmentos = pd.Series(cadenas[codigos_grupo] if n else [], index=df.index, dtype=object)
+        modificadas = df.index[(segmentos != actual).to_numpy()] if n else df.index[:0]
+        por_segmento = self._por_segmento(matriz)
+        coincidencias = {s: int(por_segmento[:, j].sum()) for j, s in enumerate(self.segmentos)}
+
+        for s in self.segmentos:
+            logger.info(f"Segmento '{s}': {coincidencias[s]} filas coinciden, {asignados[s]} asignaciones nuevas")
+        return ResultadoSegmentacion(segmentos, modificadas, coincidencias, asignados)
@@ -1,15 +1,42 @@
 """
 Servicio de scraping para la gestión de segmentos en Acumbamail.
 Extraído desde mapeo_segmentos.py y adaptado al patrón de endpoints en src/scrapping/endpoints.
+
+La creación en lote consulta los segmentos existentes una sola vez, abre la
+página de segmentos de la lista una sola vez y crea cada segmento que falta
+sobre la misma página: tras pulsar guardar se espera a que el formulario se
+cierre en lugar de recargar la página con esperas fijas. Al terminar el lote,
+los nombres creados se comprueban una sola vez contra la API.
 """
-import logging
-from typing import List, Optional
 import time
+from dataclasses import dataclass
+from typing import List, Optional
 
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError, sync_playwright
+from playwright.sync_api import Page, TimeoutError as PWTimeoutError
 
+from src.infrastructure.browser.browser_service import authenticated_page
+from src.infrastructure.browser.page_profiler import profile_page
 from src.shared.logging.logger import get_logger
-from src.shared.utils.legacy_utils import load_config, crear_contexto_navegador
+from src.shared.utils.legacy_utils import load_config
+
+SEGMENTS_URL = "https://acumbamail.com/app/list/{list_id}/segments/"
+
+ESTADO_CREADO = "creado"
+ESTADO_EXISTENTE = "existente"
+ESTADO_ERROR = "error"
+
+
+@dataclass
+class SegmentCreationResult:
+    """Resultado de crear (o encontrar) un segmento en la UI."""
+    name: str
+    estado: str
+    duracion_s: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.estado != ESTADO_ERROR
 
 
 class SegmentsScrapingService:
@@ -17,15 +44,20 @@ class SegmentsScrapingService:
     Servicio para crear segmentos mediante scraping en la UI de Acumbamail.
 
     Puede operar con una Page ya autenticada (recomendada) o, si no se provee,
-    creará un navegador temporal usando el storage state configurado.
+    abrirá un navegador temporal con login para toda la operación.
     """
 
+    # Timeouts (ms)
+    NAVIGATION_TIMEOUT = 60000
+    BUTTON_TIMEOUT = 15000
+    FORM_TIMEOUT = 10000
+    CONFIRM_TIMEOUT = 20000
+
     def __init__(self, page: Optional[Page] = None):
         self.page = page
         self.logger = get_logger()
         self.config = load_config()
-
-    # (Sin helpers de lifecycle complicados; se usa context manager cuando no hay Page externa)
+        self.last_results: List[SegmentCreationResult] = []
 
     # ============== API pública ==============
     def create_segment(self, list_id: int, segment_name: str, api_client) -> bool:
@@ -33,471 +65,191 @@ class SegmentsScrapingService:
         Crea un segmento individual.
         Primero verifica por API si ya existe. Si no, lo crea vía UI.
         """
-        logging.info(f"🔍 Iniciando creación de segmento '{segment_name}' en lista {list_id}")
-
-        # Paso 1: Verificar existencia por API
-        logging.info("📌 Paso 1: Verificando si segmento ya existe por API")
-        try:
-            logging.debug(f"🔍 Consultando segmentos existentes para lista {list_id}")
-            segmentos_existentes = api_client.suscriptores.get_list_segments(list_id)
-            existing_names: List[str] = []
-
-            if segmentos_existentes:
-                logging.debug(f"📋 Se encontraron segmentos existentes, procesando...")
-                # soportar distintos formatos (objeto con .segments o lista directa/tuplas)
-                items = getattr(segmentos_existentes, 'segments', segmentos_existentes)
-                for seg in items or []:
-                    if isinstance(seg, tuple):
-                        existing_names.append(str(seg[0]))
-                    elif hasattr(seg, 'name'):
-                        existing_names.append(str(getattr(seg, 'name')))
-                    elif isinstance(seg, dict) and 'name' in seg:
-                        existing_names.append(str(seg['name']))
-                    else:
-                        existing_names.append(str(seg))
-
-                logging.debug(f"📋 Nombres de segmentos existentes: {existing_names}")
-
-            if segment_name in existing_names:
-                logging.info(f"✅ Segmento '{segment_name}' ya existe - No es necesario crearlo")
-                return True
-
-            logging.debug(f"📋 Segmento '{segment_name}' no existe - Procediendo a crearlo")
-
-        except Exception as e:
-            logging.warning(f"⚠️ No se pudo verificar segmentos existentes por API: {e}")
-            logging.warning("🔄 Continuando con creación vía UI de todas formas")
-
-        # Paso 2: Navegar a página de segmentos
-        logging.info("📌 Paso 2: Navegando a página de segmentos")
-        try:
-            if self.page is not None:
-                page = self.page
-                segments_url = f"https://acumbamail.com/app/list/{list_id}/segments/"
-                logging.debug(f"🌐 Navegando a: {segments_url}")
-
-                page.goto(segments_url, wait_until="networkidle", timeout=60000)
-                logging.debug("✅ Navegación iniciada (networkidle)")
+        return self.create_segments_batch(list_id, [segment_name], api_client)
 
-                page.wait_for_load_state("networkidle", timeout=30000)
-                page.wait_for_timeout(1500)  # Espera adicional para conexiones lentas
-                logging.debug("✅ Página cargada completamente (networkidle + 1.5s)")
+    def create_segments_batch(self, list_id: int, segment_names: List[str], api_client) -> bool:
+        """
+        Crea múltiples segmentos con una sola consulta de existentes y una sola navegación.
 
-            else:
-                logging.error("❌ ERROR PASO 2 - No hay página disponible")
-                return False
+        Los tiempos por segmento quedan en ``last_results``.
 
-        except PWTimeoutError as e:
-            logging.error(f"❌ ERROR PASO 2 - Timeout navegando a página de segmentos: {e}")
-            logging.error(f"⏱️ URL intentada: https://acumbamail.com/app/list/{list_id}/segments/")
-            return False
-        except Exception as e:
-            logging.error(f"❌ ERROR PASO 2 - Error navegando a página de segmentos: {e}")
-            return False
+        Returns:
+            True si todos los segmentos existen o se crearon
+        """
+        inicio = time.perf_counter()
+        self.last_results = []
+        self.logger.info(f"🔍 Creación batch de segmentos - Lista: {list_id}, Total: {len(segment_names)}")
 
-        # Paso 3: Localizar botón "Nuevo segmento"
-        logging.info("📌 Paso 3: Localizando botón 'Nuevo segmento'")
-        nuevo_segmento_button = None
+        nombres = list(dict.fromkeys(str(n) for n in segment_names if n))
+        if not nombres:
+            print("  ℹ️  No hay segmentos para crear")
+            return True
 
-        # Estrategia 1: Botón en estado vacío
-        try:
-            logging.debug("🔍 Buscando botón en estado vacío (#empty-state-add-segment-button)")
-            empty_state_button = page.locator("#empty-state-add-segment-button").get_by_text("Nuevo segmento")
-            if empty_state_button.is_visible(timeout=5000):
-                nuevo_segmento_button = empty_state_button
-                logging.debug("✅ Botón encontrado en estado vacío")
-        except PWTimeoutError:
-            logging.debug("⏱️ Botón en estado vacío no encontrado (timeout)")
-        except Exception as e:
-            logging.debug(f"⚠️ Error buscando botón en estado vacío: {e}")
+        # Una sola consulta de segmentos existentes
+        existentes = set(self.fetch_existing_names(list_id, api_client))
+        to_create = [n for n in nombres if n not in existentes]
+        self.last_results = [SegmentCreationResult(n, ESTADO_EXISTENTE) for n in nombres if n in existentes]
 
-        # Estrategia 2: Botón normal
-        if not nuevo_segmento_button:
-            try:
-                logging.debug("🔍 Buscando botón normal (#new-segment-button)")
-                normal_button = page.locator("#new-segment-button").get_by_text("Nuevo segmento")
-                if normal_button.is_visible(timeout=5000):
-                    nuevo_segmento_button = normal_button
-                    logging.debug("✅ Botón normal encontrado")
-            except PWTimeoutError:
-                logging.debug("⏱️ Botón normal no encontrado (timeout)")
-            except Exception as e:
-                logging.debug(f"⚠️ Error buscando botón normal: {e}")
+        if self.last_results:
+            ya = [r.name for r in self.last_results]
+            print(f"  ✅ {len(ya)} segmento(s) ya existe(n): {ya}")
 
-        # Estrategia 3: Por rol
-        if not nuevo_segmento_button:
+        if to_create:
+            print(f"  🚀 Creando {len(to_create)} segmento(s) nuevo(s): {to_create}")
             try:
-                logging.debug("🔍 Buscando botón por rol (button, name='Nuevo segmento')")
-                by_role_button = page.get_by_role("button", name="Nuevo segmento")
-                if by_role_button.is_visible(timeout=5000):
-                    nuevo_segmento_button = by_role_button
-                    logging.debug("✅ Botón encontrado por rol")
-            except PWTimeoutError:
-                logging.debug("⏱️ Botón por rol no encontrado (timeout)")
+                with authenticated_page(self.page) as (page, _context):
+                    self.last_results.extend(self._create_on_page(profile_page(page), list_id, to_create))
             except Exception as e:
-                logging.debug(f"⚠️ Error buscando botón por rol: {e}")
+                self.logger.error(f"❌ Error abriendo la página de segmentos: {e}", list_id=list_id)
+                hechos = {r.name for r in self.last_results}
+                self.last_results.extend(
+                    SegmentCreationResult(n, ESTADO_ERROR, error=str(e)) for n in to_create if n not in hechos
+                )
+            self._verify_created(list_id, api_client)
+        else:
+            print("  ✅ Todos los segmentos ya existen")
 
-        # Verificación final
-        if not nuevo_segmento_button:
-            logging.error("❌ ERROR PASO 3 - No se pudo encontrar el botón 'Nuevo segmento' con ninguna estrategia")
-            logging.debug("🔍 Estrategias intentadas: estado vacío, normal, por rol")
-            return False
+        self._report(list_id, time.perf_counter() - inicio)
+        return all(r.ok for r in self.last_results)
 
-        # Paso 4: Hacer clic en "Nuevo segmento"
-        logging.info("📌 Paso 4: Haciendo clic en 'Nuevo segmento'")
+    def fetch_existing_names(self, list_id: int, api_client) -> List[str]:
+        """Nombres de los segmentos de la lista según la API (vacío si la consulta falla)."""
         try:
-            logging.debug("🖱️ Haciendo clic en botón 'Nuevo segmento'")
-            nuevo_segmento_button.click(timeout=10000)
-            logging.debug("✅ Clic realizado exitosamente")
-        except PWTimeoutError as e:
-            logging.error(f"❌ ERROR PASO 4 - Timeout haciendo clic en 'Nuevo segmento': {e}")
-            return False
+            return self._segment_names(list_id, api_client)
         except Exception as e:
-            logging.error(f"❌ ERROR PASO 4 - Error haciendo clic en 'Nuevo segmento': {e}")
-            return False
-
-        # Paso 5: Esperar y llenar formulario
-        logging.info("📌 Paso 5: Llenando formulario de segmento")
+            self.logger.warning(f"⚠️ Error verificando segmentos existentes por API: {e}")
+            return []
+
+    def _segment_names(self, list_id: int, api_client) -> List[str]:
+        segmentos = api_client.suscriptores.get_list_segments(list_id)
+        nombres: List[str] = []
+        # soportar distintos formatos (objeto con .segments o lista directa/tuplas)
+        for seg in getattr(segmentos, 'segments', segmentos) or []:
+            if isinstance(seg, tuple):
+                nombres.append(str(seg[0]))
+            elif hasattr(seg, 'name'):
+                nombres.append(str(getattr(seg, 'name')))
+            elif isinstance(seg, dict) and 'name' in seg:
+                nombres.append(str(seg['name']))
+            else:
+                nombres.append(str(seg))
+        self.logger.debug(f"📋 Segmentos existentes en lista {list_id}: {nombres}")
+        return nombres
+
+    def _verify_created(self, list_id: int, api_client) -> None:
+        """Marca como error los segmentos dados por creados que la API no devuelve."""
+        creados = [r for r in self.last_results if r.estado == ESTADO_CREADO]
+        if not creados:
+            return
         try:
-            # Esperar a que aparezca el formulario
-            logging.debug("⏳ Esperando selector #field-value-1")
-            page.wait_for_selector("#field-value-1", timeout=10000)
-            logging.debug("✅ Formulario visible")
-
-            # Llenar nombre del segmento
-            try:
-                logging.debug("📝 Intentando llenar nombre con rol 'textbox, name=Nombre del segmento'")
-                nombre_input = page.get_by_role("textbox", name="Nombre del segmento")
-                nombre_input.fill(segment_name)
-                logging.debug(f"✅ Nombre '{segment_name}' llenado con rol")
-            except Exception:
-                try:
-                    logging.debug("📝 Fallback: usando selector #field-value-1")
-                    nombre_input = page.locator("#field-value-1")
-                    nombre_input.fill(segment_name)
-                    logging.debug(f"✅ Nombre '{segment_name}' llenado con selector")
-                except Exception as e:
-                    logging.error(f"❌ ERROR llenando nombre del segmento: {e}")
-                    return False
-
-            # Paso 6: Configurar condiciones del segmento
-            logging.info("📌 Paso 6: Configurando condiciones del segmento")
+            en_api = set(self._segment_names(list_id, api_client))
+        except Exception as e:
+            self.logger.warning(f"⚠️ No se pudieron verificar los segmentos creados por API: {e}", list_id=list_id)
+            return
+        for r in creados:
+            if r.name not in en_api:
+                r.estado = ESTADO_ERROR
+                r.error = "La API no devuelve el segmento tras guardarlo"
+                print(f"      ❌ Segmento '{r.name}' no aparece en la lista tras guardarlo")
+
+    # ============== Flujo en página ==============
+    def _create_on_page(self, page: Page, list_id: int, names: List[str]) -> List[SegmentCreationResult]:
+        resultados: List[SegmentCreationResult] = []
+        self._open_segments_page(page, list_id)
+
+        for idx, name in enumerate(names, 1):
+            inicio = time.perf_counter()
+            print(f"      📝 Creando segmento {idx}/{len(names)}: '{name}'")
             try:
-                logging.debug("📋 Configurando campo 'Segmentos'")
-                campo_select = page.locator("#field-name-1")
-                campo_select.select_option(label="Segmentos")
-                logging.debug("✅ Campo 'Segmentos' seleccionado")
-
-                logging.debug("📋 Configurando condición 'contiene'")
-                condicion_select = page.locator("#field-type-1")
-                condicion_select.select_option(label="contiene")
-                logging.debug("✅ Condición 'contiene' seleccionada")
-
-                logging.debug(f"📋 Configurando valor '{segment_name}'")
-                valor_input = page.locator("#field-value-1")
-                valor_input.fill(segment_name)
-                logging.debug(f"✅ Valor '{segment_name}' configurado")
-
+                self._create_one(page, name)
+                resultado = SegmentCreationResult(name, ESTADO_CREADO, time.perf_counter() - inicio)
+                print(f"      ✅ Segmento '{name}' creado ({resultado.duracion_s:.1f}s)")
             except Exception as e:
-                logging.warning(f"⚠️ Selectores específicos fallaron: {e}")
-                logging.debug("🔄 Intentando estrategia genérica fallback")
+                resultado = SegmentCreationResult(name, ESTADO_ERROR, time.perf_counter() - inicio, str(e))
+                print(f"      ❌ Error creando segmento '{name}': {e}")
+                self.logger.error(f"❌ Error creando segmento '{name}': {e}", list_id=list_id)
+                # La página puede haber quedado con el formulario abierto: volver a un estado conocido
                 try:
-                    logging.debug("📋 Fallback: haciendo clic en 'Segmentos'")
-                    page.get_by_text("Segmentos").click(timeout=5000)
-
-                    logging.debug("📋 Fallback: haciendo clic en 'contiene'")
-                    page.get_by_text("contiene").click(timeout=5000)
-
-                    logging.debug(f"📋 Fallback: llenando último input con '{segment_name}'")
-                    page.locator("input[type='text']").last.fill(segment_name)
-                    logging.debug("✅ Estrategia fallback completada")
+                    self._open_segments_page(page, list_id)
                 except Exception as e2:
-                    logging.error(f"❌ ERROR configurando condiciones - Fallback también falló: {e2}")
-                    return False
-
-        except PWTimeoutError as e:
-            logging.error(f"❌ ERROR PASO 5/6 - Timeout en formulario: {e}")
-            return False
-        except Exception as e:
-            logging.error(f"❌ ERROR PASO 5/6 - Error en formulario: {e}")
-            return False
-
-        # Paso 7: Guardar el segmento
-        logging.info("📌 Paso 7: Guardando el segmento")
+                    self.logger.error(f"❌ No se pudo recargar la página de segmentos: {e2}", list_id=list_id)
+                    resultados.append(resultado)
+                    resultados.extend(
+                        SegmentCreationResult(n, ESTADO_ERROR, error=str(e2)) for n in names[idx:]
+                    )
+                    return resultados
+            resultados.append(resultado)
+        return resultados
+
+    def _open_segments_page(self, page: Page, list_id: int) -> None:
+        url = SEGMENTS_URL.format(list_id=list_id)
+        self.logger.debug(f"🌐 Navegando a: {url}")
+        page.goto(url, wait_until="domcontentloaded", timeout=self.NAVIGATION_TIMEOUT)
+        self._new_segment_button(page).wait_for(state="visible", timeout=self.BUTTON_TIMEOUT)
+
+    def _new_segment_button(self, page: Page):
+        """Botón 'Nuevo segmento' en cualquiera de sus variantes (estado vacío, normal o por rol)."""
+        return (
+            page.locator("#empty-state-add-segment-button, #new-segment-button").get_by_text("Nuevo segmento")
+            .or_(page.get_by_role("button", name="Nuevo segmento"))
+            .first
+        )
+
+    def _save_button(self, page: Page):
+        return (
+            page.locator("#segment-button-text")
+            .or_(page.get_by_role("button", name="Guardar"))
+            .or_(page.get_by_role("button", name="Crear"))
+            .or_(page.locator("button[type='submit']"))
+            .first
+        )
+
+    def _create_one(self, page: Page, name: str) -> None:
+        self._new_segment_button(page).click(timeout=self.BUTTON_TIMEOUT)
+        formulario = page.locator("#field-value-1")
+        formulario.wait_for(state="visible", timeout=self.FORM_TIMEOUT)
+
+        # Nombre del segmento
+        nombre_input = page.get_by_role("textbox", name="Nombre del segmento")
+        if nombre_input.count():
+            nombre_input.fill(name)
+
+        # Condición: Segmentos contiene <nombre>
+        page.locator("#field-name-1").select_option(label="Segmentos")
+        page.locator("#field-type-1").select_option(label="contiene")
+        formulario.fill(name)
+
+        self._save_button(page).click(timeout=self.FORM_TIMEOUT)
+
+        # Confirmación: el formulario se cierra (la existencia se comprueba por API al final del lote)
         try:
-            save_button = None
-
-            # Estrategia 1: #segment-button-text
-            try:
-                logging.debug("🔍 Buscando botón #segment-button-text")
-                save_button = page.locator("#segment-button-text")
-                if save_button.is_visible(timeout=3000):
-                    logging.debug("✅ Botón #segment-button-text encontrado")
-            except Exception:
-                pass
-
-            # Estrategia 2: botón "Guardar"
-            if not save_button or not save_button.is_visible():
-                try:
-                    logging.debug("🔍 Buscando botón 'Guardar' por rol")
-                    save_button = page.get_by_role("button", name="Guardar")
-                    if save_button.is_visible(timeout=3000):
-                        logging.debug("✅ Botón 'Guardar' encontrado")
-                except Exception:
-                    pass
-
-            # Estrategia 3: botón "Crear"
-            if not save_button or not save_button.is_visible():
-                try:
-                    logging.debug("🔍 Buscando botón 'Crear' por rol")
-                    save_button = page.get_by_role("button", name="Crear")
-                    if save_button.is_visible(timeout=3000):
-                        logging.debug("✅ Botón 'Crear' encontrado")
-                except Exception:
-                    pass
-
-            # Estrategia 4: submit button
-            if not save_button or not save_button.is_visible():
-                try:
-                    logging.debug("🔍 Buscando botón type='submit'")
-                    save_button = page.locator("button[type='submit']").first
-                    if save_button.is_visible(timeout=3000):
-                        logging.debug("✅ Botón submit encontrado")
-                except Exception:
-                    pass
-
-            if not save_button or not save_button.is_visible():
-                logging.error("❌ ERROR PASO 7 - No se encontró botón de guardar con ninguna estrategia")
-                return False
-
-            # Hacer clic en guardar
-            logging.debug("💾 Haciendo clic en guardar segmento")
-            save_button.click(timeout=10000)
-            logging.debug("✅ Clic en guardar realizado")
-
-            # Esperar confirmación
-            logging.debug("⏳ Esperando confirmación de guardado")
-            page.wait_for_load_state("networkidle", timeout=15000)
-            page.wait_for_timeout(5000)
-
-            logging.success(f"✅ Segmento '{segment_name}' creado exitosamente en lista {list_id}")
-            return True
-
+            formulario.wait_for(state="hidden", timeout=self.CONFIRM_TIMEOUT)
         except PWTimeoutError as e:
-            logging.error(f"❌ ERROR PASO 7 - Timeout guardando segmento: {e}")
-            return False
-        except Exception as e:
-            logging.error(f"❌ ERROR PASO 7 - Error guardando segmento: {e}")
-            return False
-        # Si no hay página disponible, crear navegador temporal
-        logging.info("📌 Creando navegador temporal para creación de segmento")
-        try:
-            with sync_playwright() as playwright:
-                logging.debug("🌐 Iniciando navegador temporal")
-                browser = playwright.chromium.launch(headless=False)
-                context = crear_contexto_navegador(browser)
-                page = context.new_page()
-                logging.debug("✅ Navegador temporal creado")
-
-                # Ejecutar los mismos pasos de creación pero con la página temporal
-                # Pasos 2-7 del flujo normal (reutilizamos la lógica)
-                segments_url = f"https://acumbamail.com/app/list/{list_id}/segments/"
-                logging.debug(f"🌐 Navegando a: {segments_url}")
-
-                page.goto(segments_url, wait_until="networkidle", timeout=60000)
-                page.wait_for_load_state("networkidle", timeout=30000)
-                page.wait_for_timeout(1500)  # Espera adicional para conexiones lentas
-
-                # TODO: Extraer lógica de creación a un método privado para reutilizar
-                # Por ahora, replicamos la lógica esencial de forma simplificada
-
-                # Localizar y hacer clic en "Nuevo segmento"
-                nuevo_segmento_button = None
-                for strategy_name, locator_func in [
-                    ("estado vacío", lambda: page.locator("#empty-state-add-segment-button").get_by_text("Nuevo segmento")),
-                    ("normal", lambda: page.locator("#new-segment-button").get_by_text("Nuevo segmento")),
-                    ("por rol", lambda: page.get_by_role("button", name="Nuevo segmento"))
-                ]:
-                    try:
-                        button = locator_func()
-                        if button.is_visible(timeout=5000):
-                            nuevo_segmento_button = button
-                            logging.debug(f"✅ Botón encontrado con estrategia: {strategy_name}")
-                            break
-                    except PlaywrightTimeoutError:
-                        continue
-
-                if not nuevo_segmento_button:
-                    logging.error("❌ ERROR - No se encontró botón 'Nuevo segmento' en navegador temporal")
-                    return False
-
-                nuevo_segmento_button.click()
-                logging.debug("✅ Clic en 'Nuevo segmento' realizado")
-
-                # Llenar formulario y guardar (versión simplificada)
-                page.wait_for_selector("#field-value-1", timeout=10000)
-
-                # Nombre del segmento
-                nombre_input = page.locator("#field-value-1")
-                nombre_input.fill(segment_name)
-
-                # Configuración del segmento
-                campo_select = page.locator("#field-name-1")
-                campo_select.select_option(label="Segmentos")
-
-                condicion_select = page.locator("#field-type-1")
-                condicion_select.select_option(label="contiene")
-
-                valor_input = page.locator("#field-value-1")
-                valor_input.fill(segment_name)
-
-                # Guardar
-                save_button = page.locator("button[type='submit']").first
-                save_button.click()
-
-                # Esperar confirmación
-                page.wait_for_load_state("networkidle", timeout=15000)
-                page.wait_for_timeout(5000)
-
-                logging.success(f"✅ Segmento '{segment_name}' creado exitosamente con navegador temporal")
-                return True
-
-        except PlaywrightTimeoutError as e:
-            logging.error(f"❌ ERROR - Timeout en navegador temporal: {e}")
-            return False
-        except Exception as e:
-            logging.error(f"❌ ERROR - Error con navegador temporal: {e}")
-            return False
+            raise RuntimeError(f"Sin confirmación de guardado en {self.CONFIRM_TIMEOUT / 1000:.0f}s") from e
 
-    def create_segments_batch(self, list_id: int, segment_names: List[str], api_client) -> bool:
-        """
-        Crea múltiples segmentos con verificación previa de existencia.
-        """
-        logging.info(f"🔍 Iniciando creación batch de segmentos - Lista: {list_id}, Total: {len(segment_names)}")
+        # Dejar la página lista para el siguiente (si el guardado recargó la página, el botón vuelve a aparecer)
+        self._new_segment_button(page).wait_for(state="visible", timeout=self.BUTTON_TIMEOUT)
 
-        # Paso 1: Validar entrada
-        logging.info("📌 Paso 1: Validando entrada de segmentos")
-        if not segment_names:
-            logging.info("✅ No hay segmentos para crear - Lista vacía")
-            print("  ℹ️  No hay segmentos para crear")
-            return True
-
-        logging.debug(f"📋 Segmentos a procesar: {segment_names}")
-        logging.info(f"✅ Entrada validada - {len(segment_names)} segmentos para procesar")
-
-        # Paso 2: Verificar existencia por API
-        logging.info("📌 Paso 2: Verificando segmentos existentes por API")
-        try:
-            logging.debug(f"🔍 Consultando segmentos existentes para lista {list_id}")
-            segmentos_existentes = api_client.suscriptores.get_list_segments(list_id)
-            existing_names: List[str] = []
-
-            if segmentos_existentes:
-                logging.debug("📋 Procesando segmentos existentes encontrados...")
-                items = getattr(segmentos_existentes, 'segments', segmentos_existentes)
-                for seg in items or []:
-                    if isinstance(seg, tuple):
-                        existing_names.append(str(seg[0]))
-                    elif hasattr(seg, 'name'):
-                        existing_names.append(str(getattr(seg, 'name')))
-                    elif isinstance(seg, dict) and 'name' in seg:
-                        existing_names.append(str(seg['name']))
-                    else:
-                        existing_names.append(str(seg))
-
-                logging.debug(f"📋 Segmentos existentes procesados: {existing_names}")
-            else:
-                logging.debug("📋 No se encontraron segmentos existentes")
-
-            logging.info(f"✅ Verificación API completada - {len(existing_names)} segmentos existentes")
-
-        except Exception as e:
-            logging.warning(f"⚠️ Error verificando segmentos existentes por API: {e}")
-            logging.warning("🔄 Continuando con creación de todos los segmentos")
-            existing_names = []
-
-        # Paso 3: Analizar y clasificar segmentos
-        logging.info("📌 Paso 3: Clasificando segmentos por estado")
-        to_create = [n for n in segment_names if n not in existing_names]
-        already = [n for n in segment_names if n in existing_names]
-
-        logging.debug(f"📊 Clasificación resultante:")
-        logging.debug(f"   • Ya existen: {already}")
-        logging.debug(f"   • Por crear: {to_create}")
-
-        if already:
-            print(f"  ✅ {len(already)} segmento(s) ya existe(n): {already}")
-            logging.info(f"✅ {len(already)} segmentos ya existen: {already}")
-
-        if not to_create:
-            print("  ✅ Todos los segmentos ya existen")
-            logging.success("✅ Todos los segmentos solicitados ya existen")
-            return True
-
-        print(f"  🚀 Creando {len(to_create)} segmento(s) nuevo(s): {to_create}")
-        logging.info(f"🚀 Iniciando creación de {len(to_create)} segmentos nuevos: {to_create}")
-
-        # Paso 4: Creación iterativa de segmentos
-        logging.info("📌 Paso 4: Creación iterativa de segmentos")
-        success = True
-        created_count = 0
-        error_count = 0
-
-        for idx, name in enumerate(to_create):
-            segment_number = idx + 1
-            total_segments = len(to_create)
-
-            try:
-                logging.info(f"📝 Creando segmento {segment_number}/{total_segments}: '{name}'")
-                print(f"      📝 Creando segmento {segment_number}/{total_segments}: '{name}'")
-
-                # Llamar al método create_segment individual
-                creation_success = self.create_segment(list_id, name, api_client)
-
-                if creation_success:
-                    created_count += 1
-                    print(f"      ✅ Segmento '{name}' creado exitosamente")
-                    logging.success(f"✅ Segmento '{name}' creado exitosamente ({created_count}/{total_segments})")
-                else:
-                    error_count += 1
-                    print(f"      ❌ Error creando segmento '{name}'")
-                    logging.error(f"❌ Error creando segmento '{name}' ({error_count} errores)")
-                    success = False
-
-                # Pausa entre segmentos (excepto el último)
-                if idx < len(to_create) - 1:
-                    logging.debug("⏱️ Pausa de 2 segundos entre segmentos")
-                    time.sleep(2)
-
-            except Exception as e:
-                error_count += 1
-                logging.error(f"❌ ERROR INESPERADO creando segmento '{name}': {e}")
-                print(f"      ❌ Error inesperado creando segmento '{name}': {e}")
-                success = False
-
-                # Continuar con el siguiente segmento incluso si hay error
-                continue
-
-        # Paso 5: Resumen final
-        logging.info("📌 Paso 5: Generando resumen final")
-        total = len(segment_names)
+    def _report(self, list_id: int, total_s: float) -> None:
+        creados = [r for r in self.last_results if r.estado == ESTADO_CREADO]
+        errores = [r for r in self.last_results if r.estado == ESTADO_ERROR]
+        existentes = [r for r in self.last_results if r.estado == ESTADO_EXISTENTE]
 
         print("  📊 Resumen de segmentos:")
-        print(f"      • Total solicitados: {total}")
-        print(f"      • Ya existían: {len(already)}")
-        print(f"      • Creados nuevos: {created_count}")
-        print(f"      • Errores: {len(to_create) - created_count}")
-
-        logging.info("📊 Resumen final de operación batch:")
-        logging.info(f"   • Total solicitados: {total}")
-        logging.info(f"   • Ya existían: {len(already)}")
-        logging.info(f"   • Creados nuevos: {created_count}")
-        logging.info(f"   • Errores: {error_count}")
-        logging.info(f"   • Éxito general: {'✅' if success else '❌'}")
-
-        if success:
-            logging.success(f"✅ Operación batch completada exitosamente - {created_count}/{len(to_create)} segmentos creados")
-        else:
-            logging.warning(f"⚠️ Operación batch completada con errores - {created_count}/{len(to_create)} segmentos creados, {error_count} errores")
-
-        return success
+        print(f"      • Total solicitados: {len(self.last_results)}")
+        print(f"      • Ya existían: {len(existentes)}")
+        print(f"      • Creados nuevos: {len(creados)}")
+        print(f"      • Errores: {len(errores)}")
+        for r in creados + errores:
+            detalle = f" - {r.error}" if r.error else ""
+            print(f"      • {r.name}: {r.estado} en {r.duracion_s:.1f}s{detalle}")
+
+        self.logger.info(
+            "📊 Creación batch de segmentos completada",
+            list_id=list_id,
+            creados=len(creados),
+            existentes=len(existentes),
+            errores=len(errores),
+            duracion_total_s=round(total_s, 2),
+            tiempos={r.name: round(r.duracion_s, 2) for r in creados + errores},
+        )
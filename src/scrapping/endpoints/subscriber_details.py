@@ -4,16 +4,18 @@ Contiene la lógica extraída de demo.py con mejores prácticas aplicadas
 """
 import logging
 from playwright.sync_api import Page, TimeoutError as PWTimeoutError
-from typing import List, Optional
+from typing import Dict, List, Optional, Type
 import time
 import re
 
-from src.shared.utils.legacy_utils import obtener_total_paginas, navegar_siguiente_pagina, load_config
+from src.shared.utils.legacy_utils import obtener_total_paginas, navegar_siguiente_pagina, ir_a_pagina, load_config
 from src.shared.logging.logger import get_logger
 from src.structured_logger import (
     log_success, log_error, log_warning, log_info, log_browser_action, log_data_extraction, log_operation, timer_decorator
 )
 from src.infrastructure.api.models.campanias import CampaignBasicInfo
+from src.cache.checkpoints import ScrapeCheckpointStore, get_checkpoint_store
+from src.infrastructure.browser.page_profiler import profile_page
 from ..models import (
     HardBounceSubscriber,
     NoOpenSubscriber,
@@ -26,10 +28,13 @@ from ..models import (
 class SubscriberDetailsService:
     """Servicio para extraer detalles de suscriptores por scraping"""
 
-    def __init__(self, page: Page):
-        self.page = page
+    def __init__(self, page: Page, checkpoints: Optional[ScrapeCheckpointStore] = None):
+        self.page = profile_page(page)
         self.logger = get_logger()
         self.config = load_config()
+        self.checkpoints = checkpoints or get_checkpoint_store()
+        # checkpoint_key -> la última extracción terminó sin errores
+        self.extracciones_completas: Dict[str, bool] = {}
 
         # Configuración de timeouts muy largos para conexiones lentas
         self.timeouts = {
@@ -397,6 +402,39 @@ class SubscriberDetailsService:
                      expected_columns=expected_columns, error_type=type(e).__name__, error=str(e))
             return []
 
+    def _resume_from_checkpoint(self, checkpoint_key: str, total_pages: int, model: Type,
+                                campaign_id: int, filter_index: int) -> tuple:
+        """
+        Recupera las páginas ya extraídas de un intento anterior y posiciona la tabla
+        en la primera página pendiente.
+
+        Returns:
+            (página inicial, registros recuperados)
+        """
+        start_page = self.checkpoints.start(checkpoint_key, total_pages)
+        if start_page <= 1:
+            return 1, []
+
+        recovered = self.checkpoints.load_models(checkpoint_key, model)
+        if start_page > total_pages:
+            log_info("Extracción recuperada completa desde checkpoint",
+                    registros=len(recovered), campaign_id=campaign_id)
+            return start_page, recovered
+
+        if ir_a_pagina(self.page, start_page):
+            log_info(f"Reanudando desde página {start_page}/{total_pages}",
+                    registros_recuperados=len(recovered), campaign_id=campaign_id)
+            return start_page, recovered
+
+        # No se pudo llegar a la página pendiente: empezar de cero
+        log_warning("No se pudo reanudar desde checkpoint, reiniciando extracción",
+                   start_page=start_page, campaign_id=campaign_id)
+        self.checkpoints.discard(checkpoint_key)
+        if not self.navigate_to_subscriber_details(campaign_id, filter_index=filter_index):
+            raise Exception(f"Campaña {campaign_id} no disponible al reiniciar la extracción")
+        self.checkpoints.start(checkpoint_key, total_pages)
+        return 1, []
+
     def _parse_subscriber_quality(self, quality_text: str) -> SubscriberQuality:
         """Convierte texto de calidad a enum"""
         quality_map = {
@@ -423,11 +461,24 @@ class SubscriberDetailsService:
             self.logger.warning(f"⚠️ Estado desconocido: {status_text}")
         return status
 
+    def extraccion_completa(self, checkpoint_key: str) -> bool:
+        """
+        True si la última extracción de ``checkpoint_key`` (``hard_bounces:<id>``,
+        ``no_opens:<id>``) recorrió todas las páginas sin errores. Los extractores
+        devuelven una lista vacía o parcial cuando fallan, así que el resultado por
+        sí solo no distingue una campaña sin datos de una extracción fallida.
+        """
+        return self.extracciones_completas.get(checkpoint_key, False)
+
     def extract_hard_bounces(self, campaign: CampaignBasicInfo, campaign_id: int) -> List[HardBounceSubscriber]:
         """
         Extrae Hard bounces de la campaña usando scraping con mejores prácticas.
         """
         suscriptores: List[HardBounceSubscriber] = []
+        checkpoint_key = f"hard_bounces:{campaign_id}"
+        # Solo se marca completa si se recorren todas las páginas sin errores
+        self.extracciones_completas[checkpoint_key] = False
+        errores_pagina = 0
 
         with log_operation("extraccion_hard_bounces",
                           campaign_id=campaign_id, campaign_name=campaign.name):
@@ -446,8 +497,14 @@ class SubscriberDetailsService:
                 log_info("Información de paginación obtenida",
                         total_pages=total_pages, campaign_id=campaign_id)
 
+                # Retomar un intento anterior interrumpido, si lo hay
+                start_page, recovered = self._resume_from_checkpoint(
+                    checkpoint_key, total_pages, HardBounceSubscriber, campaign_id, filter_index=1)
+                suscriptores.extend(recovered)
+
                 # Procesar todas las páginas
-                for page_number in range(1, total_pages + 1):
+                for page_number in range(start_page, total_pages + 1):
+                    inicio_pagina = len(suscriptores)
                     try:
                         log_info(f"Procesando página {page_number}/{total_pages}", 
                                page_number=page_number, total_pages=total_pages, campaign_id=campaign_id)
@@ -495,6 +552,7 @@ class SubscriberDetailsService:
                                   page_number=page_number, 
                                   registros_procesados=page_successes, 
                                   campaign_id=campaign_id)
+                        self.checkpoints.save_page(checkpoint_key, page_number, suscriptores[inicio_pagina:])
 
                         # Navegar a siguiente página si no es la última
                         if page_number < total_pages:
@@ -503,6 +561,7 @@ class SubscriberDetailsService:
                             if not navegar_siguiente_pagina(self.page, page_number):
                                 log_warning(f"No se pudo navegar a página {page_number + 1}", 
                                           page_number=page_number + 1, campaign_id=campaign_id)
+                                errores_pagina += 1
                                 break
 
                             # Pequeña pausa para evitar sobrecargar el servidor
@@ -512,8 +571,13 @@ class SubscriberDetailsService:
                         log_error(f"Error procesando página {page_number}", 
                                 page_number=page_number, error_type=type(e).__name__, 
                                 campaign_id=campaign_id, error=str(e))
+                        errores_pagina += 1
                         continue
 
+                if self.checkpoints.is_complete(checkpoint_key):
+                    self.checkpoints.complete(checkpoint_key)
+                self.extracciones_completas[checkpoint_key] = errores_pagina == 0
+
                 log_success("Extracción de hard bounces completada", 
                           total_hard_bounces=len(suscriptores), 
                           pages_processed=total_pages, 
@@ -537,6 +601,10 @@ class SubscriberDetailsService:
         Estructura de No abiertos: 4 columnas (Correo electrónico, Lista, Estado, Calidad)
         """
         suscriptores: List[NoOpenSubscriber] = []
+        checkpoint_key = f"no_opens:{campaign_id}"
+        # Solo se marca completa si se recorren todas las páginas sin errores
+        self.extracciones_completas[checkpoint_key] = False
+        errores_pagina = 0
 
         with log_operation("extraccion_no_abiertos",
                           campaign_id=campaign_id, campaign_name=campaign.name):
@@ -567,8 +635,14 @@ class SubscriberDetailsService:
                 log_info("Información de paginación obtenida",
                         total_pages=total_pages, campaign_id=campaign_id)
 
+                # Retomar un intento anterior interrumpido, si lo hay
+                start_page, recovered = self._resume_from_checkpoint(
+                    checkpoint_key, total_pages, NoOpenSubscriber, campaign_id, filter_index=5)
+                suscriptores.extend(recovered)
+
                 # Procesar todas las páginas
-                for page_number in range(1, total_pages + 1):
+                for page_number in range(start_page, total_pages + 1):
+                    inicio_pagina = len(suscriptores)
                     try:
                         log_info(f"Procesando página {page_number}/{total_pages}",
                                page_number=page_number, total_pages=total_pages, campaign_id=campaign_id)
@@ -659,6 +733,7 @@ class SubscriberDetailsService:
                                   registros_procesados=page_successes,
                                   registros_descartados=page_discarded,
                                   campaign_id=campaign_id)
+                        self.checkpoints.save_page(checkpoint_key, page_number, suscriptores[inicio_pagina:])
 
                         # Navegar a siguiente página si no es la última
                         if page_number < total_pages:
@@ -667,6 +742,7 @@ class SubscriberDetailsService:
                             if not navegar_siguiente_pagina(self.page, page_number):
                                 log_warning(f"No se pudo navegar a página {page_number + 1}",
                                           page_number=page_number + 1, campaign_id=campaign_id)
+                                errores_pagina += 1
                                 break
 
                             # Pequeña pausa para evitar sobrecargar el servidor
@@ -676,8 +752,13 @@ class SubscriberDetailsService:
                         log_error(f"Error procesando página {page_number}",
                                 page_number=page_number, error_type=type(e).__name__,
                                 campaign_id=campaign_id, error=str(e))
+                        errores_pagina += 1
                         continue
 
+                if self.checkpoints.is_complete(checkpoint_key):
+                    self.checkpoints.complete(checkpoint_key)
+                self.extracciones_completas[checkpoint_key] = errores_pagina == 0
+
                 log_success("Extracción de no abiertos completada",
                           total_no_abiertos=len(suscriptores),
                           total_elements_expected=total_elements,
@@ -690,6 +771,7 @@ class SubscriberDetailsService:
                              total_elements_esperados=total_elements,
                              total_extraidos=len(suscriptores),
                              campaign_id=campaign_id)
+                    self.extracciones_completas[checkpoint_key] = False
 
             except Exception as e:
                 log_error("Error extrayendo no abiertos",
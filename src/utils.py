@@ -29,6 +29,7 @@ os.makedirs(os.environ["PLAYWRIGHT_BROWSERS_PATH"], exist_ok=True)
 
 from playwright.sync_api import Page
 from playwright._impl._errors import Error as PWError
+from .infrastructure.browser.page_profiler import profile_page
 import pandas as pd
 import yaml
 
@@ -139,6 +140,19 @@ def save_config(cfg: dict):
 		yaml.safe_dump(cfg, f, sort_keys=False)
 	logger.success("✅ Configuración guardada exitosamente", path=config_path())
 
+def config_int(seccion: str, clave: str, por_defecto: int, minimo: int = 1) -> int:
+	"""
+	Entero ``seccion.clave`` de config.yaml, nunca menor que ``minimo``.
+
+	Si config.yaml no se puede leer o el valor no es un número se usa ``por_defecto``.
+	"""
+	try:
+		valor = int((load_config().get(seccion, {}) or {}).get(clave, por_defecto))
+	except Exception:
+		logger.warning(f"⚠️ {seccion}.{clave} no válido en config.yaml, usando {por_defecto}")
+		valor = por_defecto
+	return max(minimo, valor)
+
 def crear_contexto_navegador(browser, extraccion_oculta: bool = False) -> BrowserContext:
 	"""Crea contexto del navegador con configuración de sesión optimizada."""
 	storage_state = storage_state_path() if os.path.exists(storage_state_path()) else None
@@ -241,6 +255,7 @@ def obtener_total_paginas(page: Page) -> int:
 	"""
 	Obtiene el número total de páginas de reportes calculando desde elementos totales
 	"""
+	page = profile_page(page)
 	items_por_pagina = 15  # Valor por defecto si no se puede determinar
 
 	try:
@@ -345,6 +360,7 @@ def obtener_total_paginas_rapido(page: Page) -> int:
 	Versión rápida para obtener total de páginas sin optimizar items por página.
 	Útil cuando sabemos que hay pocos elementos o queremos máxima velocidad.
 	"""
+	page = profile_page(page)
 	try:
 		# Solo buscar navegación, sin intentar optimizar items por página
 		navegacion = page.locator('ul').filter(has=page.locator('li').locator('a', has_text="1")).last
@@ -364,6 +380,7 @@ def navegar_siguiente_pagina(page: Page, pagina_actual: int) -> bool:
 	"""
 	Navega a la siguiente página si existe (optimizado)
 	"""
+	page = profile_page(page)
 	siguiente_pagina = pagina_actual + 1
 
 	try:
@@ -390,6 +407,37 @@ def navegar_siguiente_pagina(page: Page, pagina_actual: int) -> bool:
 		print(f"❌ Error navegando a página {siguiente_pagina}: {e}")
 		return False
 
+def ir_a_pagina(page: Page, numero_pagina: int, pagina_actual: int = 1) -> bool:
+	"""
+	Lleva la tabla paginada a ``numero_pagina`` (usado para reanudar extracciones).
+
+	Intenta primero un salto directo reescribiendo el parámetro ``page=`` de un
+	enlace de la paginación; si no hay enlace utilizable, avanza página a página
+	desde ``pagina_actual``.
+	"""
+	page = profile_page(page)
+	if numero_pagina <= pagina_actual:
+		return True
+
+	try:
+		enlace = page.locator("ul li a[href*='page=']").first
+		if enlace.count() > 0:
+			href = enlace.get_attribute("href") or ""
+			if re.search(r"([?&])page=\d+", href):
+				from urllib.parse import urljoin
+				destino = urljoin(page.url, re.sub(r"([?&])page=\d+", rf"\g<1>page={numero_pagina}", href))
+				page.goto(destino, wait_until="domcontentloaded", timeout=30000)
+				page.wait_for_timeout(1500)
+				logger.info(f"⏭️ Reanudando en página {numero_pagina}...")
+				return True
+	except Exception as e:
+		logger.warning("⚠️ Salto directo de página fallido, navegando secuencialmente", error=str(e))
+
+	for actual in range(pagina_actual, numero_pagina):
+		if not navegar_siguiente_pagina(page, actual):
+			return False
+	return True
+
 def notify(title: str, message: str, level: str = "info") -> bool:
 	"""
 	Muestra una notificación segura:
@@ -0,0 +1,116 @@
+"""
+Unit tests for the persistent browser service
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.infrastructure.browser import browser_service as bs
+from src.infrastructure.browser.browser_service import BrowserService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """BrowserService with Playwright and login replaced by mocks"""
+    launches = []
+
+    def fake_ensure_context(self):
+        if self._context is None:
+            self._context = Mock()
+            self._context.new_page.return_value.is_closed.return_value = False
+            self._browser = Mock()
+            launches.append(threading.current_thread().name)
+        return self._context
+
+    monkeypatch.setattr(BrowserService, "_ensure_context", fake_ensure_context)
+    monkeypatch.setattr(BrowserService, "_ensure_authenticated", lambda self, page, context: None)
+
+    svc = BrowserService(idle_timeout=0.2)
+    svc.launches = launches
+    yield svc
+    svc.shutdown()
+
+
+class TestBrowserService:
+    def test_run_returns_operation_result(self, service):
+        result = service.run(lambda page, context: "ok")
+        assert result == "ok"
+
+    def test_operations_share_one_browser_and_thread(self, service):
+        threads = [service.run(lambda page, context: threading.current_thread()) for _ in range(3)]
+        assert len(set(threads)) == 1
+        assert threads[0] is not threading.current_thread()
+        assert len(service.launches) == 1
+
+    def test_operation_exception_is_reraised(self, service):
+        def boom(page, context):
+            raise ValueError("fallo")
+
+        with pytest.raises(ValueError, match="fallo"):
+            service.run(boom)
+        # The service keeps working after a failed operation
+        assert service.run(lambda page, context: 1) == 1
+
+    def test_idle_timeout_closes_browser_and_relaunches(self, service):
+        service.run(lambda page, context: None)
+        assert service.is_running
+
+        deadline = time.time() + 3
+        while service.is_running and time.time() < deadline:
+            time.sleep(0.05)
+        assert not service.is_running
+        assert service._context is None
+
+        service.run(lambda page, context: None)
+        assert len(service.launches) == 2
+
+    def test_page_is_closed_after_operation(self, service):
+        page = service.run(lambda page, context: page)
+        page.close.assert_called_once()
+
+    def test_shutdown_stops_worker(self, service):
+        service.run(lambda page, context: None)
+        service.shutdown(wait=True)
+        assert not service.is_running
+
+    def test_shutdown_does_not_wait_for_running_operation(self, service):
+        started, release = threading.Event(), threading.Event()
+
+        def slow(page, context):
+            started.set()
+            release.wait(5)
+            return "done"
+
+        caller = threading.Thread(target=lambda: setattr(service, "result", service.run(slow)))
+        caller.start()
+        assert started.wait(2)
+
+        inicio = time.perf_counter()
+        service.shutdown()
+        assert time.perf_counter() - inicio < 0.5
+        assert service.is_running
+
+        release.set()
+        caller.join(2)
+        assert service.result == "done"
+        deadline = time.time() + 2
+        while service.is_running and time.time() < deadline:
+            time.sleep(0.05)
+        assert not service.is_running
+        assert service._context is None
+
+    def test_operation_queued_after_shutdown_runs_on_new_browser(self, service):
+        service.run(lambda page, context: None)
+        service.shutdown()
+        assert service.run(lambda page, context: "ok") == "ok"
+        assert len(service.launches) == 2
+
+
+def test_get_browser_service_is_singleton(monkeypatch):
+    monkeypatch.setattr(bs, "_service", None)
+    monkeypatch.setattr(bs, "load_config", lambda: {"browser_service": {"idle_timeout": 12}})
+    first = bs.get_browser_service()
+    assert first is bs.get_browser_service()
+    assert first.idle_timeout == 12.0
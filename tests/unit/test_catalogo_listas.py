@@ -0,0 +1,149 @@
+"""
+Unit tests for the keyed list catalogue (Busqueda_Listas.xlsx)
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from src import catalogo_listas
+from src.catalogo_listas import COLUMNAS, CatalogoListas, clave_orden_fechas
+
+
+@pytest.fixture(autouse=True)
+def lectura_directa(monkeypatch):
+    monkeypatch.setattr(catalogo_listas, "leer_excel_cacheado", lambda archivo: pd.read_excel(archivo))
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    ruta = tmp_path / "Busqueda_Listas.xlsx"
+    pd.DataFrame([
+        ["x", 1, "Clientes", 120, "2024-05-01 10:00:00"],
+        ["", 2, "Antigua", 5, "2023-01-15 08:00:00"],
+        ["", 3, "Sin stats", None, None],
+    ], columns=COLUMNAS).to_excel(ruta, index=False)
+    return ruta
+
+
+def test_sync_adds_renames_and_moves_deleted_lists(archivo):
+    catalogo = CatalogoListas.cargar(archivo)
+    resumen = catalogo.sincronizar_remotas([(1, "Clientes VIP"), (3, "Sin stats"), (4, "Nueva")])
+
+    assert resumen == {"nuevas": 1, "renombradas": 1, "eliminadas": 1}
+    assert catalogo.fila(1) == ["x", "1", "Clientes VIP", "120", "2024-05-01 10:00:00"]
+    assert catalogo.eliminadas["ID_LISTA"].tolist() == ["2"]
+    assert sorted(catalogo.pendientes_de_estadisticas()) == ["3", "4"]
+
+
+def test_upsert_tracks_only_real_changes(archivo):
+    catalogo = CatalogoListas.cargar(archivo)
+
+    assert catalogo.upsert(1, suscriptores=120, creacion="2024-05-01 10:00:00") is False
+    assert not catalogo.hay_cambios
+    assert catalogo.upsert(3, suscriptores=7, creacion="2024-02-01") is True
+    assert catalogo.cambios == {"3"}
+
+
+def test_save_is_skipped_without_changes(archivo):
+    antes = os.stat(archivo).st_mtime_ns
+    catalogo = CatalogoListas.cargar(archivo)
+    catalogo.sincronizar_remotas([(1, "Clientes"), (2, "Antigua"), (3, "Sin stats")])
+
+    assert catalogo.guardar() is False
+    assert os.stat(archivo).st_mtime_ns == antes
+
+
+def test_saved_file_is_sorted_by_date_with_blanks_last(archivo):
+    catalogo = CatalogoListas.cargar(archivo)
+    catalogo.upsert(4, nombre="Nueva", suscriptores=1, creacion="2023/06/30")
+    assert catalogo.guardar() is True
+
+    df = pd.read_excel(archivo, dtype=str).fillna("")
+    assert df["ID_LISTA"].tolist() == ["2", "4", "1", "3"]
+    assert df.loc[df["ID_LISTA"] == "1", "Buscar"].item() == "x"
+
+
+def test_upsert_filas_is_vectorised_upsert(archivo):
+    catalogo = CatalogoListas.cargar(archivo)
+    cambiadas = catalogo.upsert_filas([
+        ["x", "1", "Clientes", "120", "2024-05-01 10:00:00"],
+        ["", "3", "Sin stats", "9", "2024-06-01"],
+        ["", "5", "Otra", "1", ""],
+    ])
+
+    assert cambiadas == 2
+    assert catalogo.cambios == {"3", "5"}
+
+
+def test_date_key_handles_mixed_and_invalid_values():
+    claves = clave_orden_fechas(pd.Series(["2024-09-16 10:30:00", "2024/01/02", "", "ayer"]))
+    assert claves.iloc[1].tolist() == [2024, 1, 2, 0, 0, 0]
+    assert claves.iloc[2:]["_anio"].isna().all()
+
+
+def test_stats_enrichment_runs_concurrently_and_streams_into_catalogue(archivo):
+    import threading
+    import time
+    from types import SimpleNamespace
+
+    from src.obtener_listas import enriquecer_estadisticas
+
+    estado = {"activas": 0, "max": 0}
+    lock = threading.Lock()
+
+    def get_list_stats(list_id):
+        with lock:
+            estado["activas"] += 1
+            estado["max"] = max(estado["max"], estado["activas"])
+        time.sleep(0.05)
+        with lock:
+            estado["activas"] -= 1
+        if list_id == 4:
+            raise RuntimeError("500")
+        return SimpleNamespace(total_subscribers=list_id * 10, create_date=f"2024-0{list_id}-01")
+
+    api = SimpleNamespace(suscriptores=SimpleNamespace(get_list_stats=get_list_stats))
+    catalogo = CatalogoListas.cargar(archivo)
+    catalogo.upsert(4, nombre="Falla")
+    catalogo.upsert(5, nombre="Nueva")
+    listas = [SimpleNamespace(id=i, name=n) for i, n in [(3, "Sin stats"), (4, "Falla"), (5, "Nueva")]]
+    mensajes, guardados = [], []
+
+    resumen = enriquecer_estadisticas(api, catalogo, listas, progress_callback=mensajes.append,
+                                      guardar=guardados.append, guardar_cada=1, max_workers=3)
+
+    assert estado["max"] > 1
+    assert resumen == {"procesadas": 3, "actualizadas": 2, "sin_cambios": 0, "errores": 1}
+    assert catalogo.fila(5)[3:] == ["50", "2024-05-01"]
+    assert catalogo.pendientes_de_estadisticas() == ["4"]
+    assert len(guardados) == 2  # tras cada lista salvo la última (la guarda el llamador)
+    assert mensajes[-1].startswith("Progreso: 3/3 (100%)")
+
+
+def test_stats_are_refetched_only_for_changed_or_expired_lists(archivo, tmp_path):
+    from types import SimpleNamespace
+
+    from src.cache.list_stats_cache import ListStatsCache
+    from src.obtener_listas import listas_para_estadisticas
+
+    def remotas(firmas):
+        return [SimpleNamespace(id=i, name=n, firma=firmas.get(i, "a")) for i, n in [(1, "Clientes"), (2, "Antigua"), (3, "Sin stats")]]
+
+    cache = ListStatsCache(db_path=str(tmp_path / "stats.db"))
+    catalogo = CatalogoListas.cargar(archivo)
+
+    # Primera ejecución: las stats del catálogo sirven de punto de partida
+    assert [l.id for l in listas_para_estadisticas(catalogo, remotas({}), cache)] == [3]
+    cache.put(3, "a", "7", "2024-02-01")
+
+    # La lista 1 cambió en getLists: se vuelve a pedir aunque tenga datos
+    assert [l.id for l in listas_para_estadisticas(catalogo, remotas({1: "b"}), cache)] == [1]
+
+    # Catálogo sin datos de la lista 3: se rellenan desde la caché sin llamar a la API
+    assert catalogo.fila(3)[3:] == ["7", "2024-02-01"]
+
+    caducada = ListStatsCache(db_path=str(tmp_path / "stats.db"), max_age_hours=0)
+    assert len(listas_para_estadisticas(catalogo, remotas({}), caducada)) == 3
+    desactivada = ListStatsCache(enabled=False)
+    assert listas_para_estadisticas(CatalogoListas.cargar(archivo), remotas({1: "b"}), desactivada)[0].id == 3
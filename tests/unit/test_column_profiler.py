@@ -0,0 +1,75 @@
+"""
+Unit tests for the column type profiler and the per-list schema cache
+"""
+import pandas as pd
+from openpyxl import Workbook
+
+from src.cache.column_schema import ColumnSchemaStore
+from src.infrastructure.excel.column_profiler import perfilar_columna, perfilar_columnas
+from src.infrastructure.scraping.endpoints import lista_upload
+from src.infrastructure.scraping.endpoints.lista_upload import ListUploader
+
+
+def test_profiles_whole_column_not_first_row():
+    df = pd.DataFrame({
+        "email": ["a@x.com", "b@y.es", "c@z.org"],
+        "edad": ["30", "41", ""],
+        "importe": ["12", "3,50", "7.25"],
+        "cp": ["08001", "28004", "46001"],
+        "alta": ["2024-01-02 03:04:05", "2024-02-03", "15/03/2024"],
+        "web": ["https://a.com/x", "www.b.es", "http://c.org"],
+        "nota": ["123", "abc", "def"],
+    })
+
+    perfiles = {p.nombre: p for p in perfilar_columnas(df)}
+
+    assert perfiles["email"].detectado == "email" and perfiles["email"].tipo == "Texto"
+    assert perfiles["edad"].tipo == "Número entero" and perfiles["edad"].no_vacios == 2
+    assert perfiles["importe"].tipo == "Número decimal"
+    assert perfiles["cp"].tipo == "Texto"  # ceros a la izquierda
+    assert perfiles["alta"].tipo == "Fecha"
+    assert perfiles["web"].tipo == "Url"
+    # La primera fila parece un entero pero la columna es texto
+    assert perfiles["nota"].tipo == "Texto"
+    assert perfiles["nota"].puntuaciones["entero"] == round(1 / 3, 4)
+    assert perfiles["nota"].confianza == round(1 - 1 / 3, 4)
+
+
+def test_threshold_and_empty_column():
+    valores = pd.Series([str(i) for i in range(99)] + ["n/a"])
+    assert perfilar_columna(valores, umbral=0.95).tipo == "Número entero"
+    assert perfilar_columna(valores, umbral=1.0).tipo == "Texto"
+    vacia = perfilar_columna(pd.Series(["", None, "nan"]), "x")
+    assert vacia.tipo == "Texto" and vacia.no_vacios == 0
+
+
+def test_upload_columns_reuse_cached_schema(tmp_path, monkeypatch):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Clientes"
+    ws.append(["email", "codigo", "saldo"])
+    ws.append(["a@x.com", "10", "abc"])
+    for i in range(20):
+        ws.append([f"u{i}@x.com", str(i + 11), f"{i}.5"])
+    archivo = tmp_path / "lista.xlsx"
+    wb.save(archivo)
+
+    store = ColumnSchemaStore(db_path=str(tmp_path / "schemas.db"))
+    monkeypatch.setattr(lista_upload, "get_column_schema_store", lambda: store)
+    uploader = ListUploader()
+
+    columnas, primera = uploader.cargar_columnas_excel(str(archivo), "Clientes")
+    assert [c.field_type for c in columnas] == ["Texto", "Número entero", "Número decimal"]
+    assert primera == ["a@x.com", "10", "abc"]
+    assert [c.index for c in columnas] == [1, 2, 3]
+
+    # Segunda subida del mismo archivo: no se lee la hoja
+    def sin_lectura(*args, **kwargs):
+        raise AssertionError("no debería leerse el Excel")
+
+    monkeypatch.setattr(lista_upload.pd, "ExcelFile", sin_lectura)
+    cacheadas, primera_cache = uploader.cargar_columnas_excel(str(archivo), "Clientes")
+    assert cacheadas == columnas and primera_cache == primera
+
+    # Otra lista con el mismo archivo se perfila de nuevo (y falla al no poder leer)
+    assert uploader.cargar_columnas_excel(str(archivo), "Clientes", lista="Otra") == ([], [])
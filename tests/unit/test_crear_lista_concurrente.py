@@ -0,0 +1,74 @@
+"""
+Unit tests for parallel multi-sheet list uploads
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from src import crear_lista_scraping as cls
+from src.infrastructure.scraping.models.listas import ListUploadColumn, ListUploadProgress
+
+
+@pytest.fixture
+def subida_simulada(monkeypatch):
+    estado = {"activas": 0, "max_activas": 0, "paginas": 0}
+    lock = threading.Lock()
+
+    def cargar_columnas(self, archivo, hoja, lista=None):
+        if hoja == "SinColumnas":
+            return [], []
+        return [ListUploadColumn(index=1, name="email")], ["a@x.com"]
+
+    @contextmanager
+    def pagina(headless):
+        with lock:
+            estado["paginas"] += 1
+        yield object()
+
+    def procesar(page, uploader, config, callback, hoja):
+        with lock:
+            estado["activas"] += 1
+            estado["max_activas"] = max(estado["max_activas"], estado["activas"])
+        callback(ListUploadProgress(stage="subiendo_archivo", mensaje="Subiendo", porcentaje=50.0))
+        time.sleep(0.1)
+        with lock:
+            estado["activas"] -= 1
+        if hoja == "Falla":
+            raise RuntimeError("timeout")
+        return {"hoja": hoja, "success": True, "subscribers_uploaded": 1, "fields_mapped": 1}
+
+    monkeypatch.setattr(cls.ListUploader, "cargar_columnas_excel", cargar_columnas)
+    monkeypatch.setattr(cls, "_pagina_autenticada", pagina)
+    monkeypatch.setattr(cls, "procesar_hoja_lista", procesar)
+    return estado
+
+
+def test_sheets_run_concurrently_with_limit(subida_simulada):
+    hojas = [f"Hoja{i}" for i in range(6)]
+    inicio = time.perf_counter()
+    resultados = cls.procesar_hojas_concurrente("libro.xlsx", hojas, True, max_workers=3,
+                                                progress_callback=lambda p: None)
+
+    assert time.perf_counter() - inicio < 0.5  # 2 tandas de 0.1s, no 6
+    assert subida_simulada["max_activas"] == 3
+    assert [r["hoja"] for r in resultados] == hojas
+    assert all(r["success"] and "duracion_s" in r for r in resultados)
+
+
+def test_failures_are_isolated_and_progress_is_shared(subida_simulada):
+    eventos = []
+    resultados = cls.procesar_hojas_concurrente(
+        "libro.xlsx", ["Ok", "Falla", "SinColumnas"], True, max_workers=3, progress_callback=eventos.append
+    )
+
+    assert [r["success"] for r in resultados] == [True, False, False]
+    assert resultados[1]["error"] == "timeout"
+    assert resultados[2]["error"] == "Error al cargar columnas"
+    assert subida_simulada["paginas"] == 2
+    assert all(isinstance(e, ListUploadProgress) for e in eventos)
+    assert any(e.mensaje.startswith("[Falla] ") for e in eventos)
+    assert eventos[-1].porcentaje == 100.0
@@ -0,0 +1,78 @@
+"""
+Unit tests for the streaming xlsx -> CSV converter
+"""
+import csv
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from src.infrastructure.excel.csv_stream import convertir_hoja_a_csv
+
+
+@pytest.fixture
+def libro(tmp_path):
+    wb = Workbook()
+    wb.active.title = "Otra"
+    ws = wb.create_sheet("Datos")
+    ws.append(["email", "Nombre", None, "Alta", None])
+    for i in range(1_000):
+        ws.append([f"u{i}@example.com", f"Nombre, {i}", i, datetime(2024, 1, 2, 3, 4, 5), None])
+    ws.append([None, None, None])
+    ws.append(["ultimo@example.com", "Último"])
+    ruta = tmp_path / "lista.xlsx"
+    wb.save(ruta)
+    return ruta
+
+
+def leer(ruta):
+    with open(ruta, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_matches_pandas_conversion(libro, tmp_path):
+    resultado = convertir_hoja_a_csv(str(libro), "Datos", str(tmp_path / "lista.csv"))
+
+    esperado = pd.read_excel(libro, sheet_name="Datos", dtype=str).dropna(how="all").fillna("")
+    filas = leer(resultado.archivos[0])
+    assert filas[0] == list(esperado.columns)
+    assert filas[1:] == esperado.values.tolist()
+    assert resultado.filas == 1_001
+    assert resultado.mb_por_segundo > 0
+
+
+def test_splits_by_size_repeating_header(libro, tmp_path):
+    resultado = convertir_hoja_a_csv(str(libro), "Datos", str(tmp_path / "lista.csv"),
+                                     max_bytes_por_archivo=20_000, filas_por_bloque=100)
+
+    assert len(resultado.archivos) > 1
+    assert resultado.archivos[1] == str(tmp_path / "lista_2.csv")
+    partes = [leer(ruta) for ruta in resultado.archivos]
+    assert all(parte[0][0] == "email" for parte in partes)
+    assert sum(len(parte) - 1 for parte in partes) == resultado.filas
+    assert all((tmp_path / ruta).stat().st_size <= 20_500 for ruta in resultado.archivos)
+
+
+def test_missing_sheet_raises(libro, tmp_path):
+    with pytest.raises(ValueError, match="no existe"):
+        convertir_hoja_a_csv(str(libro), "Nada", str(tmp_path / "x.csv"))
+
+
+def test_failed_conversion_removes_written_parts(libro, tmp_path, monkeypatch):
+    from src.infrastructure.excel import csv_stream
+
+    def filas_rotas(archivo_excel, hoja):
+        yield ["email", "Nombre"]
+        for i in range(2_000):
+            yield [f"u{i}@example.com", f"Nombre {i}"]
+        raise OSError("libro truncado")
+
+    monkeypatch.setattr(csv_stream, "_filas_hoja", filas_rotas)
+    salida = tmp_path / "csv"
+    salida.mkdir()
+
+    with pytest.raises(OSError, match="truncado"):
+        convertir_hoja_a_csv(str(libro), "Datos", str(salida / "lista.csv"),
+                             max_bytes_por_archivo=10_000, filas_por_bloque=100)
+    assert list(salida.iterdir()) == []
@@ -0,0 +1,106 @@
+"""
+Unit tests for the concurrent streaming list downloader
+"""
+import csv
+import threading
+import time
+
+import pytest
+
+from src import descargar_listas
+from src.descargar_listas import DescargadorListas, TAMANO_BLOQUE
+from src.export import CsvSink
+
+
+class FakeSuscriptoresAPI:
+    def __init__(self, tamanos, repetir_ultimo=False, retardo=0.0, merge_fields=None):
+        self.tamanos = tamanos  # {list_id: número de suscriptores}
+        self.merge_fields = merge_fields or {}
+        self.repetir_ultimo = repetir_ultimo
+        self.retardo = retardo
+        self.llamadas = []
+        self.activas = 0
+        self.max_activas = 0
+        self._lock = threading.Lock()
+
+    def get_subscribers(self, list_id, status=None, block_index=0, all_fields=1, complete_json=1):
+        with self._lock:
+            self.llamadas.append((list_id, block_index))
+            self.activas += 1
+            self.max_activas = max(self.max_activas, self.activas)
+        time.sleep(self.retardo)
+        with self._lock:
+            self.activas -= 1
+        total = self.tamanos[list_id]
+        if not total:
+            raise RuntimeError("No subscribers found")
+        inicio = block_index * TAMANO_BLOQUE
+        if inicio >= total and self.repetir_ultimo:
+            inicio = (total - 1) // TAMANO_BLOQUE * TAMANO_BLOQUE
+        return [{"email": f"u{i}@x.com", "id": i, "SEDE": None} for i in range(inicio, min(inicio + TAMANO_BLOQUE, total))]
+
+    def get_merge_fields(self, list_id):
+        return self.merge_fields
+
+
+def descargador(tmp_path, api, monkeypatch):
+    monkeypatch.setattr(descargar_listas, "create_export_sink", lambda ruta: CsvSink(ruta))
+    d = DescargadorListas.__new__(DescargadorListas)
+    d.directorio_salida = tmp_path
+    d.suscriptores_api = api
+    d._rutas_usadas = set()
+    d._rutas_lock = threading.Lock()
+    return d
+
+
+def test_pagination_stops_at_short_or_repeated_block(tmp_path, monkeypatch):
+    api = FakeSuscriptoresAPI({1: 2 * TAMANO_BLOQUE + 5, 2: TAMANO_BLOQUE}, repetir_ultimo=True)
+    d = descargador(tmp_path, api, monkeypatch)
+
+    assert len(d.descargar_suscriptores_lista(1)) == 2 * TAMANO_BLOQUE + 5
+    assert [b for l, b in api.llamadas if l == 1] == [0, 1, 2]
+    # Bloque completo seguido de un bloque repetido: no se duplican filas
+    assert len(d.descargar_suscriptores_lista(2)) == TAMANO_BLOQUE
+    assert [b for l, b in api.llamadas if l == 2] == [0, 1]
+
+
+def test_lists_stream_to_files_concurrently(tmp_path, monkeypatch):
+    api = FakeSuscriptoresAPI({1: TAMANO_BLOQUE + 3, 2: 10, 3: 0, 4: 5}, retardo=0.05)
+    d = descargador(tmp_path, api, monkeypatch)
+    listas = [
+        {"id_lista": 1, "nombre": "Clientes"},
+        {"id_lista": 2, "nombre": "Socios"},
+        {"id_lista": 3, "nombre": "Vacía"},
+        {"id_lista": 4, "nombre": "clientes"},
+    ]
+    monkeypatch.setattr(d, "leer_listas_marcadas", lambda: listas)
+
+    resultados = d.procesar_todas_las_listas(max_workers=4)
+
+    assert api.max_activas > 1
+    assert (resultados["exitosas"], resultados["fallidas"]) == (3, 1)
+    assert [r["id_lista"] for r in resultados["detalle"]] == [1, 2, 3, 4]
+    assert resultados["suscriptores_descargados"] == TAMANO_BLOQUE + 18
+    primera = resultados["detalle"][0]
+    assert primera["filas_por_segundo"] > 0 and primera["completa"]
+    # Dos listas con el mismo nombre no comparten archivo
+    assert len(set(resultados["archivos_creados"])) == 3
+
+    with open(primera["archivo_creado"], newline="", encoding="utf-8") as f:
+        filas = list(csv.reader(f))
+    assert filas[0] == ["email", "SEDE", "id"]
+    assert len(filas) == TAMANO_BLOQUE + 4
+    assert filas[1] == ["u0@x.com", "", "0"]
+
+
+def test_header_includes_merge_fields_missing_from_first_block(tmp_path, monkeypatch):
+    # CIUDAD no aparece en ningún suscriptor del primer bloque pero es un campo de la lista
+    api = FakeSuscriptoresAPI({701: 5}, merge_fields={"SEDE": "text", "CIUDAD": "text"})
+    d = descargador(tmp_path, api, monkeypatch)
+
+    resultado = d.procesar_lista_individual({"id_lista": 701, "nombre": "Esquema"})
+
+    assert resultado["exitoso"]
+    assert resultado["campos_encontrados"] == ["email", "SEDE", "id", "CIUDAD"]
+    with open(resultado["archivo_creado"], newline="", encoding="utf-8") as f:
+        assert next(csv.reader(f)) == ["email", "SEDE", "id", "CIUDAD"]
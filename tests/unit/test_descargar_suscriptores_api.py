@@ -0,0 +1,90 @@
+"""
+Unit tests for the API-first subscriber export with scraping fallback
+"""
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from src import descargar_suscriptores as ds
+
+
+class FakeSuscriptores:
+    def __init__(self, filas=None, error=None):
+        self.filas = filas or []
+        self.error = error
+
+    def get_subscribers(self, list_id, status=None, block_index=0, all_fields=1, complete_json=1):
+        if self.error:
+            raise self.error
+        return self.filas if block_index == 0 else []
+
+
+def api_con(filas=None, error=None):
+    return SimpleNamespace(suscriptores=FakeSuscriptores(filas, error))
+
+
+FILAS_API = [
+    {"email": "a@x.com", "id": 1, "status": "active", "create_date": "2025/01/01", "SEDE": "Madrid", "Segmentos": None},
+    {"email": "b@x.com", "id": 2, "status": "active", "create_date": "2025/01/02", "SEDE": "", "Segmentos": "S1"},
+]
+
+
+def test_api_rows_use_web_table_keys():
+    filas, columnas = ds.obtener_suscriptores_via_api(5, "Clientes", api_con(FILAS_API))
+
+    assert filas[0] == {"lista": "Clientes", "email": "a@x.com", "estado": "active",
+                        "fecha_de_alta": "2025/01/01", "sede": "Madrid"}
+    assert filas[1]["segmentos"] == "S1" and "sede" not in filas[1]
+    # Las columnas incluyen las que no tienen valor en ninguna fila
+    assert columnas == ["email", "estado", "fecha_de_alta", "sede", "segmentos"]
+
+
+def test_scraping_only_fills_fields_missing_from_api(monkeypatch):
+    monkeypatch.setattr(ds, "columnas_tabla_web", lambda page, list_id: ["correo_electronico", "sede", "observaciones"])
+    web = [{"lista": "Clientes", "email": "A@x.com", "sede": "Otra", "observaciones": "VIP"}]
+    scraping = Mock(return_value=web)
+    monkeypatch.setattr(ds, "obtener_suscriptores_via_scraping", scraping)
+
+    filas = ds.obtener_suscriptores_api_primero(object(), 5, "Clientes", api_con(FILAS_API))
+
+    scraping.assert_called_once()
+    assert filas[0]["observaciones"] == "VIP" and filas[0]["sede"] == "Madrid"
+    assert "observaciones" not in filas[1]
+
+    # Si la API cubre todas las columnas de la web no se recorre la tabla
+    scraping.reset_mock()
+    monkeypatch.setattr(ds, "columnas_tabla_web", lambda page, list_id: ["correo_electronico", "estado", "sede"])
+    ds.obtener_suscriptores_api_primero(object(), 5, "Clientes", api_con(FILAS_API))
+    scraping.assert_not_called()
+
+
+def test_falls_back_to_full_scraping_when_api_fails(monkeypatch):
+    monkeypatch.setattr(ds, "_origen_suscriptores", lambda: ds.ORIGEN_API)
+    web = [{"lista": "Clientes", "email": "a@x.com"}]
+    monkeypatch.setattr(ds, "obtener_suscriptores_via_scraping", Mock(return_value=web))
+    generar = Mock(return_value=True)
+    monkeypatch.setattr(ds, "generar_archivo_excel", generar)
+    monkeypatch.setattr(ds, "generar_nombre_archivo", lambda nombre, list_id: "salida.xlsx")
+
+    assert ds.procesar_lista_individual(object(), 5, "Clientes", api_con(error=RuntimeError("HTTP 500")))
+    assert generar.call_args.args[0] == web
+
+
+def test_partial_api_download_falls_back_to_scraping(monkeypatch):
+    class CortadaEnSegundoBloque(FakeSuscriptores):
+        def get_subscribers(self, list_id, status=None, block_index=0, **kwargs):
+            if block_index:
+                raise RuntimeError("HTTP 502")
+            return [{"email": f"u{i}@x.com", "id": i} for i in range(1000)]
+
+    api = SimpleNamespace(suscriptores=CortadaEnSegundoBloque())
+    assert ds.obtener_suscriptores_via_api(5, "Clientes", api) == ([], [])
+
+    monkeypatch.setattr(ds, "_origen_suscriptores", lambda: ds.ORIGEN_API)
+    web = [{"lista": "Clientes", "email": "a@x.com"}]
+    monkeypatch.setattr(ds, "obtener_suscriptores_via_scraping", Mock(return_value=web))
+    generar = Mock(return_value=True)
+    monkeypatch.setattr(ds, "generar_archivo_excel", generar)
+    monkeypatch.setattr(ds, "generar_nombre_archivo", lambda nombre, list_id: "salida.xlsx")
+
+    assert ds.procesar_lista_individual(object(), 5, "Clientes", api)
+    assert generar.call_args.args[0] == web
@@ -0,0 +1,90 @@
+"""
+Unit tests for the local vs remote subscriber diff engine
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.descargar_listas import TAMANO_BLOQUE
+from src.diff_suscriptores import comparar_con_remoto
+
+
+class FakeSuscriptores:
+    def __init__(self, filas):
+        self.filas = filas
+        self.bloques_pedidos = []
+
+    def get_subscribers(self, list_id, status=None, block_index=0, all_fields=1, complete_json=1):
+        self.bloques_pedidos.append(block_index)
+        inicio = block_index * TAMANO_BLOQUE
+        return self.filas[inicio:inicio + TAMANO_BLOQUE]
+
+
+def test_full_remote_list_is_diffed_by_field_hash():
+    total = TAMANO_BLOQUE + 5
+    remotos = [
+        {"email": f"U{i}@x.com", "id": i, "status": "active", "SEDE": "Madrid", "N_ORGANO": str(i % 7)}
+        for i in range(total)
+    ]
+    api = SimpleNamespace(suscriptores=FakeSuscriptores(remotos))
+    local = pd.DataFrame({
+        "Correo Electrónico": [f"u{i}@x.com " for i in range(total)] + ["nuevo@x.com"],
+        "sede": ["Madrid"] * total + ["Sevilla"],
+        "N ORGANO": [float(i % 7) for i in range(total)] + [np.nan],
+    })
+    local.loc[3, "sede"] = "Cádiz"  # modificado en local
+
+    diff = comparar_con_remoto(local, api, 42)
+
+    assert api.suscriptores.bloques_pedidos == [0, 1]
+    assert diff.total_remotos == total
+    assert diff.nuevos == {"nuevo@x.com"}
+    assert diff.modificados == {"u3@x.com"}
+    assert len(diff.sin_cambios) == total - 1
+
+    envio = diff.filas_a_enviar(local)
+    assert sorted(envio["email"].str.strip()) == ["nuevo@x.com", "u3@x.com"]
+    assert list(envio.columns) == ["email", "sede", "N ORGANO"]
+
+
+def test_sheet_without_email_column_is_rejected():
+    api = SimpleNamespace(suscriptores=FakeSuscriptores([]))
+    with pytest.raises(ValueError, match="email"):
+        comparar_con_remoto(pd.DataFrame({"nombre": ["a"]}), api, 1)
+
+
+def test_cleared_local_value_is_sent_empty_and_converges(monkeypatch):
+    from src import crear_lista_mejorado
+    from src.infrastructure.api.models.suscriptores import BatchAddResult
+
+    remotos = [
+        {"email": "a@x.com", "SEDE": "Madrid", "ROL": "Juez"},
+        {"email": "b@x.com", "SEDE": "Sevilla", "ROL": "Juez"},
+    ]
+    suscriptores = FakeSuscriptores(remotos)
+
+    def batch_add_subscribers(list_id, subscribers_data, update_subscriber=0, complete_json=0):
+        suscriptores.enviados = [s.model_dump(exclude_none=True) for s in subscribers_data]
+        return BatchAddResult.from_api_response([{"email": s.email, "id": 1} for s in subscribers_data])
+
+    suscriptores.batch_add_subscribers = batch_add_subscribers
+    api = SimpleNamespace(suscriptores=suscriptores)
+    monkeypatch.setattr(crear_lista_mejorado, "verificar_y_mostrar_campos", lambda *args: None)
+    local = pd.DataFrame({"email": ["a@x.com", "b@x.com", "c@x.com"], "SEDE": ["Madrid", None, None], "ROL": ["Juez", "Juez", ""]})
+
+    diff = comparar_con_remoto(local, api, 1)
+    assert diff.modificados == {"b@x.com"} and diff.nuevos == {"c@x.com"}
+
+    crear_lista_mejorado.agregar_suscriptores_via_api(1, diff.filas_a_enviar(local), api,
+                                                      emails_con_vacios=diff.modificados)
+    assert suscriptores.enviados == [
+        {"email": "b@x.com", "SEDE": "", "ROL": "Juez"},
+        {"email": "c@x.com"},
+    ]
+
+    # La lista remota queda con el campo vacío y el siguiente diff no vuelve a enviarlo
+    remotos[1]["SEDE"] = ""
+    remotos.append({"email": "c@x.com"})
+    assert comparar_con_remoto(local, api, 1).pendientes == set()
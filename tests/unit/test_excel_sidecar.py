@@ -0,0 +1,79 @@
+"""
+Unit tests for the Excel read sidecar cache
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from src.cache import excel_sidecar
+from src.cache.excel_sidecar import leer_excel_cacheado, limpiar_cache_excel
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directorio = tmp_path / "excel_cache"
+    directorio.mkdir()
+    monkeypatch.setattr(excel_sidecar, "_directorio_cache", lambda: str(directorio))
+    monkeypatch.setattr(excel_sidecar, "_cache_habilitado", lambda: True)
+    return directorio
+
+
+@pytest.fixture
+def libro(tmp_path):
+    archivo = tmp_path / "Busqueda_Listas.xlsx"
+    with pd.ExcelWriter(archivo) as writer:
+        pd.DataFrame({"ID_LISTA": [1, 2], "NOMBRE LISTA": ["A", "B"]}).to_excel(writer, sheet_name="Listas", index=False)
+        pd.DataFrame({"Buscar": ["x", ""]}).to_excel(writer, sheet_name="Otra", index=False)
+    return archivo
+
+
+def test_second_read_is_served_from_sidecar(cache_dir, libro, monkeypatch):
+    primero = leer_excel_cacheado(libro)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    def no_leer(*args, **kwargs):
+        raise AssertionError("no debería releer el Excel")
+
+    monkeypatch.setattr(excel_sidecar.pd, "read_excel", no_leer)
+    segundo = leer_excel_cacheado(libro)
+    pd.testing.assert_frame_equal(primero, segundo)
+
+
+def test_sheets_are_cached_separately(cache_dir, libro):
+    listas = leer_excel_cacheado(libro, "Listas")
+    otra = leer_excel_cacheado(libro, "Otra")
+
+    assert list(listas.columns) == ["ID_LISTA", "NOMBRE LISTA"]
+    assert list(otra.columns) == ["Buscar"]
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_modified_workbook_rebuilds_sidecar(cache_dir, libro):
+    leer_excel_cacheado(libro, "Listas")
+
+    pd.DataFrame({"ID_LISTA": [1, 2, 3], "NOMBRE LISTA": ["A", "B", "C"]}).to_excel(libro, sheet_name="Listas", index=False)
+    stat = os.stat(libro)
+    os.utime(libro, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    df = leer_excel_cacheado(libro, "Listas")
+    assert len(df) == 3
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_missing_file_raises_like_pandas(cache_dir, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        leer_excel_cacheado(tmp_path / "no_existe.xlsx")
+
+
+def test_disabled_cache_reads_directly(cache_dir, libro, monkeypatch):
+    monkeypatch.setattr(excel_sidecar, "_cache_habilitado", lambda: False)
+    assert len(leer_excel_cacheado(libro)) == 2
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_limpiar_cache_excel(cache_dir, libro):
+    leer_excel_cacheado(libro, "Listas")
+    leer_excel_cacheado(libro, "Otra")
+    assert limpiar_cache_excel() == 2
+    assert list(cache_dir.iterdir()) == []
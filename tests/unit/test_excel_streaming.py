@@ -0,0 +1,52 @@
+"""
+Unit tests for the streaming (write_only) campaign report
+"""
+from openpyxl import load_workbook
+
+from src.export import ESTILO_ENCABEZADO, XlsxSink
+
+
+def test_header_uses_shared_named_style(tmp_path):
+    with XlsxSink(tmp_path / "informe.xlsx") as sink:
+        sink.write_table("Clics", ["Correo", "Fecha"], [])
+
+    ws = load_workbook(sink.path)["Clics"]
+    assert ws["A1"].style == ESTILO_ENCABEZADO
+    assert ws["B1"].font.bold
+
+
+def test_empty_rows_are_skipped_and_generators_accepted(tmp_path):
+    filas = ([f"user{i}@example.com", i] if i % 100 else ["", None] for i in range(500))
+    with XlsxSink(tmp_path / "informe.xlsx") as sink:
+        sink.write_table("Abiertos", ["Correo", "N"], filas)
+
+    assert sink.filas_por_tabla["Abiertos"] == 495
+    assert load_workbook(sink.path)["Abiertos"].max_row == 496
+
+
+def test_crear_archivo_excel_writes_every_report_sheet(tmp_path, monkeypatch):
+    from src import demo
+    from src.export import sinks
+
+    archivo = str(tmp_path / "Campaña-2026-10-01.xlsx")
+    monkeypatch.setattr(demo, "generar_nombre_archivo_informe", lambda *args: archivo)
+    monkeypatch.setattr(sinks, "_config_exportacion", lambda: {})
+
+    general = [["Campaña", "Clásica", "2026-10-01", "Clientes", 3, 1, 1, "https://example.com"]]
+    informe = [
+        [["P", "Clientes", "a@example.com", "01/10/2026", "ES", 2, "Clientes", "Activo", "Alta"]],
+        iter([["P", "Clientes", "b@example.com", "Clientes", "Activo", "Alta"]]),
+        [],
+        [],
+        [],
+    ]
+    ruta = demo.crear_archivo_excel(general, informe, "Campaña", "2026-10-01",
+                                    [["https://example.com", 1, "100%"]], debug_mode=False)
+
+    wb = load_workbook(ruta)
+    assert wb.sheetnames == ["General", "Abiertos", "No abiertos", "Clics", "Hard bounces", "Soft bounces", "URLs de Clics"]
+    assert [c.value for c in wb["General"][1]][:2] == ["Nombre", "Tipo"]
+    assert wb["General"]["A2"].value == "Campaña"
+    assert wb["No abiertos"]["C2"].value == "b@example.com"
+    assert wb["Clics"].max_row == 1
+    assert wb["URLs de Clics"]["A2"].value == "https://example.com"
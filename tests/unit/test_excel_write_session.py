@@ -0,0 +1,71 @@
+"""
+Unit tests for the batched multi-sheet Excel write session
+"""
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.excel_helper import ExcelHelper
+
+
+@pytest.fixture
+def libro(tmp_path):
+    archivo = tmp_path / "Lista_envio.xlsx"
+    with pd.ExcelWriter(archivo) as writer:
+        pd.DataFrame({"email": ["a@x.com"]}).to_excel(writer, sheet_name="Lista A", index=False)
+        pd.DataFrame({"email": ["b@x.com"]}).to_excel(writer, sheet_name="Lista B", index=False)
+        pd.DataFrame({"email": ["c@x.com"]}).to_excel(writer, sheet_name="Lista C", index=False)
+    return str(archivo)
+
+
+def test_all_sheets_saved_with_a_single_writer(libro):
+    sesion = ExcelHelper.sesion_escritura(libro)
+    sesion.escribir_hoja(pd.DataFrame({"email": ["a@x.com"], "Segmentos": ["S1"]}), "Lista A")
+    sesion.escribir_hoja(pd.DataFrame({"email": ["c@x.com"], "Segmentos": ["S2"]}), "Lista C")
+
+    with patch("src.excel_helper.pd.ExcelWriter", wraps=pd.ExcelWriter) as writer:
+        assert sesion.guardar()
+    assert writer.call_count == 1
+
+    hojas = pd.read_excel(libro, sheet_name=None)
+    assert list(hojas) == ["Lista A", "Lista B", "Lista C"]
+    assert hojas["Lista A"]["Segmentos"].tolist() == ["S1"]
+    assert "Segmentos" not in hojas["Lista B"].columns
+    assert hojas["Lista C"]["Segmentos"].tolist() == ["S2"]
+
+
+def test_replace_mode_keeps_only_session_sheets(libro):
+    with ExcelHelper.sesion_escritura(libro, reemplazar=True) as sesion:
+        sesion.escribir_hoja(pd.DataFrame({"email": ["z@x.com"]}), "Datos")
+        sesion.escribir_hoja(pd.DataFrame({"cambio": ["alta"]}), "Cambios")
+
+    assert sesion.guardado
+    assert list(pd.read_excel(libro, sheet_name=None)) == ["Datos", "Cambios"]
+
+
+def test_leer_hoja_sees_pending_changes(libro):
+    sesion = ExcelHelper.sesion_escritura(libro)
+    sesion.escribir_hoja(pd.DataFrame({"email": ["nuevo@x.com"]}), "Lista B")
+
+    assert sesion.leer_hoja("Lista B")["email"].tolist() == ["nuevo@x.com"]
+    assert sesion.leer_hoja("Lista A")["email"].tolist() == ["a@x.com"]
+
+
+def test_creates_new_file(tmp_path):
+    archivo = str(tmp_path / "sub" / "nuevo.xlsx")
+    sesion = ExcelHelper.sesion_escritura(archivo)
+    sesion.escribir_hoja(pd.DataFrame({"a": [1]}), "Hoja")
+
+    assert sesion.guardar()
+    assert sesion.hojas_pendientes == []
+    assert pd.read_excel(archivo)["a"].tolist() == [1]
+
+
+def test_nothing_is_written_when_block_raises(libro):
+    with pytest.raises(RuntimeError):
+        with ExcelHelper.sesion_escritura(libro) as sesion:
+            sesion.escribir_hoja(pd.DataFrame({"email": []}), "Lista A")
+            raise RuntimeError("fallo")
+
+    assert pd.read_excel(libro, sheet_name="Lista A")["email"].tolist() == ["a@x.com"]
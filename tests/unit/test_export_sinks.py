@@ -0,0 +1,152 @@
+"""
+Unit tests for the pluggable export sinks
+"""
+import csv
+import sqlite3
+
+import pytest
+from openpyxl import load_workbook
+
+from src.export import sinks
+from src.export.sinks import (
+    CsvSink,
+    SqliteSink,
+    XlsxSink,
+    create_export_sink,
+    resolver_formato,
+)
+
+
+@pytest.fixture
+def export_config(monkeypatch):
+    config = {}
+    monkeypatch.setattr(sinks, "_config_exportacion", lambda: config)
+    return config
+
+
+def test_xlsx_sink_streams_one_sheet_per_table(tmp_path):
+    with XlsxSink(tmp_path / "informe.xlsx") as sink:
+        sink.write_table("General", ["Nombre"], [["Campaña"]])
+        sink.begin_table("Abiertos", ["Correo", "N"])
+        sink.write_rows(iter([["a@example.com", 1], ["", None]]))
+        sink.write_rows([["b@example.com", 2]])
+
+    assert sink.filas_por_tabla == {"General": 1, "Abiertos": 2}
+    wb = load_workbook(sink.path)
+    assert wb.sheetnames == ["General", "Abiertos"]
+    assert wb["Abiertos"]["A3"].value == "b@example.com"
+
+
+def test_csv_sink_single_table_writes_base_file(tmp_path):
+    with CsvSink(tmp_path / "no_openers.csv") as sink:
+        sink.write_table("", ["email", "domain"], [["a@example.com", "example.com"]])
+
+    assert sink.path == str(tmp_path / "no_openers.csv")
+    with open(sink.path, encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["email", "domain"], ["a@example.com", "example.com"]]
+
+
+def test_csv_sink_multiple_tables_returns_directory(tmp_path):
+    with CsvSink(tmp_path / "informe") as sink:
+        sink.write_table("General", ["Nombre"], [["Campaña"]])
+        sink.write_table("No abiertos", ["Correo"], [])
+
+    assert sink.path == str(tmp_path)
+    assert (tmp_path / "informe_No abiertos.csv").exists()
+
+
+def test_sqlite_sink_creates_table_per_sheet_with_unique_columns(tmp_path):
+    filas = ([f"user{i}@example.com", "Lista A", "Lista B"] for i in range(12_000))
+    with SqliteSink(tmp_path / "informe") as sink:
+        sink.write_table("Abiertos", ["Correo", "Lista", "Lista"], filas)
+
+    conn = sqlite3.connect(sink.path)
+    try:
+        columnas = [c[1] for c in conn.execute('PRAGMA table_info("Abiertos")')]
+        total = conn.execute('SELECT COUNT(*) FROM "Abiertos"').fetchone()[0]
+    finally:
+        conn.close()
+    assert columnas == ["Correo", "Lista", "Lista_2"]
+    assert total == 12_000
+
+
+def test_write_rows_requires_begin_table(tmp_path):
+    sink = CsvSink(tmp_path / "datos")
+    with pytest.raises(Exception, match="begin_table"):
+        sink.write_rows([["x"]])
+    sink.close()
+
+
+def test_format_resolution_priority(export_config):
+    assert resolver_formato() == "xlsx"
+    assert resolver_formato(por_defecto="csv") == "csv"
+
+    export_config.update({"format": "sqlite", "report_format": "csv"})
+    assert resolver_formato(por_defecto="csv") == "sqlite"
+    assert resolver_formato(proposito=sinks.PROPOSITO_INFORMES) == "csv"
+    assert resolver_formato("xlsx") == "xlsx"
+
+
+def test_unknown_or_unavailable_format_falls_back(export_config, monkeypatch):
+    export_config["format"] = "json"
+    assert resolver_formato(por_defecto="csv") == "csv"
+
+    monkeypatch.setattr(sinks, "PARQUET_DISPONIBLE", False)
+    assert resolver_formato("parquet") == "xlsx"
+
+
+def test_create_export_sink_replaces_known_extension(tmp_path, export_config):
+    export_config["format"] = "sqlite"
+    with create_export_sink(tmp_path / "Clientes.xlsx") as sink:
+        sink.write_table("Clientes", ["email"], [["a@example.com"]])
+
+    assert isinstance(sink, SqliteSink)
+    assert sink.path == str(tmp_path / "Clientes.db")
+
+
+@pytest.mark.skipif(not sinks.PARQUET_DISPONIBLE, reason="pyarrow no instalado")
+def test_parquet_sink_writes_columnar_file(tmp_path):
+    import pandas as pd
+
+    with create_export_sink(tmp_path / "lista", formato="parquet") as sink:
+        sink.write_table("", ["email", "n"], ([f"u{i}@example.com", i] for i in range(25_000)))
+
+    df = pd.read_parquet(sink.path)
+    assert len(df) == 25_000
+    assert df.iloc[-1]["n"] == "24999"
+
+
+def test_xlsx_sink_rolls_over_to_new_sheets_with_index(tmp_path):
+    with XlsxSink(tmp_path / "lista", max_filas_por_hoja=4) as sink:
+        sink.write_table("Clientes", ["email"], ([f"u{i}@example.com"] for i in range(10)))
+        sink.write_table("General", ["Nombre"], [["Campaña"]])
+
+    assert sink.filas_por_tabla == {"Clientes": 10, "General": 1}
+    wb = load_workbook(sink.path)
+    assert wb.sheetnames == ["Índice", "Clientes", "Clientes_2", "Clientes_3", "General"]
+    assert [c.value for c in wb["Clientes_2"][1]] == ["email"]
+    assert wb["Clientes_3"]["A3"].value == "u9@example.com"
+    indice = [[c.value for c in fila] for fila in wb["Índice"].iter_rows(min_row=2)]
+    assert indice[:3] == [
+        ["Clientes", "Clientes", 1, 4, 4],
+        ["Clientes", "Clientes_2", 5, 8, 4],
+        ["Clientes", "Clientes_3", 9, 10, 2],
+    ]
+
+
+def test_xlsx_sink_split_parts_do_not_reuse_existing_sheet_names(tmp_path):
+    with XlsxSink(tmp_path / "lista", max_filas_por_hoja=2) as sink:
+        sink.write_table("datos_2", ["n"], [[1]])
+        sink.write_table("Datos", ["n"], ([i] for i in range(1, 6)))
+
+    wb = load_workbook(sink.path)
+    assert wb.sheetnames == ["Índice", "datos_2", "Datos", "Datos_3", "Datos_4"]
+    assert [c.value for c in wb["datos_2"]["A"]] == ["n", 1]
+    assert sink.partes["Datos"] == [["Datos", 1, 2], ["Datos_3", 3, 4], ["Datos_4", 5, 5]]
+
+
+def test_xlsx_sink_without_split_has_no_index(tmp_path):
+    with XlsxSink(tmp_path / "lista", max_filas_por_hoja=4) as sink:
+        sink.write_table("Una lista con un nombre muy largo de verdad", ["email"], [["a@example.com"]] * 4)
+
+    assert load_workbook(sink.path).sheetnames == ["Una lista con un nombre muy lar"]
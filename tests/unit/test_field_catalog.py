@@ -0,0 +1,56 @@
+"""
+Unit tests for the API-backed field catalogue
+"""
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src import field_scraper
+from src.field_catalog import FieldCatalogService
+
+
+def fake_api(nombres_list_fields, merge_fields=None):
+    suscriptores = Mock()
+    suscriptores.get_list_fields.return_value = SimpleNamespace(field_names=nombres_list_fields)
+    suscriptores.get_merge_fields.return_value = SimpleNamespace(merge_fields=merge_fields or {})
+    return SimpleNamespace(suscriptores=suscriptores)
+
+
+def test_serves_fields_from_api_and_local_cache(tmp_path):
+    api = fake_api(["Correo electrónico", "Nombre", "nombre", "SEDE"])
+    catalogo = FieldCatalogService(api, cache_path=str(tmp_path / "catalogo.json"), ttl=60)
+
+    campos = catalogo.obtener_campos(5)
+    assert campos == {
+        "fields": ["Correo electrónico", "Nombre", "SEDE"],
+        "required": ["Correo electrónico"],
+        "optional": ["Nombre", "SEDE"],
+    }
+    # Otra instancia (otra ejecución) usa el archivo de caché
+    otro = FieldCatalogService(fake_api([]), cache_path=str(tmp_path / "catalogo.json"), ttl=60)
+    assert otro.obtener_campos(5) == campos
+    otro.api.suscriptores.get_list_fields.assert_not_called()
+
+    catalogo.invalidar(5)
+    catalogo.obtener_campos(5)
+    assert api.suscriptores.get_list_fields.call_count == 2
+
+
+def test_falls_back_to_merge_fields(tmp_path):
+    api = fake_api([], merge_fields={"email": "text", "Segmentos": "text"})
+    catalogo = FieldCatalogService(api, cache_path=str(tmp_path / "c.json"), ttl=0)
+    assert catalogo.obtener_campos(5)["fields"] == ["email", "Segmentos"]
+
+
+def test_scraper_entry_point_uses_catalogue_without_browser(tmp_path, monkeypatch):
+    catalogo = FieldCatalogService(fake_api(["email", "SEDE"]), cache_path=str(tmp_path / "c.json"), ttl=60)
+    monkeypatch.setattr(field_scraper, "get_field_catalog", lambda api=None: catalogo)
+    monkeypatch.setattr(field_scraper, "obtener_campos_por_scraping",
+                        Mock(side_effect=AssertionError("no debería abrir la página")))
+
+    assert field_scraper.obtener_campos_disponibles_acumba(None, 5)["fields"] == ["email", "SEDE"]
+
+    catalogo.api.suscriptores.get_list_fields.side_effect = RuntimeError("API caída")
+    catalogo.invalidar()
+    assert field_scraper.obtener_campos_disponibles_acumba(None, 6)["required"] == ["email"]
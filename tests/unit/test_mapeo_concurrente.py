@@ -0,0 +1,48 @@
+"""
+Unit tests for concurrent list processing in segment mapping
+"""
+import time
+
+import pytest
+
+from src import mapeo_segmentos
+
+
+@pytest.fixture
+def listas(monkeypatch):
+    duraciones = {f"Lista {i}": 0.05 for i in range(40)}
+    duraciones["Lista 7"] = 0.3
+    monkeypatch.setattr(mapeo_segmentos, "_tamano_lista", lambda nombre: int(duraciones[nombre] * 1000))
+
+    def procesar(nombre_lista, segmentos_data, headers):
+        time.sleep(duraciones[nombre_lista])
+        if nombre_lista == "Lista 3":
+            raise RuntimeError("API caída")
+        return nombre_lista != "Lista 5"
+
+    monkeypatch.setattr(mapeo_segmentos, "procesar_lista_individual", procesar)
+    return [[nombre, [["Segmento", None]]] for nombre in duraciones]
+
+
+def test_failures_are_isolated_and_order_is_kept(listas):
+    resultados = mapeo_segmentos.procesar_listas_concurrente(listas, ["NOMBRE SEGMENTO", "SEDE"], max_workers=8)
+
+    assert [r["lista"] for r in resultados] == [l[0] for l in listas]
+    fallidas = {r["lista"]: r["error"] for r in resultados if r["estado"] != "procesada"}
+    assert fallidas == {"Lista 3": "API caída", "Lista 5": "Error en procesamiento"}
+
+
+def test_total_time_approaches_largest_list(listas):
+    inicio = time.perf_counter()
+    mapeo_segmentos.procesar_listas_concurrente(listas, ["NOMBRE SEGMENTO", "SEDE"], max_workers=8)
+    transcurrido = time.perf_counter() - inicio
+
+    secuencial = 39 * 0.05 + 0.3
+    assert transcurrido < secuencial / 3
+    assert transcurrido >= 0.3
+
+
+def test_single_worker_runs_in_order(listas):
+    resultados = mapeo_segmentos.procesar_listas_concurrente(listas[:3], ["NOMBRE SEGMENTO", "SEDE"], max_workers=1)
+
+    assert [r["estado"] for r in resultados] == ["procesada", "procesada", "procesada"]
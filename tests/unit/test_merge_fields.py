@@ -0,0 +1,110 @@
+"""
+Unit tests for the merge-field schema cache and batched field provisioning
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src import field_catalog
+from src.field_catalog import FieldCatalogService
+from src.infrastructure.api import merge_fields
+from src.infrastructure.api.endpoints.suscriptores import SuscriptoresAPI
+from src.infrastructure.api.merge_fields import MergeFieldSchemaCache, provisionar_campos
+
+
+@pytest.fixture(autouse=True)
+def cache_compartida(monkeypatch):
+    cache = MergeFieldSchemaCache(ttl=60)
+    monkeypatch.setattr(merge_fields, "_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def catalogo(monkeypatch, tmp_path):
+    catalogo = FieldCatalogService(cache_path=str(tmp_path / "field_catalog.json"), ttl=3600)
+    monkeypatch.setattr(field_catalog, "_catalogo", catalogo)
+    return catalogo
+
+
+class FakeAPI:
+    def __init__(self, existentes, fallan=()):
+        self.existentes = list(existentes)
+        self.fallan = set(fallan)
+        self.consultas = 0
+        self.creados = []
+        self.activas = 0
+        self.max_activas = 0
+        self._lock = threading.Lock()
+        self.suscriptores = self
+
+    def get_merge_fields(self, list_id):
+        self.consultas += 1
+        return {nombre: "text" for nombre in self.existentes}
+
+    def add_merge_tag(self, list_id, nombre, tipo):
+        with self._lock:
+            self.activas += 1
+            self.max_activas = max(self.max_activas, self.activas)
+        time.sleep(0.05)
+        with self._lock:
+            self.activas -= 1
+        if nombre in self.fallan:
+            raise RuntimeError("error remoto")
+        self.creados.append(nombre)
+
+
+def test_provisions_missing_fields_once_and_concurrently(cache_compartida):
+    api = FakeAPI(["Segmentos", "SEDE"])
+    campos = {"Segmentos": "text", "SEDE": "text", "ORGANO": "text", "CARGO": "text", "AREA": "text"}
+
+    resultado = provisionar_campos(api, 7, campos, max_workers=3)
+
+    assert resultado.existentes == ["Segmentos", "SEDE"]
+    assert sorted(resultado.creados) == ["AREA", "CARGO", "ORGANO"]
+    assert api.max_activas > 1
+    # Segunda ejecución: todo está en caché, ni consulta ni creación
+    segundo = provisionar_campos(api, 7, campos)
+    assert api.consultas == 1 and len(api.creados) == 3
+    assert segundo.creados == [] and len(segundo.existentes) == 5
+
+
+def test_failure_invalidates_and_ttl_expires(cache_compartida):
+    api = FakeAPI(["Segmentos"], fallan={"SEDE"})
+    resultado = provisionar_campos(api, 7, {"Segmentos": "text", "SEDE": "text"})
+    assert resultado.fallidos == {"SEDE": "error remoto"} and not resultado.ok
+    assert cache_compartida.get(7) is None
+
+    cache_compartida.ttl = 0
+    cache_compartida.put(8, ["x"])
+    time.sleep(0.01)
+    assert cache_compartida.get(8) is None
+
+
+def test_endpoint_keeps_cache_in_sync_and_validates_segment_field(cache_compartida):
+    client = Mock()
+    client.get.return_value = {"email": "text", "Segmentos": "text"}
+    api = SuscriptoresAPI(client)
+
+    api.get_merge_fields(42)
+    assert cache_compartida.get(42) == {"email", "Segmentos"}
+    api.add_merge_tag(42, "SEDE", "text")
+    assert "SEDE" in cache_compartida.get(42)
+
+    with pytest.raises(ValueError, match="incorrecto"):
+        api._validate_merge_fields({"email": "a@x.com", "SEGMENTOS": "A"}, 42)
+    api._validate_merge_fields({"email": "a@x.com", "Segmentos": "A"}, 42)
+    # Lista sin esquema conocido: solo las validaciones generales
+    api._validate_merge_fields({"email": "a@x.com", "SEGMENTOS": "A"}, 99)
+
+
+def test_provisioning_invalidates_the_on_disk_field_catalogue(catalogo):
+    api = FakeAPI(["email"])
+    catalogo._api = api
+    assert catalogo.obtener_campos(7)["fields"] == ["email"]
+
+    provisionar_campos(api, 7, {"email": "text", "Segmentos": "text"})
+    api.existentes.append("Segmentos")
+
+    assert catalogo.obtener_campos(7)["fields"] == ["email", "Segmentos"]
@@ -0,0 +1,122 @@
+"""
+Unit tests for the vectorised segment assignment engine
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.motor_segmentos import MotorSegmentos
+
+HEADERS = ['NOMBRE SEGMENTO', 'SEDE', 'ORGANO', 'N ORGANO', 'ROL USUARIO', 'PERFIL USUARIO']
+
+
+def asignar_secuencial(df, reglas, headers):
+    """Semántica original: una regla tras otra sobre la columna Segmentos."""
+    segmentos = df['Segmentos'].fillna('').astype(str).str.strip().tolist() if 'Segmentos' in df else [''] * len(df)
+    for regla in reglas:
+        mask = np.ones(len(df), dtype=bool)
+        for valor, columna in zip(regla[1:], headers[1:]):
+            if valor is None or columna not in df.columns:
+                continue
+            if isinstance(valor, (int, float)):
+                mask &= (pd.to_numeric(df[columna], errors='coerce') == float(valor)).to_numpy()
+            else:
+                mask &= (df[columna].astype(str) == str(valor)).to_numpy()
+        for i in np.flatnonzero(mask):
+            if segmentos[i] == '':
+                segmentos[i] = regla[0]
+            elif regla[0] not in segmentos[i].split(';'):
+                segmentos[i] = f"{segmentos[i]};{regla[0]}"
+    return segmentos
+
+
+@pytest.fixture
+def lista():
+    rng = np.random.default_rng(7)
+    n = 2_000
+    return pd.DataFrame({
+        'email': [f'u{i}@example.com' for i in range(n)],
+        'SEDE': rng.choice(['Madrid', 'Sevilla', 'Cádiz'], n),
+        'ORGANO': rng.choice(['Juzgado', 'Audiencia'], n),
+        'N ORGANO': rng.integers(1, 4, n),
+        'ROL USUARIO': rng.choice(['Juez', 'LAJ', 'Gestor'], n),
+        'PERFIL USUARIO': rng.choice(['A', 'B'], n),
+        'Segmentos': pd.Series(rng.choice(['', 'Previo', 'Madrid jueces', 'nan'], n)).replace('nan', np.nan),
+    })
+
+
+def test_matches_sequential_assignment(lista):
+    reglas = [
+        ['Madrid jueces', 'Madrid', None, None, 'Juez', None],
+        ['Juzgado 2', None, 'Juzgado', 2, None, None],
+        ['Sevilla', 'Sevilla', None, None, None, None],
+        ['Madrid jueces', 'Cádiz', None, 1, 'Juez', 'B'],
+        ['Sin coincidencias', 'Bilbao', None, None, None, None],
+    ]
+    resultado = MotorSegmentos(reglas, HEADERS).asignar(lista)
+
+    assert resultado.segmentos.tolist() == asignar_secuencial(lista, reglas, HEADERS)
+    assert resultado.coincidencias_por_segmento['Sin coincidencias'] == 0
+    esperadas = lista.index[resultado.segmentos != lista['Segmentos'].fillna('')]
+    assert resultado.filas_modificadas.equals(esperadas)
+
+
+def test_numeric_rule_matches_text_column():
+    df = pd.DataFrame({'N ORGANO': ['1', '2.0', 'x', None], 'SEDE': ['1', '2', '1', '1']})
+    reglas = [['Dos', None, None, 2, None, None], ['Texto', '1', None, None, None, None]]
+    matriz = MotorSegmentos(reglas, HEADERS).evaluar(df)
+
+    assert matriz[:, 0].tolist() == [False, True, False, False]
+    assert matriz[:, 1].tolist() == [True, False, True, True]
+
+
+def test_apply_adds_column_only_when_needed():
+    df = pd.DataFrame({'email': ['a@example.com', 'b@example.com'], 'SEDE': ['Madrid', 'Sevilla']})
+    motor = MotorSegmentos([['Madrid', 'Madrid', None, None, None, None]], HEADERS)
+
+    resultado = motor.asignar(df)
+    actualizado = resultado.aplicar(df)
+    assert 'Segmentos' not in df.columns
+    assert actualizado['Segmentos'].tolist() == ['Madrid', '']
+    assert resultado.total_asignaciones == 1
+
+    repetido = motor.asignar(actualizado)
+    assert repetido.total_asignaciones == 0
+    assert repetido.filas_modificadas.empty
+
+
+def test_invalid_rule_length_matches_nothing():
+    df = pd.DataFrame({'SEDE': ['Madrid']})
+    motor = MotorSegmentos([['Corta', 'Madrid']], HEADERS)
+
+    assert not motor.evaluar(df).any()
+    assert motor.asignar(df).total_asignaciones == 0
+
+
+def test_repeated_segment_keeps_sequential_order():
+    df = pd.DataFrame({'SEDE': ['Cádiz'], 'ROL USUARIO': ['Juez']})
+    reglas = [
+        ['A', 'Madrid', None, None, None, None],
+        ['B', None, None, None, 'Juez', None],
+        ['A', 'Cádiz', None, None, None, None],
+    ]
+    resultado = MotorSegmentos(reglas, HEADERS).asignar(df)
+
+    assert resultado.segmentos.tolist() == ['B;A']
+    assert resultado.coincidencias_por_segmento == {'A': 1, 'B': 1}
+
+
+def test_rule_mask_keeps_the_frame_index():
+    from src.mapeo_segmentos import actualizar_columna_segmentos, aplicar_condiciones_segmento
+
+    df = pd.DataFrame({'email': ['a@x.com', 'b@x.com', 'c@x.com'], 'SEDE': ['Madrid', 'Sevilla', 'Madrid']},
+                      index=[10, 20, 30])
+    regla = ['Centro', 'Madrid', None, None, None, None]
+
+    mask = aplicar_condiciones_segmento(df, regla, HEADERS)
+    assert mask.index.equals(df.index)
+    assert df[mask]['email'].tolist() == ['a@x.com', 'c@x.com']
+
+    df, filas = actualizar_columna_segmentos(df, mask, 'Centro')
+    assert filas == [10, 30]
+    assert aplicar_condiciones_segmento(df, regla[:2], HEADERS).index.equals(df.index)
@@ -0,0 +1,110 @@
+"""
+Unit tests for the opt-in Playwright page profiler
+"""
+import json
+from unittest.mock import Mock
+
+import pytest
+from playwright.sync_api import Locator, Page
+
+from src.infrastructure.browser import page_profiler
+from src.infrastructure.browser.page_profiler import (
+    CATEGORY_FIXED_WAIT,
+    CATEGORY_LOCATOR,
+    CATEGORY_NAVIGATION,
+    profile_page,
+    profiling_session,
+)
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_profiler, "_profiling_config", lambda: {"output_dir": str(tmp_path)})
+    return tmp_path
+
+
+def make_page():
+    page = Mock(spec=Page)
+    page.url = "https://acumbamail.com/report/campaign/1/"
+    locator = Mock(spec=Locator)
+    locator.count.return_value = 3
+    locator.first = Mock(spec=Locator)
+    page.locator.return_value = locator
+    return page, locator
+
+
+def test_page_is_untouched_without_session():
+    page, _ = make_page()
+    assert profile_page(page) is page
+
+
+def test_disabled_session_does_not_profile(output_dir):
+    page, _ = make_page()
+    with profiling_session("run", enabled=False) as session:
+        assert session is None
+        assert profile_page(page) is page
+
+
+def test_records_steps_by_category(output_dir):
+    page, _ = make_page()
+    with profiling_session("run", enabled=True) as session:
+        profiled = profile_page(page)
+        profiled.goto("https://acumbamail.com/report/")
+        profiled.wait_for_timeout(1500)
+        assert profiled.locator("table tr").count() == 3
+
+    categories = [step.category for step in session.steps]
+    assert categories == [CATEGORY_NAVIGATION, CATEGORY_FIXED_WAIT, CATEGORY_LOCATOR]
+    assert session.steps[1].detail == "1500 ms"
+    assert session.steps[2].detail == "table tr"
+    assert session.steps[0].url == page.url
+
+
+def test_proxies_are_unwrapped_when_passed_to_playwright(output_dir):
+    page, locator = make_page()
+    with profiling_session("run", enabled=True):
+        profiled = profile_page(page)
+        inner = profiled.locator("li")
+        profiled.locator("ul").filter(has=inner)
+
+    assert locator.filter.call_args.kwargs["has"] is locator
+
+
+def test_profile_page_is_idempotent(output_dir):
+    page, _ = make_page()
+    with profiling_session("run", enabled=True):
+        profiled = profile_page(page)
+        assert profile_page(profiled) is profiled
+    page.on.assert_called_once()
+
+
+def test_errors_are_recorded_and_reraised(output_dir):
+    page, _ = make_page()
+    page.goto.side_effect = TimeoutError("lento")
+    with profiling_session("run", enabled=True) as session:
+        with pytest.raises(TimeoutError):
+            profile_page(page).goto("https://acumbamail.com")
+
+    assert "lento" in session.steps[0].error
+
+
+def test_report_written_with_breakdown(output_dir):
+    page, _ = make_page()
+    with profiling_session("listar campañas", enabled=True):
+        profile_page(page).wait_for_timeout(10)
+
+    reports = list(output_dir.glob("*.json"))
+    assert len(reports) == 1
+    report = json.loads(reports[0].read_text(encoding="utf-8"))
+    assert report["steps"] == 1
+    assert CATEGORY_FIXED_WAIT in report["categories"]
+    assert page_profiler.get_active_session() is None
+
+
+def test_trace_is_exported_when_requested(output_dir):
+    context = Mock()
+    with profiling_session("run", context=context, enabled=True, trace=True):
+        pass
+
+    context.tracing.start.assert_called_once()
+    assert context.tracing.stop.call_args.kwargs["path"].endswith(".zip")
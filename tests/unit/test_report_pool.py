@@ -0,0 +1,47 @@
+"""
+Unit tests for the process-pool report builder
+"""
+import math
+import time
+from contextlib import nullcontext
+
+from src.export import report_pool
+from src.export.report_pool import ReportBuilderPool, crear_pool_informes
+
+
+def test_results_and_errors_are_collected_by_label():
+    with ReportBuilderPool(max_workers=2) as pool:
+        pool.submit("nueve", math.sqrt, 9)
+        pool.submit("roto", int, "no es un número")
+        pool.submit("cuatro", math.sqrt, 16)
+        resultados, errores = pool.close()
+
+    assert sorted(resultados) == [("cuatro", 4.0), ("nueve", 3.0)]
+    assert len(errores) == 1 and errores[0][0] == "roto"
+    assert "no es un número" in errores[0][1]
+
+
+def test_submit_applies_backpressure():
+    pool = ReportBuilderPool(max_workers=1, max_pendientes=1)
+    inicio = time.perf_counter()
+    pool.submit("a", time.sleep, 0.3)
+    pool.submit("b", time.sleep, 0.0)
+
+    assert pool.pendientes == 1
+    assert time.perf_counter() - inicio >= 0.25
+    resultados, errores = pool.close()
+    assert [etiqueta for etiqueta, _ in resultados] == ["a", "b"]
+    assert errores == []
+
+
+def test_pool_disabled_by_default():
+    assert isinstance(crear_pool_informes(0, 1), nullcontext)
+    with crear_pool_informes(0, 1) as pool:
+        assert pool is None
+
+
+def test_worker_count_parsing():
+    assert report_pool._procesos_configurados("auto") >= 1
+    assert report_pool._procesos_configurados("3") == 3
+    assert report_pool._procesos_configurados("muchos") == 0
+    assert report_pool._procesos_configurados(None) == 0
@@ -0,0 +1,137 @@
+"""
+Unit tests for the on-disk scrape result cache
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.cache.scrape_cache import (
+    ScrapeResultCache,
+    parse_send_date,
+    KIND_HARD_BOUNCES,
+    KIND_NO_OPENS,
+    KIND_EMAIL_URL,
+)
+from src.scrapping.models import HardBounceSubscriber, NoOpenSubscriber
+
+
+OLD_SEND_DATE = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S")
+RECENT_SEND_DATE = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScrapeResultCache(db_path=str(tmp_path / "scrape_cache.db"), frozen_after_days=7)
+
+
+class TestParseSendDate:
+    @pytest.mark.parametrize("value,expected", [
+        ("2025-06-02 11:18:24", datetime(2025, 6, 2, 11, 18, 24)),
+        ("02/06/25 11:18", datetime(2025, 6, 2, 11, 18)),
+        ("2025-06-02", datetime(2025, 6, 2)),
+    ])
+    def test_known_formats(self, value, expected):
+        assert parse_send_date(value) == expected
+
+    @pytest.mark.parametrize("value", [None, "", "None", "no es fecha"])
+    def test_unsent_or_invalid(self, value):
+        assert parse_send_date(value) is None
+
+
+class TestScrapeResultCache:
+    def test_frozen_campaign_is_cached(self, cache):
+        assert cache.put(1, KIND_EMAIL_URL, "https://clickacm.com/show/abc/", OLD_SEND_DATE)
+        assert cache.get(1, KIND_EMAIL_URL) == "https://clickacm.com/show/abc/"
+
+    def test_recent_campaign_is_not_cached(self, cache):
+        assert not cache.put(1, KIND_EMAIL_URL, "x", RECENT_SEND_DATE)
+        assert cache.get(1, KIND_EMAIL_URL) is None
+
+    def test_unsent_campaign_is_not_cached(self, cache):
+        assert not cache.put(1, KIND_EMAIL_URL, "x", "None")
+
+    def test_models_roundtrip(self, cache):
+        bounces = [HardBounceSubscriber(email="a@example.com", lista="Lista A")]
+        cache.put(7, KIND_HARD_BOUNCES, bounces, OLD_SEND_DATE)
+
+        restored = cache.get_models(7, KIND_HARD_BOUNCES, HardBounceSubscriber)
+        assert [b.email for b in restored] == ["a@example.com"]
+        assert restored[0].lista == "Lista A"
+
+    def test_invalidate_single_campaign(self, cache):
+        cache.put(1, KIND_EMAIL_URL, "a", OLD_SEND_DATE)
+        cache.put(2, KIND_EMAIL_URL, "b", OLD_SEND_DATE)
+
+        assert cache.invalidate(1) == 1
+        assert cache.get(1, KIND_EMAIL_URL) is None
+        assert cache.get(2, KIND_EMAIL_URL) == "b"
+
+    def test_invalidate_all(self, cache):
+        cache.put(1, KIND_EMAIL_URL, "a", OLD_SEND_DATE)
+        cache.put(1, KIND_HARD_BOUNCES, [], OLD_SEND_DATE)
+        assert cache.invalidate() == 2
+        assert cache.stats()["kinds"] == {}
+
+    def test_has_requires_every_kind_without_counting_hits(self, cache):
+        cache.put(3, KIND_EMAIL_URL, "a", OLD_SEND_DATE)
+        cache.put(3, KIND_NO_OPENS, [], OLD_SEND_DATE)
+
+        assert cache.has(3, [KIND_EMAIL_URL, KIND_NO_OPENS])
+        assert not cache.has(3, [KIND_EMAIL_URL, KIND_HARD_BOUNCES])
+        assert cache.stats()["kinds"][KIND_EMAIL_URL]["hits"] == 0
+
+    def test_disabled_cache_is_noop(self, tmp_path):
+        cache = ScrapeResultCache(db_path=str(tmp_path / "c.db"), enabled=False)
+        assert not cache.put(1, KIND_EMAIL_URL, "a", OLD_SEND_DATE)
+        assert cache.get(1, KIND_EMAIL_URL) is None
+
+
+class FakeDetailsService:
+    """Hard bounces falla (lista vacía, extracción incompleta); no abiertos termina bien."""
+
+    def __init__(self):
+        self.extracciones_completas = {}
+
+    def extraccion_completa(self, checkpoint_key):
+        return self.extracciones_completas.get(checkpoint_key, False)
+
+    def extract_hard_bounces(self, campaign, campaign_id):
+        self.extracciones_completas[f"hard_bounces:{campaign_id}"] = False
+        return []
+
+    def extract_no_opens(self, campaign, campaign_id):
+        self.extracciones_completas[f"no_opens:{campaign_id}"] = True
+        return [NoOpenSubscriber(email="b@example.com", lista="Lista A")]
+
+
+def test_only_completed_extractions_are_cached(cache, monkeypatch):
+    from src import hybrid_service
+    from src.infrastructure.api.models.campanias import CampaignBasicInfo
+
+    monkeypatch.setattr(hybrid_service, "API", lambda: None)
+    monkeypatch.setattr("time.sleep", lambda segundos: None)
+    servicio = hybrid_service.HybridDataService(scrape_cache=cache)
+    servicio.scraping_service = FakeDetailsService()
+    campania = CampaignBasicInfo(status="sent", date_sent=OLD_SEND_DATE, name="Campaña", date=OLD_SEND_DATE)
+
+    resultado = servicio._extract_scraping_data(campania, 9)
+
+    assert [s.email for s in resultado.no_opens] == ["b@example.com"]
+    assert cache.get_models(9, KIND_NO_OPENS, NoOpenSubscriber)[0].email == "b@example.com"
+    assert cache.get_models(9, KIND_HARD_BOUNCES, HardBounceSubscriber) is None
+
+
+def test_demo_skips_browser_only_when_every_campaign_is_cached(cache, monkeypatch):
+    from src import demo
+    from src.cache import KIND_CAMPAIGN_URLS
+
+    monkeypatch.setattr(demo, "get_scrape_cache", lambda: cache)
+    for campania in (1, 2):
+        cache.put(campania, KIND_HARD_BOUNCES, [], OLD_SEND_DATE)
+        cache.put(campania, KIND_NO_OPENS, [], OLD_SEND_DATE)
+        cache.put(campania, KIND_CAMPAIGN_URLS, [], OLD_SEND_DATE)
+    cache.put(1, KIND_EMAIL_URL, "https://clickacm.com/show/a/", OLD_SEND_DATE)
+
+    assert demo.campanias_en_cache([(1, "Frozen")])
+    assert not demo.campanias_en_cache([(1, "Frozen"), (2, "Sin URL del correo")])
+    assert not demo.campanias_en_cache([])
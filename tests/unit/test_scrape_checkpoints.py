@@ -0,0 +1,122 @@
+"""
+Unit tests for resumable scrape checkpoints
+"""
+import re
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from src.cache.checkpoints import ScrapeCheckpointStore
+from src.scrapping.models import NoOpenSubscriber
+from src.shared.utils import legacy_utils
+from src.shared.utils.legacy_utils import ir_a_pagina
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScrapeCheckpointStore(db_path=str(tmp_path / "checkpoints.db"), max_age_hours=24)
+
+
+class TestScrapeCheckpointStore:
+    def test_new_job_starts_at_first_page(self, store):
+        assert store.start("job", 5) == 1
+        assert store.load_rows("job") == []
+
+    def test_resumes_after_last_contiguous_page(self, store):
+        store.start("job", 5)
+        store.save_page("job", 1, [["a"]])
+        store.save_page("job", 2, [["b"], ["c"]])
+
+        assert store.start("job", 5) == 3
+        assert store.load_rows("job") == [["a"], ["b"], ["c"]]
+
+    def test_hole_limits_resume_point(self, store):
+        store.start("job", 5)
+        store.save_page("job", 1, [["a"]])
+        store.save_page("job", 3, [["c"]])
+
+        assert store.start("job", 5) == 2
+        assert store.load_rows("job") == [["a"]]
+        assert not store.is_complete("job")
+
+    def test_changed_total_pages_resets(self, store):
+        store.start("job", 5)
+        store.save_page("job", 1, [["a"]])
+
+        assert store.start("job", 6) == 1
+        assert store.load_rows("job") == []
+
+    def test_expired_checkpoint_resets(self, store):
+        store.start("job", 5)
+        store.save_page("job", 1, [["a"]])
+        with store._connect() as conn:
+            viejo = (datetime.now() - timedelta(hours=48)).isoformat()
+            conn.execute("UPDATE checkpoint_jobs SET started_at = ?", (viejo,))
+
+        assert store.start("job", 5) == 1
+
+    def test_models_round_trip(self, store):
+        store.start("no_opens:1", 1)
+        store.save_page("no_opens:1", 1, [NoOpenSubscriber(email="a@example.com", lista="L")])
+
+        restored = store.load_models("no_opens:1", NoOpenSubscriber)
+        assert restored[0].email == "a@example.com"
+
+    def test_complete_removes_job(self, store):
+        store.start("job", 2)
+        store.save_page("job", 1, [1])
+        store.save_page("job", 2, [2])
+        assert store.is_complete("job")
+
+        store.complete("job")
+        assert store.start("job", 2) == 1
+
+    def test_disabled_store_is_noop(self, tmp_path):
+        disabled = ScrapeCheckpointStore(db_path=str(tmp_path / "x.db"), enabled=False)
+        disabled.save_page("job", 1, [1])
+        assert disabled.start("job", 3) == 1
+        assert disabled.load_rows("job") == []
+
+
+class TestIrAPagina:
+    def test_direct_jump_rewrites_page_parameter(self):
+        page = Mock()
+        page.url = "https://acumbamail.com/app/list/1/subscriber/list/?page=1"
+        enlace = page.locator.return_value.first
+        enlace.count.return_value = 1
+        enlace.get_attribute.return_value = "?page=2&order=asc"
+
+        assert ir_a_pagina(page, 7)
+        destino = page.goto.call_args[0][0]
+        assert re.search(r"[?&]page=7\b", destino)
+        assert "order=asc" in destino
+
+    def test_falls_back_to_sequential_navigation(self, monkeypatch):
+        page = Mock()
+        page.locator.return_value.first.count.return_value = 0
+        visitadas = []
+        monkeypatch.setattr(legacy_utils, "navegar_siguiente_pagina",
+                            lambda p, actual: visitadas.append(actual) or True)
+
+        assert ir_a_pagina(page, 4)
+        assert visitadas == [1, 2, 3]
+        page.goto.assert_not_called()
+
+
+def test_empty_scraped_page_is_not_checkpointed(store, monkeypatch):
+    from src import descargar_suscriptores
+
+    paginas = iter([[{"email": "a@x.com"}], [], [{"email": "c@x.com"}]])
+    monkeypatch.setattr(descargar_suscriptores, "get_checkpoint_store", lambda: store)
+    monkeypatch.setattr(descargar_suscriptores, "obtener_total_paginas", lambda page: 3)
+    monkeypatch.setattr(descargar_suscriptores, "_reanudar_desde_checkpoint",
+                        lambda page, clave, total, url: (store.start(clave, total), []))
+    monkeypatch.setattr(descargar_suscriptores, "extraer_suscriptores_tabla_lista", lambda *args: next(paginas))
+    monkeypatch.setattr(descargar_suscriptores, "navegar_siguiente_pagina", lambda page, actual: True)
+
+    filas = descargar_suscriptores.obtener_suscriptores_via_scraping(Mock(), 5, "Lista")
+
+    assert [f["email"] for f in filas] == ["a@x.com", "c@x.com"]
+    # La página vacía queda pendiente: el siguiente intento la vuelve a extraer
+    assert store.start("list_subscribers:5", 3) == 2
@@ -0,0 +1,116 @@
+"""
+Unit tests for delta-based segment synchronisation
+"""
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from src.cache.sync_snapshot import SegmentSyncSnapshotStore, calcular_delta, calcular_hashes
+from src.infrastructure.api.models.suscriptores import BatchAddResult, BatchDeleteResult
+from src.mapeo_segmentos import sincronizar_delta_segmentos
+
+COLUMNAS = ['Segmentos', 'SEDE', 'ROL USUARIO']
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SegmentSyncSnapshotStore(db_path=str(tmp_path / "segment_sync.db"))
+
+
+@pytest.fixture
+def lista():
+    n = 1_000
+    return pd.DataFrame({
+        'email': [f'u{i}@example.com' for i in range(n)],
+        'SEDE': ['Madrid' if i % 2 else 'Sevilla' for i in range(n)],
+        'ROL USUARIO': ['Juez'] * n,
+        'Segmentos': ['Madrid' if i % 2 else '' for i in range(n)],
+        'Telefono': [str(i) for i in range(n)],
+    })
+
+
+@pytest.fixture
+def api_client():
+    client = Mock()
+    client.suscriptores.batch_add_subscribers.side_effect = (
+        lambda list_id, subscribers_data, **kwargs: BatchAddResult(success_count=len(subscribers_data))
+    )
+    client.suscriptores.batch_delete_subscribers.side_effect = (
+        lambda list_id, emails: BatchDeleteResult(success_count=len(emails))
+    )
+    return client
+
+
+def test_hashes_ignore_irrelevant_columns_and_empty_values(lista):
+    base = calcular_hashes(lista, COLUMNAS)
+    otra = lista.assign(Telefono='x', Segmentos=lista['Segmentos'].replace('', None))
+    otra['email'] = otra['email'].str.upper()
+
+    assert calcular_hashes(otra, COLUMNAS) == base
+    assert len(base) == len(lista)
+
+
+def test_delta_classifies_inserts_updates_and_deletes():
+    delta = calcular_delta({'a': '1', 'b': '2', 'c': '3'}, {'a': '1', 'b': 'x', 'd': '4'})
+
+    assert (delta.altas, delta.modificaciones, delta.bajas, delta.sin_cambios) == (['c'], ['b'], ['d'], 1)
+    assert delta.total == 3
+
+
+def test_snapshot_is_discarded_when_columns_change(store):
+    store.save(7, COLUMNAS, {'a@example.com': 'abc'})
+
+    assert store.load(7, list(reversed(COLUMNAS))) == {'a@example.com': 'abc'}
+    assert store.load(7, COLUMNAS + ['PERFIL USUARIO']) is None
+    assert store.load(8, COLUMNAS) is None
+
+
+def test_one_percent_change_sends_one_percent(lista, store, api_client):
+    store.save(7, COLUMNAS, calcular_hashes(lista, COLUMNAS))
+    cambiada = lista.copy()
+    cambiada.loc[:8, 'Segmentos'] = 'Nuevo'
+    cambiada = pd.concat([cambiada.iloc[1:], pd.DataFrame([{'email': 'nuevo@example.com', 'SEDE': 'Madrid'}])])
+
+    delta = sincronizar_delta_segmentos(cambiada, 7, api_client, COLUMNAS, store.load(7, COLUMNAS), store)
+
+    assert (len(delta.altas), len(delta.modificaciones), len(delta.bajas)) == (1, 8, 1)
+    enviados = api_client.suscriptores.batch_add_subscribers.call_args.kwargs['subscribers_data']
+    assert api_client.suscriptores.batch_add_subscribers.call_count == 1
+    assert len(enviados) == 9
+    api_client.suscriptores.batch_delete_subscribers.assert_called_once_with(7, ['u0@example.com'])
+    assert store.load(7, COLUMNAS) == calcular_hashes(cambiada, COLUMNAS)
+
+    api_client.reset_mock()
+    assert sincronizar_delta_segmentos(cambiada, 7, api_client, COLUMNAS, store.load(7, COLUMNAS), store).vacio
+    api_client.suscriptores.batch_add_subscribers.assert_not_called()
+
+
+def test_failed_batch_is_retried_next_time(lista, store, api_client):
+    store.save(7, COLUMNAS, calcular_hashes(lista, COLUMNAS))
+    cambiada = lista.assign(Segmentos='Todos')
+    api_client.suscriptores.batch_add_subscribers.side_effect = (
+        lambda list_id, subscribers_data, **kwargs: BatchAddResult(success_count=0, error_count=len(subscribers_data))
+    )
+
+    sincronizar_delta_segmentos(cambiada, 7, api_client, COLUMNAS, store.load(7, COLUMNAS), store)
+
+    assert calcular_delta(calcular_hashes(cambiada, COLUMNAS), store.load(7, COLUMNAS)).total == len(lista)
+
+
+def test_cleared_fields_are_sent_empty_before_snapshot_records_them(lista, store, api_client):
+    store.save(7, COLUMNAS, calcular_hashes(lista, COLUMNAS))
+    cambiada = lista.copy()
+    cambiada.loc[1, 'Segmentos'] = ''
+    cambiada.loc[3, 'Segmentos'] = None
+    cambiada.loc[3, 'SEDE'] = None
+
+    delta = sincronizar_delta_segmentos(cambiada, 7, api_client, COLUMNAS, store.load(7, COLUMNAS), store)
+
+    assert delta.modificaciones == ['u1@example.com', 'u3@example.com']
+    enviados = api_client.suscriptores.batch_add_subscribers.call_args.kwargs['subscribers_data']
+    datos = {s.email: s.model_dump() for s in enviados}
+    assert datos['u1@example.com']['Segmentos'] == '' and datos['u1@example.com']['SEDE'] == 'Madrid'
+    assert datos['u3@example.com']['Segmentos'] == '' and datos['u3@example.com']['SEDE'] == ''
+    assert 'Telefono' in datos['u3@example.com']
+    assert store.load(7, COLUMNAS) == calcular_hashes(cambiada, COLUMNAS)
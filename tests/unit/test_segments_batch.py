@@ -0,0 +1,126 @@
+"""
+Unit tests for batch segment creation in the segments UI
+"""
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.scrapping.endpoints import segments
+from src.scrapping.endpoints.segments import SegmentsScrapingService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    page = Mock()
+
+    @contextmanager
+    def fake_authenticated_page(p=None, *args, **kwargs):
+        yield page, page.context
+
+    monkeypatch.setattr(segments, "authenticated_page", fake_authenticated_page)
+    monkeypatch.setattr(segments, "profile_page", lambda p: p)
+    monkeypatch.setattr(segments, "load_config", lambda: {})
+    svc = SegmentsScrapingService()
+    svc.abiertas = []
+    svc.creados = []
+    monkeypatch.setattr(svc, "_open_segments_page", lambda p, list_id: svc.abiertas.append(list_id))
+
+    def create_one(p, name):
+        if name == "Roto":
+            raise RuntimeError("Sin confirmación de guardado en 20s")
+        svc.creados.append(name)
+
+    monkeypatch.setattr(svc, "_create_one", create_one)
+    return svc
+
+
+@pytest.fixture
+def api_client(service):
+    client = Mock()
+
+    def get_list_segments(list_id):
+        # La API devuelve también lo que el lote ya ha guardado
+        return SimpleNamespace(
+            segments=[SimpleNamespace(name="Madrid"), {"name": "Sevilla"}] + [(n,) for n in service.creados]
+        )
+
+    client.suscriptores.get_list_segments.side_effect = get_list_segments
+    return client
+
+
+def test_batch_checks_existing_once_and_navigates_once(service, api_client):
+    assert service.create_segments_batch(7, ["Madrid", "Cádiz", "Jaén", "Cádiz"], api_client)
+
+    # Una consulta antes de crear y otra para verificar el lote
+    assert [c.args for c in api_client.suscriptores.get_list_segments.call_args_list] == [(7,), (7,)]
+    assert service.abiertas == [7]
+    assert service.creados == ["Cádiz", "Jaén"]
+    assert {r.name: r.estado for r in service.last_results} == {
+        "Madrid": "existente", "Cádiz": "creado", "Jaén": "creado"
+    }
+    assert all(r.duracion_s >= 0 for r in service.last_results)
+
+
+def test_failed_segment_reloads_page_and_continues(service, api_client):
+    assert not service.create_segments_batch(7, ["Roto", "Cádiz"], api_client)
+
+    assert service.abiertas == [7, 7]
+    assert service.creados == ["Cádiz"]
+    fallido = service.last_results[0]
+    assert (fallido.name, fallido.estado) == ("Roto", "error")
+    assert "confirmación" in fallido.error
+
+
+def test_nothing_to_create_skips_browser(service, api_client):
+    assert service.create_segment(7, "Sevilla", api_client)
+    assert service.abiertas == []
+
+
+def test_saved_segment_missing_from_api_is_an_error(service, api_client):
+    api_client.suscriptores.get_list_segments.side_effect = [
+        SimpleNamespace(segments=[]),
+        SimpleNamespace(segments=[{"name": "Cádiz"}]),
+    ]
+
+    assert not service.create_segments_batch(7, ["Cádiz", "Jaén"], api_client)
+
+    assert service.creados == ["Cádiz", "Jaén"]
+    assert {r.name: r.estado for r in service.last_results} == {"Cádiz": "creado", "Jaén": "error"}
+
+
+def test_confirmation_waits_for_the_form_to_close(monkeypatch):
+    monkeypatch.setattr(segments, "load_config", lambda: {})
+    page = Mock()
+    formulario = Mock()
+    page.locator.side_effect = lambda selector: formulario if selector == "#field-value-1" else Mock()
+
+    SegmentsScrapingService(page)._create_one(page, "Cádiz")
+
+    assert [c.kwargs["state"] for c in formulario.wait_for.call_args_list] == ["visible", "hidden"]
+    page.get_by_text.assert_not_called()
+
+
+def test_batch_without_page_runs_on_shared_browser_service(monkeypatch, api_client):
+    from src import mapeo_segmentos
+
+    paginas = []
+
+    class FakeBrowserService:
+        def run(self, operation, timeout=None, name=None):
+            return operation("pagina-compartida", "contexto")
+
+    class FakeSegments:
+        def __init__(self, page=None):
+            paginas.append(page)
+
+        def create_segments_batch(self, list_id, names, api_client):
+            return True
+
+    monkeypatch.setattr(mapeo_segmentos, "get_browser_service", lambda: FakeBrowserService())
+    monkeypatch.setattr(mapeo_segmentos, "SegmentsScrapingService", FakeSegments)
+
+    assert mapeo_segmentos.crear_segmentos_con_scraping_batch(7, ["Cádiz"], api_client)
+    assert mapeo_segmentos.crear_segmentos_con_scraping_batch(8, ["Jaén"], api_client, page="pagina-propia")
+    assert paginas == ["pagina-compartida", "pagina-propia"]
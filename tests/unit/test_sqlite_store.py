@@ -0,0 +1,44 @@
+"""
+Unit tests for the shared SQLite store base in src/cache
+"""
+import sqlite3
+import threading
+
+from src.cache.sqlite_store import SQLiteStore, instancia_compartida
+
+
+class NotasStore(SQLiteStore):
+    DB_FILENAME = "notas.db"
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS notas (id INTEGER PRIMARY KEY, texto TEXT)",)
+
+
+def test_store_creates_schema_only_when_enabled(tmp_path):
+    ruta = tmp_path / "sub" / "notas.db"
+    store = NotasStore(db_path=str(ruta))
+    with store._lock, store._connect() as conn:
+        conn.execute("INSERT INTO notas (texto) VALUES ('hola')")
+
+    with sqlite3.connect(ruta) as conn:
+        assert conn.execute("SELECT texto FROM notas").fetchall() == [("hola",)]
+
+    NotasStore(db_path=str(tmp_path / "apagado.db"), enabled=False)
+    assert not (tmp_path / "apagado.db").exists()
+
+
+def test_shared_instance_is_created_once_across_threads():
+    llamadas = []
+
+    @instancia_compartida
+    def get_notas():
+        llamadas.append(1)
+        return object()
+
+    vistas = []
+    hilos = [threading.Thread(target=lambda: vistas.append(get_notas())) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(llamadas) == 1
+    assert len({id(v) for v in vistas}) == 1
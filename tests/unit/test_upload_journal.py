@@ -0,0 +1,76 @@
+"""
+Unit tests for the resumable upload journal
+"""
+from src.cache.upload_journal import UploadJournal, clave_subida
+from src.infrastructure.api.batch_upload import enviar_lotes
+from src.infrastructure.api.models.suscriptores import BatchAddResult, SubscriberData
+
+
+class FakeSuscriptores:
+    def __init__(self, falla_en=None):
+        self.falla_en = falla_en
+        self.enviados = []
+
+    def batch_add_subscribers(self, list_id, subscribers_data, update_subscriber=0, complete_json=0):
+        if len(self.enviados) == self.falla_en:
+            self.falla_en = None
+            raise RuntimeError("429 Too Many Requests")
+        self.enviados.append([s.email for s in subscribers_data])
+        return BatchAddResult.from_api_response([
+            {"error": "email inválido"} if s.email.startswith("mal") else {"email": s.email, "id": i}
+            for i, s in enumerate(subscribers_data)
+        ])
+
+
+class FakeAPI:
+    def __init__(self, falla_en=None):
+        self.suscriptores = FakeSuscriptores(falla_en)
+
+
+def lotes(total=10, tamano=3, malos=()):
+    filas = [SubscriberData(email=("mal" if i in malos else "u") + f"{i}@x.com") for i in range(total)]
+    return [(offset, filas[offset:offset + tamano]) for offset in range(0, total, tamano)]
+
+
+def test_interrupted_upload_resumes_from_first_unconfirmed_chunk(tmp_path):
+    journal = UploadJournal(db_path=str(tmp_path / "diario.db"))
+    clave = clave_subida("libro.xlsx", "Datos", "Clientes")
+
+    assert journal.begin(clave, 10, 3) is None
+    journal.set_list(clave, 77)
+    api = FakeAPI(falla_en=2)
+    primero = enviar_lotes(api, 77, lotes(malos={4}), journal, clave)
+    assert (primero.enviados, primero.errores, primero.lotes_fallidos) == (6, 1, 1)
+    assert journal.first_pending(clave) == 6
+    assert journal.summary(clave) == {"lotes_confirmados": 3, "lotes_fallidos": 1, "filas_ok": 6, "filas_error": 1}
+
+    # Segunda ejecución: misma lista, solo se reenvía el lote que no llegó
+    assert journal.begin(clave, 10, 3) == 77
+    api = FakeAPI()
+    segundo = enviar_lotes(api, 77, lotes(malos={4}), journal, clave)
+    assert api.suscriptores.enviados == [["u6@x.com", "u7@x.com", "u8@x.com"]]
+    assert segundo.lotes_omitidos == 3 and segundo.completo
+    assert segundo.total_exitosos == 9  # 10 filas, una rechazada
+
+    journal.complete(clave)
+    assert journal.begin(clave, 10, 3) is None
+
+
+def test_changed_chunk_is_resent_and_stale_jobs_restart(tmp_path):
+    journal = UploadJournal(db_path=str(tmp_path / "diario.db"))
+    clave = clave_subida("libro.xlsx", "Datos", "Clientes")
+    journal.begin(clave, 4, 2)
+    journal.set_list(clave, 5)
+    enviar_lotes(FakeAPI(), 5, lotes(4, 2), journal, clave)
+
+    cambiados = lotes(4, 2)
+    cambiados[1][1][0] = SubscriberData(email="u2@x.com", nombre="Ana")
+    api = FakeAPI()
+    enviar_lotes(api, 5, cambiados, journal, clave)
+    assert api.suscriptores.enviados == [["u2@x.com", "u3@x.com"]]
+
+    # Otro tamaño de lote (u otra configuración) no reutiliza el trabajo
+    assert journal.begin(clave, 4, 3) is None
+    caducado = UploadJournal(db_path=str(tmp_path / "diario.db"), max_age_hours=0)
+    caducado.set_list(clave, 6)
+    assert caducado.begin(clave, 4, 3) is None